@@ -1,7 +1,13 @@
 from app_init import app, socketio
+import app_init
 
 # Import routes
 import routes
 
+def boot(ingest=None):
+    """Start the application's services (app_init.boot) and the daily event log export scheduler"""
+    return app_init.boot(ingest, services=[('export scheduler', routes.start_daily_export_scheduler)])
+
 if __name__ == '__main__':
+    boot()
     socketio.run(app, host='0.0.0.0', port=5000, debug=True)
@@ -1,5 +1,8 @@
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask
 from flask_socketio import SocketIO
 from flask_login import LoginManager
@@ -7,6 +10,7 @@ from werkzeug.middleware.proxy_fix import ProxyFix
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 # Create the app
 app = Flask(__name__)
@@ -14,15 +18,8 @@ app.secret_key = os.environ.get("SESSION_SECRET", "surveillance_secret_key_2025"
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
 # Configure the database
-app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///surveillance.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
-
-# Import models and initialize database
-from models import db, User, Track, Event
-db.init_app(app)
+from models import db, User, Track, Event, ensure_columns, ensure_indexes, configure_database, create_default_user
+configure_database(app)
 
 # Initialize Flask-Login
 login_manager = LoginManager()
@@ -34,21 +31,13 @@ setattr(login_manager, 'login_message', 'Please log in to access this page.')
 def load_user(user_id):
     return User.query.get(int(user_id))
 
-socketio = SocketIO(app, cors_allowed_origins="*", logger=False, engineio_logger=False, ping_timeout=180, ping_interval=60, async_mode='threading')
-
-def create_default_user():
-    """Create default user if none exists"""
-    if not User.query.first():
-        default_user = User()
-        default_user.username = 'user'
-        default_user.set_password('pass')
-        db.session.add(default_user)
-        db.session.commit()
+# Async mode is 'threading' unless a production entry point (serve.py) patched for eventlet/gevent
+socketio = SocketIO(app, cors_allowed_origins="*", logger=False, engineio_logger=False, ping_timeout=180, ping_interval=60,
+                    async_mode=os.environ.get("SOCKETIO_ASYNC_MODE", "threading"))
 
 def initialize_udp_receiver():
     """Initialize UDP receiver with Flask app dependencies"""
     from udp_receiver import start_udp_receiver
-    logger = logging.getLogger(__name__)
     
     try:
         if start_udp_receiver(app=app, db=db, socketio=socketio, Track=Track, Event=Event):
@@ -60,8 +49,6 @@ def initialize_udp_receiver():
 
 def initialize_track_calculator():
     """Initialize track calculator with Flask app dependencies"""
-    logger = logging.getLogger(__name__)
-    
     try:
         from track_flask_integration import initialize_track_calculator_app
         if initialize_track_calculator_app(app):
@@ -71,11 +58,65 @@ def initialize_track_calculator():
     except Exception as e:
         logger.error(f"Error initializing track calculator: {e}")
 
-# Initialize database and create default user
-with app.app_context():
+def initialize_database():
+    """Create tables, columns and indexes and the default user"""
     db.create_all()
+    ensure_columns()
+    ensure_indexes()
     create_default_user()
-    # Start UDP receiver automatically
-    initialize_udp_receiver()
-    # Initialize track calculator
-    initialize_track_calculator()
+
+def _run_boot_step(name, step):
+    """Run one boot step in an app context and log how long it took"""
+    started = time.perf_counter()
+    try:
+        with app.app_context():
+            step()
+    except Exception as e:
+        logger.error(f"Boot step '{name}' failed: {e}")
+    elapsed = time.perf_counter() - started
+    logger.info(f"Boot: {name} ready in {elapsed * 1000:.0f} ms")
+    return elapsed
+
+_boot_lock = threading.Lock()
+_boot_timings = None
+
+def boot(ingest=None, services=()):
+    """
+    Start the application's services (the explicit startup phase)
+    
+    Importing this module only configures the app. boot() prepares the
+    database first, since everything else uses it, then starts the services
+    in parallel: the UDP receiver, the track calculator (imports the tracker
+    and replays stored tracks) and any extra services. It runs once; later
+    calls return the first call's timings.
+    
+    Args:
+        ingest: Start UDP ingest and tracking in this process (default: yes,
+            unless SURVEILLANCE_INGEST=0 because a separate ingest process does)
+        services: Additional (name, callable) steps, e.g. the daily export scheduler
+    
+    Returns:
+        Step name -> seconds taken, plus 'total'
+    """
+    global _boot_timings
+    with _boot_lock:
+        if _boot_timings is not None:
+            return _boot_timings
+        if ingest is None:
+            ingest = os.environ.get("SURVEILLANCE_INGEST", "1") != "0"
+        
+        started = time.perf_counter()
+        timings = {'database': _run_boot_step('database', initialize_database)}
+        steps = list(services)
+        if ingest:
+            steps += [('UDP receiver', initialize_udp_receiver), ('track calculator', initialize_track_calculator)]
+        if steps:
+            with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix='boot') as pool:
+                futures = [(name, pool.submit(_run_boot_step, name, step)) for name, step in steps]
+            timings.update((name, future.result()) for name, future in futures)
+        timings['total'] = time.perf_counter() - started
+        
+        logger.info(f"Boot complete in {timings['total'] * 1000:.0f} ms "
+                    f"(ingest {'in this process' if ingest else 'elsewhere'})")
+        _boot_timings = timings
+        return timings
@@ -1,30 +1,33 @@
 """
 ASTERIX CAT-48 and Lower Categories Consolidated Processor
-Handles ASTERIX Categories 10, 21, and 48 in a single comprehensive processor.
+Handles ASTERIX Categories 10, 21, 34 and 48 in a single comprehensive processor.
 Based on EUROCONTROL ASTERIX specifications and Cambridge Pixel implementation guidance.
 """
 
 import struct
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
-import math
 import logging
 
+from tracking_clock import TimeOfDayConverter
+from geodesy import site_frame, NM_TO_M
+
 logger = logging.getLogger(__name__)
 
 class AsterixConsolidatedProcessor:
     """
-    Consolidated processor for ASTERIX Categories 10, 21, and 48.
+    Consolidated processor for ASTERIX Categories 10, 21, 34 and 48.
     Handles all lower categories in a single efficient processor.
     """
     
     def __init__(self):
-        self.supported_categories = [10, 21, 48]
+        self.supported_categories = [10, 21, 34, 48]
         
         # Category descriptions
         self.category_descriptions = {
             10: "Transmission of Monosensor Surface Movement Data",
             21: "ADS-B Target Reports", 
+            34: "Transmission of Monoradar Service Messages",
             48: "Monoradar Target Reports"
         }
         
@@ -36,9 +39,17 @@ class AsterixConsolidatedProcessor:
             'last_processing_time': None
         }
         
+        # Time-of-day (I048/140) to measurement datetime conversion
+        self.tod_converter = TimeOfDayConverter()
+        
+        # Radar sites by (SAC, SIC) for polar-to-geodetic conversion
+        self.default_radar_site = (28.0836, -80.6081)  # Melbourne FL
+        self.radar_sites: Dict[Tuple[int, int], Tuple[float, float]] = {}
+        
         # Initialize category-specific configurations
         self._init_cat10_config()
         self._init_cat21_config()
+        self._init_cat34_config()
         self._init_cat48_config()
     
     def _init_cat10_config(self):
@@ -134,6 +145,40 @@ class AsterixConsolidatedProcessor:
             ["I021/020", "I021/220", "I021/146", "I021/148", "I021/110", "I021/016", "I021/008"]
         ]
     
+    def _init_cat34_config(self):
+        """Initialize CAT-34 specific configuration."""
+        self.cat34_data_items = {
+            "I034/010": "Data Source Identifier",
+            "I034/000": "Message Type",
+            "I034/030": "Time of Day",
+            "I034/020": "Sector Number",
+            "I034/041": "Antenna Rotation Period",
+            "I034/050": "System Configuration and Status",
+            "I034/060": "System Processing Mode",
+            "I034/070": "Message Count Values",
+            "I034/100": "Generic Polar Window",
+            "I034/110": "Data Filter",
+            "I034/120": "3D-Position of Data Source",
+            "I034/090": "Collimation Error",
+            "I034/RE": "Reserved Expansion Field",
+            "I034/SP": "Special Purpose Field"
+        }
+        
+        # CAT-34 FSPEC mapping (UAP order)
+        self.cat34_fspec_mapping = [
+            # First octet
+            ["I034/010", "I034/000", "I034/030", "I034/020", "I034/041", "I034/050", "I034/060"],
+            # Second octet
+            ["I034/070", "I034/100", "I034/110", "I034/120", "I034/090", "I034/RE", "I034/SP"]
+        ]
+        
+        self.cat34_message_types = {
+            1: 'North Marker',
+            2: 'Sector Crossing',
+            3: 'Geographical Filtering',
+            4: 'Jamming Strobe'
+        }
+    
     def _init_cat48_config(self):
         """Initialize CAT-48 specific configuration."""
         self.cat48_data_items = {
@@ -216,210 +261,324 @@ class AsterixConsolidatedProcessor:
             if len(raw_data) < 3:
                 return []
             
-            # Extract category and length
-            category = raw_data[0]
-            length = struct.unpack('>H', raw_data[1:3])[0]
-            
-            if length > len(raw_data):
-                logger.warning(f"Message length {length} exceeds data length {len(raw_data)}")
-                return []
-            
-            # Update statistics
-            self.processing_stats['total_messages'] += 1
-            self.processing_stats['messages_by_category'][category] = \
-                self.processing_stats['messages_by_category'].get(category, 0) + 1
-            self.processing_stats['last_processing_time'] = datetime.utcnow().isoformat()
+            # A datagram may carry several data blocks back to back
+            reports = []
+            offset = 0
+            while offset + 3 <= len(raw_data):
+                # Extract category and length
+                category = raw_data[offset]
+                length = struct.unpack('>H', raw_data[offset + 1:offset + 3])[0]
+                
+                if length < 3 or offset + length > len(raw_data):
+                    logger.warning(f"Message length {length} exceeds data length {len(raw_data) - offset}")
+                    break
+                block = raw_data[offset:offset + length]
+                offset += length
+                
+                # Update statistics
+                self.processing_stats['total_messages'] += 1
+                self.processing_stats['messages_by_category'][category] = \
+                    self.processing_stats['messages_by_category'].get(category, 0) + 1
+                self.processing_stats['last_processing_time'] = datetime.utcnow().isoformat()
+                
+                # Route to appropriate category processor
+                if category == 10:
+                    reports.extend(self._process_cat10_message(block))
+                elif category == 21:
+                    reports.extend(self._process_cat21_message(block))
+                elif category == 34:
+                    reports.extend(self._process_cat34_message(block))
+                elif category == 48:
+                    reports.extend(self._process_cat48_message(block))
+                else:
+                    logger.warning(f"Unsupported ASTERIX category: {category}")
             
-            # Route to appropriate category processor
-            if category == 10:
-                return self._process_cat10_message(raw_data)
-            elif category == 21:
-                return self._process_cat21_message(raw_data)
-            elif category == 48:
-                return self._process_cat48_message(raw_data)
-            else:
-                logger.warning(f"Unsupported ASTERIX category: {category}")
-                return []
+            return reports
                 
         except Exception as e:
             self.processing_stats['processing_errors'] += 1
             logger.error(f"Error processing ASTERIX message: {e}")
             return []
     
+    def _decode_records(self, raw_data: bytes, parse_record) -> List[Dict[str, Any]]:
+        """
+        Decode every record of one data block.
+        
+        Args:
+            raw_data: Data block (category, length, records)
+            parse_record: Function (block, position) -> (record, position after the record)
+            
+        Returns:
+            Decoded records in block order
+        """
+        length = struct.unpack('>H', raw_data[1:3])[0]
+        block = raw_data[:length]
+        
+        records = []
+        position = 3
+        while position < len(block):
+            record, next_position = parse_record(block, position)
+            if next_position <= position:
+                break
+            records.append(record)
+            position = next_position
+        
+        return records
+    
     def _process_cat48_message(self, raw_data: bytes) -> List[Dict[str, Any]]:
         """Process CAT-48 message using Cambridge Pixel methodology."""
         try:
-            # Parse header
-            category = raw_data[0]
-            length = struct.unpack('>H', raw_data[1:3])[0]
-            
-            # Parse data record
-            position = 3
-            
-            # Extract FSPEC
-            fspec, fspec_length = self._extract_fspec(raw_data[position:])
-            position += fspec_length
-            
-            # Decode which data items are present
-            items_present = self._decode_fspec(fspec, self.cat48_fspec_mapping)
-            
-            # Parse each data item
-            target = {
-                'category': 48,
-                'message_type': 'Monoradar Target Report',
-                'timestamp': datetime.utcnow().isoformat(),
-                'data_items': {},
-                'track_id': None,
-                'callsign': None,
-                'latitude': None,
-                'longitude': None,
-                'altitude': None,
-                'ground_speed': None,
-                'heading': None,
-                'range': None,
-                'azimuth': None,
-                'mode_3a': None,
-                'aircraft_address': None,
-                'detection_type': None,
-                'time_of_day': None,
-                'track_number': None,
-                'flight_level': None,
-                'radial_doppler_speed': None,
-                'warning_conditions': []
-            }
-            
-            # Parse each present data item
-            for item_code in items_present:
-                if position >= len(raw_data):
-                    break
-                    
-                item_data, item_length = self._parse_cat48_data_item(item_code, raw_data[position:])
-                if item_data:
-                    target['data_items'][item_code] = item_data
-                    self._apply_cat48_item_to_target(target, item_code, item_data)
-                
-                position += item_length
-            
-            # Generate track ID
-            target['track_id'] = self._generate_track_id(target, 48)
-            
-            return [target]
-            
+            return self._decode_records(raw_data, self._parse_cat48_record)
         except Exception as e:
             logger.error(f"Error processing CAT-48 message: {e}")
             return []
     
+    def _parse_cat48_record(self, raw_data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+        """Parse one CAT-48 record starting at position."""
+        # Extract FSPEC
+        fspec, fspec_length = self._extract_fspec(raw_data[position:])
+        position += fspec_length
+        
+        # Decode which data items are present
+        items_present = self._decode_fspec(fspec, self.cat48_fspec_mapping)
+        
+        # Parse each data item
+        target = {
+            'category': 48,
+            'message_type': 'Monoradar Target Report',
+            'timestamp': datetime.utcnow().isoformat(),
+            'data_items': {},
+            'track_id': None,
+            'callsign': None,
+            'latitude': None,
+            'longitude': None,
+            'altitude': None,
+            'ground_speed': None,
+            'heading': None,
+            'range': None,
+            'azimuth': None,
+            'mode_3a': None,
+            'aircraft_address': None,
+            'detection_type': None,
+            'time_of_day': None,
+            'measurement_time': None,
+            'track_number': None,
+            'flight_level': None,
+            'radial_doppler_speed': None,
+            'warning_conditions': []
+        }
+        
+        # Parse each present data item
+        for item_code in items_present:
+            if position >= len(raw_data):
+                break
+                
+            item_data, item_length = self._parse_cat48_data_item(item_code, raw_data[position:])
+            if item_data:
+                target['data_items'][item_code] = item_data
+                self._apply_cat48_item_to_target(target, item_code, item_data)
+            
+            position += item_length
+        
+        # Generate track ID
+        target['track_id'] = self._generate_track_id(target, 48)
+        
+        return target, position
+    
     def _process_cat21_message(self, raw_data: bytes) -> List[Dict[str, Any]]:
         """Process CAT-21 message."""
         try:
-            # Similar structure to CAT-48 but with CAT-21 specific parsing
-            category = raw_data[0]
-            length = struct.unpack('>H', raw_data[1:3])[0]
-            
-            position = 3
-            fspec, fspec_length = self._extract_fspec(raw_data[position:])
-            position += fspec_length
-            
-            items_present = self._decode_fspec(fspec, self.cat21_fspec_mapping)
-            
-            target = {
-                'category': 21,
-                'message_type': 'ADS-B Target Report',
-                'timestamp': datetime.utcnow().isoformat(),
-                'data_items': {},
-                'track_id': None,
-                'callsign': None,
-                'latitude': None,
-                'longitude': None,
-                'altitude': None,
-                'ground_speed': None,
-                'heading': None,
-                'aircraft_address': None,
-                'time_of_day': None,
-                'track_number': None,
-                'flight_level': None,
-                'geometric_height': None,
-                'selected_altitude': None,
-                'air_speed': None,
-                'true_air_speed': None,
-                'magnetic_heading': None,
-                'vertical_rate': None
-            }
-            
-            for item_code in items_present:
-                if position >= len(raw_data):
-                    break
-                    
-                item_data, item_length = self._parse_cat21_data_item(item_code, raw_data[position:])
-                if item_data:
-                    target['data_items'][item_code] = item_data
-                    self._apply_cat21_item_to_target(target, item_code, item_data)
-                
-                position += item_length
-            
-            target['track_id'] = self._generate_track_id(target, 21)
-            
-            return [target]
-            
+            return self._decode_records(raw_data, self._parse_cat21_record)
         except Exception as e:
             logger.error(f"Error processing CAT-21 message: {e}")
             return []
     
+    def _parse_cat21_record(self, raw_data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+        """Parse one CAT-21 record starting at position."""
+        fspec, fspec_length = self._extract_fspec(raw_data[position:])
+        position += fspec_length
+        
+        items_present = self._decode_fspec(fspec, self.cat21_fspec_mapping)
+        
+        target = {
+            'category': 21,
+            'message_type': 'ADS-B Target Report',
+            'timestamp': datetime.utcnow().isoformat(),
+            'data_items': {},
+            'track_id': None,
+            'callsign': None,
+            'latitude': None,
+            'longitude': None,
+            'altitude': None,
+            'ground_speed': None,
+            'heading': None,
+            'aircraft_address': None,
+            'time_of_day': None,
+            'track_number': None,
+            'flight_level': None,
+            'geometric_height': None,
+            'selected_altitude': None,
+            'air_speed': None,
+            'true_air_speed': None,
+            'magnetic_heading': None,
+            'vertical_rate': None
+        }
+        
+        for item_code in items_present:
+            if position >= len(raw_data):
+                break
+                
+            item_data, item_length = self._parse_cat21_data_item(item_code, raw_data[position:])
+            if item_data:
+                target['data_items'][item_code] = item_data
+                self._apply_cat21_item_to_target(target, item_code, item_data)
+            
+            position += item_length
+        
+        target['track_id'] = self._generate_track_id(target, 21)
+        
+        return target, position
+    
     def _process_cat10_message(self, raw_data: bytes) -> List[Dict[str, Any]]:
         """Process CAT-10 message."""
         try:
-            category = raw_data[0]
-            length = struct.unpack('>H', raw_data[1:3])[0]
-            
-            position = 3
-            fspec, fspec_length = self._extract_fspec(raw_data[position:])
-            position += fspec_length
-            
-            items_present = self._decode_fspec(fspec, self.cat10_fspec_mapping)
-            
-            target = {
-                'category': 10,
-                'message_type': 'Surface Movement Data',
-                'timestamp': datetime.utcnow().isoformat(),
-                'data_items': {},
-                'track_id': None,
-                'callsign': None,
-                'latitude': None,
-                'longitude': None,
-                'altitude': None,
-                'ground_speed': None,
-                'heading': None,
-                'range': None,
-                'azimuth': None,
-                'mode_3a': None,
-                'aircraft_address': None,
-                'time_of_day': None,
-                'track_number': None,
-                'flight_level': None,
-                'measured_height': None,
-                'target_size': None,
-                'vehicle_fleet': None,
-                'surface_type': None
-            }
-            
-            for item_code in items_present:
-                if position >= len(raw_data):
-                    break
-                    
-                item_data, item_length = self._parse_cat10_data_item(item_code, raw_data[position:])
-                if item_data:
-                    target['data_items'][item_code] = item_data
-                    self._apply_cat10_item_to_target(target, item_code, item_data)
+            return self._decode_records(raw_data, self._parse_cat10_record)
+        except Exception as e:
+            logger.error(f"Error processing CAT-10 message: {e}")
+            return []
+    
+    def _parse_cat10_record(self, raw_data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+        """Parse one CAT-10 record starting at position."""
+        fspec, fspec_length = self._extract_fspec(raw_data[position:])
+        position += fspec_length
+        
+        items_present = self._decode_fspec(fspec, self.cat10_fspec_mapping)
+        
+        target = {
+            'category': 10,
+            'message_type': 'Surface Movement Data',
+            'timestamp': datetime.utcnow().isoformat(),
+            'data_items': {},
+            'track_id': None,
+            'callsign': None,
+            'latitude': None,
+            'longitude': None,
+            'altitude': None,
+            'ground_speed': None,
+            'heading': None,
+            'range': None,
+            'azimuth': None,
+            'mode_3a': None,
+            'aircraft_address': None,
+            'time_of_day': None,
+            'track_number': None,
+            'flight_level': None,
+            'measured_height': None,
+            'target_size': None,
+            'vehicle_fleet': None,
+            'surface_type': None
+        }
+        
+        for item_code in items_present:
+            if position >= len(raw_data):
+                break
                 
-                position += item_length
+            item_data, item_length = self._parse_cat10_data_item(item_code, raw_data[position:])
+            if item_data:
+                target['data_items'][item_code] = item_data
+                self._apply_cat10_item_to_target(target, item_code, item_data)
+            
+            position += item_length
+        
+        target['track_id'] = self._generate_track_id(target, 10)
+        
+        return target, position
+    
+    def _process_cat34_message(self, raw_data: bytes) -> List[Dict[str, Any]]:
+        """Process CAT-34 service message (north marker / sector crossing)."""
+        try:
+            return self._decode_records(raw_data, self._parse_cat34_record)
+        except Exception as e:
+            logger.error(f"Error processing CAT-34 message: {e}")
+            return []
+    
+    def _parse_cat34_record(self, raw_data: bytes, position: int) -> Tuple[Dict[str, Any], int]:
+        """Parse one CAT-34 record starting at position."""
+        fspec, fspec_length = self._extract_fspec(raw_data[position:])
+        position += fspec_length
+        
+        items_present = self._decode_fspec(fspec, self.cat34_fspec_mapping)
+        
+        message = {
+            'category': 34,
+            'message_type': 'Monoradar Service Message',
+            'timestamp': datetime.utcnow().isoformat(),
+            'data_items': {},
+            'service_message_type': None,
+            'sac': None,
+            'sic': None,
+            'time_of_day': None,
+            'measurement_time': None,
+            'sector_azimuth': None,
+            'antenna_rotation_period': None
+        }
+        
+        for item_code in items_present:
+            if position >= len(raw_data):
+                break
+            
+            item_data, item_length = self._parse_cat34_data_item(item_code, raw_data[position:])
+            if item_data is None:
+                # Remaining items are not needed for scan/sector batching; their
+                # length is not decoded, so the rest of the block is skipped
+                position = len(raw_data)
+                break
+            
+            message['data_items'][item_code] = item_data
+            message.update(item_data)
+            position += item_length
+        
+        if message['time_of_day'] is not None:
+            message['measurement_time'] = self.tod_converter.to_datetime(message['time_of_day']).isoformat()
+        
+        return message, position
+    
+    def _parse_cat34_data_item(self, item_code: str, data: bytes) -> Tuple[Optional[Dict[str, Any]], int]:
+        """Parse CAT-34 data items used for antenna position tracking."""
+        try:
+            if item_code == "I034/010":  # Data Source Identifier
+                if len(data) < 2:
+                    return None, 0
+                sac, sic = struct.unpack('BB', data[:2])
+                return {'sac': sac, 'sic': sic}, 2
+            
+            elif item_code == "I034/000":  # Message Type
+                if len(data) < 1:
+                    return None, 0
+                return {'service_message_type': self.cat34_message_types.get(data[0], 'Unknown')}, 1
+            
+            elif item_code == "I034/030":  # Time of Day
+                if len(data) < 3:
+                    return None, 0
+                time_raw = struct.unpack('>I', b'\x00' + data[:3])[0]
+                return {'time_of_day': time_raw / 128.0}, 3  # 1/128 seconds LSB
+            
+            elif item_code == "I034/020":  # Sector Number
+                if len(data) < 1:
+                    return None, 0
+                return {'sector_azimuth': data[0] * 360.0 / 256.0}, 1  # 360/2^8 degrees LSB
             
-            target['track_id'] = self._generate_track_id(target, 10)
+            elif item_code == "I034/041":  # Antenna Rotation Period
+                if len(data) < 2:
+                    return None, 0
+                period_raw = struct.unpack('>H', data[:2])[0]
+                return {'antenna_rotation_period': period_raw / 128.0}, 2  # 1/128 seconds LSB
             
-            return [target]
+            return None, 0
             
         except Exception as e:
-            logger.error(f"Error processing CAT-10 message: {e}")
-            return []
+            logger.error(f"Error parsing CAT-34 item {item_code}: {e}")
+            return None, 0
     
     def _extract_fspec(self, data: bytes) -> Tuple[bytes, int]:
         """Extract FSPEC bytes from message data."""
@@ -526,7 +685,7 @@ class AsterixConsolidatedProcessor:
                 if len(data) < 4:
                     return None, 0
                 speed_raw, heading_raw = struct.unpack('>HH', data[:4])
-                speed = speed_raw  # 1 kt LSB
+                speed = speed_raw * 3600.0 / 16384.0  # 2^-14 NM/s LSB, in knots
                 heading = heading_raw * 360.0 / 65536.0  # 360/2^16 degrees LSB
                 return {'ground_speed': speed, 'heading': heading}, 4
             
@@ -559,14 +718,41 @@ class AsterixConsolidatedProcessor:
                 sac, sic = struct.unpack('BB', data[:2])
                 return {'SAC': sac, 'SIC': sic}, 2
             
-            elif item_code == "I021/040":  # Target Position in WGS-84
+            elif item_code in ("I021/040", "I021/130"):  # Target Position in WGS-84
                 if len(data) < 6:
                     return None, 0
-                lat_raw, lon_raw = struct.unpack('>II', data[:6])
+                lat_raw = int.from_bytes(data[0:3], 'big', signed=True)
+                lon_raw = int.from_bytes(data[3:6], 'big', signed=True)
                 latitude = lat_raw * 180.0 / (2**23)  # 180/2^23 degrees LSB
                 longitude = lon_raw * 180.0 / (2**23)  # 180/2^23 degrees LSB
                 return {'latitude': latitude, 'longitude': longitude}, 6
             
+            elif item_code == "I021/030":  # Time of Day
+                if len(data) < 3:
+                    return None, 0
+                time_raw = struct.unpack('>I', b'\x00' + data[:3])[0]
+                return {'time_of_day': time_raw / 128.0}, 3  # 1/128 seconds LSB
+            
+            elif item_code == "I021/140":  # Geometric Height
+                if len(data) < 2:
+                    return None, 0
+                height_raw = struct.unpack('>h', data[:2])[0]
+                return {'geometric_height': height_raw * 6.25}, 2  # 6.25 ft LSB
+            
+            elif item_code == "I021/157":  # Geometric Vertical Rate
+                if len(data) < 2:
+                    return None, 0
+                rate_raw = struct.unpack('>h', data[:2])[0]
+                return {'vertical_rate': rate_raw * 6.25}, 2  # 6.25 ft/min LSB
+            
+            elif item_code == "I021/160":  # Airborne Ground Vector
+                if len(data) < 4:
+                    return None, 0
+                speed_raw, angle_raw = struct.unpack('>HH', data[:4])
+                speed = speed_raw * 3600.0 / 16384.0  # 2^-14 NM/s LSB, in knots
+                heading = angle_raw * 360.0 / 65536.0  # 360/2^16 degrees LSB
+                return {'ground_speed': speed, 'heading': heading}, 4
+            
             elif item_code == "I021/080":  # Target Address
                 if len(data) < 3:
                     return None, 0
@@ -603,6 +789,42 @@ class AsterixConsolidatedProcessor:
                 sac, sic = struct.unpack('BB', data[:2])
                 return {'SAC': sac, 'SIC': sic}, 2
             
+            elif item_code == "I010/020":  # Target Report Descriptor
+                if len(data) < 1:
+                    return None, 0
+                return {'TYP': data[0] >> 5, 'raw_value': data[0]}, self._get_variable_length(data)
+            
+            elif item_code == "I010/060":  # Mode-3/A Code
+                if len(data) < 2:
+                    return None, 0
+                mode_3a_raw = struct.unpack('>H', data[:2])[0]
+                return {'mode_3a': self._decode_mode_3a(mode_3a_raw), 'raw_value': mode_3a_raw}, 2
+            
+            elif item_code == "I010/090":  # Flight Level
+                if len(data) < 2:
+                    return None, 0
+                fl_raw = struct.unpack('>h', data[:2])[0]
+                return {'flight_level': fl_raw / 4.0}, 2  # 1/4 FL LSB
+            
+            elif item_code == "I010/140":  # Time of Day
+                if len(data) < 3:
+                    return None, 0
+                time_raw = struct.unpack('>I', b'\x00' + data[:3])[0]
+                return {'time_of_day': time_raw / 128.0}, 3  # 1/128 seconds LSB
+            
+            elif item_code == "I010/161":  # Track Number
+                if len(data) < 2:
+                    return None, 0
+                return {'track_number': struct.unpack('>H', data[:2])[0] & 0x0FFF}, 2
+            
+            elif item_code == "I010/200":  # Calculated Track Velocity in Polar Coordinates
+                if len(data) < 4:
+                    return None, 0
+                speed_raw, heading_raw = struct.unpack('>HH', data[:4])
+                speed = speed_raw * 3600.0 / 16384.0  # 2^-14 NM/s LSB, in knots
+                heading = heading_raw * 360.0 / 65536.0  # 360/2^16 degrees LSB
+                return {'ground_speed': speed, 'heading': heading}, 4
+            
             elif item_code == "I010/040":  # Measured Position in Polar Coordinates
                 if len(data) < 4:
                     return None, 0
@@ -647,17 +869,18 @@ class AsterixConsolidatedProcessor:
         if len(data) < 1:
             return {}
         
+        # First octet: TYP(3) SIM RDP SPI RAB FX
         descriptor = data[0]
-        typ = descriptor & 0x07
+        typ = descriptor >> 5
         
         return {
             'TYP': typ,
             'type_description': self.cat48_target_types.get(typ, 'Unknown'),
-            'SIM': (descriptor >> 3) & 0x01,
-            'RDP': (descriptor >> 4) & 0x01,
-            'SPI': (descriptor >> 5) & 0x01,
-            'RAB': (descriptor >> 6) & 0x01,
-            'TST': (descriptor >> 7) & 0x01,
+            'SIM': (descriptor >> 4) & 0x01,
+            'RDP': (descriptor >> 3) & 0x01,
+            'SPI': (descriptor >> 2) & 0x01,
+            'RAB': (descriptor >> 1) & 0x01,
+            'TST': (data[1] >> 7) & 0x01 if descriptor & 0x01 and len(data) > 1 else 0,
             'raw_value': descriptor
         }
     
@@ -721,7 +944,11 @@ class AsterixConsolidatedProcessor:
     
     def _apply_cat48_item_to_target(self, target: Dict[str, Any], item_code: str, item_data: Dict[str, Any]):
         """Apply CAT-48 parsed data item to target dictionary."""
-        if item_code == "I048/020":
+        if item_code == "I048/010":
+            target['sac'] = item_data.get('SAC')
+            target['sic'] = item_data.get('SIC')
+            target['sensor_id'] = f"radar_{target['sac']}_{target['sic']}"
+        elif item_code == "I048/020":
             target['detection_type'] = item_data.get('type_description', 'Unknown')
         elif item_code == "I048/030":
             target['warning_conditions'] = item_data.get('warnings', [])
@@ -729,7 +956,8 @@ class AsterixConsolidatedProcessor:
             target['range'] = item_data.get('range')
             target['azimuth'] = item_data.get('azimuth')
             if target['range'] and target['azimuth']:
-                lat, lon = self._convert_polar_to_latlon(target['range'], target['azimuth'])
+                radar_lat, radar_lon = self._radar_site_for(target)
+                lat, lon = self._convert_polar_to_latlon(target['range'], target['azimuth'], radar_lat, radar_lon)
                 target['latitude'] = lat
                 target['longitude'] = lon
         elif item_code == "I048/070":
@@ -740,6 +968,8 @@ class AsterixConsolidatedProcessor:
             target['radial_doppler_speed'] = item_data.get('radial_doppler_speed')
         elif item_code == "I048/140":
             target['time_of_day'] = item_data.get('time_of_day')
+            if target['time_of_day'] is not None:
+                target['measurement_time'] = self.tod_converter.to_datetime(target['time_of_day']).isoformat()
         elif item_code == "I048/161":
             target['track_number'] = item_data.get('track_number')
         elif item_code == "I048/200":
@@ -752,9 +982,25 @@ class AsterixConsolidatedProcessor:
     
     def _apply_cat21_item_to_target(self, target: Dict[str, Any], item_code: str, item_data: Dict[str, Any]):
         """Apply CAT-21 parsed data item to target dictionary."""
-        if item_code == "I021/040":
+        if item_code == "I021/010":
+            target['sac'] = item_data.get('SAC')
+            target['sic'] = item_data.get('SIC')
+            target['sensor_id'] = f"adsb_{target['sac']}_{target['sic']}"
+        elif item_code in ("I021/040", "I021/130"):
             target['latitude'] = item_data.get('latitude')
             target['longitude'] = item_data.get('longitude')
+        elif item_code == "I021/030":
+            target['time_of_day'] = item_data.get('time_of_day')
+            if target['time_of_day'] is not None:
+                target['measurement_time'] = self.tod_converter.to_datetime(target['time_of_day']).isoformat()
+        elif item_code == "I021/140":
+            target['geometric_height'] = item_data.get('geometric_height')
+            target['altitude'] = target['geometric_height']
+        elif item_code == "I021/157":
+            target['vertical_rate'] = item_data.get('vertical_rate')
+        elif item_code == "I021/160":
+            target['ground_speed'] = item_data.get('ground_speed')
+            target['heading'] = item_data.get('heading')
         elif item_code == "I021/080":
             target['aircraft_address'] = item_data.get('aircraft_address')
         elif item_code == "I021/145":
@@ -764,40 +1010,49 @@ class AsterixConsolidatedProcessor:
     
     def _apply_cat10_item_to_target(self, target: Dict[str, Any], item_code: str, item_data: Dict[str, Any]):
         """Apply CAT-10 parsed data item to target dictionary."""
-        if item_code == "I010/040":
+        if item_code == "I010/010":
+            target['sac'] = item_data.get('SAC')
+            target['sic'] = item_data.get('SIC')
+            target['sensor_id'] = f"radar_{target['sac']}_{target['sic']}"
+        elif item_code == "I010/040":
             target['range'] = item_data.get('range')
             target['azimuth'] = item_data.get('azimuth')
             if target['range'] and target['azimuth']:
-                lat, lon = self._convert_polar_to_latlon(target['range'], target['azimuth'])
+                radar_lat, radar_lon = self._radar_site_for(target)
+                lat, lon = self._convert_polar_to_latlon(target['range'], target['azimuth'], radar_lat, radar_lon)
                 target['latitude'] = lat
                 target['longitude'] = lon
+        elif item_code == "I010/060":
+            target['mode_3a'] = item_data.get('mode_3a')
+        elif item_code == "I010/090":
+            target['flight_level'] = item_data.get('flight_level')
+        elif item_code == "I010/140":
+            target['time_of_day'] = item_data.get('time_of_day')
+            if target['time_of_day'] is not None:
+                target['measurement_time'] = self.tod_converter.to_datetime(target['time_of_day']).isoformat()
+        elif item_code == "I010/161":
+            target['track_number'] = item_data.get('track_number')
+        elif item_code == "I010/200":
+            target['ground_speed'] = item_data.get('ground_speed')
+            target['heading'] = item_data.get('heading')
         elif item_code == "I010/220":
             target['aircraft_address'] = item_data.get('aircraft_address')
         elif item_code == "I010/245":
             target['callsign'] = item_data.get('callsign')
     
+    def set_radar_site(self, sac: int, sic: int, latitude: float, longitude: float):
+        """Register the location of the radar identified by SAC/SIC."""
+        self.radar_sites[(sac, sic)] = (latitude, longitude)
+    
+    def _radar_site_for(self, target: Dict[str, Any]) -> Tuple[float, float]:
+        """Site of the radar that produced a target (default site if unknown)."""
+        return self.radar_sites.get((target.get('sac'), target.get('sic')), self.default_radar_site)
+    
     def _convert_polar_to_latlon(self, range_nm: float, azimuth_deg: float, 
                                  radar_lat: float = 28.0836, radar_lon: float = -80.6081) -> Tuple[float, float]:
-        """Convert polar coordinates to latitude/longitude."""
-        # Convert to radians
-        azimuth_rad = math.radians(azimuth_deg)
-        
-        # Earth radius in nautical miles
-        earth_radius_nm = 3443.92
-        
-        # Calculate delta lat/lon
-        delta_lat = (range_nm / earth_radius_nm) * math.cos(azimuth_rad)
-        delta_lon = (range_nm / earth_radius_nm) * math.sin(azimuth_rad) / math.cos(math.radians(radar_lat))
-        
-        # Convert to degrees
-        delta_lat_deg = math.degrees(delta_lat)
-        delta_lon_deg = math.degrees(delta_lon)
-        
-        # Calculate final position
-        lat = radar_lat + delta_lat_deg
-        lon = radar_lon + delta_lon_deg
-        
-        return lat, lon
+        """Convert polar coordinates to latitude/longitude (WGS-84 tangent plane of the radar site)."""
+        lat, lon = site_frame(radar_lat, radar_lon).polar_to_geodetic(range_nm * NM_TO_M, azimuth_deg)
+        return float(lat), float(lon)
     
     def _generate_track_id(self, target: Dict[str, Any], category: int) -> str:
         """Generate a unique track ID for the target."""
@@ -822,6 +1077,10 @@ class AsterixConsolidatedProcessor:
         # Fallback to hash-based ID
         return f"{prefix}_{hash(str(target)) % 100000:05d}"
     
+    def set_reference_date(self, reference_date):
+        """Set the UTC date of archived data so time of day maps to the right day (None for live)"""
+        self.tod_converter.set_reference_date(reference_date)
+    
     def get_processing_statistics(self) -> Dict[str, Any]:
         """Get processing statistics."""
         return self.processing_stats.copy()
@@ -25,6 +25,7 @@ class AsterixMultiCategoryConverter:
         self.processors = {
             10: self.consolidated_processor,
             21: self.consolidated_processor,
+            34: self.consolidated_processor,
             48: self.consolidated_processor
         }
         
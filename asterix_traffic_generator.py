@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+"""
+Synthetic ASTERIX Traffic Generator
+Simulates thousands of moving targets (constant velocity, turning and
+climbing), uniform clutter and several rotating radars, and encodes the
+result as multi-record ASTERIX data blocks:
+
+- CAT-48 (or CAT-10) plots per radar, in beam order
+- CAT-34 north markers (with the I034/041 antenna rotation period) and sector crossings per radar
+- CAT-21 ADS-B reports for equipped targets
+
+Data blocks are packed into datagrams and sent to a UDP port or written to a
+PCAP file (Ethernet/IPv4/UDP, readable by pcap_parser). Output is paced in
+real time, sped up, or unthrottled to find the throughput ceiling of the
+receiver and tracker.
+
+Usage:
+    python asterix_traffic_generator.py --targets 2000 --radars 2 --duration 300 --udp 127.0.0.1:8080
+    python asterix_traffic_generator.py --targets 5000 --duration 60 --pcap load.pcap
+"""
+
+import argparse
+import logging
+import math
+import socket
+import struct
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geodesy import NM_TO_M, WGS84_A, site_frame
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+MAX_DATAGRAM_BYTES = 1400  # fits an Ethernet MTU with IP/UDP headers
+ADSB_SAC_SIC = (0, 100)
+FEET_PER_METER = 1.0 / 0.3048
+KNOTS_PER_MPS = 3600.0 / NM_TO_M
+
+# ICAO 6-bit character set (decoded by AsterixConsolidatedProcessor._decode_callsign)
+_CALLSIGN_CODES = {**{chr(ord('A') + i): i + 1 for i in range(26)},
+                   **{str(d): 48 + d for d in range(10)}, ' ': 32}
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+def encode_fspec(frns: Sequence[int]) -> bytes:
+    """FSPEC for the given field reference numbers (1-based, 7 per octet, FX extension)"""
+    octets = bytearray((max(frns) + 6) // 7)
+    for frn in frns:
+        octets[(frn - 1) // 7] |= 0x80 >> ((frn - 1) % 7)
+    for i in range(len(octets) - 1):
+        octets[i] |= 0x01
+    return bytes(octets)
+
+
+def _tod(time_of_day: float) -> bytes:
+    """Time of day in 1/128 s, 3 octets"""
+    return struct.pack('>I', int(round(time_of_day * 128.0)) % (int(SECONDS_PER_DAY) * 128))[1:]
+
+
+def _velocity(speed_kt: float, heading_deg: float) -> bytes:
+    """Ground speed (2^-14 NM/s) and heading (360/2^16 deg), 4 octets"""
+    speed_raw = min(int(round(speed_kt / 3600.0 * 16384.0)), 0xFFFF)
+    return struct.pack('>HH', speed_raw, int(round(heading_deg * 65536.0 / 360.0)) & 0xFFFF)
+
+
+def _polar(range_nm: float, azimuth_deg: float) -> bytes:
+    """Range (1/256 NM) and azimuth (360/2^16 deg), 4 octets"""
+    rho = min(int(round(range_nm * 256.0)), 0xFFFF)
+    return struct.pack('>HH', rho, int(round(azimuth_deg * 65536.0 / 360.0)) & 0xFFFF)
+
+
+def _flight_level(altitude_m: float) -> bytes:
+    """Flight level in 1/4 FL, 2 octets (V/G bits clear)"""
+    return struct.pack('>h', max(min(int(round(altitude_m * FEET_PER_METER / 25.0)), 0x1FFF), -0x2000))
+
+
+def encode_callsign(callsign: str) -> bytes:
+    """8 characters in ICAO 6-bit encoding, 6 octets"""
+    value = 0
+    for char in callsign.upper()[:8].ljust(8):
+        value = (value << 6) | _CALLSIGN_CODES.get(char, 32)
+    return value.to_bytes(6, 'big')
+
+
+def encode_cat48_record(sac: int, sic: int, time_of_day: float, range_nm: float, azimuth_deg: float,
+                        mode_3a: Optional[int] = None, altitude_m: Optional[float] = None,
+                        address: Optional[int] = None, callsign: Optional[str] = None,
+                        track_number: Optional[int] = None, speed_kt: Optional[float] = None,
+                        heading_deg: Optional[float] = None) -> bytes:
+    """
+    One CAT-48 target report
+
+    Plots with an address are encoded as Mode S roll-call + PSR detections,
+    plots without one (clutter) as single PSR detections.
+    """
+    frns = [1, 2, 3, 4]
+    items = [bytes((sac, sic)), _tod(time_of_day),
+             bytes((0xE0 if address is not None else 0x20,)), _polar(range_nm, azimuth_deg)]
+    if mode_3a is not None:
+        frns.append(5)
+        items.append(struct.pack('>H', mode_3a & 0x0FFF))
+    if altitude_m is not None:
+        frns.append(6)
+        items.append(_flight_level(altitude_m))
+    if address is not None:
+        frns.append(8)
+        items.append(struct.pack('>I', address & 0xFFFFFF)[1:])
+    if callsign is not None:
+        frns.append(9)
+        items.append(encode_callsign(callsign))
+    if track_number is not None:
+        frns.append(11)
+        items.append(struct.pack('>H', track_number & 0x0FFF))
+    if speed_kt is not None and heading_deg is not None:
+        frns.append(13)
+        items.append(_velocity(speed_kt, heading_deg))
+    return encode_fspec(frns) + b''.join(items)
+
+
+def encode_cat10_record(sac: int, sic: int, time_of_day: float, range_nm: float, azimuth_deg: float,
+                        mode_3a: Optional[int] = None, altitude_m: Optional[float] = None,
+                        address: Optional[int] = None, callsign: Optional[str] = None,
+                        track_number: Optional[int] = None, speed_kt: Optional[float] = None,
+                        heading_deg: Optional[float] = None) -> bytes:
+    """One CAT-10 target report (PSR plot in polar coordinates)"""
+    frns = [1, 2, 3]
+    items = [bytes((sac, sic)), bytes((0x60,)), _polar(range_nm, azimuth_deg)]
+    if speed_kt is not None and heading_deg is not None:
+        frns.append(6)
+        items.append(_velocity(speed_kt, heading_deg))
+    if track_number is not None:
+        frns.append(8)
+        items.append(struct.pack('>H', track_number & 0x0FFF))
+    if mode_3a is not None:
+        frns.append(10)
+        items.append(struct.pack('>H', mode_3a & 0x0FFF))
+    if address is not None:
+        frns.append(11)
+        items.append(struct.pack('>I', address & 0xFFFFFF)[1:])
+    if callsign is not None:
+        frns.append(12)
+        items.append(encode_callsign(callsign))
+    if altitude_m is not None:
+        frns.append(15)
+        items.append(_flight_level(altitude_m))
+    frns.append(24)
+    items.append(_tod(time_of_day))
+    return encode_fspec(frns) + b''.join(items)
+
+
+def encode_cat21_record(sac: int, sic: int, time_of_day: float, latitude: float, longitude: float,
+                        address: int, altitude_m: float, speed_kt: float, heading_deg: float,
+                        vertical_rate_fpm: float, callsign: Optional[str] = None) -> bytes:
+    """One CAT-21 ADS-B report (position, address, heights, ground vector, identification)"""
+    lsb = 180.0 / 2 ** 23
+    frns = [1, 3, 4, 5, 6, 10, 15, 16]
+    items = [
+        bytes((sac, sic)),
+        _tod(time_of_day),
+        int(round(latitude / lsb)).to_bytes(3, 'big', signed=True)
+        + int(round(longitude / lsb)).to_bytes(3, 'big', signed=True),
+        struct.pack('>I', address & 0xFFFFFF)[1:],
+        struct.pack('>h', max(min(int(round(altitude_m * FEET_PER_METER / 6.25)), 0x7FFF), -0x8000)),
+        _flight_level(altitude_m),
+        struct.pack('>h', max(min(int(round(vertical_rate_fpm / 6.25)), 0x7FFF), -0x8000)),
+        _velocity(speed_kt, heading_deg),
+    ]
+    if callsign is not None:
+        frns.append(18)
+        items.append(encode_callsign(callsign))
+    return encode_fspec(frns) + b''.join(items)
+
+
+def encode_cat34_record(sac: int, sic: int, time_of_day: float, sector_azimuth: Optional[float] = None,
+                        rotation_period_s: Optional[float] = None) -> bytes:
+    """CAT-34 north marker (no sector, optionally with the I034/041 rotation period) or sector crossing"""
+    if sector_azimuth is None:
+        if rotation_period_s is None:
+            return encode_fspec([1, 2, 3]) + bytes((sac, sic, 1)) + _tod(time_of_day)
+        period = struct.pack('>H', min(int(round(rotation_period_s * 128.0)), 0xFFFF))  # 1/128 s
+        return encode_fspec([1, 2, 3, 5]) + bytes((sac, sic, 1)) + _tod(time_of_day) + period
+    sector = int(round(sector_azimuth * 256.0 / 360.0)) & 0xFF
+    return encode_fspec([1, 2, 3, 4]) + bytes((sac, sic, 2)) + _tod(time_of_day) + bytes((sector,))
+
+
+def pack_blocks(category: int, records: Sequence[bytes], max_bytes: int = MAX_DATAGRAM_BYTES) -> List[bytes]:
+    """Pack records of one category into as few data blocks of at most max_bytes as possible"""
+    blocks = []
+    current: List[bytes] = []
+    size = 3
+    for record in records:
+        if current and size + len(record) > max_bytes:
+            blocks.append(bytes((category,)) + struct.pack('>H', size) + b''.join(current))
+            current, size = [], 3
+        current.append(record)
+        size += len(record)
+    if current:
+        blocks.append(bytes((category,)) + struct.pack('>H', size) + b''.join(current))
+    return blocks
+
+
+# ---------------------------------------------------------------------------
+# Scenario
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RadarConfig:
+    """One rotating radar and the category it reports in"""
+    sac: int
+    sic: int
+    latitude: float
+    longitude: float
+    category: int = 48  # 48 (monoradar target reports) or 10 (surface movement)
+    scan_period_s: float = 4.0
+    max_range_m: float = 200 * NM_TO_M
+    detection_probability: float = 0.9
+    clutter_per_scan: int = 50
+    range_noise_m: float = 30.0
+    azimuth_noise_deg: float = 0.08
+    sector_count: int = 32
+    phase_deg: float = 0.0  # antenna azimuth at time 0
+
+    @property
+    def rate_deg_s(self) -> float:
+        return 360.0 / self.scan_period_s
+
+
+class TargetSwarm:
+    """
+    Kinematic state of all simulated targets, advanced as numpy arrays
+
+    Positions are east/north/up in meters in the scenario tangent plane.
+    Each target follows one motion model: 'cv' (straight and level), 'turn'
+    (coordinated turns that change direction every minute or so) or 'climb'
+    (climbs and descends between 1 km and 12 km).
+    """
+
+    def __init__(self, count: int, area_radius_m: float, turn_fraction: float, climb_fraction: float,
+                 adsb_fraction: float, adsb_interval_s: float, rng: np.random.Generator):
+        self.count = count
+        self.area_radius_m = area_radius_m
+        self.rng = rng
+
+        radius = area_radius_m * np.sqrt(rng.uniform(0.0, 1.0, count))
+        bearing = rng.uniform(0.0, 2 * np.pi, count)
+        self.east = radius * np.sin(bearing)
+        self.north = radius * np.cos(bearing)
+        self.up = rng.uniform(1000.0, 12000.0, count)
+        self.speed = rng.uniform(60.0, 260.0, count)
+        self.course = rng.uniform(0.0, 2 * np.pi, count)  # clockwise from north
+
+        model = rng.uniform(0.0, 1.0, count)
+        turning = model < turn_fraction
+        climbing = (model >= turn_fraction) & (model < turn_fraction + climb_fraction)
+        self.turn_rate = np.where(turning, np.radians(rng.uniform(1.0, 3.0, count))
+                                  * rng.choice((-1.0, 1.0), count), 0.0)
+        self.turning = turning
+        self.climb_rate = np.where(climbing, rng.uniform(5.0, 20.0, count) * rng.choice((-1.0, 1.0), count), 0.0)
+
+        # Identity
+        self.address = rng.choice(np.arange(0x100000, 0xF00000), count, replace=False)
+        self.mode_3a = rng.integers(0, 0o7777, count)
+        self.callsigns = [f"SIM{i:05d}" for i in range(count)]
+
+        # ADS-B equipage and report schedule (staggered)
+        self.adsb = rng.uniform(0.0, 1.0, count) < adsb_fraction
+        self.adsb_interval_s = adsb_interval_s
+        self.next_adsb = rng.uniform(0.0, adsb_interval_s, count)
+
+    @property
+    def velocity(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.speed * np.sin(self.course), self.speed * np.cos(self.course), self.climb_rate
+
+    def advance(self, dt: float):
+        """Move every target dt seconds"""
+        self.course = (self.course + self.turn_rate * dt) % (2 * np.pi)
+        self.east += self.speed * np.sin(self.course) * dt
+        self.north += self.speed * np.cos(self.course) * dt
+        self.up += self.climb_rate * dt
+
+        # Level-change reversal and occasional turn reversal
+        self.climb_rate = np.where((self.up > 12000.0) & (self.climb_rate > 0)
+                                   | (self.up < 1000.0) & (self.climb_rate < 0), -self.climb_rate, self.climb_rate)
+        flip = self.turning & (self.rng.uniform(0.0, 1.0, self.count) < dt / 60.0)
+        self.turn_rate = np.where(flip, -self.turn_rate, self.turn_rate)
+
+        # Targets leaving the area turn back towards its centre
+        outside = np.hypot(self.east, self.north) > self.area_radius_m
+        if np.any(outside):
+            inbound = np.arctan2(-self.east[outside], -self.north[outside])
+            self.course[outside] = inbound + self.rng.uniform(-0.5, 0.5, int(np.count_nonzero(outside)))
+
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+class UdpSink:
+    """Sends datagrams to a UDP endpoint"""
+
+    def __init__(self, host: str, port: int):
+        self.address = (host, port)
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def write(self, sim_time: float, datagram: bytes):
+        self.socket.sendto(datagram, self.address)
+
+    def close(self):
+        self.socket.close()
+
+
+class PcapSink:
+    """Writes datagrams as Ethernet/IPv4/UDP packets to a PCAP file"""
+
+    def __init__(self, path: str, start_epoch: float, src_ip: str = '10.0.0.1', dst_ip: str = '10.0.0.2',
+                 src_port: int = 50000, dst_port: int = 8080):
+        self.file = open(path, 'wb')
+        self.start_epoch = start_epoch
+        self.src_ip = socket.inet_aton(src_ip)
+        self.dst_ip = socket.inet_aton(dst_ip)
+        self.src_port = src_port
+        self.dst_port = dst_port
+        self.ip_id = 0
+        # Global header: magic, version 2.4, UTC, accuracy, snaplen, Ethernet
+        self.file.write(struct.pack('<IHHiIII', 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+
+    @staticmethod
+    def _checksum(header: bytes) -> int:
+        total = sum(struct.unpack('>10H', header))
+        total = (total & 0xFFFF) + (total >> 16)
+        total = (total & 0xFFFF) + (total >> 16)
+        return ~total & 0xFFFF
+
+    def write(self, sim_time: float, datagram: bytes):
+        udp = struct.pack('>HHHH', self.src_port, self.dst_port, 8 + len(datagram), 0) + datagram
+        self.ip_id = (self.ip_id + 1) & 0xFFFF
+        ip = struct.pack('>BBHHHBBH4s4s', 0x45, 0, 20 + len(udp), self.ip_id, 0x4000, 64, 17, 0,
+                         self.src_ip, self.dst_ip)
+        ip = ip[:10] + struct.pack('>H', self._checksum(ip)) + ip[12:]
+        frame = b'\x00\x00\x5e\x00\x01\x02' + b'\x00\x00\x5e\x00\x01\x01' + b'\x08\x00' + ip + udp
+
+        timestamp = self.start_epoch + sim_time
+        seconds = int(timestamp)
+        self.file.write(struct.pack('<IIII', seconds, int(round((timestamp - seconds) * 1e6)) % 1000000,
+                                    len(frame), len(frame)))
+        self.file.write(frame)
+
+    def close(self):
+        self.file.close()
+
+
+# ---------------------------------------------------------------------------
+# Generator
+# ---------------------------------------------------------------------------
+
+class TrafficGenerator:
+    """
+    Produces time-ordered ASTERIX datagrams for a scenario
+    """
+
+    def __init__(self, config: Dict | None = None):
+        """
+        Initialize generator
+
+        Args:
+            config: Scenario with targets, radars (list of RadarConfig), area_radius_m,
+                turn_fraction, climb_fraction, adsb_fraction, adsb_interval_s,
+                start_time_of_day, max_datagram_bytes and seed
+        """
+        self.config = config or {}
+        self.rng = np.random.default_rng(self.config.get('seed', 1))
+        self.radars: List[RadarConfig] = self.config.get('radars') or [RadarConfig(0, 1, 28.0836, -80.6081)]
+        self.start_time_of_day = self.config.get('start_time_of_day', 36000.0)
+        self.max_datagram_bytes = self.config.get('max_datagram_bytes', MAX_DATAGRAM_BYTES)
+
+        # Targets live in the tangent plane of the first radar
+        self.frame = site_frame(self.radars[0].latitude, self.radars[0].longitude)
+        self.radar_frames = [site_frame(radar.latitude, radar.longitude) for radar in self.radars]
+        self.swarm = TargetSwarm(
+            self.config.get('targets', 1000),
+            self.config.get('area_radius_m', 150000.0),
+            self.config.get('turn_fraction', 0.2),
+            self.config.get('climb_fraction', 0.2),
+            self.config.get('adsb_fraction', 0.5),
+            self.config.get('adsb_interval_s', 1.0),
+            self.rng
+        )
+
+        # Tick: one CAT-34 sector of the fastest radar
+        self.tick_s = min(radar.scan_period_s / radar.sector_count for radar in self.radars)
+        self.time_s = 0.0
+
+        self.stats = {
+            'records_by_category': {48: 0, 10: 0, 21: 0, 34: 0},
+            'datagrams': 0,
+            'bytes': 0
+        }
+
+    def _antenna(self, radar: RadarConfig, t: float) -> float:
+        """Unwrapped antenna azimuth (degrees) at time t"""
+        return radar.phase_deg + radar.rate_deg_s * t
+
+    def _radar_events(self, index: int, t0: float, t1: float) -> List[Tuple[float, int, bytes]]:
+        """(time, category, record) for one radar's sweep between t0 and t1"""
+        radar = self.radars[index]
+        swarm = self.swarm
+        a0, a1 = self._antenna(radar, t0), self._antenna(radar, t1)
+        events = []
+
+        # CAT-34 north markers and sector crossings passed during the sweep
+        width = 360.0 / radar.sector_count
+        for k in range(int(math.floor(a0 / width)) + 1, int(math.floor(a1 / width)) + 1):
+            boundary = k * width
+            t = t0 + (boundary - a0) / radar.rate_deg_s
+            sector_azimuth = boundary % 360.0
+            if k % radar.sector_count == 0:
+                events.append((t, 34, encode_cat34_record(radar.sac, radar.sic, self._tod(t),
+                                                          rotation_period_s=radar.scan_period_s)))
+            events.append((t, 34, encode_cat34_record(radar.sac, radar.sic, self._tod(t), sector_azimuth)))
+
+        # Target detections: azimuth from the radar inside the swept interval
+        east, north, up = self.frame.enu_to_frame(self.radar_frames[index], swarm.east, swarm.north, swarm.up)
+        ground = np.hypot(east, north)
+        azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+        offset = (azimuth - a0) % 360.0
+        detected = ((offset < a1 - a0) & (ground < radar.max_range_m)
+                    & (self.rng.uniform(0.0, 1.0, swarm.count) < radar.detection_probability))
+        indices = np.nonzero(detected)[0]
+        if len(indices):
+            beam_time = t0 + offset[indices] / radar.rate_deg_s
+            # Back to the position at the time the beam passed
+            vx, vy, vz = swarm.velocity
+            lag = t1 - beam_time
+            east, north, _ = self.frame.enu_to_frame(self.radar_frames[index],
+                                                     swarm.east[indices] - vx[indices] * lag,
+                                                     swarm.north[indices] - vy[indices] * lag,
+                                                     swarm.up[indices] - vz[indices] * lag)
+            east, north = np.atleast_1d(east), np.atleast_1d(north)
+            ranges = np.hypot(east, north) + self.rng.normal(0.0, radar.range_noise_m, len(indices))
+            azimuths = (np.degrees(np.arctan2(east, north))
+                        + self.rng.normal(0.0, radar.azimuth_noise_deg, len(indices))) % 360.0
+            speed_kt = swarm.speed[indices] * KNOTS_PER_MPS
+            heading = np.degrees(swarm.course[indices]) % 360.0
+            encode = encode_cat48_record if radar.category == 48 else encode_cat10_record
+            for j, target in enumerate(indices.tolist()):
+                events.append((float(beam_time[j]), radar.category, encode(
+                    radar.sac, radar.sic, self._tod(float(beam_time[j])), float(ranges[j]) / NM_TO_M,
+                    float(azimuths[j]), mode_3a=int(swarm.mode_3a[target]), altitude_m=float(swarm.up[target]),
+                    address=int(swarm.address[target]), callsign=swarm.callsigns[target],
+                    track_number=target, speed_kt=float(speed_kt[j]), heading_deg=float(heading[j])
+                )))
+
+        # Clutter: Poisson count for the swept fraction, uniform over the area
+        clutter = self.rng.poisson(radar.clutter_per_scan * (a1 - a0) / 360.0)
+        if clutter:
+            clutter_offsets = self.rng.uniform(0.0, a1 - a0, clutter)
+            clutter_ranges = np.sqrt(self.rng.uniform((2 * NM_TO_M) ** 2, radar.max_range_m ** 2, clutter))
+            encode = encode_cat48_record if radar.category == 48 else encode_cat10_record
+            for offset_deg, range_m in zip(clutter_offsets.tolist(), clutter_ranges.tolist()):
+                t = t0 + offset_deg / radar.rate_deg_s
+                events.append((t, radar.category, encode(radar.sac, radar.sic, self._tod(t), range_m / NM_TO_M,
+                                                         (a0 + offset_deg) % 360.0)))
+        return events
+
+    def _adsb_events(self, t0: float, t1: float) -> List[Tuple[float, int, bytes]]:
+        """CAT-21 reports of equipped targets due between t0 and t1"""
+        swarm = self.swarm
+        due = swarm.adsb & (swarm.next_adsb < t1)
+        indices = np.nonzero(due)[0]
+        if not len(indices):
+            return []
+        report_time = np.maximum(swarm.next_adsb[indices], t0)
+        swarm.next_adsb[indices] += swarm.adsb_interval_s
+
+        vx, vy, vz = swarm.velocity
+        lag = t1 - report_time
+        lat, lon, _ = self.frame.enu_to_geodetic(swarm.east[indices] - vx[indices] * lag,
+                                                 swarm.north[indices] - vy[indices] * lag,
+                                                 swarm.up[indices] - vz[indices] * lag)
+        lat, lon = np.atleast_1d(lat), np.atleast_1d(lon)
+        speed_kt = swarm.speed[indices] * KNOTS_PER_MPS
+        heading = np.degrees(swarm.course[indices]) % 360.0
+        vertical_fpm = swarm.climb_rate[indices] * FEET_PER_METER * 60.0
+        sac, sic = ADSB_SAC_SIC
+        return [(float(report_time[j]), 21, encode_cat21_record(
+                    sac, sic, self._tod(float(report_time[j])), float(lat[j]), float(lon[j]),
+                    int(swarm.address[target]), float(swarm.up[target]), float(speed_kt[j]),
+                    float(heading[j]), float(vertical_fpm[j]), swarm.callsigns[target]))
+                for j, target in enumerate(indices.tolist())]
+
+    def _tod(self, t: float) -> float:
+        return (self.start_time_of_day + t) % SECONDS_PER_DAY
+
+    def step(self) -> List[Tuple[float, bytes]]:
+        """
+        Advance one tick and return its datagrams
+
+        Returns:
+            (simulation time, datagram) pairs in time order; consecutive records of
+            the same source and category share data blocks
+        """
+        t0, t1 = self.time_s, self.time_s + self.tick_s
+        self.swarm.advance(self.tick_s)
+
+        events = []
+        for index in range(len(self.radars)):
+            events.extend((t, category, index, record) for t, category, record in self._radar_events(index, t0, t1))
+        events.extend((t, 21, -1, record) for t, _, record in self._adsb_events(t0, t1))
+        events.sort(key=lambda event: event[0])
+        self.time_s = t1
+
+        # Runs of records from one source/category become data blocks
+        blocks: List[Tuple[float, bytes]] = []
+        run: List[bytes] = []
+        run_key, run_time = None, 0.0
+        for t, category, source, record in events:
+            self.stats['records_by_category'][category] = self.stats['records_by_category'].get(category, 0) + 1
+            if (category, source) != run_key:
+                if run:
+                    blocks.extend((run_time, block) for block in pack_blocks(run_key[0], run, self.max_datagram_bytes))
+                run, run_key, run_time = [], (category, source), t
+            run.append(record)
+        if run:
+            blocks.extend((run_time, block) for block in pack_blocks(run_key[0], run, self.max_datagram_bytes))
+
+        # Consecutive blocks share a datagram up to the size limit
+        datagrams: List[Tuple[float, bytes]] = []
+        for t, block in blocks:
+            if datagrams and len(datagrams[-1][1]) + len(block) <= self.max_datagram_bytes:
+                datagrams[-1] = (datagrams[-1][0], datagrams[-1][1] + block)
+            else:
+                datagrams.append((t, block))
+        self.stats['datagrams'] += len(datagrams)
+        self.stats['bytes'] += sum(len(datagram) for _, datagram in datagrams)
+        return datagrams
+
+    def run(self, sink, duration_s: float, speed: float = 1.0, report_interval_s: float = 10.0):
+        """
+        Generate duration_s seconds of traffic into a sink
+
+        Args:
+            sink: UdpSink or PcapSink
+            duration_s: Simulated seconds
+            speed: Simulation seconds per wall-clock second (0 = as fast as possible)
+            report_interval_s: Wall-clock seconds between progress log lines
+        """
+        wall_start = time.monotonic()
+        last_report = wall_start
+        while self.time_s < duration_s:
+            for sim_time, datagram in self.step():
+                if speed > 0:
+                    delay = wall_start + sim_time / speed - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                sink.write(sim_time, datagram)
+
+            now = time.monotonic()
+            if now - last_report >= report_interval_s:
+                last_report = now
+                records = sum(self.stats['records_by_category'].values())
+                logger.info(f"t={self.time_s:.0f}s: {records} records, {self.stats['datagrams']} datagrams, "
+                            f"{records / (now - wall_start):.0f} records/s")
+
+    def get_statistics(self) -> Dict:
+        """Generated record, datagram and byte counts"""
+        return {
+            'records_by_category': dict(self.stats['records_by_category']),
+            'datagrams': self.stats['datagrams'],
+            'bytes': self.stats['bytes'],
+            'simulated_s': self.time_s
+        }
+
+
+def radar_ring(count: int, center_lat: float, center_lon: float, spacing_m: float,
+               categories: Sequence[int], scan_period_s: float, clutter_per_scan: int) -> List[RadarConfig]:
+    """First radar at the centre, the others evenly spaced on a ring around it"""
+    radars = []
+    for i in range(count):
+        lat, lon = center_lat, center_lon
+        if i > 0:
+            bearing = 2 * math.pi * (i - 1) / max(count - 1, 1)
+            lat = center_lat + math.degrees(spacing_m * math.cos(bearing) / WGS84_A)
+            lon = center_lon + math.degrees(spacing_m * math.sin(bearing) / (WGS84_A * math.cos(math.radians(center_lat))))
+        radars.append(RadarConfig(sac=0, sic=i + 1, latitude=lat, longitude=lon,
+                                  category=categories[i % len(categories)], scan_period_s=scan_period_s,
+                                  clutter_per_scan=clutter_per_scan, phase_deg=137.5 * i))
+    return radars
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic multi-radar ASTERIX traffic")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--udp', metavar='HOST:PORT', help="Send datagrams to this UDP endpoint")
+    output.add_argument('--pcap', metavar='FILE', help="Write datagrams to a PCAP file")
+    parser.add_argument('--targets', type=int, default=1000)
+    parser.add_argument('--radars', type=int, default=1)
+    parser.add_argument('--radar-categories', type=int, nargs='+', default=[48], choices=[10, 48],
+                        help="Category per radar, cycled (e.g. 48 10)")
+    parser.add_argument('--radar-spacing-km', type=float, default=80.0)
+    parser.add_argument('--center', type=float, nargs=2, default=[28.0836, -80.6081], metavar=('LAT', 'LON'))
+    parser.add_argument('--scan-period', type=float, default=4.0, help="Antenna rotation period (s)")
+    parser.add_argument('--clutter', type=int, default=50, help="Clutter plots per radar scan")
+    parser.add_argument('--area-radius-km', type=float, default=150.0)
+    parser.add_argument('--turn-fraction', type=float, default=0.2)
+    parser.add_argument('--climb-fraction', type=float, default=0.2)
+    parser.add_argument('--adsb-fraction', type=float, default=0.5)
+    parser.add_argument('--adsb-interval', type=float, default=1.0, help="Seconds between ADS-B reports")
+    parser.add_argument('--duration', type=float, default=60.0, help="Simulated seconds")
+    parser.add_argument('--speed', type=float, help="Simulated seconds per second, 0 = unthrottled "
+                                                    "(default 1 for UDP, 0 for PCAP)")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    generator = TrafficGenerator({
+        'targets': args.targets,
+        'radars': radar_ring(args.radars, args.center[0], args.center[1], args.radar_spacing_km * 1000.0,
+                             args.radar_categories, args.scan_period, args.clutter),
+        'area_radius_m': args.area_radius_km * 1000.0,
+        'turn_fraction': args.turn_fraction,
+        'climb_fraction': args.climb_fraction,
+        'adsb_fraction': args.adsb_fraction,
+        'adsb_interval_s': args.adsb_interval,
+        'start_time_of_day': time.time() % SECONDS_PER_DAY,
+        'seed': args.seed
+    })
+
+    if args.udp:
+        host, port = args.udp.rsplit(':', 1)
+        sink = UdpSink(host, int(port))
+        speed = 1.0 if args.speed is None else args.speed
+    else:
+        sink = PcapSink(args.pcap, start_epoch=time.time())
+        speed = 0.0 if args.speed is None else args.speed
+
+    started = time.monotonic()
+    try:
+        generator.run(sink, args.duration, speed)
+    except KeyboardInterrupt:
+        print("\nStopped by user")
+    finally:
+        sink.close()
+
+    elapsed = time.monotonic() - started
+    stats = generator.get_statistics()
+    records = sum(stats['records_by_category'].values())
+    print(f"{stats['simulated_s']:.0f} s simulated in {elapsed:.1f} s: {records} records "
+          f"({records / max(elapsed, 1e-9):.0f}/s), {stats['datagrams']} datagrams, {stats['bytes']} bytes")
+    for category, count in sorted(stats['records_by_category'].items()):
+        print(f"  CAT-{category:03d}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+Measures cold import time of the entry modules, each in a fresh interpreter
+with `python -X importtime`, and lists the packages that take the longest
+(their own import time, summed per top-level package). With --boot it also
+runs the boot phase (app.boot) and prints its step timings.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--modules app clear_db track_integrator] [--top 10] [--boot]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module):
+    """(total ms, [(self ms, top-level package)]) of importing module cold"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    total = None
+    by_package = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = (field.strip() for field in line[len('import time:'):].split('|'))
+        package = name.split('.')[0]
+        by_package[package] = by_package.get(package, 0.0) + int(own) / 1000.0
+        if name == module:
+            total = int(cumulative) / 1000.0
+    if total is None:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return total, sorted(((ms, package) for package, ms in by_package.items()), reverse=True)
+
+
+def boot_timings():
+    code = "import json, app; print(json.dumps(app.boot()))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"boot failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument('--modules', nargs='+', default=['app', 'clear_db', 'track_integrator'])
+    parser.add_argument('--top', type=int, default=10, help='Slowest packages to list per module')
+    parser.add_argument('--boot', action='store_true', help='Also run the boot phase and report its steps')
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            total, packages = import_profile(module)
+        except RuntimeError as e:
+            print(f"{module}: {e}")
+            continue
+        print(f"\nimport {module}: {total:.0f} ms")
+        for ms, name in packages[:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+
+    if args.boot:
+        print("\nBoot phase:")
+        for name, seconds in boot_timings().items():
+            print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
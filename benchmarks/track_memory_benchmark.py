@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Track Memory Benchmark
+Measures per-track memory and garbage-collector pressure for a large number of
+concurrent tracks held by the tracker data structures.
+
+Usage:
+    python benchmarks/track_memory_benchmark.py [--tracks 50000] [--history-fill 50]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from track_calculator import TrackData, TrackState  # noqa: E402
+from igmm_track_associator import IGMMTrackData  # noqa: E402
+
+
+def build_legacy_tracks(count: int, history_fill: int):
+    """Create TrackData objects with full position history and plot log"""
+    start = datetime(2024, 1, 1)
+    tracks = {}
+    for i in range(count):
+        track = TrackData(
+            track_id=f"track_{i:06d}",
+            state=TrackState.CONFIRMED,
+            created_time=start,
+            last_update=start
+        )
+        for k in range(history_fill):
+            timestamp = start + timedelta(seconds=4 * k)
+            track.position_history.append((float(i), float(k), timestamp))
+            track.associated_plots.append(f"plot_{i}_{k}")
+        tracks[track.track_id] = track
+    return tracks
+
+
+def build_igmm_tracks(count: int, history_fill: int):
+    """Create IGMMTrackData objects with full position history"""
+    start = datetime(2024, 1, 1)
+    tracks = {}
+    for i in range(count):
+        track = IGMMTrackData(
+            track_id=f"track_{i:06d}",
+            x=float(i),
+            y=0.0,
+            heading=0.0,
+            speed=0.0,
+            timestamp=start
+        )
+        for k in range(history_fill):
+            track.position_history.append((float(i), float(k), start + timedelta(seconds=4 * k)))
+        tracks[track.track_id] = track
+    return tracks
+
+
+def measure(name: str, builder, count: int, history_fill: int) -> dict:
+    """Measure allocation size and full-collection time for one track type"""
+    gc.collect()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+
+    tracks = builder(count, history_fill)
+
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, 'filename'))
+    gc_tracked = len(gc.get_objects()) - objects_before
+
+    start = time.perf_counter()
+    gc.collect()
+    collect_ms = (time.perf_counter() - start) * 1000.0
+
+    result = {
+        'name': name,
+        'tracks': len(tracks),
+        'bytes_per_track': allocated / max(1, len(tracks)),
+        'gc_objects_per_track': gc_tracked / max(1, len(tracks)),
+        'full_collect_ms': collect_ms
+    }
+    del tracks
+    gc.collect()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-track memory and GC benchmark")
+    parser.add_argument('--tracks', type=int, default=50000, help="Concurrent tracks")
+    parser.add_argument('--history-fill', type=int, default=50,
+                        help="Updates applied per track (fills the history ring buffers)")
+    args = parser.parse_args()
+
+    results = [
+        measure('TrackData', build_legacy_tracks, args.tracks, args.history_fill),
+        measure('IGMMTrackData', build_igmm_tracks, args.tracks, args.history_fill)
+    ]
+
+    print(f"{'structure':<16}{'tracks':>10}{'KiB/track':>12}{'gc objs/track':>16}{'full gc (ms)':>14}")
+    for result in results:
+        print(f"{result['name']:<16}{result['tracks']:>10}"
+              f"{result['bytes_per_track'] / 1024:>12.2f}"
+              f"{result['gc_objects_per_track']:>16.1f}"
+              f"{result['full_collect_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
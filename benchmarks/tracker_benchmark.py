@@ -0,0 +1,598 @@
+#!/usr/bin/env python3
+"""
+Tracker Regression and Performance Benchmark
+Feeds recorded and synthetic radar data through the decode -> sector batch ->
+track pipeline and reports:
+
+- throughput (plots/s through decoding and tracking)
+- latency percentiles of tracker processing per antenna scan and per sector batch
+- peak Python heap while tracking (tracemalloc, in a separate untimed pass)
+- track accuracy against ground truth for synthetic scenarios: OSPA and
+  GOSPA (with its localisation / missed / false components) over confirmed
+  tracks at the end of every scan
+
+Synthetic scenarios encode every plot as a CAT-48 record (I048/010, /140,
+/020, /040), and open every scan with a CAT-34 north marker carrying the
+antenna rotation period (I034/041), so decoding is exercised as well. The
+recorded capture (cat48-only-plot-capture.pcap) has no ground truth and only
+reports throughput, latency, memory and track counts. As in the track
+integrator, the tracker takes its scan period from the north markers.
+
+It also checks that a TrackIntegrator with the default configuration, as the
+live pipeline runs it, starts tracks on a 10 s radar with and without CAT-34
+north markers reporting the rotation period.
+
+Results can be saved as a JSON baseline and later runs compared against it;
+the script exits with status 1 when a metric regresses beyond the tolerance
+or the integrator check fails.
+
+Usage:
+    python benchmarks/tracker_benchmark.py [--scenarios light dense manoeuvre pcap]
+                                           [--baseline benchmarks/tracker_baseline.json]
+                                           [--save-baseline] [--tolerance 0.25]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import random
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import create_engine
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from asterix_cat48_consolidated import AsterixConsolidatedProcessor  # noqa: E402
+from asterix_traffic_generator import encode_cat34_record, pack_blocks  # noqa: E402
+from geodesy import NM_TO_M, site_frame  # noqa: E402
+from models import db  # noqa: E402
+from pcap_parser import PCAPParser  # noqa: E402
+from scan_batcher import SectorBatcher  # noqa: E402
+from track_calculator import TrackCalculator, PlotData, create_default_config  # noqa: E402
+from track_integrator import TrackIntegrator  # noqa: E402
+
+DEFAULT_PCAP = os.path.join(ROOT, 'cat48-only-plot-capture.pcap')
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tracker_baseline.json')
+
+SCAN_PERIOD_S = 4.0
+MIN_RANGE_M = 5000.0
+MAX_RANGE_M = 80000.0
+RANGE_NOISE_M = 30.0
+AZIMUTH_NOISE_DEG = 0.1
+START_TIME_OF_DAY = 36000.0  # 10:00 UTC
+REFERENCE_DATE = date(2024, 1, 1)
+
+# OSPA / GOSPA parameters: cut-off distance (m) and order
+METRIC_CUTOFF_M = 1000.0
+METRIC_ORDER = 2
+
+# Antenna rotation period of the default-config integrator initiation check
+INTEGRATOR_CHECK_SCAN_PERIOD_S = 10.0
+
+# Scenario name -> targets, clutter plots per scan, fraction of manoeuvring targets
+SCENARIOS = {
+    'light': {'targets': 20, 'clutter': 20, 'manoeuvre_fraction': 0.0},
+    'dense': {'targets': 100, 'clutter': 200, 'manoeuvre_fraction': 0.1},
+    'manoeuvre': {'targets': 30, 'clutter': 50, 'manoeuvre_fraction': 0.6},
+}
+
+# Metric -> True when larger is better (used for regression checks)
+CHECKED_METRICS = {
+    'plots_per_s': True,
+    'scan_latency_p95_ms': False,
+    'peak_memory_kb': False,
+    'ospa_m': False,
+    'gospa_m': False,
+}
+
+
+@dataclass
+class SyntheticTarget:
+    """Target flying straight, optionally with one coordinated turn"""
+    x: float
+    y: float
+    speed: float
+    course_rad: float  # clockwise from north
+    turn_start_s: float = math.inf
+    turn_end_s: float = math.inf
+    turn_rate_rad: float = 0.0
+
+    def position(self, t: float) -> Tuple[float, float]:
+        """Position (east, north) in meters t seconds after the start"""
+        straight = min(t, self.turn_start_s)
+        x = self.x + self.speed * math.sin(self.course_rad) * straight
+        y = self.y + self.speed * math.cos(self.course_rad) * straight
+        if t <= self.turn_start_s:
+            return x, y
+
+        # Arc of the coordinated turn
+        turning = min(t, self.turn_end_s) - self.turn_start_s
+        course_end = self.course_rad + self.turn_rate_rad * turning
+        radius = self.speed / self.turn_rate_rad
+        x += radius * (math.cos(self.course_rad) - math.cos(course_end))
+        y += radius * (math.sin(course_end) - math.sin(self.course_rad))
+        if t <= self.turn_end_s:
+            return x, y
+
+        after = t - self.turn_end_s
+        return x + self.speed * math.sin(course_end) * after, y + self.speed * math.cos(course_end) * after
+
+
+def build_targets(count: int, manoeuvre_fraction: float, scans: int, rng: random.Random) -> List[SyntheticTarget]:
+    """Targets spread over the coverage; a fraction turn at 1.5-3 deg/s for 30-60 s mid-scenario"""
+    duration = scans * SCAN_PERIOD_S
+    targets = []
+    for i in range(count):
+        r = rng.uniform(15000.0, 60000.0)
+        az = rng.uniform(0.0, 2 * math.pi)
+        target = SyntheticTarget(r * math.sin(az), r * math.cos(az), rng.uniform(80.0, 250.0),
+                                 rng.uniform(0.0, 2 * math.pi))
+        if i < round(count * manoeuvre_fraction):
+            target.turn_start_s = rng.uniform(0.25, 0.5) * duration
+            target.turn_end_s = target.turn_start_s + rng.uniform(30.0, 60.0)
+            target.turn_rate_rad = math.radians(rng.choice((-1, 1)) * rng.uniform(1.5, 3.0))
+        targets.append(target)
+    return targets
+
+
+def encode_cat48_plot(range_m: float, azimuth_deg: float, time_of_day: float) -> bytes:
+    """Single-record CAT-48 message with I048/010, /140, /020 (PSR plot) and /040"""
+    record = bytearray([0xF0, 0x01, 0x02])
+    record += struct.pack('>I', int(round(time_of_day * 128.0)) & 0xFFFFFF)[1:]
+    record.append(0x20)
+    rho = min(int(round(range_m / NM_TO_M * 256.0)), 0xFFFF)
+    theta = int(round(azimuth_deg * 65536.0 / 360.0)) & 0xFFFF
+    record += struct.pack('>HH', rho, theta)
+    return bytes([48]) + struct.pack('>H', len(record) + 3) + bytes(record)
+
+
+def synthetic_scan(targets: List[SyntheticTarget], scan: int, clutter: int,
+                   detection_probability: float, rng: random.Random) -> List[bytes]:
+    """Encoded plots of one antenna revolution in beam order"""
+    plots = []
+
+    def beam_time(azimuth_deg: float) -> float:
+        return (scan + azimuth_deg / 360.0) * SCAN_PERIOD_S
+
+    for target in targets:
+        if rng.random() > detection_probability:
+            continue
+        # Position when the beam sweeps over the target (two fixed-point steps)
+        t = scan * SCAN_PERIOD_S
+        for _ in range(2):
+            x, y = target.position(t)
+            t = beam_time(math.degrees(math.atan2(x, y)) % 360.0)
+        x, y = target.position(t)
+        range_m = math.hypot(x, y) + rng.gauss(0.0, RANGE_NOISE_M)
+        azimuth = (math.degrees(math.atan2(x, y)) + rng.gauss(0.0, AZIMUTH_NOISE_DEG)) % 360.0
+        plots.append((azimuth, range_m))
+
+    for _ in range(clutter):
+        plots.append((rng.uniform(0.0, 360.0), math.sqrt(rng.uniform(MIN_RANGE_M ** 2, MAX_RANGE_M ** 2))))
+
+    plots.sort()
+    north_marker = pack_blocks(34, [encode_cat34_record(0, 1, START_TIME_OF_DAY + beam_time(0.0),
+                                                        rotation_period_s=SCAN_PERIOD_S)])
+    return north_marker + [encode_cat48_plot(range_m, azimuth, START_TIME_OF_DAY + beam_time(azimuth))
+                           for azimuth, range_m in plots]
+
+
+def pcap_messages(path: str) -> List[bytes]:
+    """UDP payloads of a capture file"""
+    parser = PCAPParser(path)
+    with contextlib.redirect_stdout(io.StringIO()):  # the parser prints the capture header
+        opened = parser.open()
+    if not opened:
+        raise SystemExit(f"Cannot open capture {path}")
+    messages = []
+    try:
+        while True:
+            packet = parser.read_packet()
+            if packet is None:
+                break
+            udp = parser.extract_udp_payload(packet['data'])
+            if udp:
+                messages.append(udp['payload'])
+    finally:
+        parser.close()
+    return messages
+
+
+def decode(processor: AsterixConsolidatedProcessor, message: bytes):
+    """
+    Decode one message into (plots, north marker, sector crossing azimuth)
+
+    Returns:
+        Tuple of PlotData list, the antenna rotation period of a CAT-34 north
+        marker (0.0 when it reports none, None without a north marker), and
+        the sector azimuth of a CAT-34 sector crossing (or None)
+    """
+    plots = []
+    north_marker, sector_azimuth = None, None
+    for report in processor.process_asterix_message(message):
+        if report.get('category') == 34:
+            if report.get('service_message_type') == 'North Marker':
+                north_marker = report.get('antenna_rotation_period') or 0.0
+            elif report.get('service_message_type') == 'Sector Crossing' and report.get('sector_azimuth') is not None:
+                sector_azimuth = report['sector_azimuth']
+            continue
+        if report.get('range') is None or report.get('azimuth') is None or not report.get('measurement_time'):
+            continue
+        plots.append(PlotData(
+            timestamp=datetime.fromisoformat(report['measurement_time']),
+            range_m=report['range'] * NM_TO_M,
+            azimuth_deg=report['azimuth'],
+            plot_id=report.get('track_id') or ''
+        ))
+    return plots, north_marker, sector_azimuth
+
+
+def optimal_assignment(cost: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Minimum cost assignment (Hungarian method with shortest augmenting paths)
+
+    Args:
+        cost: Rectangular cost matrix
+
+    Returns:
+        (rows, cols) of the assigned pairs, sorted by row; min(rows, cols) pairs
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+
+    # Potentials and the row matched to each column (1-based, column 0 is the augmenting root)
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=int)
+    way = np.zeros(m + 1, dtype=int)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while match[column] != 0:
+            used[column] = True
+            current = match[column]
+            free = np.flatnonzero(~used[1:]) + 1
+            slack = cost[current - 1, free - 1] - u[current] - v[free]
+            better = slack < min_slack[free]
+            min_slack[free[better]] = slack[better]
+            way[free[better]] = column
+            next_column = free[np.argmin(min_slack[free])]
+            delta = min_slack[next_column]
+            visited = np.flatnonzero(used)
+            u[match[visited]] += delta
+            v[visited] -= delta
+            min_slack[free] -= delta
+            column = next_column
+        # Flip the augmenting path
+        while column != 0:
+            previous = way[column]
+            match[column] = match[previous]
+            column = previous
+
+    cols = np.flatnonzero(match[1:])
+    rows = match[cols + 1] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+def ospa_gospa(truth: np.ndarray, estimates: np.ndarray) -> Dict[str, float]:
+    """
+    OSPA and GOSPA (alpha = 2) between two point sets with cut-off METRIC_CUTOFF_M and order METRIC_ORDER
+
+    Returns:
+        Dict with ospa, gospa and the GOSPA localisation, missed and false terms
+    """
+    c, p = METRIC_CUTOFF_M, METRIC_ORDER
+    m, n = len(truth), len(estimates)
+    if m == 0 and n == 0:
+        return {'ospa': 0.0, 'gospa': 0.0, 'localisation': 0.0, 'missed': 0, 'false': 0}
+
+    localisation, assigned = 0.0, 0
+    ospa_sum = 0.0
+    if m and n:
+        distances = np.minimum(np.linalg.norm(truth[:, None, :] - estimates[None, :, :], axis=2), c)
+        rows, cols = optimal_assignment(distances ** p)
+        matched = distances[rows, cols]
+        ospa_sum = float(np.sum(matched ** p))
+        within = matched < c
+        localisation = float(np.sum(matched[within] ** p))
+        assigned = int(np.count_nonzero(within))
+
+    ospa = ((ospa_sum + c ** p * abs(m - n)) / max(m, n)) ** (1.0 / p)
+    missed, false = m - assigned, n - assigned
+    gospa = (localisation + c ** p / 2.0 * (missed + false)) ** (1.0 / p)
+    return {'ospa': ospa, 'gospa': gospa, 'localisation': localisation, 'missed': missed, 'false': false}
+
+
+def confirmed_estimates(tracker: TrackCalculator, at: datetime) -> np.ndarray:
+    """Confirmed track positions extrapolated to a common time"""
+    associator = tracker.igmm_associator
+    estimates = []
+    for track in associator.tracks.values():
+        if track.plot_count < associator.confirmation_threshold:
+            continue
+        dt = (at - track.timestamp).total_seconds()
+        heading = math.radians(track.heading)  # IGMM heading: math angle of the velocity
+        estimates.append((track.x + track.speed * math.cos(heading) * dt,
+                          track.y + track.speed * math.sin(heading) * dt))
+    return np.array(estimates, dtype=float).reshape(-1, 2)
+
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def make_tracker(args) -> TrackCalculator:
+    config = create_default_config()
+    config['filter_engine'] = args.filter_engine
+    config['association_engine'] = args.association_engine
+    # Filter noise matched to the simulated plots (cross-range error at mid range)
+    config['measurement_noise_std'] = max(RANGE_NOISE_M, 40000.0 * math.radians(AZIMUTH_NOISE_DEG))
+    return TrackCalculator(config)
+
+
+def run_pipeline(scans: List[List[bytes]], args, truth: Optional[List[SyntheticTarget]] = None) -> Dict:
+    """
+    Decode, batch and track the scans, timing decoding and tracking separately
+
+    Args:
+        scans: Encoded messages grouped by antenna scan (the capture is one group)
+        args: Command line options
+        truth: Targets for accuracy metrics (synthetic scenarios only)
+
+    Returns:
+        Timing, track count and accuracy results
+    """
+    processor = AsterixConsolidatedProcessor()
+    processor.set_reference_date(REFERENCE_DATE)
+    batcher = SectorBatcher(args.sectors)
+    tracker = make_tracker(args)
+
+    decode_s = track_s = 0.0
+    plot_count = 0
+    sector_latencies: List[float] = []
+    scan_latencies: Dict[int, float] = {}
+    metrics: List[Dict[str, float]] = []
+
+    def track(batches):
+        nonlocal track_s
+        for batch in batches:
+            begin = time.perf_counter()
+            tracker.process_plot_batch(batch.plots)
+            elapsed = time.perf_counter() - begin
+            track_s += elapsed
+            sector_latencies.append(elapsed)
+            scan_latencies[batch.scan_number] = scan_latencies.get(batch.scan_number, 0.0) + elapsed
+
+    for scan, messages in enumerate(scans):
+        for message in messages:
+            begin = time.perf_counter()
+            plots, north_marker, sector_azimuth = decode(processor, message)
+            decode_s += time.perf_counter() - begin
+            plot_count += len(plots)
+
+            if north_marker is not None:
+                tracker.set_scan_period(north_marker)  # as TrackIntegrator does for north marker events
+                track(batcher.on_north_marker())
+            if sector_azimuth is not None:
+                track(batcher.on_sector_crossing(sector_azimuth))
+            for plot in plots:
+                track(batcher.add_plot(plot))
+
+        if truth is not None:
+            # Score at the end of the scan once the last sector has been tracked
+            track(batcher.flush())
+            t = (scan + 1) * SCAN_PERIOD_S
+            at = datetime.combine(REFERENCE_DATE, datetime.min.time()) + timedelta(seconds=START_TIME_OF_DAY + t)
+            truth_positions = np.array([target.position(t) for target in truth], dtype=float)
+            if scan >= args.warmup_scans:
+                metrics.append(ospa_gospa(truth_positions, confirmed_estimates(tracker, at)))
+    track(batcher.flush())
+
+    associator = tracker.igmm_associator
+    result = {
+        'plots': plot_count,
+        'scans': len(scan_latencies),
+        'decode_s': decode_s,
+        'track_s': track_s,
+        'plots_per_s': plot_count / (decode_s + track_s) if decode_s + track_s > 0 else 0.0,
+        'track_plots_per_s': plot_count / track_s if track_s > 0 else 0.0,
+        'scan_latency_p50_ms': percentile(list(scan_latencies.values()), 50) * 1000.0,
+        'scan_latency_p95_ms': percentile(list(scan_latencies.values()), 95) * 1000.0,
+        'scan_latency_p99_ms': percentile(list(scan_latencies.values()), 99) * 1000.0,
+        'sector_latency_p95_ms': percentile(sector_latencies, 95) * 1000.0,
+        'sector_latency_max_ms': max(sector_latencies, default=0.0) * 1000.0,
+        'tracks_created': (associator.next_track_id - 1) // associator.track_id_stride,
+        'tracks_confirmed': sum(1 for track in associator.tracks.values()
+                                if track.plot_count >= associator.confirmation_threshold),
+    }
+    if metrics:
+        result.update({
+            'ospa_m': float(np.mean([m['ospa'] for m in metrics])),
+            'gospa_m': float(np.mean([m['gospa'] for m in metrics])),
+            'gospa_localisation_m': float(np.mean([m['localisation'] for m in metrics])) ** (1.0 / METRIC_ORDER),
+            'gospa_missed': float(np.mean([m['missed'] for m in metrics])),
+            'gospa_false': float(np.mean([m['false'] for m in metrics])),
+        })
+    return result
+
+
+def scenario_input(name: str, args):
+    """Encoded scans and ground truth for a scenario"""
+    if name == 'pcap':
+        messages = pcap_messages(args.pcap)
+        return [messages], None
+
+    spec = dict(SCENARIOS[name])
+    for key in ('targets', 'clutter', 'manoeuvre_fraction'):
+        if getattr(args, key) is not None:
+            spec[key] = getattr(args, key)
+    rng = random.Random(args.seed)
+    targets = build_targets(spec['targets'], spec['manoeuvre_fraction'], args.scans, rng)
+    scans = [synthetic_scan(targets, scan, spec['clutter'], args.detection_probability, rng)
+             for scan in range(args.scans)]
+    return scans, targets
+
+
+def run_scenario(name: str, args) -> Dict:
+    """Timed pass, then an untimed pass under tracemalloc for peak memory"""
+    scans, truth = scenario_input(name, args)
+    result = run_pipeline(scans, args, truth)
+
+    if not args.no_memory:
+        tracemalloc.start()
+        run_pipeline(scans, args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result['peak_memory_kb'] = peak / 1024.0
+    return result
+
+
+def integrator_initiation(scan_period_s: float, north_markers: bool, scans: int = 6) -> int:
+    """
+    Tracks a default-config TrackIntegrator starts from two targets seen once per scan
+
+    The targets are on opposite bearings, so each plot closes the previous
+    antenna sector. Their events are stored in a scratch database the way the
+    UDP receiver stores them (with north_markers, each scan is opened by a
+    north marker reporting scan_period_s) and polled once per scan.
+    """
+    config = create_default_config()
+    site = site_frame(config['radar_lat'], config['radar_lon'])
+    start = datetime.combine(REFERENCE_DATE, datetime.min.time()) + timedelta(seconds=START_TIME_OF_DAY)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'surveillance.db')
+        engine = create_engine(f'sqlite:///{db_path}')
+        db.metadata.create_all(engine)
+        engine.dispose()
+
+        integrator = TrackIntegrator(db_path)
+        for scan in range(scans):
+            t = start + timedelta(seconds=scan * scan_period_s)
+            events = []
+            if north_markers:
+                events.append((t, None, None, scan_period_s, 'asterix_north_marker'))
+            for sign in (1.0, -1.0):
+                offset = sign * (20000.0 + scan * scan_period_s * 150.0)  # 150 m/s outbound
+                lat, lon = site.plane_to_geodetic(offset, sign * 20000.0)
+                events.append((t + timedelta(seconds=scan_period_s * (0.125 if sign > 0 else 0.625)),
+                               lat, lon, None, 'asterix_plot'))
+            with sqlite3.connect(db_path) as conn:
+                conn.executemany(
+                    "INSERT INTO event (timestamp, track_id, sensor_id, latitude, longitude, speed, event_type) "
+                    "VALUES (?, 'radar_0_1', 'radar_0_1', ?, ?, ?, ?)",
+                    [(timestamp.isoformat(), lat, lon, speed, event_type)
+                     for timestamp, lat, lon, speed, event_type in events])
+            integrator.process_new_data()
+        integrator.process_new_data()  # flush the last sector
+        return len(integrator.tracker.active_tracks)
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], tolerance: float) -> List[str]:
+    """Regressions of checked metrics beyond the relative tolerance"""
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in CHECKED_METRICS.items():
+            if metric not in result or metric not in reference or not reference[metric]:
+                continue
+            change = (result[metric] - reference[metric]) / abs(reference[metric])
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{name}: {metric} {result[metric]:.1f} vs baseline "
+                                   f"{reference[metric]:.1f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tracker throughput, latency, memory and accuracy benchmark")
+    parser.add_argument('--scenarios', nargs='+', default=['light', 'dense', 'manoeuvre', 'pcap'],
+                        choices=list(SCENARIOS) + ['pcap'])
+    parser.add_argument('--scans', type=int, default=30, help="Antenna scans per synthetic scenario")
+    parser.add_argument('--targets', type=int, help="Override the scenario's target count")
+    parser.add_argument('--clutter', type=int, help="Override the scenario's clutter plots per scan")
+    parser.add_argument('--manoeuvre-fraction', type=float, help="Override the fraction of turning targets")
+    parser.add_argument('--detection-probability', type=float, default=0.9)
+    parser.add_argument('--warmup-scans', type=int, default=5, help="Scans before accuracy is scored")
+    parser.add_argument('--filter-engine', default='imm', choices=['igmm', 'cv', 'imm'])
+    parser.add_argument('--association-engine', default='nn', choices=['nn', 'jpda'])
+    parser.add_argument('--sectors', type=int, default=16, help="Sector batches per scan")
+    parser.add_argument('--pcap', default=DEFAULT_PCAP)
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--no-memory', action='store_true', help="Skip the peak memory pass")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="Write the results as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument('--json', help="Also write the results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    results = {}
+    print(f"{'scenario':<11}{'plots':>8}{'plots/s':>10}{'scan p50':>10}{'p95':>8}{'p99':>8}"
+          f"{'peak KB':>10}{'tracks':>8}{'OSPA':>8}{'GOSPA':>8}{'miss':>6}{'false':>7}")
+    for name in args.scenarios:
+        result = run_scenario(name, args)
+        results[name] = result
+        accuracy = (f"{result['ospa_m']:>8.1f}{result['gospa_m']:>8.0f}{result['gospa_missed']:>6.1f}"
+                    f"{result['gospa_false']:>7.1f}" if 'ospa_m' in result else f"{'-':>8}{'-':>8}{'-':>6}{'-':>7}")
+        print(f"{name:<11}{result['plots']:>8}{result['plots_per_s']:>10.0f}{result['scan_latency_p50_ms']:>10.1f}"
+              f"{result['scan_latency_p95_ms']:>8.1f}{result['scan_latency_p99_ms']:>8.1f}"
+              f"{result.get('peak_memory_kb', 0.0):>10.0f}{result['tracks_confirmed']:>8}" + accuracy)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    # The live pipeline's default configuration must start tracks on a slow radar
+    # whether or not it reports its rotation period
+    regressions = []
+    for north_markers in (True, False):
+        tracks = integrator_initiation(INTEGRATOR_CHECK_SCAN_PERIOD_S, north_markers)
+        label = 'with' if north_markers else 'without'
+        print(f"integrator, {INTEGRATOR_CHECK_SCAN_PERIOD_S:.0f} s scan {label} north markers: {tracks} of 2 tracks")
+        if tracks < 2:
+            regressions.append(f"integrator: {tracks} of 2 tracks initiated on a "
+                               f"{INTEGRATOR_CHECK_SCAN_PERIOD_S:.0f} s scan {label} north markers")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions += compare(results, json.load(f), args.tolerance)
+
+    if regressions:
+        print("Regressions against baseline:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    if not args.save_baseline and os.path.exists(args.baseline):
+        print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+WebSocket Client Capacity Load Test
+Opens increasing numbers of concurrent Socket.IO (websocket transport) clients
+that subscribe to the track delta stream like the dashboard does, while the
+server's simulator moves tracks. For each client count it reports how many
+clients connected, connect latency, how many were still receiving deltas at
+the end, the delta rate per client and the server's threads and memory.
+
+With --spawn the test starts the server itself (serve.py, one run per async
+mode, e.g. "before" = threading and "after" = eventlet) and drives traffic
+by logging in and starting the simulator; otherwise it targets --url.
+
+websocket_load_results.json holds a recorded --spawn threading eventlet
+gevent run (100-2000 clients, one CPU shared by server and load generator).
+
+Usage:
+    python benchmarks/websocket_load_test.py --spawn threading eventlet [--clients 100 250 500 1000]
+    python benchmarks/websocket_load_test.py --url http://127.0.0.1:5000 [--clients 100 500] [--duration 20]
+"""
+
+import argparse
+import http.cookiejar
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+
+import simple_websocket
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class WebSocketClient(simple_websocket.Client):
+    """
+    simple_websocket client that also delivers frames received with the handshake
+
+    Client.handshake() takes only the accept event from the first read, so a
+    frame that arrived in the same read (eventlet and gevent servers send the
+    Engine.IO open packet right behind the 101 response) stays buffered until
+    the next frame, which never comes before the client answers it.
+    """
+
+    def _thread(self):
+        self.connected = self._handle_events()
+        super()._thread()
+
+
+class LoadClient(threading.Thread):
+    """One Socket.IO client speaking Engine.IO v4 over a websocket"""
+
+    def __init__(self, ws_url: str, stop: threading.Event, connect_timeout: float):
+        super().__init__(daemon=True)
+        self.ws_url = ws_url
+        self.stop = stop
+        self.connect_timeout = connect_timeout
+        self.connect_s = None
+        self.deltas = 0
+        self.snapshots = 0
+        self.last_message_at = None
+        self.error = None
+
+    def _receive(self, ws, deadline):
+        while True:
+            message = ws.receive(timeout=max(deadline - time.monotonic(), 0.01))
+            if message is None:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("timed out")
+                continue
+            if message == '2':  # Engine.IO ping
+                ws.send('3')
+                continue
+            return message
+
+    def run(self):
+        started = time.monotonic()
+        deadline = started + self.connect_timeout
+        ws = None
+        try:
+            ws = WebSocketClient.connect(self.ws_url)
+            if not self._receive(ws, deadline).startswith('0'):
+                raise ConnectionError("no Engine.IO open packet")
+            ws.send('40')
+            while not self._receive(ws, deadline).startswith('40'):
+                pass
+            self.connect_s = time.monotonic() - started
+            ws.send('42' + json.dumps(['subscribe_tracks', {'ack': True}]))
+
+            while not self.stop.is_set():
+                message = ws.receive(timeout=0.5)
+                if message is None or not isinstance(message, str):
+                    continue
+                if message == '2':
+                    ws.send('3')
+                elif message.startswith('42'):
+                    body = message[2:]
+                    ack_id = ''
+                    while body and body[0].isdigit():
+                        ack_id, body = ack_id + body[0], body[1:]
+                    event = json.loads(body)[0]
+                    if event == 'track_delta':
+                        self.deltas += 1
+                    elif event == 'track_snapshot':
+                        self.snapshots += 1
+                    self.last_message_at = time.monotonic()
+                    if ack_id:
+                        ws.send(f'43{ack_id}[]')
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+        finally:
+            if ws is not None:
+                try:
+                    ws.close()
+                except Exception:
+                    pass
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def process_usage(pid):
+    """(OS threads, resident MB) of a local process, from /proc"""
+    try:
+        threads = len(os.listdir(f'/proc/{pid}/task'))
+        with open(f'/proc/{pid}/status') as status:
+            rss_kb = next(int(line.split()[1]) for line in status if line.startswith('VmRSS:'))
+        return threads, rss_kb / 1024.0
+    except (OSError, StopIteration):
+        return None, None
+
+
+def run_level(base_url, count, duration, ramp_per_s, connect_timeout, server_pid):
+    """Connect count clients, hold them for duration seconds, collect metrics"""
+    parsed = urllib.parse.urlparse(base_url)
+    scheme = 'wss' if parsed.scheme == 'https' else 'ws'
+    ws_url = f"{scheme}://{parsed.netloc}/socket.io/?EIO=4&transport=websocket"
+
+    stop = threading.Event()
+    clients = []
+    for i in range(count):
+        client = LoadClient(ws_url, stop, connect_timeout)
+        client.start()
+        clients.append(client)
+        time.sleep(1.0 / ramp_per_s)
+
+    time.sleep(connect_timeout)  # let the last clients finish connecting
+    counted_from = time.monotonic()
+    start_deltas = {id(client): client.deltas for client in clients}
+    time.sleep(duration)
+    window_s = time.monotonic() - counted_from
+    threads, rss_mb = process_usage(server_pid) if server_pid else (None, None)
+    now = time.monotonic()
+
+    connected = [client for client in clients if client.connect_s is not None]
+    live = [client for client in connected if client.error is None and client.last_message_at is not None
+            and now - client.last_message_at < 5.0]
+    rates = [(client.deltas - start_deltas[id(client)]) / window_s for client in connected if client.error is None]
+    connect_times = [client.connect_s for client in connected]
+    errors = {}
+    for client in clients:
+        if client.error:
+            errors[client.error.split(':')[0]] = errors.get(client.error.split(':')[0], 0) + 1
+
+    stop.set()
+    for client in clients:
+        client.join(timeout=2.0)
+
+    return {
+        'clients': count,
+        'connected': len(connected),
+        'live': len(live),
+        'connect_p50_ms': round(1000 * percentile(connect_times, 0.5), 1) if connect_times else None,
+        'connect_p95_ms': round(1000 * percentile(connect_times, 0.95), 1) if connect_times else None,
+        'deltas_per_client_s': round(statistics.mean(rates), 2) if rates else 0.0,
+        'min_deltas_per_client_s': round(min(rates), 2) if rates else 0.0,
+        'server_threads': threads,
+        'server_rss_mb': round(rss_mb, 1) if rss_mb else None,
+        'errors': errors
+    }
+
+
+def start_simulation(base_url):
+    """Log in with the default user and start the track simulator"""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urllib.parse.urlencode({'username': 'user', 'password': 'pass'}).encode()
+    opener.open(f"{base_url}/login", data=form, timeout=10).read()
+    request = urllib.request.Request(f"{base_url}/api/surveillance/start", data=b'{}',
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+    print(f"  simulator: {json.loads(opener.open(request, timeout=30).read()).get('message')}")
+
+
+def wait_for_server(base_url, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base_url}/login", timeout=2).read()
+            return
+        except OSError:
+            time.sleep(0.5)
+    raise RuntimeError(f"server at {base_url} did not come up")
+
+
+def print_results(mode, results):
+    print(f"\n{mode}")
+    print(f"{'clients':>8} {'connected':>9} {'live':>6} {'p50 ms':>8} {'p95 ms':>8} {'deltas/s':>9} "
+          f"{'min/s':>7} {'threads':>8} {'RSS MB':>8}  errors")
+    for r in results:
+        print(f"{r['clients']:>8} {r['connected']:>9} {r['live']:>6} {str(r['connect_p50_ms']):>8} "
+              f"{str(r['connect_p95_ms']):>8} {r['deltas_per_client_s']:>9} {r['min_deltas_per_client_s']:>7} "
+              f"{str(r['server_threads']):>8} {str(r['server_rss_mb']):>8}  {r['errors'] or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent websocket client capacity load test")
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Server to test (without --spawn)')
+    parser.add_argument('--spawn', nargs='+', choices=['threading', 'eventlet', 'gevent'],
+                        help='Start serve.py in each async mode in turn and test it')
+    parser.add_argument('--port', type=int, default=5099, help='Port for spawned servers')
+    parser.add_argument('--clients', type=int, nargs='+', default=[100, 250, 500, 1000])
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds to measure at each level')
+    parser.add_argument('--ramp', type=float, default=100.0, help='New connections per second')
+    parser.add_argument('--connect-timeout', type=float, default=10.0)
+    parser.add_argument('--json', help='Write all results to this file')
+    args = parser.parse_args()
+
+    all_results = {}
+    for mode in args.spawn or [None]:
+        server = None
+        base_url = args.url
+        if mode:
+            base_url = f"http://127.0.0.1:{args.port}"
+            server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py'), 'web', '--async-mode', mode,
+                                       '--port', str(args.port), '--no-ingest'], cwd=ROOT)
+        try:
+            wait_for_server(base_url)
+            print(f"Testing {base_url} ({mode or 'external server'})")
+            if mode:
+                start_simulation(base_url)
+            results = []
+            for count in args.clients:
+                result = run_level(base_url, count, args.duration, args.ramp, args.connect_timeout,
+                                   server.pid if server else None)
+                print(f"  {count} clients: {result['connected']} connected, {result['live']} live")
+                results.append(result)
+            all_results[mode or base_url] = results
+            print_results(mode or base_url, results)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(all_results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
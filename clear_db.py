@@ -29,8 +29,12 @@ from sqlalchemy import text
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app_init import app, db
-from models import User, Track, Event, NetworkConfig
+from flask import Flask
+from models import db, User, Track, Event, NetworkConfig, configure_database, create_default_user
+
+# A bare app bound to the database; importing app_init would pull in the whole web application
+app = Flask(__name__)
+configure_database(app)
 
 def clear_surveillance_data():
     """Clear tracks and events (surveillance data only)"""
@@ -156,7 +160,6 @@ def reset_database():
                 print(f"✓ Restored {len(existing_users)} existing users")
             else:
                 # Create default user if no users existed
-                from app_init import create_default_user
                 create_default_user()
                 print("✓ Created default user (username: user, password: pass)")
             
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+In-Process Event Bus
+Pushes new Event rows and Event Monitor updates to the dashboard instead of
+having every tab poll for them.
+
+Publishers append an entry (topic, data) once; entries get consecutive IDs and
+are kept in a bounded history. Subscribers do not get queues of their own:
+each reads the shared history from the last ID it has seen, blocking until
+something newer is published. That makes resuming after a reconnect the same
+operation as reading live, as long as the resume point is still held.
+
+Resume IDs carry the bus epoch ("<epoch>:<id>"), so an ID from before a server
+restart, or one older than the history, is recognised and the subscriber is
+told to reload rather than silently skipping entries.
+
+Event rows are published from a SQLAlchemy hook once their transaction
+commits, so every writer (simulator, UDP receiver, tracker) is covered.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+TOPIC_EVENT = 'event'
+TOPIC_MONITOR = 'monitor'
+
+
+class EventBus:
+    """
+    Bounded, ID-ordered history of published entries with blocking reads
+    """
+
+    def __init__(self, history: int = 2000):
+        """
+        Initialize bus
+
+        Args:
+            history: Entries kept for subscribers that are behind or resuming
+        """
+        self.epoch = format(int(time.time() * 1000), 'x')
+        self._entries = deque(maxlen=history)
+        self._last_id = 0
+        self._condition = threading.Condition()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def publish(self, topic: str, data: Any) -> int:
+        """
+        Append an entry and wake blocked readers
+
+        Args:
+            topic: Entry topic (TOPIC_EVENT, TOPIC_MONITOR)
+            data: JSON-serializable payload
+
+        Returns:
+            The entry ID
+        """
+        with self._condition:
+            self._last_id += 1
+            self._entries.append({'id': self._last_id, 'topic': topic, 'data': data, 'time': time.time()})
+            self._condition.notify_all()
+            return self._last_id
+
+    def cursor(self, entry_id: int) -> str:
+        """Resume ID of an entry ID"""
+        return f"{self.epoch}:{entry_id}"
+
+    def parse_cursor(self, value: Optional[str]) -> Optional[int]:
+        """
+        Entry ID of a resume ID
+
+        Returns:
+            The entry ID, or None if the value is absent, malformed or from
+            another epoch (server restart)
+        """
+        if not value:
+            return None
+        epoch, _, entry_id = value.partition(':')
+        if epoch != self.epoch:
+            return None
+        try:
+            return int(entry_id)
+        except ValueError:
+            return None
+
+    def read(self, after: int, topics: Optional[Iterable[str]] = None,
+             timeout: Optional[float] = None) -> Optional[Tuple[int, List[Dict]]]:
+        """
+        Entries published after an ID, waiting for one if there are none yet
+
+        Args:
+            after: Last entry ID the reader has seen
+            topics: Topics to return (None for all)
+            timeout: Seconds to wait for a new entry
+
+        Returns:
+            (ID to read after next time, matching entries), with no entries on
+            timeout; None if entries after `after` are no longer held (the
+            reader must reload and continue from last_id)
+        """
+        with self._condition:
+            if after > self._last_id or (self._entries and after < self._entries[0]['id'] - 1):
+                return None
+            if after == self._last_id:
+                self._condition.wait_for(lambda: self._last_id > after, timeout)
+
+            start = after - self._entries[0]['id'] + 1 if self._entries else 0
+            if start < 0:
+                return None  # overtaken while waiting
+            entries = list(islice(self._entries, start, None))
+            position = self._last_id
+
+        if topics is not None:
+            topics = set(topics)
+            entries = [entry for entry in entries if entry['topic'] in topics]
+        return position, entries
+
+    def get_statistics(self) -> Dict:
+        with self._condition:
+            return {
+                'last_id': self._last_id,
+                'held': len(self._entries),
+                'oldest_id': self._entries[0]['id'] if self._entries else None
+            }
+
+
+def publish_committed_rows(bus: EventBus, model, topic: str):
+    """
+    Publish model rows to the bus when the transaction inserting them commits
+
+    Args:
+        bus: Bus to publish to
+        model: Mapped class with to_dict() (e.g. Event)
+        topic: Topic of the entries (one per row, data = row.to_dict())
+    """
+    key = f'event_bus:{topic}'
+
+    def after_flush(session, flush_context):
+        # Serialized now: rows are expired after the commit
+        rows = [instance.to_dict() for instance in session.new if isinstance(instance, model)]
+        if rows:
+            session.info.setdefault(key, []).extend(rows)
+
+    def after_commit(session):
+        for data in sorted(session.info.pop(key, ()), key=lambda data: data.get('id') or 0):
+            bus.publish(topic, data)
+
+    def after_rollback(session):
+        session.info.pop(key, None)
+
+    sqlalchemy_event.listen(Session, 'after_flush', after_flush)
+    sqlalchemy_event.listen(Session, 'after_commit', after_commit)
+    sqlalchemy_event.listen(Session, 'after_rollback', after_rollback)
+
+
+event_bus = EventBus()
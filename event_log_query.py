@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Event Log Queries
+Filtering, keyset pagination and cached totals for /api/events.
+
+Pages are read newest first in (timestamp, id) order. A page cursor encodes
+the (timestamp, id) of the last event returned, and the next page starts
+strictly after it using the (timestamp, id) index, so reading a page costs the
+same at any depth instead of scanning and discarding OFFSET rows. The live
+event log polls with since_id and only reads events newer than the last one
+it shows.
+
+Totals for the page count are cached per filter and refreshed in a background
+thread once older than ttl_s, so polling never waits on a COUNT(*) over the
+whole table; responses carry the time the total was counted.
+"""
+
+import base64
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from models import Event
+
+logger = logging.getLogger(__name__)
+
+
+def parse_event_filters(start_date: Optional[str], end_date: Optional[str],
+                        event_type: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime], Optional[str]]:
+    """Filter parameters as (start, end, event type); invalid dates are ignored"""
+    start = end = None
+    if start_date:
+        try:
+            start = datetime.fromisoformat(start_date.replace('T', ' '))
+        except ValueError:
+            pass  # Invalid date format, ignore filter
+    if end_date:
+        try:
+            end = datetime.fromisoformat(end_date.replace('T', ' '))
+        except ValueError:
+            pass  # Invalid date format, ignore filter
+    return start, end, event_type or None
+
+
+def filtered_events(filters: Tuple[Optional[datetime], Optional[datetime], Optional[str]]):
+    """Event query with the parsed filters applied"""
+    start, end, event_type = filters
+    query = Event.query
+    if start is not None:
+        query = query.filter(Event.timestamp >= start)
+    if end is not None:
+        query = query.filter(Event.timestamp <= end)
+    if event_type:
+        query = query.filter(Event.event_type == event_type)
+    return query
+
+
+def encode_cursor(event: Event) -> str:
+    """Opaque cursor positioned after an event"""
+    raw = f"{event.timestamp.isoformat() if event.timestamp else ''}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[Optional[datetime], int]]:
+    """(timestamp, id) from a cursor, or None if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, event_id = raw.rsplit('|', 1)
+        return (datetime.fromisoformat(timestamp) if timestamp else None), int(event_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def newest_first(query):
+    return query.order_by(Event.timestamp.desc(), Event.id.desc())
+
+
+def keyset_page(query, cursor: Optional[Tuple[Optional[datetime], int]],
+                per_page: int) -> Tuple[List[Event], Optional[str]]:
+    """
+    One page of events, newest first, after a cursor
+
+    Args:
+        query: Filtered event query
+        cursor: Decoded cursor of the previous page, or None for the first page
+        per_page: Page size
+
+    Returns:
+        (events, cursor of the next page or None on the last page)
+    """
+    if cursor is not None:
+        timestamp, event_id = cursor
+        if timestamp is None:
+            query = query.filter(Event.timestamp.is_(None), Event.id < event_id)
+        else:
+            query = query.filter(or_(Event.timestamp < timestamp,
+                                     and_(Event.timestamp == timestamp, Event.id < event_id)))
+    events = newest_first(query).limit(per_page + 1).all()
+    if len(events) <= per_page:
+        return events, None
+    events = events[:per_page]
+    return events, encode_cursor(events[-1])
+
+
+def offset_page(query, page: int, per_page: int) -> Tuple[List[Event], Optional[str]]:
+    """Page by number (for jumping to a page); returns the same next cursor as keyset_page"""
+    events = newest_first(query).offset((max(page, 1) - 1) * per_page).limit(per_page + 1).all()
+    if len(events) <= per_page:
+        return events, None
+    events = events[:per_page]
+    return events, encode_cursor(events[-1])
+
+
+def events_since(query, since_id: int, limit: int) -> Tuple[List[Event], bool]:
+    """
+    Events added after since_id, newest first
+
+    Returns:
+        (events, whether more than limit were added, i.e. the caller should reload)
+    """
+    events = query.filter(Event.id > since_id).order_by(Event.id.desc()).limit(limit + 1).all()
+    return events[:limit], len(events) > limit
+
+
+class EventCountCache:
+    """
+    Per-filter event totals, recounted in the background when stale
+    """
+
+    def __init__(self, app, ttl_s: float = 30.0, max_entries: int = 64):
+        """
+        Initialize cache
+
+        Args:
+            app: Flask app (background recounts need its app context)
+            ttl_s: Age after which a total is recounted
+            max_entries: Filters kept; the least recently used are dropped
+        """
+        self.app = app
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.counts: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()  # key -> (total, counted_at)
+        self.refreshing = set()
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, count: Callable[[], int]) -> Tuple[int, float]:
+        """
+        Total for a filter
+
+        The first request for a filter counts synchronously; later ones get the
+        cached total and, if it is stale, start a background recount.
+
+        Args:
+            key: Filter identity
+            count: Counts the filtered events (runs in an app context)
+
+        Returns:
+            (total, epoch time it was counted)
+        """
+        with self.lock:
+            cached = self.counts.get(key)
+            if cached is not None:
+                self.counts.move_to_end(key)
+                if time.time() - cached[1] > self.ttl_s and key not in self.refreshing:
+                    self.refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, count), daemon=True).start()
+                return cached
+
+        return self._store(key, count())
+
+    def _store(self, key: Hashable, total: int) -> Tuple[int, float]:
+        entry = (total, time.time())
+        with self.lock:
+            self.counts[key] = entry
+            self.counts.move_to_end(key)
+            while len(self.counts) > self.max_entries:
+                self.counts.popitem(last=False)
+        return entry
+
+    def _refresh(self, key: Hashable, count: Callable[[], int]):
+        try:
+            with self.app.app_context():
+                self._store(key, count())
+        except Exception as e:
+            logger.error(f"Error recounting events: {e}")
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+
+    def clear(self):
+        """Drop all totals (e.g. after the event table is emptied)"""
+        with self.lock:
+            self.counts.clear()
+
+    def get_statistics(self) -> Dict:
+        with self.lock:
+            return {'cached_filters': len(self.counts), 'refreshing': len(self.refreshing)}
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Spatial Index for Association Gates
+Uniform grid over the tracking plane. Each track is entered in every cell its
+gate's bounding square overlaps, so the tracks whose gates can contain a plot
+are found with a single cell lookup instead of a scan over all tracks.
+
+The same grid, in degrees, indexes track positions and client map viewports
+for the live track subscriptions (track_subscriptions.py).
+"""
+
+import math
+from typing import Dict, Hashable, List, Set, Tuple
+
+
+class GateIndex:
+    """
+    Grid of track gates, rebuilt whenever the track predictions change
+    """
+
+    def __init__(self, cell_size: float = 1000.0):
+        """
+        Initialize index
+
+        Args:
+            cell_size: Grid cell size in meters
+        """
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[Hashable]] = {}
+
+    def _cell(self, value: float) -> int:
+        return int(math.floor(value / self.cell_size))
+
+    def clear(self):
+        """Remove all gates"""
+        self.cells = {}
+
+    def insert(self, key: Hashable, x: float, y: float, radius: float):
+        """
+        Enter a gate
+
+        Args:
+            key: Track identifier returned by query
+            x, y: Gate centre in meters
+            radius: Largest distance from the centre at which the gate can accept a plot
+        """
+        self.insert_box(key, x - radius, y - radius, x + radius, y + radius)
+
+    def insert_box(self, key: Hashable, min_x: float, min_y: float, max_x: float, max_y: float):
+        """Enter a key in every cell overlapped by an axis-aligned box"""
+        for cell_x in range(self._cell(min_x), self._cell(max_x) + 1):
+            for cell_y in range(self._cell(min_y), self._cell(max_y) + 1):
+                self.cells.setdefault((cell_x, cell_y), []).append(key)
+
+    def query(self, x: float, y: float) -> List[Hashable]:
+        """Keys of the gates whose bounding square may contain the point (x, y)"""
+        return self.cells.get((self._cell(x), self._cell(y)), [])
+
+    def query_box(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Set[Hashable]:
+        """Keys entered in any cell overlapped by an axis-aligned box (a superset of the exact matches)"""
+        keys = set()
+        cell_min_x, cell_max_x = self._cell(min_x), self._cell(max_x)
+        cell_min_y, cell_max_y = self._cell(min_y), self._cell(max_y)
+        if (cell_max_x - cell_min_x + 1) * (cell_max_y - cell_min_y + 1) > len(self.cells):
+            # Box covers more cells than are occupied: walk the occupied ones
+            for (cell_x, cell_y), cell_keys in self.cells.items():
+                if cell_min_x <= cell_x <= cell_max_x and cell_min_y <= cell_y <= cell_max_y:
+                    keys.update(cell_keys)
+            return keys
+        for cell_x in range(cell_min_x, cell_max_x + 1):
+            for cell_y in range(cell_min_y, cell_max_y + 1):
+                keys.update(self.cells.get((cell_x, cell_y), ()))
+        return keys
+
+    def __len__(self) -> int:
+        return len(self.cells)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Geodesy
+WGS-84 conversions between geodetic coordinates (latitude, longitude, height),
+Earth-centred Earth-fixed (ECEF) and local East-North-Up (ENU) tangent planes.
+
+All functions accept scalars or numpy arrays and return the same shape.
+
+Radar stages work in the tangent plane of their site: a 2D plot at ground
+range r and azimuth a is the plane point (r sin a, r cos a), and its
+latitude/longitude are those of the ellipsoid normal through that point.
+plane_to_geodetic and geodetic_to_plane are exact inverses of each other, so
+positions do not drift when they pass between the decoder, the integrator
+and the tracker.
+"""
+
+import math
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+# WGS-84 ellipsoid
+WGS84_A = 6378137.0                      # semi-major axis (m)
+WGS84_F = 1.0 / 298.257223563            # flattening
+WGS84_B = WGS84_A * (1.0 - WGS84_F)      # semi-minor axis (m)
+WGS84_E2 = WGS84_F * (2.0 - WGS84_F)     # first eccentricity squared
+WGS84_EP2 = WGS84_E2 / (1.0 - WGS84_E2)  # second eccentricity squared
+
+NM_TO_M = 1852.0
+
+
+def geodetic_to_ecef(lat_deg, lon_deg, height_m=0.0):
+    """
+    Convert geodetic coordinates to ECEF
+
+    Args:
+        lat_deg, lon_deg: Latitude and longitude in degrees
+        height_m: Height above the ellipsoid in meters
+
+    Returns:
+        (x, y, z) ECEF coordinates in meters
+    """
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    sin_lat = np.sin(lat)
+    cos_lat = np.cos(lat)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+
+    x = (n + height_m) * cos_lat * np.cos(lon)
+    y = (n + height_m) * cos_lat * np.sin(lon)
+    z = (n * (1.0 - WGS84_E2) + height_m) * sin_lat
+    return x, y, z
+
+
+def ecef_to_geodetic(x, y, z):
+    """
+    Convert ECEF to geodetic coordinates (Bowring's method, sub-millimetre near the surface)
+
+    Args:
+        x, y, z: ECEF coordinates in meters
+
+    Returns:
+        (lat_deg, lon_deg, height_m)
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    z = np.asarray(z, dtype=float)
+
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    sin_theta = np.sin(theta)
+    cos_theta = np.cos(theta)
+
+    lat = np.arctan2(z + WGS84_EP2 * WGS84_B * sin_theta ** 3,
+                     p - WGS84_E2 * WGS84_A * cos_theta ** 3)
+    lon = np.arctan2(y, x)
+
+    sin_lat = np.sin(lat)
+    n = WGS84_A / np.sqrt(1.0 - WGS84_E2 * sin_lat * sin_lat)
+    cos_lat = np.cos(lat)
+    # Height from p near the equator, from z near the poles
+    height = np.where(np.abs(cos_lat) > 1e-9,
+                      p / np.where(np.abs(cos_lat) > 1e-9, cos_lat, 1.0) - n,
+                      np.abs(z) - WGS84_B)
+
+    return _unwrap(np.degrees(lat)), _unwrap(np.degrees(lon)), _unwrap(height)
+
+
+def _unwrap(value):
+    """Return Python floats for 0-d results so scalar callers get scalars back"""
+    if np.ndim(value) == 0:
+        return float(value)
+    return value
+
+
+class LocalTangentPlane:
+    """
+    East-North-Up frame anchored at a site (e.g. a radar)
+
+    The ECEF origin and rotation matrix are computed once per site.
+    """
+
+    def __init__(self, lat_deg: float, lon_deg: float, height_m: float = 0.0):
+        """
+        Initialize tangent plane
+
+        Args:
+            lat_deg, lon_deg: Site latitude and longitude in degrees
+            height_m: Site height above the ellipsoid in meters
+        """
+        self.lat_deg = lat_deg
+        self.lon_deg = lon_deg
+        self.height_m = height_m
+        self.origin = np.array(geodetic_to_ecef(lat_deg, lon_deg, height_m))
+
+        lat = math.radians(lat_deg)
+        lon = math.radians(lon_deg)
+        sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+        sin_lon, cos_lon = math.sin(lon), math.cos(lon)
+
+        # Rows are the East, North and Up unit vectors in ECEF
+        self.rotation = np.array([
+            [-sin_lon, cos_lon, 0.0],
+            [-sin_lat * cos_lon, -sin_lat * sin_lon, cos_lat],
+            [cos_lat * cos_lon, cos_lat * sin_lon, sin_lat]
+        ])
+
+    def ecef_to_enu(self, x, y, z):
+        """ECEF -> (east, north, up) relative to the site"""
+        delta = np.stack([np.asarray(x, dtype=float) - self.origin[0],
+                          np.asarray(y, dtype=float) - self.origin[1],
+                          np.asarray(z, dtype=float) - self.origin[2]])
+        east, north, up = np.tensordot(self.rotation, delta, axes=1)
+        return _unwrap(east), _unwrap(north), _unwrap(up)
+
+    def enu_to_ecef(self, east, north, up=0.0):
+        """(east, north, up) relative to the site -> ECEF"""
+        east = np.asarray(east, dtype=float)
+        enu = np.stack([east, np.broadcast_to(np.asarray(north, dtype=float), east.shape),
+                        np.broadcast_to(np.asarray(up, dtype=float), east.shape)])
+        x, y, z = np.tensordot(self.rotation.T, enu, axes=1)
+        return (_unwrap(x + self.origin[0]), _unwrap(y + self.origin[1]),
+                _unwrap(z + self.origin[2]))
+
+    def geodetic_to_enu(self, lat_deg, lon_deg, height_m=0.0):
+        """Geodetic -> (east, north, up) relative to the site"""
+        return self.ecef_to_enu(*geodetic_to_ecef(lat_deg, lon_deg, height_m))
+
+    def enu_to_geodetic(self, east, north, up=0.0):
+        """(east, north, up) relative to the site -> (lat_deg, lon_deg, height_m)"""
+        return ecef_to_geodetic(*self.enu_to_ecef(east, north, up))
+
+    def enu_to_frame(self, other: "LocalTangentPlane", east, north, up=0.0):
+        """Re-express ENU coordinates of this site in another site's ENU frame"""
+        return other.ecef_to_enu(*self.enu_to_ecef(east, north, up))
+
+    def plane_to_geodetic(self, east, north):
+        """Tangent-plane point (up = 0) -> (lat_deg, lon_deg) of the ellipsoid normal through it"""
+        lat, lon, _ = self.enu_to_geodetic(east, north, 0.0)
+        return lat, lon
+
+    def geodetic_to_plane(self, lat_deg, lon_deg):
+        """
+        (lat_deg, lon_deg) -> (east, north) where the ellipsoid normal through
+        that position meets the tangent plane (inverse of plane_to_geodetic)
+        """
+        lat = np.radians(lat_deg)
+        lon = np.radians(lon_deg)
+        normal = np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon),
+                           np.broadcast_to(np.sin(lat), np.shape(lat))])
+        east, north, up = self.ecef_to_enu(*geodetic_to_ecef(lat_deg, lon_deg, 0.0))
+
+        # Move along the normal by the height that brings 'up' to zero
+        d_east, d_north, d_up = np.tensordot(self.rotation, normal, axes=1)
+        height = -np.asarray(up) / d_up
+        return _unwrap(east + height * d_east), _unwrap(north + height * d_north)
+
+    def polar_to_geodetic(self, range_m, azimuth_deg):
+        """Ground range / azimuth from the site -> (lat_deg, lon_deg)"""
+        east, north, _ = polar_to_enu(range_m, azimuth_deg)
+        return self.plane_to_geodetic(east, north)
+
+    def geodetic_to_polar(self, lat_deg, lon_deg):
+        """(lat_deg, lon_deg) -> (ground range m, azimuth deg) from the site"""
+        east, north = self.geodetic_to_plane(lat_deg, lon_deg)
+        range_m, azimuth_deg, _ = enu_to_polar(east, north)
+        return range_m, azimuth_deg
+
+
+@lru_cache(maxsize=64)
+def site_frame(lat_deg: float, lon_deg: float, height_m: float = 0.0) -> LocalTangentPlane:
+    """Shared tangent plane for a site (origin and rotation computed once per site)"""
+    return LocalTangentPlane(lat_deg, lon_deg, height_m)
+
+
+def polar_to_enu(range_m, azimuth_deg, elevation_deg=0.0) -> Tuple:
+    """
+    Slant range / azimuth (clockwise from north) / elevation -> local ENU
+
+    Args:
+        range_m: Slant range in meters
+        azimuth_deg: Azimuth in degrees
+        elevation_deg: Elevation angle in degrees
+
+    Returns:
+        (east, north, up) in meters
+    """
+    azimuth = np.radians(azimuth_deg)
+    elevation = np.radians(elevation_deg)
+    ground = range_m * np.cos(elevation)
+    return (_unwrap(ground * np.sin(azimuth)), _unwrap(ground * np.cos(azimuth)),
+            _unwrap(range_m * np.sin(elevation)))
+
+
+def enu_to_polar(east, north, up=0.0) -> Tuple:
+    """
+    Local ENU -> (slant range m, azimuth deg clockwise from north, elevation deg)
+    """
+    east = np.asarray(east, dtype=float)
+    north = np.asarray(north, dtype=float)
+    up = np.asarray(up, dtype=float)
+    ground = np.hypot(east, north)
+    azimuth = np.degrees(np.arctan2(east, north)) % 360.0
+    azimuth = np.where(azimuth >= 360.0, 0.0, azimuth)  # -0.0 rounds up to 360 under %
+    return (_unwrap(np.sqrt(ground * ground + up * up)),
+            _unwrap(azimuth),
+            _unwrap(np.degrees(np.arctan2(up, ground))))
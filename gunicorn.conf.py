@@ -0,0 +1,40 @@
+"""
+Gunicorn configuration for Surveillance Sentry
+
+    gunicorn -c gunicorn.conf.py
+    SURVEILLANCE_ASYNC_MODE=gevent gunicorn -c gunicorn.conf.py
+
+One worker only: Socket.IO sessions, the live picture and the event bus live
+in the worker process. Concurrency comes from the eventlet/gevent worker class
+(worker_connections), not from more workers. The master starts the ingest
+process (UDP receiver and tracker, see serve.py), which relays to the worker.
+"""
+
+import os
+import subprocess
+import sys
+
+async_mode = os.environ.get("SURVEILLANCE_ASYNC_MODE", "eventlet")
+relay = os.environ.setdefault("SURVEILLANCE_RELAY", "127.0.0.1:5055")
+
+bind = os.environ.get("SURVEILLANCE_BIND", "0.0.0.0:5000")
+workers = 1
+worker_class = {'eventlet': 'eventlet', 'gevent': 'gevent', 'threading': 'gthread'}[async_mode]
+threads = 100  # gthread only
+worker_connections = int(os.environ.get("SURVEILLANCE_WORKER_CONNECTIONS", "2000"))
+timeout = 120
+wsgi_app = "serve:gunicorn_app()"
+
+
+def on_starting(server):
+    if os.environ.get("SURVEILLANCE_SEPARATE_INGEST", "1") != "0":
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'serve.py'),
+                   'ingest', '--relay', relay]
+        server.ingest_process = subprocess.Popen(command)
+        server.log.info(f"Started ingest process {server.ingest_process.pid}")
+
+
+def on_exit(server):
+    process = getattr(server, 'ingest_process', None)
+    if process is not None:
+        process.terminate()
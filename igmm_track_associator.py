@@ -7,23 +7,39 @@ for Target Tracking With Compact HFSWR" approach
 
 import numpy as np
 import math
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, TYPE_CHECKING
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from sklearn.mixture import BayesianGaussianMixture
 import logging
 
+from imm_filter import IMMFilter, create_motion_filter
+from track_history import PositionHistory
+from tracking_clock import SimulationClock
+from track_deadlines import DeadlineScheduler
+from track_initiator import TrackInitiator
+from gate_index import GateIndex
+
+if TYPE_CHECKING:
+    from sklearn.mixture import BayesianGaussianMixture
+
 logger = logging.getLogger(__name__)
 
+POSITION_HISTORY_LENGTH = 20  # positions kept per track (ring buffer)
+
+ASSOCIATION_ENGINES = ('nn', 'jpda')
+INITIATION_MODES = ('immediate', 'm_of_n')
+SCAN_PERIOD_TOLERANCE = 0.05  # relative change of the reported scan period that rebuilds M-of-N
 
-@dataclass
+
+@dataclass(slots=True)
 class CourseModel:
     """Course model for a track using IGMM"""
     # Gaussian mixture model for course prediction
-    gmm: Optional[BayesianGaussianMixture] = None
+    gmm: Optional['BayesianGaussianMixture'] = None
     
     # Course history (heading, speed, time_delta)
-    course_history: List[Tuple[float, float, float]] = field(default_factory=list)
+    course_history: deque = field(default_factory=deque)
     
     # Model parameters
     max_components: int = 5
@@ -37,7 +53,7 @@ class CourseModel:
         
         # Limit history length
         if len(self.course_history) > self.history_length:
-            self.course_history.pop(0)
+            self.course_history.popleft()
         
         # Retrain GMM if we have enough data
         if len(self.course_history) >= 3:
@@ -65,7 +81,9 @@ class CourseModel:
         if len(features) >= 2:
             X = np.array(features)
             
-            # Use Bayesian GMM (approximates IGMM)
+            # Use Bayesian GMM (approximates IGMM); sklearn is imported on first
+            # use since it dominates the tracker's import time
+            from sklearn.mixture import BayesianGaussianMixture
             self.gmm = BayesianGaussianMixture(
                 n_components=min(self.max_components, len(features)),
                 covariance_type='full',
@@ -159,7 +177,7 @@ class CourseModel:
         return heading_diff
 
 
-@dataclass
+@dataclass(slots=True)
 class IGMMTrackData:
     """Enhanced track data with IGMM course modeling"""
     track_id: str
@@ -181,15 +199,55 @@ class IGMMTrackData:
     state: str = "Tentative"  # Tentative, Confirmed, Coasting
     
     # Position history for course calculation
-    position_history: List[Tuple[float, float, datetime]] = field(default_factory=list)
+    position_history: PositionHistory = field(default_factory=lambda: PositionHistory(POSITION_HISTORY_LENGTH))
+    
+    # Optional Kalman/IMM filter (None for the pure IGMM course engine)
+    motion_filter: Optional[IMMFilter] = None
     
     # Prediction cache (private attributes for internal use)
     _predicted_x: float = field(default=0.0, init=False)
     _predicted_y: float = field(default=0.0, init=False)
     _prediction_confidence: float = field(default=0.0, init=False)
+    _gate_radius: float = field(default=0.0, init=False)
+    _innovation_cov: Optional[np.ndarray] = field(default=None, init=False)
+    _innovation_inv: Optional[np.ndarray] = field(default=None, init=False)
+    _innovation_log_det: float = field(default=0.0, init=False)
     
     def update_with_plot(self, x: float, y: float, timestamp: datetime):
         """Update track with new plot measurement"""
+        self._update_course(x, y, timestamp)
+        
+        # Filtered estimate replaces the raw plot when a motion filter is used
+        if self.motion_filter is not None:
+            dt = (timestamp - self.timestamp).total_seconds() if self.position_history else 0.0
+            self.motion_filter.step(x, y, dt)
+        
+        self._record_update(x, y, timestamp)
+    
+    def update_with_weighted_plots(self, measurements: List[Tuple[float, float]],
+                                   weights: List[float], timestamp: datetime):
+        """
+        Update track with several candidate plots weighted by association probability (JPDA)
+        
+        Args:
+            measurements: Gated plot positions
+            weights: Association probability of each plot
+            timestamp: Update time
+        """
+        total = sum(weights)
+        x = sum(w * m[0] for w, m in zip(weights, measurements)) / total
+        y = sum(w * m[1] for w, m in zip(weights, measurements)) / total
+        
+        self._update_course(x, y, timestamp)
+        
+        if self.motion_filter is not None:
+            dt = (timestamp - self.timestamp).total_seconds() if self.position_history else 0.0
+            self.motion_filter.step_pda(measurements, weights, dt)
+        
+        self._record_update(x, y, timestamp)
+    
+    def _update_course(self, x: float, y: float, timestamp: datetime):
+        """Feed the movement since the last position into the course model"""
         # Calculate course if we have previous position
         if self.position_history:
             prev_x, prev_y, prev_time = self.position_history[-1]
@@ -210,6 +268,15 @@ class IGMMTrackData:
                 # Update track state
                 self.heading = heading
                 self.speed = speed
+    
+    def _record_update(self, x: float, y: float, timestamp: datetime):
+        """Store the new position (filtered when a motion filter is used) and update track statistics"""
+        if self.motion_filter is not None:
+            x, y = self.motion_filter.position
+            if self.position_history:
+                vx, vy = self.motion_filter.velocity
+                self.speed = math.sqrt(vx*vx + vy*vy)
+                self.heading = math.degrees(math.atan2(vy, vx))
         
         # Update position
         self.x = x
@@ -218,8 +285,6 @@ class IGMMTrackData:
         
         # Update history
         self.position_history.append((x, y, timestamp))
-        if len(self.position_history) > 20:  # Keep last 20 positions
-            self.position_history.pop(0)
         
         # Update statistics
         self.plot_count += 1
@@ -232,6 +297,14 @@ class IGMMTrackData:
     
     def get_association_gate(self, base_distance: float) -> float:
         """Get dynamic association gate based on course model confidence"""
+        if self.motion_filter is not None and self._gate_radius > 0:
+            # Extent of the ellipsoidal gate from the filter's innovation covariance
+            return self._gate_radius
+        
+        return self.get_legacy_gate(base_distance)
+    
+    def get_legacy_gate(self, base_distance: float) -> float:
+        """Course-model/quality scaled Euclidean gate used without a motion filter"""
         if self.course_model.gmm is not None:
             # Smaller gate for more confident course models
             confidence = self.course_model.confidence_threshold
@@ -262,9 +335,64 @@ class IGMMPlotTrackAssociator:
         self.confirmation_threshold = self.config.get('confirmation_threshold', 3)
         self.termination_threshold = self.config.get('termination_threshold', 5)
         
+        # Track ageing: first miss after coast_after_s without an update, then
+        # one miss per miss_interval_s until the termination threshold
+        self.coast_after_s = self.config.get('coast_after_s', 10.0)
+        self.miss_interval_s = self.config.get('miss_interval_s', 1.0)
+        self.deadlines = DeadlineScheduler()
+        
+        # Motion filter engine: 'igmm' (course model only), 'cv' or 'imm'
+        self.filter_engine = self.config.get('filter_engine', 'igmm')
+        self.gate_sigma = self.config.get('gate_sigma', 3.0)
+        create_motion_filter(self.filter_engine, self.config)  # Validate engine name early
+        
+        # Filter tracks gate on the squared Mahalanobis distance of the innovation
+        # (chi-square with 2 degrees of freedom: 9.21 keeps 99% of target plots)
+        self.gate_chi2 = self.config.get('gate_chi2', 9.21)
+        
+        # Grid of gates so each plot is only tested against tracks that can reach it.
+        # Course-model costs weight distance by at least position_weight, so their
+        # gates reach gate / position_weight from the prediction.
+        self.gate_index = GateIndex(self.config.get('gate_cell_size_m', 2 * self.base_association_distance))
+        self.course_gate_reach = 1.0 / min(1.0, self.position_weight) if self.position_weight > 0 else None
+        self.gating_stats = {
+            'plots_gated': 0,
+            'candidates_evaluated': 0
+        }
+        
+        # Association engine: 'nn' (nearest neighbour per plot) or 'jpda'
+        # (joint probabilistic data association per gated cluster)
+        self.association_engine = self.config.get('association_engine', 'nn')
+        if self.association_engine not in ASSOCIATION_ENGINES:
+            raise ValueError(f"Unknown association engine '{self.association_engine}', "
+                             f"expected one of {ASSOCIATION_ENGINES}")
+        self.detection_probability = self.config.get('jpda_detection_probability', 0.9)
+        self.clutter_density = self.config.get('jpda_clutter_density', 1e-8)  # false plots per m^2 per scan
+        self.max_hypotheses = self.config.get('jpda_max_hypotheses', 1000)
+        self.jpda_frame_s = self.config.get('jpda_frame_s', 2.0)  # shorter than the antenna revisit time
+        
+        # Track initiation: 'immediate' (every unassociated plot starts a track) or
+        # 'm_of_n' (plots wait in a candidate buffer until M of N scans confirm them).
+        # M-of-N windows are counted in antenna scans, so until the scan period is
+        # known (set_scan_period, from CAT-34 I034/041) plots start tracks immediately.
+        self.track_initiation = self.config.get('track_initiation', 'm_of_n')
+        if self.track_initiation not in INITIATION_MODES:
+            raise ValueError(f"Unknown track initiation '{self.track_initiation}', "
+                             f"expected one of {INITIATION_MODES}")
+        self.scan_period_s = self.config.get('scan_period_s')
+        self.initiator = self._create_initiator()
+        
+        # Tracker time: 'measurement' (plot timestamps) or 'wall' (current UTC time)
+        self.clock = SimulationClock(self.config.get('time_source', 'measurement'))
+        
         # Active tracks
         self.tracks: Dict[str, IGMMTrackData] = {}
-        self.next_track_id = 1
+        self.next_track_id = self.config.get('track_id_start', 1)
+        self.track_id_stride = self.config.get('track_id_stride', 1)  # >1 when IDs are shared between shards
+        
+        # Tracks changed / removed by the last process_plots call
+        self.updated_track_ids: set = set()
+        self.removed_track_ids: set = set()
         
         logger.info("IGMM track associator initialized")
     
@@ -278,14 +406,22 @@ class IGMMPlotTrackAssociator:
         Returns:
             List of updated tracks
         """
-        current_time = datetime.now()
+        self.updated_track_ids = set()
+        self.removed_track_ids = set()
         
-        # Update track predictions
-        self._update_track_predictions(current_time)
+        # Process in measurement-time order so results do not depend on arrival pacing
+        plots = self.clock.order_plots(plots)
+        current_time = self.clock.advance(plots)
         
-        # Associate plots to tracks
-        for plot in plots:
-            self._associate_plot(plot, current_time)
+        if self.association_engine == 'jpda':
+            self._associate_jpda(plots)
+        else:
+            # Update track predictions
+            self._update_track_predictions(current_time)
+            
+            # Associate plots to tracks at their own measurement time
+            for plot in plots:
+                self._associate_plot(plot, self.clock.plot_time(plot))
         
         # Track maintenance
         self._manage_tracks(current_time)
@@ -293,11 +429,26 @@ class IGMMPlotTrackAssociator:
         return list(self.tracks.values())
     
     def _update_track_predictions(self, current_time: datetime):
-        """Update track position predictions using IGMM course models"""
-        for track in self.tracks.values():
+        """Update track position predictions using IGMM course models and rebuild the gate index"""
+        self.gate_index.clear()
+        for track_id, track in self.tracks.items():
             if track.timestamp:
                 dt = (current_time - track.timestamp).total_seconds()
-                if dt > 0:
+                if track.motion_filter is not None and track.motion_filter.initialized:
+                    # Kalman/IMM prediction with ellipsoidal innovation-covariance gate,
+                    # capped by the quality-scaled legacy gate
+                    predicted, S = track.motion_filter.predict_measurement(dt)
+                    track._predicted_x = float(predicted[0])
+                    track._predicted_y = float(predicted[1])
+                    track._prediction_confidence = 1.0
+                    track._innovation_cov = S
+                    track._innovation_inv = np.linalg.inv(S)
+                    track._innovation_log_det = math.log(float(np.linalg.det(S)))
+                    track._gate_radius = min(
+                        math.sqrt(self.gate_chi2 * float(np.max(np.linalg.eigvalsh(S)))),
+                        track.get_legacy_gate(self.base_association_distance)
+                    )
+                elif dt > 0:
                     # Get IGMM prediction
                     pred_x, pred_y, confidence = track.course_model.predict_position(
                         (track.x, track.y), track.heading, track.speed, dt
@@ -307,33 +458,239 @@ class IGMMPlotTrackAssociator:
                     track._predicted_x = pred_x
                     track._predicted_y = pred_y
                     track._prediction_confidence = confidence
+                else:
+                    # Updated at or after the prediction time: gate around the current position
+                    track._predicted_x = track.x
+                    track._predicted_y = track.y
+            
+            if self.course_gate_reach is not None:
+                reach = track.get_association_gate(self.base_association_distance)
+                if track.motion_filter is None:
+                    reach *= self.course_gate_reach
+                self.gate_index.insert(track_id, track._predicted_x, track._predicted_y, reach)
+    
+    def _gate_candidates(self, x: float, y: float) -> List[IGMMTrackData]:
+        """Tracks whose gate may contain a plot at (x, y)"""
+        if self.course_gate_reach is None:
+            candidates = list(self.tracks.values())
+        else:
+            candidates = [self.tracks[track_id] for track_id in self.gate_index.query(x, y)
+                          if track_id in self.tracks]
+        self.gating_stats['plots_gated'] += 1
+        self.gating_stats['candidates_evaluated'] += len(candidates)
+        return candidates
+    
+    def _gate_cost(self, plot: Dict, track: IGMMTrackData) -> Optional[float]:
+        """
+        Association cost of a plot for a track, or None when it is outside the track's gate
+        
+        Filter tracks accept plots whose squared Mahalanobis distance d2 is within
+        gate_chi2 and score them by d2 + ln|S|, so a track with a wide, uncertain
+        prediction does not win plots over a well-established neighbour.
+        """
+        gate = track.get_association_gate(self.base_association_distance)
+        if track.motion_filter is not None and track._innovation_inv is not None:
+            dx = plot['x'] - track._predicted_x
+            dy = plot['y'] - track._predicted_y
+            if dx * dx + dy * dy > gate * gate:
+                return None
+            S_inv = track._innovation_inv
+            mahalanobis = (dx * (S_inv[0, 0] * dx + S_inv[0, 1] * dy)
+                           + dy * (S_inv[1, 0] * dx + S_inv[1, 1] * dy))
+            if mahalanobis > self.gate_chi2:
+                return None
+            return mahalanobis + track._innovation_log_det
+        
+        cost = self._calculate_association_cost(plot, track)
+        return cost if cost < gate else None
     
     def _associate_plot(self, plot: Dict, current_time: datetime):
         """Associate a plot with existing tracks or create new track"""
         x, y = plot['x'], plot['y']
         
-        # Find candidate tracks
+        # Find candidate tracks among those whose gate can reach the plot
         candidates = []
         
-        for track_id, track in self.tracks.items():
-            # Calculate association cost
-            cost = self._calculate_association_cost(plot, track)
-            gate = track.get_association_gate(self.base_association_distance)
-            
-            if cost < gate:
-                candidates.append((track_id, cost))
+        for track in self._gate_candidates(x, y):
+            cost = self._gate_cost(plot, track)
+            if cost is not None:
+                candidates.append((track.track_id, cost))
         
         if candidates:
             # Associate with best candidate
             best_track_id, _ = min(candidates, key=lambda x: x[1])
             best_track = self.tracks[best_track_id]
             best_track.update_with_plot(x, y, current_time)
+            self.updated_track_ids.add(best_track_id)
+            self._schedule_deadline(best_track)
             
             logger.debug(f"Associated plot to track {best_track_id}")
         else:
             # Create new track
             self._create_new_track(plot, current_time)
     
+    def _associate_jpda(self, plots: List[Dict]):
+        """
+        JPDA association over frames shorter than the antenna revisit time
+        
+        Within a frame each target produces at most one plot, so every track is
+        updated at most once per frame with all plots in its gate weighted by
+        their joint association probabilities.
+        """
+        frame = []
+        for plot in plots:
+            if frame and (self.clock.plot_time(plot) - self.clock.plot_time(frame[0])).total_seconds() > self.jpda_frame_s:
+                self._associate_jpda_frame(frame)
+                frame = []
+            frame.append(plot)
+        if frame:
+            self._associate_jpda_frame(frame)
+    
+    def _associate_jpda_frame(self, plots: List[Dict]):
+        """Gate, cluster and update tracks for one frame of plots"""
+        frame_time = self.clock.plot_time(plots[-1])
+        self._update_track_predictions(frame_time)
+        
+        # Gate the frame against the indexed tracks: track_id -> {plot index: likelihood ratio}
+        gated: Dict[str, Dict[int, float]] = {}
+        plot_tracks: List[List[str]] = [[] for _ in plots]
+        innovations: Dict[str, Tuple[np.ndarray, float]] = {}
+        for index, plot in enumerate(plots):
+            for track in self._gate_candidates(plot['x'], plot['y']):
+                track_id = track.track_id
+                gate = track.get_association_gate(self.base_association_distance)
+                dx = plot['x'] - track._predicted_x
+                dy = plot['y'] - track._predicted_y
+                if dx * dx + dy * dy >= gate * gate:
+                    continue
+                if track_id not in innovations:
+                    innovations[track_id] = self._jpda_innovation(track, gate)
+                S_inv, normaliser = innovations[track_id]
+                mahalanobis = (dx * (S_inv[0, 0] * dx + S_inv[0, 1] * dy)
+                               + dy * (S_inv[1, 0] * dx + S_inv[1, 1] * dy))
+                if track.motion_filter is not None and mahalanobis > self.gate_chi2:
+                    continue
+                ratio = self.detection_probability * normaliser * math.exp(-0.5 * mahalanobis) / self.clutter_density
+                gated.setdefault(track_id, {})[index] = ratio
+                plot_tracks[index].append(track_id)
+        
+        # Clusters: tracks connected through shared plots (union-find)
+        parent = {track_id: track_id for track_id in gated}
+        
+        def find(track_id: str) -> str:
+            while parent[track_id] != track_id:
+                parent[track_id] = parent[parent[track_id]]
+                track_id = parent[track_id]
+            return track_id
+        
+        for track_ids in plot_tracks:
+            for other in track_ids[1:]:
+                root_a, root_b = find(track_ids[0]), find(other)
+                if root_a != root_b:
+                    parent[root_b] = root_a
+        
+        clusters: Dict[str, List[str]] = {}
+        for track_id in gated:
+            clusters.setdefault(find(track_id), []).append(track_id)
+        
+        explained = [0.0] * len(plots)
+        for track_ids in clusters.values():
+            betas = self._jpda_marginals(track_ids, gated)
+            for track_id in track_ids:
+                for index, beta in betas[track_id].items():
+                    explained[index] += beta
+                weights = {index: beta for index, beta in betas[track_id].items() if beta > 1e-3}
+                # Update only when the target was more likely detected than missed
+                if sum(weights.values()) < 0.5:
+                    continue
+                track = self.tracks[track_id]
+                best_index = max(weights, key=weights.get)
+                track.update_with_weighted_plots(
+                    [(plots[index]['x'], plots[index]['y']) for index in weights],
+                    list(weights.values()),
+                    self.clock.plot_time(plots[best_index])
+                )
+                self.updated_track_ids.add(track_id)
+                self._schedule_deadline(track)
+        
+        # Plots unlikely to belong to any existing track (outside every gate, or
+        # e.g. a formation wingman close to its leader) may start new tracks
+        for index, plot in enumerate(plots):
+            if explained[index] < 0.5:
+                self._create_new_track(plot, self.clock.plot_time(plot))
+    
+    def _jpda_innovation(self, track: IGMMTrackData, gate: float) -> Tuple[np.ndarray, float]:
+        """Inverse innovation covariance and Gaussian normaliser for a track's gate"""
+        if track.motion_filter is not None and track._innovation_inv is not None:
+            return track._innovation_inv, math.exp(-0.5 * track._innovation_log_det) / (2 * math.pi)
+        
+        # Course-model tracks: treat the gate as gate_sigma standard deviations
+        sigma = gate / self.gate_sigma
+        S = np.eye(2) * sigma * sigma
+        return np.linalg.inv(S), 1.0 / (2 * math.pi * math.sqrt(np.linalg.det(S)))
+    
+    def _jpda_marginals(self, track_ids: List[str], gated: Dict[str, Dict[int, float]]) -> Dict[str, Dict[int, float]]:
+        """
+        Marginal association probabilities for one cluster
+        
+        Feasible joint events (each plot used by at most one track) are
+        enumerated exactly while their number stays within max_hypotheses;
+        larger clusters use the cheap JPDA approximation (Fitzgerald).
+        
+        Returns:
+            track_id -> {plot index: association probability}
+        """
+        miss_weight = 1.0 - self.detection_probability
+        
+        hypothesis_bound = 1
+        for track_id in track_ids:
+            hypothesis_bound *= len(gated[track_id]) + 1
+            if hypothesis_bound > self.max_hypotheses:
+                break
+        
+        if hypothesis_bound > self.max_hypotheses:
+            plot_sums: Dict[int, float] = {}
+            for track_id in track_ids:
+                for index, ratio in gated[track_id].items():
+                    plot_sums[index] = plot_sums.get(index, 0.0) + ratio
+            betas = {}
+            for track_id in track_ids:
+                track_sum = sum(gated[track_id].values())
+                betas[track_id] = {
+                    index: ratio / (track_sum + plot_sums[index] - ratio + miss_weight)
+                    for index, ratio in gated[track_id].items()
+                }
+            return betas
+        
+        numerators = {track_id: dict.fromkeys(gated[track_id], 0.0) for track_id in track_ids}
+        options = [list(gated[track_id].items()) for track_id in track_ids]
+        assignment: List[Optional[int]] = [None] * len(track_ids)
+        used = set()
+        total = 0.0
+        
+        def enumerate_events(position: int, weight: float):
+            nonlocal total
+            if position == len(track_ids):
+                total += weight
+                for track_index, plot_index in enumerate(assignment):
+                    if plot_index is not None:
+                        numerators[track_ids[track_index]][plot_index] += weight
+                return
+            assignment[position] = None
+            enumerate_events(position + 1, weight * miss_weight)
+            for plot_index, ratio in options[position]:
+                if plot_index in used:
+                    continue
+                used.add(plot_index)
+                assignment[position] = plot_index
+                enumerate_events(position + 1, weight * ratio)
+                used.discard(plot_index)
+            assignment[position] = None
+        
+        enumerate_events(0, 1.0)
+        return {track_id: {index: value / total for index, value in numerators[track_id].items()}
+                for track_id in track_ids}
+    
     def _calculate_association_cost(self, plot: Dict, track: IGMMTrackData) -> float:
         """
         Calculate association cost using position and course information
@@ -373,45 +730,131 @@ class IGMMPlotTrackAssociator:
         return total_cost
     
     def _create_new_track(self, plot: Dict, current_time: datetime):
-        """Create new track from plot"""
+        """Create new track from an unassociated plot (once M-of-N confirms it when enabled)"""
+        points = [(plot['x'], plot['y'], current_time)]
+        if self.initiator is not None:
+            points = self.initiator.add_plot(plot['x'], plot['y'], current_time)
+            if points is None:
+                return
+        
         track_id = f"track_{self.next_track_id:06d}"
-        self.next_track_id += 1
+        self.next_track_id += self.track_id_stride
         
+        first_x, first_y, first_time = points[0]
         track = IGMMTrackData(
             track_id=track_id,
-            x=plot['x'],
-            y=plot['y'],
+            x=first_x,
+            y=first_y,
             heading=0.0,  # Will be calculated with next plot
             speed=0.0,
-            timestamp=current_time
+            timestamp=first_time,
+            motion_filter=create_motion_filter(self.filter_engine, self.config)
         )
         
-        track.update_with_plot(plot['x'], plot['y'], current_time)
+        for x, y, timestamp in points:
+            track.update_with_plot(x, y, timestamp)
         self.tracks[track_id] = track
+        self.updated_track_ids.add(track_id)
+        self._schedule_deadline(track)
         
         logger.info(f"Created new track {track_id} at ({plot['x']:.1f}, {plot['y']:.1f})")
     
-    def _manage_tracks(self, current_time: datetime):
-        """Manage track lifecycle"""
-        tracks_to_remove = []
+    def _create_initiator(self) -> Optional[TrackInitiator]:
+        """M-of-N candidate buffer for the current scan period (None for immediate initiation)"""
+        if self.track_initiation != 'm_of_n' or not self.scan_period_s:
+            return None
+        return TrackInitiator({
+            'initiation_m': self.config.get('initiation_m', 3),
+            'initiation_n': self.config.get('initiation_n', 4),
+            'scan_period_s': self.scan_period_s,
+            'initiation_gate_m': self.config.get('initiation_gate_m', self.base_association_distance),
+            'max_speed_threshold': self.config.get('max_speed_threshold', 300.0)
+        })
+    
+    def set_scan_period(self, scan_period_s: float) -> bool:
+        """
+        Use a reported antenna rotation period for M-of-N initiation
         
-        for track_id, track in self.tracks.items():
-            # Update consecutive misses
-            if track.timestamp:
-                time_since_update = (current_time - track.timestamp).total_seconds()
-                if time_since_update > 10:  # 10 seconds without update
-                    track.consecutive_misses += 1
+        Periods within SCAN_PERIOD_TOLERANCE of the current one are ignored, so
+        the revolution-to-revolution jitter of a measured period keeps the
+        candidate buffer; a real change starts a new one.
+        
+        Args:
+            scan_period_s: Antenna rotation period in seconds
+            
+        Returns:
+            True if the scan period changed
+        """
+        if not scan_period_s or scan_period_s <= 0:
+            return False
+        if self.scan_period_s and abs(scan_period_s - self.scan_period_s) <= SCAN_PERIOD_TOLERANCE * self.scan_period_s:
+            return False
+        self.scan_period_s = scan_period_s
+        self.initiator = self._create_initiator()
+        return True
+    
+    def _schedule_deadline(self, track: IGMMTrackData):
+        """Schedule the track's next miss from its last update and current miss count"""
+        deadline = track.timestamp + timedelta(
+            seconds=self.coast_after_s + track.consecutive_misses * self.miss_interval_s
+        )
+        self.deadlines.schedule(track.track_id, deadline)
+    
+    def _manage_tracks(self, current_time: datetime):
+        """Manage track lifecycle (only tracks whose deadline has passed are touched)"""
+        if self.initiator is not None:
+            self.initiator.expire(current_time)
+        
+        for track_id, _ in self.deadlines.pop_expired(current_time):
+            track = self.tracks.get(track_id)
+            if track is None:
+                continue
+            
+            # Deadline passed without an update: count a miss
+            track.consecutive_misses += 1
+            self.updated_track_ids.add(track_id)
             
             # Remove tracks that exceed termination threshold
             if track.consecutive_misses > self.termination_threshold:
-                tracks_to_remove.append(track_id)
+                del self.tracks[track_id]
+                self.updated_track_ids.discard(track_id)
+                self.removed_track_ids.add(track_id)
                 logger.info(f"Terminating track {track_id}")
-            elif track.consecutive_misses > 0:
+            else:
                 track.state = "Coasting"
-        
-        # Remove terminated tracks
-        for track_id in tracks_to_remove:
-            del self.tracks[track_id]
+                self._schedule_deadline(track)
+    
+    def adopt_track(self, track: IGMMTrackData):
+        """Take ownership of a track created elsewhere (e.g. handed off by another shard)"""
+        self.tracks[track.track_id] = track
+        self._schedule_deadline(track)
+    
+    def release_track(self, track_id: str) -> Optional[IGMMTrackData]:
+        """Give up ownership of a track and return it"""
+        self.deadlines.cancel(track_id)
+        return self.tracks.pop(track_id, None)
+    
+    def get_state(self) -> Dict:
+        """Full associator state (tracks with filter and course models, ID counter, deadlines, clock)"""
+        return {
+            'tracks': self.tracks,
+            'next_track_id': self.next_track_id,
+            'deadlines': self.deadlines,
+            'clock': self.clock,
+            'scan_period_s': self.scan_period_s,
+            'initiator': self.initiator
+        }
+    
+    def restore_state(self, state: Dict):
+        """Replace associator state with one produced by get_state"""
+        self.tracks = state['tracks']
+        self.next_track_id = state['next_track_id']
+        self.deadlines = state['deadlines']
+        self.clock = state['clock']
+        self.scan_period_s = state.get('scan_period_s', self.scan_period_s)
+        self.initiator = state.get('initiator', self.initiator)
+        self.updated_track_ids = set()
+        self.removed_track_ids = set()
     
     def get_active_tracks(self) -> List[Dict]:
         """Get active tracks in standard format"""
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""
+Interacting Multiple Model (IMM) Filter
+Constant velocity, coordinated turn and constant acceleration motion models
+mixed through a Markov model-switching matrix. Used as a configurable filter
+engine by the track calculator and the IGMM plot-to-track associator.
+
+All models share the state layout [x, y, vx, vy, ax, ay] (metres, m/s, m/s^2,
+x = East, y = North) so that model-conditioned estimates can be mixed directly.
+"""
+
+import numpy as np
+import math
+from typing import List, Dict, Tuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_DIM = 6
+
+# Measurement matrix: radar plots observe position only
+MEASUREMENT_MATRIX = np.array([
+    [1, 0, 0, 0, 0, 0],
+    [0, 1, 0, 0, 0, 0]
+], dtype=float)
+
+FILTER_ENGINES = ('igmm', 'cv', 'imm')
+
+
+class MotionModel:
+    """Base class for a motion model on the shared IMM state layout"""
+    name = "base"
+
+    def __init__(self, noise_std: float):
+        self.noise_std = noise_std
+
+    def transition(self, state: np.ndarray, dt: float) -> np.ndarray:
+        """Return the state transition matrix for a step of dt seconds"""
+        raise NotImplementedError
+
+    def process_noise(self, dt: float) -> np.ndarray:
+        """Return the process noise covariance for a step of dt seconds"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _white_noise_acceleration(dt: float, std: float) -> np.ndarray:
+        """Discrete white-noise acceleration covariance for position/velocity"""
+        q = std ** 2
+        Q = np.zeros((STATE_DIM, STATE_DIM))
+        for p, v in ((0, 2), (1, 3)):
+            Q[p, p] = dt**4 / 4 * q
+            Q[p, v] = Q[v, p] = dt**3 / 2 * q
+            Q[v, v] = dt**2 * q
+        return Q
+
+
+class ConstantVelocityModel(MotionModel):
+    """Nearly constant velocity model; acceleration states decay to zero"""
+    name = "cv"
+
+    def transition(self, state: np.ndarray, dt: float) -> np.ndarray:
+        F = np.zeros((STATE_DIM, STATE_DIM))
+        F[0, 0] = F[1, 1] = F[2, 2] = F[3, 3] = 1.0
+        F[0, 2] = F[1, 3] = dt
+        return F
+
+    def process_noise(self, dt: float) -> np.ndarray:
+        Q = self._white_noise_acceleration(dt, self.noise_std)
+        Q[4, 4] = Q[5, 5] = self.noise_std ** 2
+        return Q
+
+
+class CoordinatedTurnModel(MotionModel):
+    """
+    Coordinated turn model with the turn rate taken from the current estimate
+
+    The turn rate is derived from the velocity/acceleration cross product of
+    the mixed state, which keeps the model linear for one prediction step.
+    """
+    name = "ct"
+
+    def __init__(self, noise_std: float, max_turn_rate_deg: float = 6.0):
+        super().__init__(noise_std)
+        self.max_turn_rate = math.radians(max_turn_rate_deg)
+
+    def turn_rate(self, state: np.ndarray) -> float:
+        """Estimate turn rate (rad/s, counter-clockwise positive) from state"""
+        vx, vy, ax, ay = state[2], state[3], state[4], state[5]
+        speed_sq = vx * vx + vy * vy
+        if speed_sq < 1.0:
+            return 0.0
+        omega = (vx * ay - vy * ax) / speed_sq
+        return max(-self.max_turn_rate, min(self.max_turn_rate, omega))
+
+    def transition(self, state: np.ndarray, dt: float) -> np.ndarray:
+        omega = self.turn_rate(state)
+        F = np.zeros((STATE_DIM, STATE_DIM))
+        F[0, 0] = F[1, 1] = 1.0
+
+        if abs(omega) < 1e-6:
+            # Degenerates to constant velocity
+            F[0, 2] = F[1, 3] = dt
+            F[2, 2] = F[3, 3] = 1.0
+            return F
+
+        s, c = math.sin(omega * dt), math.cos(omega * dt)
+        F[0, 2] = s / omega
+        F[0, 3] = -(1 - c) / omega
+        F[1, 2] = (1 - c) / omega
+        F[1, 3] = s / omega
+        F[2, 2], F[2, 3] = c, -s
+        F[3, 2], F[3, 3] = s, c
+        # Centripetal acceleration a = omega x v, expressed on the previous velocity
+        F[4, 2], F[4, 3] = -omega * s, -omega * c
+        F[5, 2], F[5, 3] = omega * c, -omega * s
+        return F
+
+    def process_noise(self, dt: float) -> np.ndarray:
+        Q = self._white_noise_acceleration(dt, self.noise_std)
+        Q[4, 4] = Q[5, 5] = self.noise_std ** 2
+        return Q
+
+
+class ConstantAccelerationModel(MotionModel):
+    """Nearly constant acceleration (white-noise jerk) model"""
+    name = "ca"
+
+    def transition(self, state: np.ndarray, dt: float) -> np.ndarray:
+        F = np.eye(STATE_DIM)
+        F[0, 2] = F[1, 3] = dt
+        F[0, 4] = F[1, 5] = dt**2 / 2
+        F[2, 4] = F[3, 5] = dt
+        return F
+
+    def process_noise(self, dt: float) -> np.ndarray:
+        q = self.noise_std ** 2
+        Q = np.zeros((STATE_DIM, STATE_DIM))
+        for p, v, a in ((0, 2, 4), (1, 3, 5)):
+            Q[p, p] = dt**5 / 20 * q
+            Q[p, v] = Q[v, p] = dt**4 / 8 * q
+            Q[p, a] = Q[a, p] = dt**3 / 6 * q
+            Q[v, v] = dt**3 / 3 * q
+            Q[v, a] = Q[a, v] = dt**2 / 2 * q
+            Q[a, a] = dt * q
+        return Q
+
+
+class IMMFilter:
+    """
+    Interacting Multiple Model filter over a set of motion models
+
+    A single-model IMMFilter reduces to a standard Kalman filter, which is how
+    the 'cv' filter engine is provided.
+    """
+
+    def __init__(self, models: List[MotionModel], transition_matrix: np.ndarray,
+                 measurement_noise_std: float = 10.0,
+                 initial_velocity_std: float = 100.0,
+                 initial_acceleration_std: float = 10.0):
+        """
+        Initialize IMM filter
+
+        Args:
+            models: Motion models mixed by the filter
+            transition_matrix: Markov model-switching probabilities (rows sum to 1)
+            measurement_noise_std: Plot position noise in meters
+            initial_velocity_std: Velocity uncertainty of a new track in m/s
+            initial_acceleration_std: Acceleration uncertainty of a new track in m/s^2
+        """
+        self.models = models
+        self.transition_matrix = np.asarray(transition_matrix, dtype=float)
+        self.R = np.eye(2) * measurement_noise_std ** 2
+        self.initial_velocity_std = initial_velocity_std
+        self.initial_acceleration_std = initial_acceleration_std
+
+        n = len(models)
+        self.model_probabilities = np.full(n, 1.0 / n)
+        self.states = [np.zeros(STATE_DIM) for _ in models]
+        self.covariances = [np.eye(STATE_DIM) for _ in models]
+        self.state = np.zeros(STATE_DIM)
+        self.covariance = np.eye(STATE_DIM)
+        self.initialized = False
+
+    def initialize(self, x: float, y: float):
+        """Start the filter from a single position measurement"""
+        state = np.array([x, y, 0.0, 0.0, 0.0, 0.0])
+        P = np.diag([
+            self.R[0, 0], self.R[1, 1],
+            self.initial_velocity_std ** 2, self.initial_velocity_std ** 2,
+            self.initial_acceleration_std ** 2, self.initial_acceleration_std ** 2
+        ])
+        self.states = [state.copy() for _ in self.models]
+        self.covariances = [P.copy() for _ in self.models]
+        self.model_probabilities = np.full(len(self.models), 1.0 / len(self.models))
+        self.state = state
+        self.covariance = P
+        self.initialized = True
+
+    def _mix_and_predict(self, dt: float) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]:
+        """IMM interaction step followed by model-conditioned prediction"""
+        mu = self.model_probabilities
+        predicted_probs = self.transition_matrix.T @ mu
+        predicted_probs = np.maximum(predicted_probs, 1e-12)
+
+        # Mixing probabilities mu[i|j]
+        mixing = (self.transition_matrix * mu[:, None]) / predicted_probs[None, :]
+
+        predicted_states = []
+        predicted_covariances = []
+        for j, model in enumerate(self.models):
+            x0 = sum(mixing[i, j] * self.states[i] for i in range(len(self.models)))
+            P0 = np.zeros((STATE_DIM, STATE_DIM))
+            for i in range(len(self.models)):
+                d = self.states[i] - x0
+                P0 += mixing[i, j] * (self.covariances[i] + np.outer(d, d))
+
+            F = model.transition(x0, dt)
+            predicted_states.append(F @ x0)
+            predicted_covariances.append(F @ P0 @ F.T + model.process_noise(dt))
+
+        return predicted_states, predicted_covariances, predicted_probs
+
+    @staticmethod
+    def _combine(states: List[np.ndarray], covariances: List[np.ndarray],
+                 weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Moment-matched combination of model-conditioned estimates"""
+        x = sum(w * s for w, s in zip(weights, states))
+        P = np.zeros((STATE_DIM, STATE_DIM))
+        for w, s, c in zip(weights, states, covariances):
+            d = s - x
+            P += w * (c + np.outer(d, d))
+        return x, P
+
+    def predict_measurement(self, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict the next measurement without changing filter state
+
+        Returns:
+            (predicted position [x, y], innovation covariance S)
+        """
+        states, covariances, probs = self._mix_and_predict(max(dt, 0.0))
+        x, P = self._combine(states, covariances, probs)
+        H = MEASUREMENT_MATRIX
+        return H @ x, H @ P @ H.T + self.R
+
+    def step(self, x: float, y: float, dt: float):
+        """Run one predict/update cycle with a position measurement"""
+        if not self.initialized:
+            self.initialize(x, y)
+            return
+
+        states, covariances, probs = self._mix_and_predict(max(dt, 0.0))
+        H = MEASUREMENT_MATRIX
+        z = np.array([x, y])
+
+        log_likelihoods = np.zeros(len(self.models))
+        for j in range(len(self.models)):
+            innovation = z - H @ states[j]
+            S = H @ covariances[j] @ H.T + self.R
+            S_inv = np.linalg.inv(S)
+            K = covariances[j] @ H.T @ S_inv
+            states[j] = states[j] + K @ innovation
+            covariances[j] = (np.eye(STATE_DIM) - K @ H) @ covariances[j]
+            log_likelihoods[j] = -0.5 * (innovation @ S_inv @ innovation
+                                         + math.log(np.linalg.det(S))
+                                         + 2 * math.log(2 * math.pi))
+
+        # Model probability update in log space to avoid underflow
+        log_weights = log_likelihoods + np.log(probs)
+        log_weights -= log_weights.max()
+        weights = np.exp(log_weights)
+        self.model_probabilities = weights / weights.sum()
+
+        self.states = states
+        self.covariances = covariances
+        self.state, self.covariance = self._combine(states, covariances, self.model_probabilities)
+
+    def step_pda(self, measurements: List[Tuple[float, float]], weights: List[float], dt: float):
+        """
+        Probabilistic data association update with several candidate measurements
+
+        Args:
+            measurements: Gated plot positions
+            weights: Association probability of each measurement; the
+                remainder (1 - sum) is the probability that none is the target
+            dt: Time since the last update
+        """
+        if not self.initialized:
+            total = sum(weights)
+            self.initialize(sum(w * m[0] for w, m in zip(weights, measurements)) / total,
+                            sum(w * m[1] for w, m in zip(weights, measurements)) / total)
+            return
+
+        states, covariances, probs = self._mix_and_predict(max(dt, 0.0))
+        H = MEASUREMENT_MATRIX
+        z = np.asarray(measurements, dtype=float)
+        beta = np.asarray(weights, dtype=float)
+        beta_none = max(0.0, 1.0 - float(beta.sum()))
+
+        likelihoods = np.zeros(len(self.models))
+        for j in range(len(self.models)):
+            innovations = z - H @ states[j]
+            S = H @ covariances[j] @ H.T + self.R
+            S_inv = np.linalg.inv(S)
+            K = covariances[j] @ H.T @ S_inv
+
+            # Combined innovation and spread-of-innovations term
+            innovation = beta @ innovations
+            spread = (innovations.T * beta) @ innovations - np.outer(innovation, innovation)
+            P_updated = (np.eye(STATE_DIM) - K @ H) @ covariances[j]
+            states[j] = states[j] + K @ innovation
+            covariances[j] = (beta_none * covariances[j] + (1.0 - beta_none) * P_updated
+                              + K @ spread @ K.T)
+
+            mahalanobis = np.einsum('ij,jk,ik->i', innovations, S_inv, innovations)
+            gaussian = np.exp(-0.5 * mahalanobis) / (2 * math.pi * math.sqrt(np.linalg.det(S)))
+            likelihoods[j] = float(beta @ gaussian) + 1e-300
+
+        weights_out = likelihoods * probs
+        self.model_probabilities = weights_out / weights_out.sum()
+
+        self.states = states
+        self.covariances = covariances
+        self.state, self.covariance = self._combine(states, covariances, self.model_probabilities)
+
+    def gate_radius(self, dt: float, gate_sigma: float = 3.0) -> float:
+        """Circular association gate radius (meters) from innovation covariance"""
+        _, S = self.predict_measurement(dt)
+        return gate_sigma * math.sqrt(float(np.max(np.linalg.eigvalsh(S))))
+
+    @property
+    def position(self) -> Tuple[float, float]:
+        return float(self.state[0]), float(self.state[1])
+
+    @property
+    def velocity(self) -> Tuple[float, float]:
+        return float(self.state[2]), float(self.state[3])
+
+    def get_model_probabilities(self) -> Dict[str, float]:
+        """Current probability of each motion model"""
+        return {model.name: float(p) for model, p in zip(self.models, self.model_probabilities)}
+
+
+def create_motion_filter(engine: str, config: Dict | None = None) -> Optional[IMMFilter]:
+    """
+    Create a motion filter for the given filter engine
+
+    Args:
+        engine: 'igmm' (course model only, no filter), 'cv' or 'imm'
+        config: Tracking configuration dictionary
+
+    Returns:
+        IMMFilter instance, or None for the 'igmm' engine
+    """
+    config = config or {}
+    if engine not in FILTER_ENGINES:
+        raise ValueError(f"Unknown filter engine '{engine}', expected one of {FILTER_ENGINES}")
+    if engine == 'igmm':
+        return None
+
+    process_noise_std = config.get('process_noise_std', 5.0)
+    measurement_noise_std = config.get('measurement_noise_std', 10.0)
+
+    if engine == 'cv':
+        return IMMFilter([ConstantVelocityModel(process_noise_std)], np.eye(1),
+                         measurement_noise_std=measurement_noise_std)
+
+    stay = config.get('imm_model_stay_probability', 0.90)
+    models = [
+        ConstantVelocityModel(process_noise_std),
+        CoordinatedTurnModel(process_noise_std, config.get('imm_max_turn_rate_deg', 6.0)),
+        ConstantAccelerationModel(config.get('imm_ca_jerk_std', 2.0))
+    ]
+    switch = (1.0 - stay) / (len(models) - 1)
+    transition_matrix = np.full((len(models), len(models)), switch)
+    np.fill_diagonal(transition_matrix, stay)
+
+    return IMMFilter(models, transition_matrix, measurement_noise_std=measurement_noise_std)
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Live Track Picture
+Versioned in-memory snapshot of the active tracks, published by the writers
+(tracker, simulator, clear/stop actions) after each batch and read by the
+dashboard endpoints without touching the database.
+
+Each publish builds a new immutable LiveSnapshot and swaps it in with a single
+reference assignment, so readers never lock. Endpoints build a view of a
+snapshot (track list, monitor events, CoT) once per version and key; the view
+and its serialized bytes are cached on the snapshot and shared by every client
+until the next publish, so dashboard read cost does not grow with the number
+of tabs.
+
+Every version also carries the delta from the previous one (added tracks,
+changed fields of updated tracks, removed track IDs) with the version as its
+sequence number. Listeners receive each delta as it is published, and a short
+history lets reconnecting clients catch up; clients that fall further behind
+resync from the full snapshot.
+"""
+
+import json
+import logging
+import threading
+import time
+import zlib
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from gate_index import GateIndex
+
+logger = logging.getLogger(__name__)
+
+
+class LiveSnapshot:
+    """One version of the live picture (never mutated after publish)"""
+
+    def __init__(self, version: int, tracks: Dict[str, Dict], published_at: float, delta: Optional[Dict] = None):
+        self.version = version
+        self.tracks = tracks  # track_id -> Track.to_dict() shaped dict
+        self.published_at = published_at
+        self.delta = delta  # changes from version - 1 (see diff_tracks)
+        self._views: Dict[str, Any] = {}
+        self._rendered: Dict[str, bytes] = {}
+        self._render_lock = threading.RLock()  # render() builds its view under the lock
+        self._position_index: Optional[GateIndex] = None
+
+    def track_list(self) -> List[Dict]:
+        """Active tracks as a list"""
+        return list(self.tracks.values())
+
+    def position_index(self, cell_deg: float = 1.0) -> GateIndex:
+        """Grid of track IDs by (longitude, latitude), built on first use"""
+        index = self._position_index
+        if index is None or index.cell_size != cell_deg:
+            index = GateIndex(cell_deg)
+            for track_id, track in self.tracks.items():
+                if track.get('latitude') is not None and track.get('longitude') is not None:
+                    index.insert(track_id, track['longitude'], track['latitude'], 0.0)
+            self._position_index = index
+        return index
+
+    def etag(self, key: str) -> str:
+        """Strong ETag of a view of this version"""
+        return f'"{self.version}-{zlib.crc32(key.encode()):08x}"'
+
+    def view(self, key: str, build: Callable[["LiveSnapshot"], Any]) -> Any:
+        """
+        JSON-serializable view, built once per snapshot and key
+
+        The view is shared by every caller and must not be modified.
+
+        Args:
+            key: View identifier (e.g. 'tracks', 'tracks:Aircraft')
+            build: Builds the view from this snapshot
+
+        Returns:
+            The view as build returned it
+        """
+        view = self._views.get(key)
+        if view is None:
+            with self._render_lock:
+                view = self._views.get(key)
+                if view is None:
+                    view = build(self)
+                    self._views[key] = view
+        return view
+
+    def render(self, key: str, build: Callable[["LiveSnapshot"], Any]) -> bytes:
+        """
+        Serialized JSON of a view, built once per snapshot and key
+
+        Args:
+            key: View identifier (e.g. 'tracks', 'tracks:Aircraft')
+            build: Builds the JSON-serializable view from this snapshot
+
+        Returns:
+            UTF-8 JSON bytes
+        """
+        return self.render_bytes(key, lambda snapshot: json.dumps(snapshot.view(key, build),
+                                                                  separators=(',', ':')).encode('utf-8'))
+
+    def render_bytes(self, key: str, build: Callable[["LiveSnapshot"], bytes]) -> bytes:
+        """Encoded view (any format), built once per snapshot and key"""
+        body = self._rendered.get(key)
+        if body is None:
+            with self._render_lock:
+                body = self._rendered.get(key)
+                if body is None:
+                    body = build(self)
+                    self._rendered[key] = body
+        return body
+
+
+def diff_tracks(previous: Dict[str, Dict], current: Dict[str, Dict], candidates: Iterable[str]) -> Dict[str, List]:
+    """
+    Changes between two pictures, looking only at the candidate track IDs
+
+    Args:
+        previous: Picture before the change
+        current: Picture after the change
+        candidates: Track IDs that may have been added, updated or removed
+
+    Returns:
+        Dict with 'added' (full track dicts), 'updated' (track_id plus changed
+        fields only) and 'removed' (track IDs)
+    """
+    added, updated, removed = [], [], []
+    for track_id in candidates:
+        old, new = previous.get(track_id), current.get(track_id)
+        if new is None:
+            if old is not None:
+                removed.append(track_id)
+        elif old is None:
+            added.append(new)
+        elif old is not new:
+            changed = {key: value for key, value in new.items() if old.get(key) != value}
+            changed.update((key, None) for key in old.keys() - new.keys())
+            if changed:
+                changed['track_id'] = track_id
+                updated.append(changed)
+    return {'added': added, 'updated': updated, 'removed': removed}
+
+
+class LivePicture:
+    """
+    Holder of the current LiveSnapshot
+    """
+
+    def __init__(self, stale_after_s: float = 10.0, delta_history: int = 64):
+        """
+        Initialize picture
+
+        Args:
+            stale_after_s: Seconds without a publish after which readers reconcile
+                the picture with the database (covers writers in other processes)
+            delta_history: Number of recent deltas kept for catching up
+        """
+        self.stale_after_s = stale_after_s
+        self._snapshot = LiveSnapshot(0, {}, 0.0)
+        self._seeded = False
+        self._checked_at = 0.0  # last publish or reload that found the picture unchanged
+        self._deltas = deque(maxlen=delta_history)
+        self._listeners: List[Callable[[LiveSnapshot], None]] = []
+        self._publish_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[LiveSnapshot], None]):
+        """
+        Call back with every new snapshot (its delta is snapshot.delta)
+
+        Callbacks run in the publishing thread while the publish lock is held,
+        so they see versions in order; they should hand off rather than block.
+        """
+        self._listeners.append(callback)
+
+    def snapshot(self) -> LiveSnapshot:
+        """Current snapshot (lock-free)"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def publish(self, tracks: Iterable[Dict] = (), removed: Iterable[str] = (), replace: bool = False) -> LiveSnapshot:
+        """
+        Apply changed tracks and publish a new version
+
+        A publish that changes nothing keeps the current version.
+
+        Args:
+            tracks: Track dicts (Track.to_dict() shape) to insert or update
+            removed: Track IDs to drop
+            replace: Replace the whole picture with tracks instead of merging
+
+        Returns:
+            The current snapshot
+        """
+        with self._publish_lock:
+            previous = self._snapshot
+            current = {} if replace else dict(previous.tracks)
+            candidates = set(previous.tracks) if replace else set()
+            for track_id in removed:
+                current.pop(track_id, None)
+                candidates.add(track_id)
+            for track in tracks:
+                current[track['track_id']] = track
+                candidates.add(track['track_id'])
+
+            delta = diff_tracks(previous.tracks, current, candidates)
+            self._seeded = True
+            if not (delta['added'] or delta['updated'] or delta['removed']):
+                self._checked_at = time.time()
+                return previous
+
+            delta['seq'] = previous.version + 1
+            delta['base'] = previous.version
+            self._snapshot = LiveSnapshot(previous.version + 1, current, time.time(), delta)
+            self._deltas.append(delta)
+            for callback in self._listeners:
+                try:
+                    callback(self._snapshot)
+                except Exception as e:
+                    logger.error(f"Live picture listener failed: {e}")
+            return self._snapshot
+
+    def clear(self) -> LiveSnapshot:
+        """Publish an empty picture"""
+        return self.publish(replace=True)
+
+    def deltas_since(self, seq: int) -> Optional[List[Dict]]:
+        """
+        Deltas published after sequence number seq
+
+        Returns:
+            Deltas in order (empty if seq is current), or None if seq is unknown
+            or too old and the caller must resync from the snapshot
+        """
+        deltas = list(self._deltas)
+        current = self._snapshot.version
+        if seq == current:
+            return []
+        if seq > current or not deltas or deltas[0]['base'] > seq:
+            return None
+        return [delta for delta in deltas if delta['seq'] > seq]
+
+    def needs_reload(self) -> bool:
+        """Whether the picture was never loaded or has not been published to for stale_after_s"""
+        last_confirmed = max(self._snapshot.published_at, self._checked_at)
+        return not self._seeded or time.time() - last_confirmed > self.stale_after_s
+
+    def reload(self, load: Callable[[], List[Dict]]) -> Optional[LiveSnapshot]:
+        """
+        Replace the picture with tracks loaded from the database
+
+        Only one caller loads at a time. Once the picture has been seeded,
+        concurrent callers return None and keep serving the current snapshot;
+        before that they wait for the first load. A reload that finds the same
+        tracks keeps the current version, so clients' ETags stay valid and no
+        delta is sent.
+
+        Args:
+            load: Returns the active tracks as dicts
+
+        Returns:
+            The current snapshot, or None if another reload was in progress
+        """
+        if not self._reload_lock.acquire(blocking=not self._seeded):
+            return None
+        try:
+            if not self.needs_reload():
+                return self._snapshot  # loaded by the caller we waited for
+            return self.publish(load(), replace=True)
+        finally:
+            self._reload_lock.release()
+
+
+live_picture = LivePicture()
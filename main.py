@@ -1,6 +1,4 @@
-from app import app, socketio
-from models import db, Track, Event
-from udp_receiver import start_udp_receiver
+from app import app, socketio, boot
 import logging
 
 # Configure logging
@@ -8,14 +6,11 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def initialize_services():
-    """Initialize all services including UDP receiver"""
+    """Initialize all services (database, UDP receiver, track calculator, export scheduler)"""
     logger.info("Initializing services...")
     
-    # Start UDP receiver with Flask dependencies
-    if start_udp_receiver(app=app, db=db, socketio=socketio, Track=Track, Event=Event):
-        logger.info("UDP receiver started successfully")
-    else:
-        logger.warning("Failed to start UDP receiver")
+    # Explicit boot phase; steps run in parallel and log their timings
+    boot()
     
     logger.info("Services initialization complete")
 
@@ -1,5 +1,6 @@
+import os
 from datetime import datetime
-from sqlalchemy import func
+from sqlalchemy import func, inspect as sa_inspect, text
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -65,6 +66,12 @@ class Track(db.Model):
         }
 
 class Event(db.Model):
+    # Event log pages are read newest first in (timestamp, id) order, optionally by type
+    __table_args__ = (
+        db.Index('ix_event_timestamp_id', 'timestamp', 'id'),
+        db.Index('ix_event_type_timestamp_id', 'event_type', 'timestamp', 'id'),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     track_id = db.Column(db.String(50), nullable=False)
     event_type = db.Column(db.String(50), nullable=False)
@@ -73,6 +80,7 @@ class Event(db.Model):
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     
     # ASTERIX plot data fields
+    sensor_id = db.Column(db.String(50))  # reporting sensor, radar_{sac}_{sic} / adsb_{sac}_{sic}
     latitude = db.Column(db.Float)
     longitude = db.Column(db.Float)
     altitude = db.Column(db.Float)
@@ -87,6 +95,7 @@ class Event(db.Model):
             'description': self.description,
             'user_notes': self.user_notes,
             'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'sensor_id': self.sensor_id,
             'latitude': self.latitude,
             'longitude': self.longitude,
             'altitude': self.altitude,
@@ -101,3 +110,38 @@ class NetworkConfig(db.Model):
     ip_address = db.Column(db.String(45), default='127.0.0.1')
     is_active = db.Column(db.Boolean, default=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def ensure_columns():
+    """Add nullable columns added to existing tables (db.create_all() only creates new tables)"""
+    inspector = sa_inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing and column.nullable:
+                column_type = column.type.compile(dialect=db.engine.dialect)
+                with db.engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {column_type}'))
+
+def ensure_indexes():
+    """Create indexes added to existing tables (db.create_all() only creates new tables)"""
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+
+def configure_database(app):
+    """Point an app at the surveillance database (DATABASE_URL) and bind db to it"""
+    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///surveillance.db")
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_recycle": 300,
+        "pool_pre_ping": True,
+    }
+    db.init_app(app)
+
+def create_default_user():
+    """Create default user if none exists"""
+    if not User.query.first():
+        default_user = User()
+        default_user.username = 'user'
+        default_user.set_password('pass')
+        db.session.add(default_user)
+        db.session.commit()
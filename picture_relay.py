@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Live Picture Relay
+Carries live picture changes and new Event rows from the ingest process (UDP
+receiver and tracker, plain OS threads) to the web process (Socket.IO under
+eventlet or gevent) over a local TCP connection.
+
+The sender is a live picture listener and event bus reader in the ingest
+process; it only queues, and a sender thread writes newline-delimited JSON.
+On every (re)connection it first sends the whole picture (replace), so the
+web process never depends on messages lost while it was down. The receiver
+runs as a Socket.IO background task in the web process and republishes to
+the local live picture and event bus, which drive the track and event streams
+there as if the tracker ran in-process.
+
+Messages:
+
+    {"type": "picture", "tracks": [...], "removed": [...], "replace": bool}
+    {"type": "event", "data": {...}}    (Event.to_dict())
+"""
+
+import json
+import logging
+import queue
+import socket
+import threading
+import time
+from typing import Optional, Tuple
+
+from event_bus import EventBus, TOPIC_EVENT
+from live_picture import LivePicture, LiveSnapshot
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RELAY_ADDRESS = ('127.0.0.1', 5055)
+
+
+def parse_address(value: Optional[str]) -> Tuple[str, int]:
+    """'host:port' (or just port) -> (host, port)"""
+    if not value:
+        return DEFAULT_RELAY_ADDRESS
+    host, _, port = value.rpartition(':')
+    return host or DEFAULT_RELAY_ADDRESS[0], int(port)
+
+
+class RelaySender:
+    """
+    Forwards the ingest process's picture changes and Event rows to the web process
+    """
+
+    def __init__(self, picture: LivePicture, bus: EventBus, address: Tuple[str, int] = DEFAULT_RELAY_ADDRESS,
+                 max_queued: int = 10000):
+        """
+        Initialize sender
+
+        Args:
+            picture: Live picture of the ingest process
+            bus: Event bus of the ingest process (its Event rows are forwarded)
+            address: Web process relay address
+            max_queued: Messages held while the web process is slow or down;
+                beyond that they are dropped and the next connection resends the picture
+        """
+        self.picture = picture
+        self.bus = bus
+        self.address = address
+        self.queue = queue.Queue(maxsize=max_queued)
+        self.resync = threading.Event()
+        self.stats = {'sent': 0, 'dropped': 0, 'connections': 0}
+
+    def start(self):
+        """Attach to the picture and bus and start the sender threads"""
+        self.picture.add_listener(self._on_publish)
+        threading.Thread(target=self._forward_events, daemon=True).start()
+        threading.Thread(target=self._send_loop, daemon=True).start()
+        logger.info(f"Relaying live picture to {self.address[0]}:{self.address[1]}")
+
+    def _put(self, message: dict):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            self.resync.set()
+
+    def _on_publish(self, snapshot: LiveSnapshot):
+        delta = snapshot.delta
+        tracks = delta['added'] + [snapshot.tracks[changes['track_id']] for changes in delta['updated']]
+        self._put({'type': 'picture', 'tracks': tracks, 'removed': delta['removed'], 'replace': False})
+
+    def _forward_events(self):
+        after = self.bus.last_id
+        while True:
+            result = self.bus.read(after, (TOPIC_EVENT,), timeout=30.0)
+            if result is None:
+                after = self.bus.last_id  # fell behind the bus history
+                continue
+            after, entries = result
+            for entry in entries:
+                self._put({'type': 'event', 'data': entry['data']})
+
+    def _send_loop(self):
+        while True:
+            try:
+                connection = socket.create_connection(self.address, timeout=5.0)
+            except OSError:
+                time.sleep(1.0)
+                continue
+
+            self.stats['connections'] += 1
+            try:
+                connection.settimeout(None)
+                with connection.makefile('w', encoding='utf-8') as stream:
+                    self._send_picture(stream)
+                    while True:
+                        message = self.queue.get()
+                        if self.resync.is_set():
+                            self._send_picture(stream)
+                        stream.write(json.dumps(message, separators=(',', ':')) + '\n')
+                        if self.queue.empty():
+                            stream.flush()
+                        self.stats['sent'] += 1
+            except OSError as e:
+                logger.warning(f"Live picture relay connection lost: {e}")
+            finally:
+                connection.close()
+
+    def _send_picture(self, stream):
+        """Whole picture first, so the receiver starts from the same state"""
+        self.resync.clear()
+        with self.queue.mutex:
+            self.queue.queue.clear()  # covered by the picture sent now
+        snapshot = self.picture.snapshot()
+        stream.write(json.dumps({'type': 'picture', 'tracks': snapshot.track_list(), 'removed': [],
+                                 'replace': True}, separators=(',', ':')) + '\n')
+        stream.flush()
+
+
+def run_relay_receiver(picture: LivePicture, bus: EventBus, address: Tuple[str, int] = DEFAULT_RELAY_ADDRESS):
+    """
+    Accept the ingest process's connection and republish what it sends (runs forever)
+
+    Run it as a Socket.IO background task so it cooperates with the async mode.
+    """
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.bind(address)
+    server.listen(1)
+    logger.info(f"Live picture relay listening on {address[0]}:{address[1]}")
+
+    while True:
+        connection, peer = server.accept()
+        logger.info(f"Ingest process connected from {peer[0]}:{peer[1]}")
+        try:
+            with connection.makefile('r', encoding='utf-8') as stream:
+                for line in stream:
+                    message = json.loads(line)
+                    if message['type'] == 'picture':
+                        picture.publish(message['tracks'], message['removed'], message['replace'])
+                    elif message['type'] == 'event':
+                        bus.publish(TOPIC_EVENT, message['data'])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Live picture relay connection lost: {e}")
+        finally:
+            connection.close()
@@ -1,5 +1,5 @@
-from flask import render_template, request, jsonify, redirect, url_for, flash, session
-from flask_socketio import emit
+from flask import render_template, request, jsonify, redirect, url_for, flash, session, Response
+from flask_socketio import emit, join_room
 from flask_login import login_user, logout_user, login_required, current_user
 from app_init import app, socketio
 from models import Track, Event, NetworkConfig, User, db
@@ -17,6 +17,14 @@ from asterix_converter import AsterixMultiCategoryConverter
 from cot_converter import CoTConverter
 from klv_converter import KLVConverter
 from cot_processor import CoTProcessor
+from live_picture import live_picture
+from track_subscriptions import SubscriptionRegistry, parse_bbox
+from track_clusters import ClusterIndex
+from track_codec import PackedTrackEncoder, PACKED_MIME
+from track_outbox import TrackOutbox
+from event_bus import event_bus, publish_committed_rows, TOPIC_EVENT, TOPIC_MONITOR
+from event_log_query import (parse_event_filters, filtered_events, keyset_page, offset_page,
+                             events_since, decode_cursor, EventCountCache)
 # Add UDP receiver imports
 from udp_receiver import start_udp_receiver, stop_udp_receiver, get_udp_receiver_status
 
@@ -33,10 +41,57 @@ cot_converter = CoTConverter()
 klv_converter = KLVConverter()
 cot_processor = CoTProcessor()
 
+def _load_active_tracks():
+    """Active tracks from the database as dicts (live picture reload)"""
+    return [track.to_dict() for track in Track.query.filter_by(status='Active').all()]
+
+def live_snapshot():
+    """Current live picture, reconciled with the database when it has gone stale"""
+    if live_picture.needs_reload():
+        live_picture.reload(_load_active_tracks)
+    return live_picture.snapshot()
+
+# Packed binary track encoding (track_codec), shared by REST and Socket.IO feeds
+track_encoder = PackedTrackEncoder()
+
+def wants_packed():
+    """Whether the request negotiated the packed track encoding"""
+    return request.args.get('format') == 'packed' or PACKED_MIME in request.headers.get('Accept', '')
+
+def serve_snapshot_view(key, build, packable=False):
+    """
+    Serve a view of the live picture as pre-serialized JSON with an ETag
+    
+    Args:
+        key: View identifier, unique per distinct view content
+        build: Builds the JSON-serializable view from a LiveSnapshot
+        packable: The view is a track list and may be sent packed if the client asks
+        
+    Returns:
+        200 response with the cached body, or 304 if the client's copy is current
+    """
+    snapshot = live_snapshot()
+    packed = packable and wants_packed()
+    if packed:
+        key = f"{key}:packed"
+    etag = snapshot.etag(key)
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if packable:
+        headers['Vary'] = 'Accept'
+    if etag in request.headers.get('If-None-Match', ''):
+        return Response(status=304, headers=headers)
+    if packed:
+        body = snapshot.render_bytes(key, lambda snapshot: track_encoder.encode(build(snapshot), snapshot.version))
+        return Response(body, mimetype=PACKED_MIME, headers=headers)
+    return Response(snapshot.render(key, build), mimetype='application/json', headers=headers)
+
 # Ensure export directory exists
 EXPORT_DIR = os.path.join(os.path.dirname(__file__), 'export_log_hist')
 os.makedirs(EXPORT_DIR, exist_ok=True)
 
+# Event log totals, recounted in the background (see event_log_query)
+event_counts = EventCountCache(app)
+
 def export_event_log_to_csv(clear_after_export=False):
     """Export all events to CSV with optional clearing"""
     try:
@@ -72,6 +127,7 @@ def export_event_log_to_csv(clear_after_export=False):
             if clear_after_export:
                 Event.query.delete()
                 db.session.commit()
+                event_counts.clear()
                 # Events exported and log cleared
                 pass
             else:
@@ -112,8 +168,7 @@ def start_daily_export_scheduler():
     # Daily event log export scheduler started
     pass
 
-# Start the scheduler when the module loads
-start_daily_export_scheduler()
+# The scheduler is started by the boot phase (app.boot), not on import
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -157,21 +212,49 @@ def dashboard():
 
 @app.route('/api/tracks')
 def get_tracks():
-    """Get all active tracks - database only for PCAP replay data"""
+    """Get all active tracks from the live picture"""
     try:
         track_type = request.args.get('type', '')
-        query = Track.query.filter_by(status='Active')
         
-        if track_type:
-            query = query.filter_by(track_type=track_type)
+        def build(snapshot):
+            tracks = snapshot.track_list()
+            if track_type:
+                tracks = [track for track in tracks if track.get('track_type') == track_type]
+            return tracks
         
-        tracks = query.all()
-        return jsonify([track.to_dict() for track in tracks])
+        return serve_snapshot_view(f"tracks:{track_type}", build, packable=True)
         
     except Exception as e:
         logger.error(f"Error getting tracks: {e}")
         return jsonify([])
 
+@app.route('/api/tracks/clusters')
+def get_track_clusters():
+    """
+    Aggregated tracks for zoomed-out map views
+    
+    Query args: zoom (map zoom level), optional bbox=west,south,east,north.
+    Returns per-cell counts, type mix, centroid and representative tracks.
+    """
+    try:
+        zoom = request.args.get('zoom', 0, type=int)
+        bbox_arg = request.args.get('bbox', '')
+        bbox = parse_bbox(bbox_arg.split(',')) if bbox_arg else None
+        
+        def build(snapshot):
+            cells = track_clusters.clusters(zoom, snapshot, bbox)
+            return {
+                'status': 'success',
+                'zoom': max(0, min(zoom, track_clusters.max_zoom)),
+                'track_count': sum(cell['count'] for cell in cells),
+                'cells': cells
+            }
+        
+        return serve_snapshot_view(f"clusters:{zoom}:{bbox}", build)
+    except Exception as e:
+        logger.error(f"Error getting track clusters: {e}")
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+
 @app.route('/api/tracks/<track_id>')
 def get_track(track_id):
     """Get specific track by ID"""
@@ -187,6 +270,7 @@ def clear_tracks():
         # Delete all tracks
         Track.query.delete()
         db.session.commit()
+        live_picture.clear()
         
         return jsonify({
             'status': 'success',
@@ -223,53 +307,60 @@ def generate_tracks():
 
 @app.route('/api/events')
 def get_events():
-    """Get all events for Event Log with optional filtering"""
+    """
+    Get events for Event Log with optional filtering
+    
+    Pages are newest first. 'cursor' (the next_cursor of the previous page)
+    reads the next page through the (timestamp, id) index; 'page' jumps to a
+    page by number. 'since_id' returns only events newer than that ID, for the
+    live log. 'total' and 'pages' come from a cached count ('total_as_of').
+    """
+    per_page = max(1, min(request.args.get('per_page', 50, type=int), 500))
     page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 50, type=int)
+    cursor = request.args.get('cursor')
+    since_id = request.args.get('since_id', type=int)
     
     # Get filter parameters
     start_date = request.args.get('start_date')
     end_date = request.args.get('end_date')
     event_type = request.args.get('event_type')
+    filters = parse_event_filters(start_date, end_date, event_type)
+    query = filtered_events(filters)
     
-    # Build query with filters
-    query = Event.query
-    
-    # Apply date filters
-    if start_date:
-        try:
-            start_datetime = datetime.fromisoformat(start_date.replace('T', ' '))
-            query = query.filter(Event.timestamp >= start_datetime)
-        except ValueError:
-            pass  # Invalid date format, ignore filter
-    
-    if end_date:
-        try:
-            end_datetime = datetime.fromisoformat(end_date.replace('T', ' '))
-            query = query.filter(Event.timestamp <= end_datetime)
-        except ValueError:
-            pass  # Invalid date format, ignore filter
-    
-    # Apply event type filter
-    if event_type:
-        query = query.filter(Event.event_type == event_type)
-    
-    # Execute query with pagination
-    events = query.order_by(Event.timestamp.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
-    
-    return jsonify({
-        'events': [event.to_dict() for event in events.items],
-        'total': events.total,
-        'pages': events.pages,
-        'current_page': page,
+    response = {
         'filters': {
             'start_date': start_date,
             'end_date': end_date,
             'event_type': event_type
         }
+    }
+    
+    if since_id is not None:
+        events, truncated = events_since(query, since_id, per_page)
+        response.update({
+            'events': [event.to_dict() for event in events],
+            'latest_id': events[0].id if events else since_id,
+            'truncated': truncated  # more new events than per_page: reload the page
+        })
+        return jsonify(response)
+    
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded is not None:
+        events, next_cursor = keyset_page(query, decoded, per_page)
+    else:
+        events, next_cursor = offset_page(query, page, per_page)
+    total, counted_at = event_counts.get(filters, lambda: filtered_events(filters).count())
+    
+    response.update({
+        'events': [event.to_dict() for event in events],
+        'total': total,
+        'total_as_of': datetime.utcfromtimestamp(counted_at).isoformat(),
+        'pages': max(1, -(-total // per_page)),
+        'current_page': page,
+        'next_cursor': next_cursor,
+        'latest_id': max((event.id for event in events), default=None)
     })
+    return jsonify(response)
 
 @app.route('/api/events/<int:event_id>/notes', methods=['PUT'])
 def update_event_notes(event_id):
@@ -322,36 +413,36 @@ def get_event_notes(event_id):
             'message': str(e)
         }), 500
 
+def monitor_event(track, current_time):
+    """Event Monitor row for a track"""
+    return {
+        'track_id': track['track_id'],
+        'event_type': 'Track Update',
+        'track_type': track.get('track_type'),
+        'latitude': round(track['latitude'], 4),
+        'longitude': round(track['longitude'], 4),
+        'speed': round(track['speed'], 1) if track.get('speed') else 0,
+        'altitude': round(track['altitude'], 0) if track.get('altitude') else 0,
+        'timestamp': current_time,
+        'is_realtime': True
+    }
+
+def build_monitor_events(snapshot):
+    """Event Monitor view of a live picture snapshot"""
+    current_time = datetime.utcfromtimestamp(snapshot.published_at).isoformat()
+    monitor_events = [monitor_event(track, current_time) for track in snapshot.track_list()]
+    
+    return {
+        'status': 'success',
+        'events': monitor_events,
+        'count': len(monitor_events)
+    }
+
 @app.route('/api/monitor-events')
 def get_monitor_events():
     """Get real-time monitor events for Event Monitor"""
     try:
-        # Get active tracks and generate current monitor events
-        tracks = Track.query.filter_by(status='Active').all()
-        monitor_events = []
-        
-        from datetime import datetime
-        current_time = datetime.utcnow().isoformat()
-        
-        for track in tracks:
-            monitor_event = {
-                'track_id': track.track_id,
-                'event_type': 'Track Update',
-                'track_type': track.track_type,
-                'latitude': round(track.latitude, 4),
-                'longitude': round(track.longitude, 4),
-                'speed': round(track.speed, 1) if track.speed else 0,
-                'altitude': round(track.altitude, 0) if track.altitude else 0,
-                'timestamp': current_time,
-                'is_realtime': True
-            }
-            monitor_events.append(monitor_event)
-        
-        return jsonify({
-            'status': 'success',
-            'events': monitor_events,
-            'count': len(monitor_events)
-        })
+        return serve_snapshot_view('monitor-events', build_monitor_events)
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -360,6 +451,121 @@ def get_monitor_events():
             'count': 0
         }), 500
 
+def publish_monitor_events(snapshot):
+    """Publish the Event Monitor rows of the tracks a live picture version changed"""
+    delta = snapshot.delta
+    current_time = datetime.utcfromtimestamp(snapshot.published_at).isoformat()
+    changed = [track['track_id'] for track in delta['added']] + [changes['track_id'] for changes in delta['updated']]
+    event_bus.publish(TOPIC_MONITOR, {
+        'events': [monitor_event(snapshot.tracks[track_id], current_time) for track_id in changed],
+        'removed': delta['removed']
+    })
+
+live_picture.add_listener(publish_monitor_events)
+publish_committed_rows(event_bus, Event, TOPIC_EVENT)
+
+def parse_stream_topics(value):
+    """Requested event stream topics (comma separated), all if absent"""
+    topics = {topic for topic in (value or '').split(',') if topic in (TOPIC_EVENT, TOPIC_MONITOR)}
+    return topics or {TOPIC_EVENT, TOPIC_MONITOR}
+
+def stream_start(resume_id):
+    """
+    Bus position to stream from for a resume ID
+    
+    Returns:
+        (entry ID to read after, whether the client must reload first)
+    """
+    if not resume_id:
+        return event_bus.last_id, False
+    after = event_bus.parse_cursor(resume_id)
+    if after is None:
+        return event_bus.last_id, True
+    return after, False
+
+@app.route('/api/events/stream')
+def stream_events():
+    """
+    Server-Sent Events stream of new Event rows ('event') and Event Monitor
+    updates ('monitor': changed tracks' rows and removed track IDs)
+    
+    'topics' selects topics (comma separated). Resumes after the Last-Event-ID
+    header or 'since' parameter; a 'reset' event means the resume point is no
+    longer held and the client should reload through the REST endpoints.
+    """
+    topics = parse_stream_topics(request.args.get('topics'))
+    after, reset = stream_start(request.headers.get('Last-Event-ID') or request.args.get('since'))
+    
+    def stream():
+        nonlocal after, reset
+        yield 'retry: 3000\n\n'
+        while True:
+            if reset:
+                yield f'id: {event_bus.cursor(after)}\nevent: reset\ndata: {{}}\n\n'
+                reset = False
+            result = event_bus.read(after, topics, timeout=15.0)
+            if result is None:
+                after, reset = event_bus.last_id, True
+                continue
+            after, entries = result
+            if not entries:
+                yield ': keepalive\n\n'
+                continue
+            for entry in entries:
+                data = json.dumps(entry['data'], separators=(',', ':'))
+                yield f"id: {event_bus.cursor(entry['id'])}\nevent: {entry['topic']}\ndata: {data}\n\n"
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Socket.IO '/events' namespace: the same entries as 'bus_event' messages
+# ({id: resume ID, topic, data}); one pump thread emits each entry once to the room
+EVENTS_NAMESPACE = '/events'
+EVENTS_ROOM = 'events'
+events_pump_lock = threading.Lock()
+events_pump = {'position': None}  # last entry ID emitted to the room
+
+def pump_bus_events():
+    """Emit new bus entries to the '/events' namespace room"""
+    while True:
+        with events_pump_lock:
+            result = event_bus.read(events_pump['position'], timeout=0)
+            if result is None:
+                events_pump['position'] = event_bus.last_id
+                socketio.emit('reset', {}, to=EVENTS_ROOM, namespace=EVENTS_NAMESPACE)
+                continue
+            events_pump['position'], entries = result
+            for entry in entries:
+                socketio.emit('bus_event', {'id': event_bus.cursor(entry['id']), 'topic': entry['topic'],
+                                            'data': entry['data']}, to=EVENTS_ROOM, namespace=EVENTS_NAMESPACE)
+        event_bus.read(events_pump['position'], timeout=15.0)  # wait for the next entry
+
+@socketio.on('connect', namespace=EVENTS_NAMESPACE)
+def handle_events_connect(auth=None):
+    """
+    Join the event stream, first sending what the client missed
+    
+    The client passes the last resume ID it received as 'since' (auth or query).
+    """
+    since = (auth or {}).get('since') or request.args.get('since')
+    with events_pump_lock:
+        if events_pump['position'] is None:
+            events_pump['position'] = event_bus.last_id
+            threading.Thread(target=pump_bus_events, daemon=True).start()
+        after, reset = stream_start(since)
+        if reset:
+            emit('reset', {})
+        elif after < events_pump['position']:
+            result = event_bus.read(after, timeout=0)
+            if result is None:
+                emit('reset', {})
+            else:
+                for entry in result[1]:
+                    if entry['id'] <= events_pump['position']:
+                        emit('bus_event', {'id': event_bus.cursor(entry['id']), 'topic': entry['topic'],
+                                           'data': entry['data']})
+        join_room(EVENTS_ROOM)
+
 @app.route('/api/network-config', methods=['GET', 'POST'])
 def network_config():
     """Get or update network configuration"""
@@ -458,14 +664,123 @@ def handle_connect():
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
-    # Debug print removed
+    track_outbox.close(request.sid)
+    track_subscriptions.unsubscribe(request.sid)
 
 @socketio.on('request_track_update')
 def handle_track_update_request():
     """Handle request for track updates"""
-    tracks = Track.query.filter_by(status='Active').all()
+    live_snapshot()
     # Removed emit for track_update (database-only dataflow)
 
+# Track delta stream: every subscribed client has an outbox in track_outbox that coalesces
+# the deltas it has not been sent yet; unfiltered clients follow the live picture's sequence,
+# clients with a viewport/type filter get their own deltas from track_subscriptions
+track_subscriptions = SubscriptionRegistry(live_picture)
+track_clusters = ClusterIndex()
+
+def pack_track_message(payload, tracks):
+    """
+    Packed form of a track_snapshot or track_delta payload
+    
+    Snapshot tracks, or a delta's added and updated tracks (as full records from
+    tracks, by track ID), are sent as one packed message in 'data'; removed IDs
+    stay a list.
+    """
+    if 'tracks' in payload:
+        return {'seq': payload['seq'], 'encoding': 'packed',
+                'data': track_encoder.encode(payload['tracks'], payload['seq'])}
+    upserts = payload['added'] + [tracks[changes['track_id']] for changes in payload['updated']
+                                  if changes['track_id'] in tracks]
+    return {'seq': payload['seq'], 'base': payload['base'], 'encoding': 'packed',
+            'data': track_encoder.encode(upserts, payload['seq']), 'removed': payload['removed']}
+
+def send_track_delta(outbox, delta, tracks, callback):
+    """Emit a coalesced delta from a client's outbox (dispatcher thread)"""
+    socketio.emit('track_delta', pack_track_message(delta, tracks) if outbox.packed else delta,
+                  to=outbox.sid, callback=callback)
+
+track_outbox = TrackOutbox(send_track_delta)
+
+def broadcast_track_delta(snapshot):
+    """Queue a new live picture version's delta for subscribed clients"""
+    track_outbox.push_many(track_outbox.streaming(), snapshot.delta, snapshot.tracks)
+    for sid, delta in track_subscriptions.fan_out(snapshot):
+        track_outbox.push(sid, delta, snapshot.tracks)
+    
+    if len(track_encoder) > 2 * len(snapshot.tracks) + 1024:
+        track_encoder.prune(snapshot.tracks)
+
+live_picture.add_listener(track_clusters.apply)
+live_picture.add_listener(broadcast_track_delta)
+
+@socketio.on('subscribe_tracks')
+def handle_subscribe_tracks(data=None):
+    """
+    Subscribe to track deltas
+    
+    The client passes the last sequence number it applied ('since'). It gets the
+    deltas it missed (coalesced into one) if they are still held, otherwise a
+    'track_snapshot' to resync from; a client that sees a delta whose base is
+    not its sequence number subscribes again.
+    
+    A client may also pass a viewport ('bbox': [west, south, east, north]),
+    'zoom' and a list of track 'types'. It then receives only matching tracks
+    on its own sequence; subscribing again with a new filter (e.g. after a pan)
+    sends the tracks entering and leaving view as a delta. 'resync' forces a
+    fresh snapshot, as does dropping the filter: a filtered client's sequence
+    numbers are its own, not live picture versions.
+    
+    'encoding': 'packed' selects the binary track encoding (track_codec) for
+    this client's messages; anything else gets JSON. 'ack': true means the
+    client acknowledges each delta, and is then sent at most one unacknowledged
+    delta at a time (see track_outbox).
+    """
+    data = data or {}
+    sid = request.sid
+    bbox = parse_bbox(data.get('bbox'))
+    types = frozenset(data['types']) if data.get('types') else None
+    packed = data.get('encoding') == 'packed'
+    ack = bool(data.get('ack'))
+    
+    def send(event, payload):
+        emit(event, pack_track_message(payload, live_picture.snapshot().tracks) if packed else payload)
+    
+    if bbox is not None or types is not None:
+        if sid in track_subscriptions.subscriptions and not data.get('resync') \
+                and track_outbox.configure(sid, True, packed, ack):
+            # Filter change: the tracks entering and leaving view follow the queued deltas
+            event, delta = track_subscriptions.subscribe(sid, bbox, data.get('zoom'), types)
+            track_outbox.push(sid, delta, live_picture.snapshot().tracks)
+            return
+        track_subscriptions.unsubscribe(sid)
+        track_outbox.open(sid, True, packed, ack)
+        event, payload = track_subscriptions.subscribe(sid, bbox, data.get('zoom'), types)
+        send(event, payload)
+        track_outbox.release(sid, payload['seq'])
+        return
+    
+    was_filtered = sid in track_subscriptions.subscriptions
+    track_subscriptions.unsubscribe(sid)
+    track_outbox.open(sid, False, packed, ack)
+    snapshot = live_snapshot()
+    since = data.get('since')
+    deltas = None
+    if isinstance(since, int) and not was_filtered and not data.get('resync'):
+        deltas = live_picture.deltas_since(since)
+    
+    if deltas is None:
+        send('track_snapshot', {'seq': snapshot.version, 'tracks': snapshot.track_list()})
+        track_outbox.release(sid, snapshot.version)
+    else:
+        track_outbox.release(sid, since, deltas, live_picture.snapshot().tracks)
+
+@socketio.on('unsubscribe_tracks')
+def handle_unsubscribe_tracks():
+    """Stop track deltas"""
+    track_outbox.close(request.sid)
+    track_subscriptions.unsubscribe(request.sid)
+
 # Simulated data generation for demonstration
 def generate_simulated_track_data():
     """Generate simulated track data for demonstration"""
@@ -493,6 +808,7 @@ def generate_simulated_track_data():
             db.session.add(track)
         
         db.session.commit()
+        live_picture.publish(_load_active_tracks(), replace=True)
         # Debug print removed
     except Exception as e:
         # Debug print removed
@@ -566,6 +882,7 @@ def update_tracks_realtime():
                         new_events.append(event)
                 
                 db.session.commit()
+                live_picture.publish(updated_tracks, replace=True)
                 
                 # Emit new events to all connected clients
                 # Removed all socketio.emit calls for new_event, track_update, and monitor_events (database-only dataflow)
@@ -636,6 +953,7 @@ def stop_surveillance():
     try:
         Track.query.delete()
         db.session.commit()
+        live_picture.clear()
         
         # Emit empty track update immediately
         socketio.emit('track_update', [])
@@ -646,17 +964,38 @@ def stop_surveillance():
         db.session.rollback()
         return False
 
+def build_cot_tracks(snapshot):
+    """Per-track CoT XML view of a live picture snapshot"""
+    cot_tracks = []
+    for track in snapshot.track_list():
+        cot_xml = cot_processor.track_to_cot_xml(track)
+        cot_tracks.append({
+            'track_id': track['track_id'],
+            'cot_xml': cot_xml
+        })
+    
+    return {
+        'status': 'success',
+        'track_count': len(cot_tracks),
+        'cot_tracks': cot_tracks
+    }
+
+def build_cot_batch(snapshot):
+    """Batch CoT XML view of a live picture snapshot"""
+    track_data = snapshot.track_list()
+    return {
+        'status': 'success',
+        'track_count': len(track_data),
+        'batch_cot_xml': cot_processor.batch_tracks_to_cot(track_data)
+    }
+
 # CoT WebSocket endpoints
 @socketio.on('request_cot_batch')
 def handle_cot_batch_request():
     """Handle request for batch CoT data"""
     try:
-        tracks = Track.query.filter_by(status='Active').all()
-        track_data = [track.to_dict() for track in tracks]
-        
-        # Generate batch CoT XML
-        batch_cot = cot_processor.batch_tracks_to_cot(track_data)
-        emit('cot_batch', {'batch_cot_xml': batch_cot, 'track_count': len(track_data)})
+        batch = live_snapshot().view('cot-batch', build_cot_batch)
+        emit('cot_batch', {'batch_cot_xml': batch['batch_cot_xml'], 'track_count': batch['track_count']})
     except Exception as e:
         emit('cot_error', {'error': str(e)})
 
@@ -674,22 +1013,7 @@ def handle_cot_heartbeat():
 def get_cot_tracks():
     """Get all tracks in CoT XML format"""
     try:
-        tracks = Track.query.filter_by(status='Active').all()
-        track_data = [track.to_dict() for track in tracks]
-        
-        cot_tracks = []
-        for track in track_data:
-            cot_xml = cot_processor.track_to_cot_xml(track)
-            cot_tracks.append({
-                'track_id': track['track_id'],
-                'cot_xml': cot_xml
-            })
-        
-        return jsonify({
-            'status': 'success',
-            'track_count': len(cot_tracks),
-            'cot_tracks': cot_tracks
-        })
+        return serve_snapshot_view('cot-tracks', build_cot_tracks)
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -700,16 +1024,7 @@ def get_cot_tracks():
 def get_cot_batch():
     """Get batch CoT XML for all active tracks"""
     try:
-        tracks = Track.query.filter_by(status='Active').all()
-        track_data = [track.to_dict() for track in tracks]
-        
-        batch_xml = cot_processor.batch_tracks_to_cot(track_data)
-        
-        return jsonify({
-            'status': 'success',
-            'track_count': len(track_data),
-            'batch_cot_xml': batch_xml
-        })
+        return serve_snapshot_view('cot-batch', build_cot_batch)
     except Exception as e:
         return jsonify({
             'status': 'error',
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Scan/Sector Batching
+Groups radar plots by antenna sector so that the tracker receives each
+azimuth sector as one batch as soon as the antenna has swept past it.
+
+Sector completion is detected from the plot azimuths themselves (the antenna
+moving into a later sector, with wraparound at north starting a new scan) or
+from ASTERIX CAT-34 north marker / sector crossing messages when available.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SectorBatch:
+    """Plots of one completed antenna sector"""
+    scan_number: int
+    sector_index: int
+    start_azimuth: float
+    end_azimuth: float
+    plots: List = field(default_factory=list)
+    closed_by: str = "azimuth"  # azimuth, north_marker, sector_crossing, flush
+
+
+class SectorBatcher:
+    """
+    Accumulates plots for the sector currently under the antenna
+
+    Plots must expose an ``azimuth_deg`` attribute (PlotData). Azimuth is
+    assumed to increase with antenna rotation (clockwise from north).
+    """
+
+    def __init__(self, sector_count: int = 16):
+        """
+        Initialize sector batcher
+
+        Args:
+            sector_count: Number of equal azimuth sectors per antenna scan
+        """
+        if sector_count < 2:
+            raise ValueError("sector_count must be at least 2")
+        self.sector_count = sector_count
+        self.sector_width = 360.0 / sector_count
+
+        self.scan_number = 0
+        self._current_sector: Optional[int] = None
+        self._pending: List = []
+
+        self.stats = {
+            'plots_batched': 0,
+            'sectors_completed': 0,
+            'scans_completed': 0,
+            'north_markers': 0,
+            'sector_crossings': 0
+        }
+
+    def sector_of(self, azimuth_deg: float) -> int:
+        """Sector index for an azimuth in degrees"""
+        return int((azimuth_deg % 360.0) / self.sector_width) % self.sector_count
+
+    def add_plot(self, plot) -> List[SectorBatch]:
+        """
+        Add a plot and return any sectors completed by the antenna moving on
+
+        Args:
+            plot: Plot with azimuth_deg
+
+        Returns:
+            Completed sector batches (usually empty or one)
+        """
+        sector = self.sector_of(plot.azimuth_deg)
+        completed = []
+
+        if self._current_sector is None:
+            self._current_sector = sector
+        elif sector != self._current_sector:
+            forward = (sector - self._current_sector) % self.sector_count
+            if forward <= self.sector_count // 2:
+                # Antenna moved on: the open sector is complete
+                completed.append(self._close("azimuth"))
+                if sector < self._current_sector:
+                    self._start_new_scan()
+                self._current_sector = sector
+            # Otherwise a slightly late plot from the previous sector; keep it
+            # with the open batch rather than reopening a completed sector
+
+        self._pending.append(plot)
+        self.stats['plots_batched'] += 1
+        return [batch for batch in completed if batch.plots]
+
+    def on_north_marker(self, timestamp: Optional[datetime] = None) -> List[SectorBatch]:
+        """CAT-34 north marker: the scan is complete"""
+        self.stats['north_markers'] += 1
+        completed = [self._close("north_marker")] if self._pending else []
+        self._start_new_scan()
+        self._current_sector = 0
+        return completed
+
+    def on_sector_crossing(self, sector_azimuth: float,
+                           timestamp: Optional[datetime] = None) -> List[SectorBatch]:
+        """CAT-34 sector crossing: every plot before this azimuth is complete"""
+        self.stats['sector_crossings'] += 1
+        completed = [self._close("sector_crossing")] if self._pending else []
+        new_sector = self.sector_of(sector_azimuth)
+        if self._current_sector is not None and new_sector < self._current_sector:
+            self._start_new_scan()
+        self._current_sector = new_sector
+        return completed
+
+    def flush(self) -> List[SectorBatch]:
+        """Hand over the open sector regardless of antenna position (e.g. data gap)"""
+        if not self._pending:
+            return []
+        return [self._close("flush")]
+
+    def _close(self, reason: str) -> SectorBatch:
+        sector = self._current_sector if self._current_sector is not None else 0
+        batch = SectorBatch(
+            scan_number=self.scan_number,
+            sector_index=sector,
+            start_azimuth=sector * self.sector_width,
+            end_azimuth=(sector + 1) * self.sector_width,
+            plots=self._pending,
+            closed_by=reason
+        )
+        self._pending = []
+        if batch.plots:
+            self.stats['sectors_completed'] += 1
+            logger.debug(f"Sector {sector} of scan {self.scan_number} complete "
+                         f"({len(batch.plots)} plots, {reason})")
+        return batch
+
+    def _start_new_scan(self):
+        self.scan_number += 1
+        self.stats['scans_completed'] += 1
+
+    def get_statistics(self) -> dict:
+        """Batching statistics"""
+        stats = self.stats.copy()
+        stats['pending_plots'] = len(self._pending)
+        stats['current_sector'] = self._current_sector
+        stats['scan_number'] = self.scan_number
+        return stats
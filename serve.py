@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Production server entry point for Surveillance Sentry
+
+Runs the web application (dashboard, REST, Socket.IO) under eventlet or gevent
+so that each connected client costs a green thread instead of an OS thread.
+UDP ingest and tracking do blocking socket reads and CPU-heavy numpy work, so
+they are kept off the event loop: they run in a separate ingest process with
+ordinary OS threads, and its live picture changes and Event rows are relayed
+to the web process (picture_relay).
+
+Usage:
+    python serve.py web --async-mode eventlet --port 5000
+    python serve.py web --async-mode threading          # in-process ingest, as main.py
+    python serve.py ingest --relay 127.0.0.1:5055       # started by 'web' unless --in-process-ingest
+    gunicorn -c gunicorn.conf.py                        # same, under gunicorn (see gunicorn.conf.py)
+
+main.py and start_surveillance.py remain the development entry points.
+"""
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import threading
+
+ASYNC_MODES = ('eventlet', 'gevent', 'threading')
+
+logger = logging.getLogger("serve")
+
+
+def patch_for(async_mode):
+    """Monkey patch the standard library for an async mode (before anything else is imported)"""
+    if async_mode == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+    elif async_mode == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+    os.environ["SOCKETIO_ASYNC_MODE"] = async_mode
+
+
+def start_ingest_process(relay):
+    """Start the UDP ingest and tracking process, relaying to the web process at relay"""
+    command = [sys.executable, os.path.abspath(__file__), 'ingest', '--relay', f'{relay[0]}:{relay[1]}']
+    logger.info(f"Starting ingest process: {' '.join(command)}")
+    return subprocess.Popen(command)
+
+
+def create_web_app(separate_ingest, relay):
+    """
+    Import the web application and run its boot phase
+
+    Args:
+        separate_ingest: UDP ingest and tracking run in the ingest process;
+            otherwise they start in this process as with main.py
+        relay: Address the ingest process relays to
+
+    Returns:
+        (app, socketio)
+    """
+    from app import app, socketio, boot
+    boot(ingest=not separate_ingest)
+
+    if separate_ingest:
+        from event_bus import event_bus
+        from live_picture import live_picture
+        from picture_relay import run_relay_receiver
+        socketio.start_background_task(run_relay_receiver, live_picture, event_bus, relay)
+    return app, socketio
+
+
+def gunicorn_app():
+    """App factory for gunicorn (the worker has already patched for its worker class)"""
+    from picture_relay import parse_address
+    os.environ.setdefault("SOCKETIO_ASYNC_MODE", os.environ.get("SURVEILLANCE_ASYNC_MODE", "eventlet"))
+    separate_ingest = os.environ.get("SURVEILLANCE_SEPARATE_INGEST", "1") != "0"
+    app, _ = create_web_app(separate_ingest, parse_address(os.environ.get("SURVEILLANCE_RELAY")))
+    return app
+
+
+def run_ingest(relay):
+    """Run UDP ingest and tracking with plain OS threads, relaying to the web process"""
+    os.environ["SOCKETIO_ASYNC_MODE"] = "threading"
+    import app_init
+    from event_bus import event_bus, publish_committed_rows, TOPIC_EVENT
+    from live_picture import live_picture
+    from models import Event
+    from picture_relay import RelaySender
+
+    publish_committed_rows(event_bus, Event, TOPIC_EVENT)
+    app_init.boot(ingest=True)  # UDP receiver and track calculator, no web routes
+    RelaySender(live_picture, event_bus, relay).start()
+    logger.info("Ingest process running")
+    threading.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Surveillance Sentry production server')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    web = subparsers.add_parser('web', help='Run the web application')
+    web.add_argument('--async-mode', choices=ASYNC_MODES, default='eventlet', help='Socket.IO async mode (default: eventlet)')
+    web.add_argument('--host', default='0.0.0.0', help='Bind address (default: 0.0.0.0)')
+    web.add_argument('--port', type=int, default=5000, help='HTTP port (default: 5000)')
+    web.add_argument('--relay', default=None, help='Ingest relay address host:port (default: 127.0.0.1:5055)')
+    web.add_argument('--max-connections', type=int,
+                     default=int(os.environ.get("SURVEILLANCE_WORKER_CONNECTIONS", "2000")),
+                     help='Concurrent connections under eventlet, whose server otherwise stops accepting '
+                          'at 1024 (default: SURVEILLANCE_WORKER_CONNECTIONS or 2000, as gunicorn.conf.py)')
+    ingest_mode = web.add_mutually_exclusive_group()
+    ingest_mode.add_argument('--in-process-ingest', action='store_true',
+                             help='Run UDP ingest and tracking in this process (default for threading)')
+    ingest_mode.add_argument('--separate-ingest', action='store_true',
+                             help='Run UDP ingest and tracking in an ingest process (default for eventlet/gevent)')
+    ingest_mode.add_argument('--no-ingest', action='store_true',
+                             help='Relay receiver only; an ingest process is started elsewhere')
+
+    ingest = subparsers.add_parser('ingest', help='Run UDP ingest and tracking, relaying to the web process')
+    ingest.add_argument('--relay', default=None, help='Web process relay address host:port (default: 127.0.0.1:5055)')
+
+    args = parser.parse_args()
+
+    if args.command == 'web':
+        patch_for(args.async_mode)  # before importing anything that uses sockets or threads
+
+    logging.basicConfig(level=logging.INFO)
+    from picture_relay import parse_address
+    relay = parse_address(args.relay)
+
+    if args.command == 'ingest':
+        run_ingest(relay)
+        return
+
+    separate_ingest = args.separate_ingest or args.no_ingest or (
+        args.async_mode != 'threading' and not args.in_process_ingest)
+    app, socketio = create_web_app(separate_ingest, relay)
+    ingest_process = start_ingest_process(relay) if separate_ingest and not args.no_ingest else None
+
+    logger.info(f"Serving on http://{args.host}:{args.port} ({args.async_mode}, "
+                f"ingest {'separate' if separate_ingest else 'in-process'})")
+    # eventlet.wsgi.server holds at most max_size connections; gevent's server is unbounded
+    server_options = {'max_size': args.max_connections} if args.async_mode == 'eventlet' else {}
+    try:
+        socketio.run(app, host=args.host, port=args.port, debug=False, use_reloader=False, log_output=False,
+                     allow_unsafe_werkzeug=args.async_mode == 'threading', **server_options)
+    finally:
+        if ingest_process is not None:
+            ingest_process.terminate()
+
+
+if __name__ == '__main__':
+    main()
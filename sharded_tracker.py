@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Sector-Sharded Tracker
+Partitions the surveillance volume into azimuth/range sectors, each owned by
+its own TrackCalculator running in a worker process. Tracks whose predicted
+position crosses a sector boundary are handed off to the neighbouring shard,
+and the shards' results are merged into a single read view for the API.
+
+Plots are routed to the shard owning the nearest predicted track position
+within the handoff margin (so a target straddling a boundary keeps its
+track), then to the shard holding the nearest M-of-N initiation candidate
+whose gate they fall in, otherwise to the shard owning their position.
+Candidates predicted to cross a boundary are handed off like tracks, so a
+target that changes shard before it is confirmed keeps collecting plots in
+one candidate.
+
+Each shard allocates track IDs from its own residue class (start=index+1,
+stride=shard count) so IDs stay unique without coordination.
+"""
+
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Dict, Optional, Sequence, Tuple, Any
+import logging
+import math
+import multiprocessing
+
+import numpy as np
+
+from geodesy import site_frame, polar_to_enu
+from track_calculator import TrackCalculator, PlotData, TrackData, TrackState, track_display_dict
+
+logger = logging.getLogger(__name__)
+
+
+class ShardLayout:
+    """
+    Azimuth/range partition of the radar coverage
+
+    Shards are numbered azimuth-major: shard = azimuth_sector * rings + ring.
+    """
+
+    def __init__(self, azimuth_sectors: int = 4, range_boundaries_m: Sequence[float] = ()):
+        """
+        Initialize shard layout
+
+        Args:
+            azimuth_sectors: Number of equal azimuth sectors (clockwise from north)
+            range_boundaries_m: Ascending ring boundaries in meters (empty for a single ring)
+        """
+        if azimuth_sectors < 1:
+            raise ValueError("azimuth_sectors must be at least 1")
+        self.azimuth_sectors = azimuth_sectors
+        self.range_boundaries_m = sorted(range_boundaries_m)
+        self.rings = len(self.range_boundaries_m) + 1
+        self.sector_width = 360.0 / azimuth_sectors
+
+    @property
+    def shard_count(self) -> int:
+        return self.azimuth_sectors * self.rings
+
+    def shard_of(self, range_m: float, azimuth_deg: float) -> int:
+        """Shard owning a polar position"""
+        sector = int((azimuth_deg % 360.0) / self.sector_width) % self.azimuth_sectors
+        ring = bisect_right(self.range_boundaries_m, range_m)
+        return sector * self.rings + ring
+
+    def shard_of_xy(self, x: float, y: float) -> int:
+        """Shard owning a cartesian position (x east, y north)"""
+        return self.shard_of(math.hypot(x, y), math.degrees(math.atan2(x, y)))
+
+
+class TrackerShard:
+    """
+    Tracker state owned by one shard
+
+    Runs inside a worker process, or in-process when multiprocessing is disabled.
+    """
+
+    def __init__(self, index: int, layout: ShardLayout, config: Dict):
+        self.index = index
+        self.layout = layout
+        self.handoff_lookahead_s = config.get('handoff_lookahead_s', 4.0)
+
+        shard_config = dict(config)
+        shard_config['track_id_start'] = index + 1
+        shard_config['track_id_stride'] = layout.shard_count
+        self.tracker = TrackCalculator(shard_config)
+
+    def handle(self, command: str, payload: Any) -> Any:
+        """Dispatch a coordinator command"""
+        if command == 'process':
+            plots, batch_time = payload
+            return self.process(plots, batch_time)
+        if command == 'adopt':
+            return self.adopt(*payload)
+        if command == 'summary':
+            return self.tracker.get_track_summary()
+        if command == 'reset':
+            self.tracker = TrackCalculator(self.tracker.config)
+            return None
+        if command == 'get_state':
+            return self.tracker.get_state()
+        if command == 'restore_state':
+            self.tracker.restore_state(payload)
+            return None
+        if command == 'set_scan_period':
+            return self.tracker.set_scan_period(payload)
+        raise ValueError(f"Unknown shard command '{command}'")
+
+    def process(self, plots: List[PlotData], batch_time: Optional[datetime]) -> Dict:
+        """
+        Process this shard's plots and release tracks predicted to leave it
+
+        Args:
+            plots: Plots located in this shard
+            batch_time: Coordinator batch time, so shards without plots still age their tracks
+
+        Returns:
+            Dict with updated and removed tracks, outgoing track and candidate
+            handoffs, and predicted track and candidate positions for plot routing
+        """
+        associator = self.tracker.igmm_associator
+        if batch_time is not None:
+            associator.clock.advance_to(batch_time)
+
+        updated_tracks = self.tracker.process_plot_batch(plots)
+
+        handoffs = []
+        positions = []
+        for track_id, track in list(associator.tracks.items()):
+            predicted_x, predicted_y = self._predicted_position(track)
+            target = self.layout.shard_of_xy(predicted_x, predicted_y)
+            if target != self.index:
+                handoffs.append((target, associator.release_track(track_id),
+                                 self.tracker.active_tracks.pop(track_id, None)))
+            positions.append((predicted_x, predicted_y, target))
+
+        # M-of-N candidates follow their predicted next plot; a single plot has no
+        # course yet and stays, but still draws plots within its reach here
+        candidate_handoffs = []
+        candidate_positions = []
+        initiator = associator.initiator
+        if initiator is not None:
+            for candidate in list(initiator.candidates.values()):
+                predicted_x, predicted_y, reach = initiator.next_scan_position(candidate)
+                target = self.index
+                if len(candidate.points) > 1:
+                    target = self.layout.shard_of_xy(predicted_x, predicted_y)
+                    if target != self.index:
+                        candidate_handoffs.append((target, initiator.release(candidate.candidate_id)))
+                candidate_positions.append((predicted_x, predicted_y, reach, target))
+
+        return {
+            'updated_tracks': updated_tracks,
+            'removed_track_ids': associator.removed_track_ids,
+            'handoffs': handoffs,
+            'positions': positions,
+            'candidate_handoffs': candidate_handoffs,
+            'candidate_positions': candidate_positions
+        }
+
+    def adopt(self, tracks: List, candidates: List = ()) -> int:
+        """
+        Take ownership of tracks (IGMM track, legacy view) and initiation
+        candidates handed off by neighbouring shards
+        """
+        for igmm_track, track_data in tracks:
+            self.tracker.igmm_associator.adopt_track(igmm_track)
+            if track_data is not None:
+                self.tracker.active_tracks[track_data.track_id] = track_data
+        initiator = self.tracker.igmm_associator.initiator
+        if initiator is not None:
+            for candidate in candidates:
+                initiator.adopt(candidate)
+        return len(tracks) + len(candidates)
+
+    def _predicted_position(self, track) -> Tuple[float, float]:
+        # IGMM heading is the math angle of the velocity vector (atan2(vy, vx))
+        heading_rad = math.radians(track.heading)
+        return (track.x + track.speed * math.cos(heading_rad) * self.handoff_lookahead_s,
+                track.y + track.speed * math.sin(heading_rad) * self.handoff_lookahead_s)
+
+
+def _shard_worker(index: int, layout: ShardLayout, config: Dict, conn):
+    """Worker process main loop"""
+    shard = TrackerShard(index, layout, config)
+    while True:
+        try:
+            command, payload = conn.recv()
+        except EOFError:
+            break
+        if command == 'stop':
+            conn.send(('ok', None))
+            break
+        try:
+            conn.send(('ok', shard.handle(command, payload)))
+        except Exception as e:
+            logger.error(f"Shard {index} failed on '{command}': {e}")
+            conn.send(('error', str(e)))
+    conn.close()
+
+
+class ShardedTracker:
+    """
+    Coordinator for sector-sharded tracking
+
+    Exposes the same read interface as TrackCalculator (process_plot_batch,
+    get_tracks_for_display, get_track_summary, active_tracks) so it can be
+    used wherever a single tracker is.
+    """
+
+    def __init__(self, config: Dict | None = None, use_processes: bool = True):
+        """
+        Initialize sharded tracker
+
+        Args:
+            config: Tracker configuration; shard layout from shard_azimuth_sectors,
+                shard_range_boundaries_m and handoff_lookahead_s
+            use_processes: Run each shard in a worker process (False keeps shards in-process)
+        """
+        self.config = config or {}
+        self.layout = ShardLayout(
+            self.config.get('shard_azimuth_sectors', 4),
+            self.config.get('shard_range_boundaries_m', ())
+        )
+        self.use_processes = use_processes
+        self.handoff_margin_m = self.config.get('handoff_margin_m',
+                                                self.config.get('max_association_distance', 500.0))
+
+        # Grid of predicted track positions -> owning shard, for plot routing
+        self._track_grid: Dict[Tuple[int, int], List[Tuple[float, float, int]]] = {}
+        # Same for initiation candidates (x, y, reach, shard), in cells of the largest reach
+        self._candidate_grid: Dict[Tuple[int, int], List[Tuple[float, float, float, int]]] = {}
+        self._candidate_cell_m = 0.0
+
+        self._shards: List[TrackerShard] = []
+        self._workers = []
+        self._connections = []
+
+        if use_processes:
+            context = multiprocessing.get_context('spawn')
+            for index in range(self.layout.shard_count):
+                parent_conn, child_conn = context.Pipe()
+                worker = context.Process(
+                    target=_shard_worker,
+                    args=(index, self.layout, self.config, child_conn),
+                    name=f"tracker-shard-{index}",
+                    daemon=True
+                )
+                worker.start()
+                child_conn.close()
+                self._workers.append(worker)
+                self._connections.append(parent_conn)
+        else:
+            self._shards = [TrackerShard(index, self.layout, self.config)
+                            for index in range(self.layout.shard_count)]
+
+        self._active_tracks: Dict[str, TrackData] = {}
+        self.terminated_tracks: Dict[str, TrackData] = {}
+
+        # Same radar site as the shard trackers
+        self.radar_lat = self.config.get('radar_lat', 28.0836)  # degrees
+        self.radar_lon = self.config.get('radar_lon', -80.6081)  # degrees
+        self.site = site_frame(self.radar_lat, self.radar_lon)
+
+        self.stats = {
+            'batches_processed': 0,
+            'handoffs': 0,
+            'candidate_handoffs': 0
+        }
+
+        logger.info(f"Sharded tracker initialized with {self.layout.shard_count} shards "
+                    f"({'processes' if use_processes else 'in-process'})")
+
+    def _broadcast(self, requests: Dict[int, Tuple[str, Any]]) -> Dict[int, Any]:
+        """Send commands to shards and collect the replies (shards run concurrently)"""
+        if not self.use_processes:
+            return {index: self._shards[index].handle(command, payload)
+                    for index, (command, payload) in requests.items()}
+
+        for index, request in requests.items():
+            self._connections[index].send(request)
+
+        replies = {}
+        for index in requests:
+            try:
+                status, result = self._connections[index].recv()
+            except EOFError:
+                logger.error(f"Shard {index} worker is no longer running")
+                continue
+            if status == 'ok':
+                replies[index] = result
+            else:
+                logger.error(f"Shard {index} error: {result}")
+        return replies
+
+    def _polar_to_cartesian(self, range_m: float, azimuth_deg: float) -> Tuple[float, float]:
+        x, y, _ = polar_to_enu(range_m, azimuth_deg)
+        return (x, y)
+
+    def _cartesian_to_latlon(self, x: float, y: float) -> Tuple[float, float]:
+        return self.site.plane_to_geodetic(x, y)
+
+    def _route_plot(self, plot: PlotData, x: float, y: float) -> int:
+        """
+        Shard for a plot at (x, y): owner of the nearest track within the margin,
+        else of the nearest initiation candidate within its reach, else by position
+        """
+        cell_x = int(math.floor(x / self.handoff_margin_m))
+        cell_y = int(math.floor(y / self.handoff_margin_m))
+
+        best_shard = None
+        best_distance = self.handoff_margin_m
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for track_x, track_y, shard in self._track_grid.get((cell_x + dx, cell_y + dy), ()):
+                    distance = math.hypot(x - track_x, y - track_y)
+                    if distance <= best_distance:
+                        best_shard, best_distance = shard, distance
+
+        if best_shard is None and self._candidate_grid:
+            cell_x = int(math.floor(x / self._candidate_cell_m))
+            cell_y = int(math.floor(y / self._candidate_cell_m))
+            best_distance = None
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    candidates = self._candidate_grid.get((cell_x + dx, cell_y + dy), ())
+                    for candidate_x, candidate_y, reach, shard in candidates:
+                        distance = math.hypot(x - candidate_x, y - candidate_y)
+                        if distance <= reach and (best_distance is None or distance < best_distance):
+                            best_shard, best_distance = shard, distance
+
+        if best_shard is not None:
+            return best_shard
+        return self.layout.shard_of(plot.range_m, plot.azimuth_deg)
+
+    def process_plot_batch(self, plots: List[PlotData]) -> Dict[str, TrackData]:
+        """
+        Route plots to their shards, process in parallel and perform handoffs
+
+        Args:
+            plots: List of plot data to process
+
+        Returns:
+            Dictionary of tracks created or updated by this batch
+        """
+        routed: Dict[int, List[PlotData]] = defaultdict(list)
+        if plots:
+            xs, ys = self._polar_to_cartesian(np.array([plot.range_m for plot in plots], dtype=float),
+                                              np.array([plot.azimuth_deg for plot in plots], dtype=float))
+            for plot, x, y in zip(plots, np.atleast_1d(xs).tolist(), np.atleast_1d(ys).tolist()):
+                routed[self._route_plot(plot, x, y)].append(plot)
+
+        batch_time = max((plot.timestamp for plot in plots), default=None)
+        replies = self._broadcast({
+            index: ('process', (routed.get(index, []), batch_time))
+            for index in range(self.layout.shard_count)
+        })
+
+        incoming: Dict[int, List] = defaultdict(list)
+        incoming_candidates: Dict[int, List] = defaultdict(list)
+        candidate_positions = []
+        updated_tracks: Dict[str, TrackData] = {}
+        track_grid: Dict[Tuple[int, int], List[Tuple[float, float, int]]] = defaultdict(list)
+        for index in sorted(replies):
+            reply = replies[index]
+            for track_id in reply['removed_track_ids']:
+                self._active_tracks.pop(track_id, None)
+            updated_tracks.update(reply['updated_tracks'])
+            for target, igmm_track, track_data in reply['handoffs']:
+                incoming[target].append((igmm_track, track_data))
+            for x, y, shard in reply['positions']:
+                cell = (int(math.floor(x / self.handoff_margin_m)), int(math.floor(y / self.handoff_margin_m)))
+                track_grid[cell].append((x, y, shard))
+            for target, candidate in reply['candidate_handoffs']:
+                incoming_candidates[target].append(candidate)
+            candidate_positions.extend(reply['candidate_positions'])
+        self._track_grid = dict(track_grid)
+        self._index_candidates(candidate_positions)
+
+        if incoming or incoming_candidates:
+            handoff_count = sum(len(tracks) for tracks in incoming.values())
+            candidate_count = sum(len(candidates) for candidates in incoming_candidates.values())
+            self._broadcast({target: ('adopt', (incoming.get(target, []), incoming_candidates.get(target, [])))
+                             for target in set(incoming) | set(incoming_candidates)})
+            self.stats['handoffs'] += handoff_count
+            self.stats['candidate_handoffs'] += candidate_count
+            logger.debug(f"Handed off {handoff_count} tracks and {candidate_count} candidates between shards")
+
+        self._active_tracks.update(updated_tracks)
+        self.stats['batches_processed'] += 1
+        return updated_tracks
+
+    def _index_candidates(self, positions: List[Tuple[float, float, float, int]]):
+        """Grid of candidate positions for plot routing, in cells of the largest reach"""
+        self._candidate_cell_m = max((reach for _, _, reach, _ in positions), default=0.0)
+        candidate_grid = defaultdict(list)
+        for x, y, reach, shard in positions:
+            cell = (int(math.floor(x / self._candidate_cell_m)), int(math.floor(y / self._candidate_cell_m)))
+            candidate_grid[cell].append((x, y, reach, shard))
+        self._candidate_grid = dict(candidate_grid)
+
+    @property
+    def active_tracks(self) -> Dict[str, TrackData]:
+        """Merged active tracks across all shards"""
+        return self._active_tracks
+
+    def get_tracks_for_display(self) -> List[Dict]:
+        """Merged display view across all shards"""
+        tracks = [track for track in self._active_tracks.values()
+                  if track.state != TrackState.TERMINATED and track.position_history]
+        if not tracks:
+            return []
+        latest = [track.position_history[-1] for track in tracks]
+        lats, lons = self._cartesian_to_latlon(np.array([pos[0] for pos in latest]),
+                                               np.array([pos[1] for pos in latest]))
+        return [track_display_dict(track, lat, lon)
+                for track, lat, lon in zip(tracks, lats.tolist(), lons.tolist())]
+
+    def get_track_summary(self) -> Dict:
+        """Tracking summary summed over all shards"""
+        summaries = self._broadcast({index: ('summary', None)
+                                     for index in range(self.layout.shard_count)})
+
+        tracks_by_state = defaultdict(int)
+        statistics = defaultdict(float)
+        active = terminated = 0
+        for summary in summaries.values():
+            active += summary['active_tracks']
+            terminated += summary['terminated_tracks']
+            for state, count in summary['tracks_by_state'].items():
+                tracks_by_state[state] += count
+            for key, value in summary['statistics'].items():
+                statistics[key] += value
+
+        if summaries:
+            statistics['association_success_rate'] /= len(summaries)
+
+        return {
+            'active_tracks': active,
+            'terminated_tracks': terminated,
+            'tracks_by_state': dict(tracks_by_state),
+            'statistics': dict(statistics),
+            'shards': self.layout.shard_count,
+            'handoffs': self.stats['handoffs'],
+            'candidate_handoffs': self.stats['candidate_handoffs']
+        }
+
+    def get_state(self) -> Dict:
+        """Coordinator and per-shard tracker state for a snapshot"""
+        shard_states = self._broadcast({index: ('get_state', None)
+                                        for index in range(self.layout.shard_count)})
+        if len(shard_states) != self.layout.shard_count:
+            raise RuntimeError("Could not collect state from every shard")
+        return {
+            'shards': [shard_states[index] for index in range(self.layout.shard_count)],
+            'active_tracks': self._active_tracks,
+            'track_grid': self._track_grid,
+            'candidate_grid': self._candidate_grid,
+            'candidate_cell_m': self._candidate_cell_m,
+            'stats': self.stats
+        }
+
+    def restore_state(self, state: Dict):
+        """Restore state produced by get_state (the shard layout must match)"""
+        if len(state['shards']) != self.layout.shard_count:
+            raise ValueError(f"Snapshot has {len(state['shards'])} shards, "
+                             f"tracker has {self.layout.shard_count}")
+        self._broadcast({index: ('restore_state', shard_state)
+                         for index, shard_state in enumerate(state['shards'])})
+        self._active_tracks = state['active_tracks']
+        self._track_grid = state['track_grid']
+        self._candidate_grid = state.get('candidate_grid', {})
+        self._candidate_cell_m = state.get('candidate_cell_m', 0.0)
+        self.stats = dict({'candidate_handoffs': 0}, **state['stats'])
+
+    def set_scan_period(self, scan_period_s: float) -> bool:
+        """Set the reported antenna rotation period in every shard"""
+        replies = self._broadcast({index: ('set_scan_period', scan_period_s)
+                                   for index in range(self.layout.shard_count)})
+        if not any(replies.values()):
+            return False
+        self.config = dict(self.config, scan_period_s=scan_period_s)
+        return True
+
+    def reset(self):
+        """Clear all tracks in every shard"""
+        self._broadcast({index: ('reset', None) for index in range(self.layout.shard_count)})
+        self._active_tracks = {}
+        self._track_grid = {}
+        self._candidate_grid = {}
+        self.terminated_tracks.clear()
+
+    def close(self):
+        """Stop worker processes"""
+        if not self.use_processes:
+            return
+        for conn in self._connections:
+            try:
+                conn.send(('stop', None))
+                conn.recv()
+            except (EOFError, OSError, BrokenPipeError):
+                pass
+            conn.close()
+        for worker in self._workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+        self._connections = []
+        self._workers = []
+        logger.info("Sharded tracker stopped")
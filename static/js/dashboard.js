@@ -11,10 +11,21 @@ class SurveillanceDashboard {
         this.updateInterval = null;
         this.monitorInterval = null; // For Event Monitor auto-refresh
         this.eventLogInterval = null; // For Event Log auto-refresh
+        this.eventPageCursors = {}; // Event Log page number -> cursor returned with the previous page
+        this.latestEventId = null; // Newest event on the first Event Log page, for incremental refresh
+        this.eventStream = null; // EventSource for /api/events/stream
+        this.eventStreamOpen = false; // Event Log and Monitor updates pushed, polling not needed
+        this.monitorTracks = new Map(); // Event Monitor rows by track ID
+        this.monitorRedrawPending = false;
         this.selectedTracks = new Set(); // For multi-track selection
         this.battleGroups = new Map(); // Battle Groups storage
         this.battleGroupCounter = 0; // Counter for naming battle groups
         this.isMultiSelecting = false; // Track if we're in multi-select mode
+        this.trackSeq = null; // Sequence number of the last applied track delta
+        this.trackStreamActive = false; // Deltas arriving over Socket.IO, polling not needed
+        this.trackResyncPending = false;
+        // Binary track messages when the browser can decode them, JSON otherwise
+        this.trackEncoding = (typeof TextDecoder !== 'undefined' && typeof DataView !== 'undefined') ? 'packed' : 'json';
         // Dashboard properties initialized
         
         this.socket = io({
@@ -67,11 +78,23 @@ class SurveillanceDashboard {
         });
 
         this.socket.on('connect', () => {
-            // Debug log removed
+            this.subscribeTracks();
         });
 
         this.socket.on('disconnect', () => {
-            // Debug log removed
+            // Fall back to polling until the stream is back
+            this.trackStreamActive = false;
+        });
+
+        // Track delta stream
+        this.socket.on('track_snapshot', (snapshot) => {
+            this.onTrackSnapshot(snapshot);
+        });
+
+        this.socket.on('track_delta', (delta, ack) => {
+            this.onTrackDelta(delta);
+            // Acknowledge so the server sends the next delta (it coalesces meanwhile)
+            if (typeof ack === 'function') ack();
         });
 
         this.socket.on('connect_error', (error) => {
@@ -93,7 +116,12 @@ class SurveillanceDashboard {
 
         // Filters
         const trackTypeFilter = document.getElementById('track-type-filter');
-        if (trackTypeFilter) trackTypeFilter.addEventListener('change', (e) => this.filterTracks(e.target.value));
+        if (trackTypeFilter) trackTypeFilter.addEventListener('change', (e) => {
+            this.filterTracks(e.target.value);
+            this.onTrackFilterChange();
+        });
+        // Map pans/zooms narrow the track subscription to the visible area
+        document.addEventListener('map-viewport-changed', () => this.onTrackFilterChange());
         const searchInput = document.getElementById('search-input');
         if (searchInput) searchInput.addEventListener('input', (e) => this.searchTracks(e.target.value));
 
@@ -220,26 +248,98 @@ class SurveillanceDashboard {
             clearInterval(this.eventLogInterval);
         }
 
-        // Track updates every 1 second for responsiveness
+        // Track updates every 1 second for responsiveness (only while the delta stream is down)
         this.updateInterval = setInterval(async () => {
-            await this.loadTracks();
+            if (!this.trackStreamActive) {
+                await this.loadTracks();
+            }
         }, 1000);
 
+        // Event Log and Monitor updates are pushed; the timers below only poll while the stream is down
+        this.openEventStream();
+
         // Monitor events every 1.5 seconds for faster real-time updates
         this.monitorInterval = setInterval(async () => {
-            // Show brief visual feedback during auto-refresh
-            this.showAutoRefreshIndicator();
-            await this.loadMonitorEvents();
+            if (!this.eventStreamOpen) {
+                // Show brief visual feedback during auto-refresh
+                this.showAutoRefreshIndicator();
+                await this.loadMonitorEvents();
+            }
         }, 1500);
 
         // Event Log updates every 3 seconds for history
         this.eventLogInterval = setInterval(async () => {
-            await this.loadEventLog();
+            if (!this.eventStreamOpen) {
+                await this.refreshEventLog();
+            }
         }, 3000);
 
         // Debug log removed
     }
 
+    openEventStream() {
+        if (this.eventStream || typeof EventSource === 'undefined') {
+            return;
+        }
+
+        // The browser reconnects by itself, resuming after the last received ID
+        this.eventStream = new EventSource('/api/events/stream');
+        this.eventStream.onopen = () => {
+            this.eventStreamOpen = true;
+        };
+        this.eventStream.onerror = () => {
+            this.eventStreamOpen = false;
+        };
+        this.eventStream.addEventListener('event', (message) => {
+            this.onStreamedEvent(JSON.parse(message.data));
+        });
+        this.eventStream.addEventListener('monitor', (message) => {
+            this.onStreamedMonitorEvents(JSON.parse(message.data));
+        });
+        this.eventStream.addEventListener('reset', () => {
+            // Missed more than the server holds: reload both views
+            this.loadEventLog();
+            this.loadMonitorEvents();
+        });
+    }
+
+    onStreamedEvent(event) {
+        const filtered = ['start-date', 'end-date', 'event-type-filter'].some(id => {
+            const input = document.getElementById(id);
+            return input && input.value;
+        });
+        if (this.currentPage !== 1 || filtered) {
+            return; // Paged or filtered views are not live
+        }
+        if (this.latestEventId !== null && event.id <= this.latestEventId) {
+            return;
+        }
+
+        const tbody = document.getElementById('events-log-body');
+        if (!tbody) return;
+        tbody.insertBefore(this.createEventRow(event), tbody.firstChild);
+        while (tbody.rows.length > 20) {
+            tbody.deleteRow(tbody.rows.length - 1);
+        }
+        this.latestEventId = event.id;
+        this.eventPageCursors = {}; // Page boundaries moved
+    }
+
+    onStreamedMonitorEvents(update) {
+        update.removed.forEach(trackId => this.monitorTracks.delete(trackId));
+        update.events.forEach(event => this.monitorTracks.set(event.track_id, event));
+        this.monitorEvents = Array.from(this.monitorTracks.values());
+
+        // Redraw at most once per frame however many updates arrive
+        if (!this.monitorRedrawPending) {
+            this.monitorRedrawPending = true;
+            requestAnimationFrame(() => {
+                this.monitorRedrawPending = false;
+                this.updateEventsDisplay();
+            });
+        }
+    }
+
     stopPeriodicUpdates() {
         if (this.updateInterval) {
             clearInterval(this.updateInterval);
@@ -580,6 +680,7 @@ class SurveillanceDashboard {
                 // Update monitor events with current real-time data
                 const previousCount = this.monitorEvents.length;
                 this.monitorEvents = data.events || [];
+                this.monitorTracks = new Map(this.monitorEvents.map(event => [event.track_id, event]));
 
                 // Update the Event Monitor display
                 this.updateEventsDisplay();
@@ -603,13 +704,43 @@ class SurveillanceDashboard {
         // Debug log removed
     }
 
+    eventLogParams() {
+        // Page size and the current filters
+        const params = new URLSearchParams();
+        params.append('per_page', '20');
+
+        const startDate = document.getElementById('start-date');
+        const endDate = document.getElementById('end-date');
+        const eventType = document.getElementById('event-type-filter');
+        if (startDate && startDate.value) params.append('start_date', startDate.value);
+        if (endDate && endDate.value) params.append('end_date', endDate.value);
+        if (eventType && eventType.value) params.append('event_type', eventType.value);
+        return params;
+    }
+
+    async fetchEventPage() {
+        // Next pages are read with the cursor of the page before, other pages by number
+        const params = this.eventLogParams();
+        params.append('page', this.currentPage);
+        const cursor = this.eventPageCursors[this.currentPage];
+        if (cursor) params.append('cursor', cursor);
+
+        const response = await fetch(`/api/events?${params.toString()}`);
+        const data = await response.json();
+
+        if (data.next_cursor) {
+            this.eventPageCursors[this.currentPage + 1] = data.next_cursor;
+        }
+        if (this.currentPage === 1) {
+            this.latestEventId = data.latest_id;
+        }
+        return data;
+    }
+
     async loadEventLog() {
         try {
-            // Debug log removed
-            const response = await fetch(`/api/events?page=${this.currentPage}&per_page=20`);
-            const data = await response.json();
+            const data = await this.fetchEventPage();
 
-            // Debug log removed
             this.updateEventLogDisplay(data.events);
             this.updatePagination(data.current_page, data.pages);
         } catch (error) {
@@ -617,6 +748,62 @@ class SurveillanceDashboard {
         }
     }
 
+    async refreshEventLog() {
+        // The first page only fetches events newer than the newest one shown
+        if (this.currentPage !== 1 || this.latestEventId === null) {
+            await this.loadEventLog();
+            return;
+        }
+
+        try {
+            const params = this.eventLogParams();
+            params.append('since_id', this.latestEventId);
+            const response = await fetch(`/api/events?${params.toString()}`);
+            const data = await response.json();
+
+            if (data.truncated) {
+                this.eventPageCursors = {};
+                await this.loadEventLog();
+                return;
+            }
+            if (data.events.length === 0) {
+                return;
+            }
+
+            const tbody = document.getElementById('events-log-body');
+            if (!tbody) return;
+            data.events.slice().reverse().forEach(event => {
+                tbody.insertBefore(this.createEventRow(event), tbody.firstChild);
+            });
+            while (tbody.rows.length > 20) {
+                tbody.deleteRow(tbody.rows.length - 1);
+            }
+            this.latestEventId = data.latest_id;
+            this.eventPageCursors = {}; // Page boundaries moved
+        } catch (error) {
+            console.error('Error refreshing event log:', error);
+        }
+    }
+
+    createEventRow(event) {
+        const row = document.createElement('tr');
+        row.innerHTML = `
+            <td class="px-4 py-2">${new Date(event.timestamp).toLocaleString()}</td>
+            <td class="px-4 py-2">${event.track_id}</td>
+            <td class="px-4 py-2"><span class="px-2 py-1 rounded text-xs font-semibold bg-blue-100 text-blue-800">${event.event_type}</span></td>
+            <td class="px-4 py-2">${event.description}</td>
+            <td class="px-4 py-2">
+                <button class="bg-blue-500 hover:bg-blue-600 text-white px-2 py-1 rounded text-xs transition-colors" 
+                        onclick="dashboard.editEventDetails(${event.id})" 
+                        title="Add/Edit Details">
+                    <i class="fas fa-info-circle"></i>
+                </button>
+                ${event.user_notes ? `<span class="ml-2 text-red-500" title="Has user notes"><i class="fas fa-exclamation-triangle"></i></span>` : ''}
+            </td>
+        `;
+        return row;
+    }
+
     updateEventLogDisplay(events) {
         const tbody = document.getElementById('events-log-body');
         if (!tbody) {
@@ -629,22 +816,7 @@ class SurveillanceDashboard {
         // Debug log removed
 
         events.forEach(event => {
-            const row = document.createElement('tr');
-            row.innerHTML = `
-                <td class="px-4 py-2">${new Date(event.timestamp).toLocaleString()}</td>
-                <td class="px-4 py-2">${event.track_id}</td>
-                <td class="px-4 py-2"><span class="px-2 py-1 rounded text-xs font-semibold bg-blue-100 text-blue-800">${event.event_type}</span></td>
-                <td class="px-4 py-2">${event.description}</td>
-                <td class="px-4 py-2">
-                    <button class="bg-blue-500 hover:bg-blue-600 text-white px-2 py-1 rounded text-xs transition-colors" 
-                            onclick="dashboard.editEventDetails(${event.id})" 
-                            title="Add/Edit Details">
-                        <i class="fas fa-info-circle"></i>
-                    </button>
-                    ${event.user_notes ? `<span class="ml-2 text-red-500" title="Has user notes"><i class="fas fa-exclamation-triangle"></i></span>` : ''}
-                </td>
-            `;
-            tbody.appendChild(row);
+            tbody.appendChild(this.createEventRow(event));
         });
 
         // Debug log removed
@@ -683,25 +855,15 @@ class SurveillanceDashboard {
     }
 
     async filterEventLog() {
-        const startDate = document.getElementById('start-date').value;
-        const endDate = document.getElementById('end-date').value;
-        const eventType = document.getElementById('event-type-filter').value;
-
         // Debug log removed
         
         try {
-            // Build query parameters
-            const params = new URLSearchParams();
-            params.append('page', this.currentPage);
-            params.append('per_page', '20');
-            
-            if (startDate) params.append('start_date', startDate);
-            if (endDate) params.append('end_date', endDate);
-            if (eventType) params.append('event_type', eventType);
+            // Cursors belong to the previous filters
+            this.eventPageCursors = {};
+            this.latestEventId = null;
             
             // Make API call with filters
-            const response = await fetch(`/api/events?${params.toString()}`);
-            const data = await response.json();
+            const data = await this.fetchEventPage();
             
             // Update display with filtered results
             this.updateEventLogDisplay(data.events);
@@ -726,6 +888,8 @@ class SurveillanceDashboard {
         
         // Reset to page 1 and reload without filters
         this.currentPage = 1;
+        this.eventPageCursors = {};
+        this.latestEventId = null;
         this.loadEventLog();
         
         this.showNotification('Event log filters cleared', 'info');
@@ -1120,6 +1284,151 @@ class SurveillanceDashboard {
 
     // ...existing code...
 
+    trackSubscriptionFilter() {
+        // Map viewport and Active Tracks type filter, if any
+        const filter = {};
+        const viewport = window.mapManager ? window.mapManager.getViewport() : null;
+        if (viewport) {
+            filter.bbox = viewport.bbox;
+            filter.zoom = viewport.zoom;
+        }
+        const trackType = document.getElementById('track-type-filter')?.value || '';
+        if (trackType) {
+            filter.types = [trackType];
+        }
+        return filter;
+    }
+
+    subscribeTracks(resync = true) {
+        // Server replies with the missed deltas or a snapshot (unfiltered stream),
+        // or with a snapshot/filter-change delta (viewport or type filtered stream)
+        this.trackResyncPending = true;
+        this.socket.emit('subscribe_tracks', {
+            since: this.trackSeq,
+            resync: resync,
+            encoding: this.trackEncoding,
+            ack: true,
+            ...this.trackSubscriptionFilter()
+        });
+        this.trackStreamActive = true;
+    }
+
+    onTrackFilterChange() {
+        if (this.socket && this.socket.connected) {
+            this.subscribeTracks(false);
+        }
+    }
+
+    decodePackedTracks(buffer) {
+        // Packed track message (track_codec.py): header, vocabulary JSON, records
+        const view = new DataView(buffer);
+        const bytes = new Uint8Array(buffer);
+        const text = new TextDecoder();
+        const count = view.getUint32(8, true);
+        const vocabularyLength = view.getUint16(12, true);
+        const vocabulary = JSON.parse(text.decode(bytes.subarray(14, 14 + vocabularyLength)));
+        let pos = 14 + vocabularyLength;
+
+        const readString = () => {
+            const length = bytes[pos];
+            const value = text.decode(bytes.subarray(pos + 1, pos + 1 + length));
+            pos += 1 + length;
+            return value;
+        };
+        const number = (value) => Number.isNaN(value) ? null : value;
+        const time = (value) => Number.isNaN(value) ? null : new Date(value * 1000).toISOString();
+        const degrees = (value) => value === -2147483648 ? null : value / 1e7;
+        const word = (index) => index === 0xFF ? null : vocabulary[index];
+
+        const tracks = [];
+        for (let i = 0; i < count; i++) {
+            const track = {
+                latitude: degrees(view.getInt32(pos, true)),
+                longitude: degrees(view.getInt32(pos + 4, true)),
+                altitude: number(view.getFloat32(pos + 8, true)),
+                speed: number(view.getFloat32(pos + 12, true)),
+                heading: number(view.getFloat32(pos + 16, true)),
+                last_updated: time(view.getFloat64(pos + 20, true)),
+                created_at: time(view.getFloat64(pos + 28, true))
+            };
+            const id = view.getUint32(pos + 36, true);
+            track.id = id === 0xFFFFFFFF ? null : id;
+            track.track_type = word(bytes[pos + 40]);
+            track.type = track.track_type;
+            track.status = word(bytes[pos + 41]);
+            pos += 42;
+
+            track.track_id = readString();
+            if (bytes[pos] === 0xFF) {
+                track.callsign = track.track_id;
+                pos += 1;
+            } else if (bytes[pos] === 0xFE) {
+                track.callsign = null;
+                pos += 1;
+            } else {
+                track.callsign = readString();
+            }
+            tracks.push(track);
+        }
+        return tracks;
+    }
+
+    onTrackSnapshot(snapshot) {
+        if (snapshot.encoding === 'packed') {
+            snapshot = { seq: snapshot.seq, tracks: this.decodePackedTracks(snapshot.data) };
+        }
+        this.tracks.clear();
+        snapshot.tracks.forEach(track => {
+            this.tracks.set(track.track_id, track);
+        });
+        this.trackSeq = snapshot.seq;
+        this.trackResyncPending = false;
+
+        this.updateTracksDisplay();
+        this.updateMapWithCurrentFilters();
+    }
+
+    onTrackDelta(delta) {
+        if (delta.encoding === 'packed') {
+            // Added and updated tracks arrive as full records
+            delta = {
+                seq: delta.seq,
+                base: delta.base,
+                added: this.decodePackedTracks(delta.data),
+                updated: [],
+                removed: delta.removed
+            };
+        }
+        if (this.trackSeq !== null && delta.seq <= this.trackSeq) {
+            return; // Already applied
+        }
+        if (delta.base !== this.trackSeq) {
+            // Gap in the sequence: resync from a snapshot
+            if (!this.trackResyncPending) {
+                this.subscribeTracks();
+            }
+            return;
+        }
+
+        delta.removed.forEach(trackId => {
+            this.tracks.delete(trackId);
+        });
+        delta.added.forEach(track => {
+            this.tracks.set(track.track_id, track);
+        });
+        delta.updated.forEach(changes => {
+            const track = this.tracks.get(changes.track_id);
+            if (track) {
+                Object.assign(track, changes);
+            }
+        });
+        this.trackSeq = delta.seq;
+        this.trackResyncPending = false;
+
+        this.updateTracksDisplay();
+        this.updateMapWithCurrentFilters();
+    }
+
     onTrackUpdate(tracks) {
         // Debug log removed
         tracks.forEach(track => {
@@ -9,6 +9,8 @@ class MapManager {
         this.tracks = [];
         this.fullTrackList = []; // Keep a copy of the full track list for filtering
         this.showTrails = true; // ATAK-CIV style movement trails
+        this.viewportTimer = null; // Debounce for map-viewport-changed
+        this.cesiumViewportHooked = false;
 
         this.init();
     }
@@ -56,6 +58,40 @@ class MapManager {
 
         // Custom control for map info
         this.addMapInfoControl();
+
+        this.leafletMap.on('moveend', () => this.notifyViewportChange());
+    }
+
+    getViewport() {
+        // Visible area as {bbox: [west, south, east, north], zoom}, or null for the whole globe
+        if (this.is3DMode && window.advancedCesium && window.advancedCesium.viewer) {
+            const viewer = window.advancedCesium.viewer;
+            const rect = viewer.camera.computeViewRectangle(viewer.scene.globe.ellipsoid);
+            if (!rect) {
+                return null;
+            }
+            const height = Math.max(viewer.camera.positionCartographic.height, 1);
+            return {
+                bbox: [rect.west, rect.south, rect.east, rect.north].map(Cesium.Math.toDegrees),
+                zoom: Math.max(0, Math.log2(40075016 / height)) // approximate web map zoom
+            };
+        }
+        if (!this.leafletMap) {
+            return null;
+        }
+        // Padded so small pans do not push tracks in and out of the subscription
+        const bounds = this.leafletMap.getBounds().pad(0.2);
+        return {
+            bbox: [bounds.getWest(), bounds.getSouth(), bounds.getEast(), bounds.getNorth()],
+            zoom: this.leafletMap.getZoom()
+        };
+    }
+
+    notifyViewportChange() {
+        clearTimeout(this.viewportTimer);
+        this.viewportTimer = setTimeout(() => {
+            document.dispatchEvent(new CustomEvent('map-viewport-changed'));
+        }, 250);
     }
 
     initCesiumMap() {
@@ -504,6 +540,11 @@ class MapManager {
             // Debug log removed
             // Call show() method to trigger optimal view reset
             window.advancedCesium.show();
+            if (!this.cesiumViewportHooked) {
+                window.advancedCesium.viewer.camera.moveEnd.addEventListener(() => this.notifyViewportChange());
+                this.cesiumViewportHooked = true;
+            }
+            this.notifyViewportChange();
 
             setTimeout(() => {
                 try {
@@ -548,6 +589,7 @@ class MapManager {
         if (window.advancedCesium) {
             window.advancedCesium.hide();
         }
+        this.notifyViewportChange();
 
         // Refresh Leaflet map
         if (this.leafletMap) {
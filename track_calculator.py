@@ -13,6 +13,8 @@ Features:
 - Dynamic gating based on course model confidence
 - Multi-target tracking with advanced data association
 - Kalman filtering with course-aware prediction
+- Optional IMM filter engine (constant velocity, coordinated turn, constant
+  acceleration) with innovation-covariance association gates
 - Track quality assessment using course consistency
 
 Based on: "Plot-to-Track Association Using IGMM Course Modeling 
@@ -33,11 +35,18 @@ from collections import defaultdict
 
 # Import IGMM associator
 from igmm_track_associator import IGMMPlotTrackAssociator, IGMMTrackData
+from imm_filter import IMMFilter, create_motion_filter
+from track_history import PositionHistory, BoundedLog
+from geodesy import site_frame, polar_to_enu
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Per-track ring buffer sizes
+POSITION_HISTORY_LENGTH = 50   # positions kept for kinematics and display
+PLOT_LOG_LENGTH = 50           # most recent associated plot IDs
+
 
 class TrackState(Enum):
     """Track lifecycle states"""
@@ -47,7 +56,7 @@ class TrackState(Enum):
     TERMINATED = "terminated"    # Dead track
 
 
-@dataclass
+@dataclass(slots=True)
 class PlotData:
     """Individual radar plot/detection"""
     timestamp: datetime
@@ -66,7 +75,7 @@ class PlotData:
             self.plot_id = f"plot_{int(self.timestamp.timestamp()*1000000)}"
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackData:
     """Consolidated track information"""
     track_id: str
@@ -74,8 +83,8 @@ class TrackData:
     created_time: datetime
     last_update: datetime
     
-    # Position and kinematics
-    position_history: List[Tuple[float, float, datetime]] = field(default_factory=list)
+    # Position and kinematics (fixed-size ring buffer, oldest entries drop off)
+    position_history: PositionHistory = field(default_factory=lambda: PositionHistory(POSITION_HISTORY_LENGTH))
     velocity_x: float = 0.0     # m/s
     velocity_y: float = 0.0     # m/s
     speed_ms: float = 0.0       # Speed in m/s
@@ -89,12 +98,16 @@ class TrackData:
     # Track classification
     track_type: str = "Aircraft"  # Target type: Aircraft, Vehicle, Vessel
     
-    # Kalman filter state
+    # Kalman filter state (covariance allocated on first inline CV update;
+    # tracks with a motion_filter keep their covariance in the filter)
     state_vector: np.ndarray = field(default_factory=lambda: np.zeros(4))  # [x, y, vx, vy]
-    covariance_matrix: np.ndarray = field(default_factory=lambda: np.eye(4) * 1000)
+    covariance_matrix: Optional[np.ndarray] = None
+    
+    # Optional Kalman/IMM filter engine (replaces the inline CV filter when set)
+    motion_filter: Optional[IMMFilter] = None
     
-    # Associated plots
-    associated_plots: List[str] = field(default_factory=list)
+    # Most recent associated plot IDs (bounded log)
+    associated_plots: BoundedLog = field(default_factory=lambda: BoundedLog(PLOT_LOG_LENGTH))
     
     def __post_init__(self):
         if not hasattr(self, 'track_id') or not self.track_id:
@@ -121,7 +134,31 @@ class TrackCalculator:
             'course_weight': self.config.get('course_weight', 0.3),
             'position_weight': self.config.get('position_weight', 0.7),
             'confirmation_threshold': self.config.get('track_confirmation_threshold', 3),
-            'termination_threshold': self.config.get('track_termination_threshold', 5)
+            'termination_threshold': self.config.get('track_termination_threshold', 5),
+            'filter_engine': self.config.get('filter_engine', 'igmm'),
+            'gate_sigma': self.config.get('gate_sigma', 3.0),
+            'gate_chi2': self.config.get('gate_chi2', 9.21),
+            'gate_cell_size_m': self.config.get('gate_cell_size_m', 1000.0),
+            'process_noise_std': self.config.get('process_noise_std', 5.0),
+            'measurement_noise_std': self.config.get('measurement_noise_std', 10.0),
+            'imm_model_stay_probability': self.config.get('imm_model_stay_probability', 0.90),
+            'imm_max_turn_rate_deg': self.config.get('imm_max_turn_rate_deg', 6.0),
+            'imm_ca_jerk_std': self.config.get('imm_ca_jerk_std', 2.0),
+            'time_source': self.config.get('time_source', 'measurement'),
+            'track_id_start': self.config.get('track_id_start', 1),
+            'track_id_stride': self.config.get('track_id_stride', 1),
+            'coast_after_s': self.config.get('coast_after_s', 10.0),
+            'miss_interval_s': self.config.get('miss_interval_s', 1.0),
+            'association_engine': self.config.get('association_engine', 'nn'),
+            'jpda_detection_probability': self.config.get('jpda_detection_probability', 0.9),
+            'jpda_clutter_density': self.config.get('jpda_clutter_density', 1e-8),
+            'jpda_max_hypotheses': self.config.get('jpda_max_hypotheses', 1000),
+            'jpda_frame_s': self.config.get('jpda_frame_s', 2.0),
+            'track_initiation': self.config.get('track_initiation', 'm_of_n'),
+            'initiation_m': self.config.get('initiation_m', 3),
+            'initiation_n': self.config.get('initiation_n', 4),
+            'scan_period_s': self.config.get('scan_period_s'),
+            'max_speed_threshold': self.config.get('max_speed_threshold', 300.0)
         }
         
         # Initialize IGMM associator
@@ -140,9 +177,14 @@ class TrackCalculator:
         self.measurement_noise_std = self.config.get('measurement_noise_std', 10.0)
         self.time_delta = self.config.get('time_delta', 1.0)  # seconds
         
-        # Melbourne FL radar location (7800 Technology Drive)
-        self.radar_lat = 28.0836  # degrees
-        self.radar_lon = -80.6081  # degrees
+        # Filter engine: 'igmm' (inline CV Kalman for legacy path), 'cv' or 'imm'
+        self.filter_engine = igmm_config['filter_engine']
+        self.gate_sigma = igmm_config['gate_sigma']
+        
+        # Radar site (defaults to Melbourne FL, 7800 Technology Drive)
+        self.radar_lat = self.config.get('radar_lat', 28.0836)  # degrees
+        self.radar_lon = self.config.get('radar_lon', -80.6081)  # degrees
+        self.site = site_frame(self.radar_lat, self.radar_lon)  # shared WGS-84 tangent plane
         
         # Legacy storage for compatibility
         self.active_tracks: Dict[str, TrackData] = {}
@@ -164,71 +206,98 @@ class TrackCalculator:
         """
         Process a batch of plots using IGMM course modeling
         
+        The legacy track view (self.active_tracks) is maintained incrementally:
+        only tracks the associator touched in this batch are created, updated
+        or removed, and TrackData objects keep their identity between batches.
+        
         Args:
             plots: List of plot data to process
             
         Returns:
-            Dictionary of updated tracks
+            Dictionary of tracks created or updated by this batch
         """
         logger.info(f"Processing batch of {len(plots)} plots")
         
-        # Convert plots to IGMM format
+        # Convert plots to IGMM format (polar to cartesian for the whole batch at once)
         igmm_plots = []
-        for plot in plots:
-            # Convert polar to cartesian
-            x, y = self._polar_to_cartesian(plot.range_m, plot.azimuth_deg)
-            igmm_plots.append({
-                'x': x,
-                'y': y,
-                'timestamp': plot.timestamp
-            })
+        if plots:
+            xs, ys, _ = polar_to_enu(np.array([plot.range_m for plot in plots], dtype=float),
+                                     np.array([plot.azimuth_deg for plot in plots], dtype=float))
+            for plot, x, y in zip(plots, np.atleast_1d(xs).tolist(), np.atleast_1d(ys).tolist()):
+                igmm_plots.append({
+                    'x': x,
+                    'y': y,
+                    'timestamp': plot.timestamp
+                })
         
         # Process using IGMM associator
-        igmm_tracks = self.igmm_associator.process_plots(igmm_plots)
-        
-        # Convert IGMM tracks back to legacy format for compatibility
-        self.active_tracks = {}
-        for igmm_track in igmm_tracks:
-            if igmm_track.state in ["Confirmed", "Coasting"]:
-                # Set track state
-                if igmm_track.state == "Confirmed":
-                    track_state = TrackState.CONFIRMED
-                elif igmm_track.state == "Coasting":
-                    track_state = TrackState.COASTING
-                else:
-                    track_state = TrackState.TENTATIVE
-                
-                # Convert back to legacy TrackData format
-                track_data = TrackData(
-                    track_id=igmm_track.track_id,
-                    state=track_state,
-                    created_time=igmm_track.timestamp,
-                    last_update=igmm_track.timestamp,
-                    speed_ms=igmm_track.speed,
-                    heading_deg=igmm_track.heading,
-                    plot_count=igmm_track.plot_count,
-                    consecutive_misses=igmm_track.consecutive_misses,
-                    quality_score=igmm_track.quality_score
-                )
-                
-                # Set position in state vector [x, y, vx, vy]
-                track_data.state_vector[0] = igmm_track.x
-                track_data.state_vector[1] = igmm_track.y
-                track_data.velocity_x = igmm_track.speed * math.cos(math.radians(igmm_track.heading))
-                track_data.velocity_y = igmm_track.speed * math.sin(math.radians(igmm_track.heading))
-                track_data.state_vector[2] = track_data.velocity_x
-                track_data.state_vector[3] = track_data.velocity_y
-                
-                # Add to position history
-                track_data.position_history.append((igmm_track.x, igmm_track.y, igmm_track.timestamp))
-                
-                self.active_tracks[igmm_track.track_id] = track_data
+        self.igmm_associator.process_plots(igmm_plots)
+        
+        # Drop tracks the associator terminated
+        for track_id in self.igmm_associator.removed_track_ids:
+            if self.active_tracks.pop(track_id, None) is not None:
+                self.stats['tracks_terminated'] += 1
+        
+        # Sync only the tracks touched by this batch into the legacy view
+        updated_tracks = {}
+        for track_id in self.igmm_associator.updated_track_ids:
+            igmm_track = self.igmm_associator.tracks.get(track_id)
+            if igmm_track is None or igmm_track.state not in ["Confirmed", "Coasting"]:
+                continue
+            updated_tracks[track_id] = self._sync_igmm_track(igmm_track)
         
         # Update statistics
         self.stats['total_plots_processed'] += len(plots)
-        logger.info(f"IGMM batch processing complete. Active tracks: {len(self.active_tracks)}")
+        logger.info(f"IGMM batch processing complete. Active tracks: {len(self.active_tracks)}, "
+                    f"updated: {len(updated_tracks)}")
         
-        return self.active_tracks.copy()
+        return updated_tracks
+    
+    
+    def _sync_igmm_track(self, igmm_track: IGMMTrackData) -> TrackData:
+        """
+        Create or update the legacy TrackData for an IGMM track in place
+        
+        Args:
+            igmm_track: Track from the IGMM associator
+            
+        Returns:
+            The (persistent) legacy track
+        """
+        track_data = self.active_tracks.get(igmm_track.track_id)
+        if track_data is None:
+            created_time = igmm_track.position_history[0][2] if igmm_track.position_history else igmm_track.timestamp
+            track_data = TrackData(
+                track_id=igmm_track.track_id,
+                state=TrackState.CONFIRMED,
+                created_time=created_time,
+                last_update=igmm_track.timestamp
+            )
+            self.active_tracks[igmm_track.track_id] = track_data
+            self.stats['tracks_confirmed'] += 1
+        
+        track_data.state = TrackState.CONFIRMED if igmm_track.state == "Confirmed" else TrackState.COASTING
+        track_data.last_update = igmm_track.timestamp
+        track_data.speed_ms = igmm_track.speed
+        track_data.heading_deg = igmm_track.heading
+        track_data.plot_count = igmm_track.plot_count
+        track_data.consecutive_misses = igmm_track.consecutive_misses
+        track_data.quality_score = igmm_track.quality_score
+        
+        # Position and velocity in the state vector [x, y, vx, vy]
+        track_data.velocity_x = igmm_track.speed * math.cos(math.radians(igmm_track.heading))
+        track_data.velocity_y = igmm_track.speed * math.sin(math.radians(igmm_track.heading))
+        track_data.state_vector[0] = igmm_track.x
+        track_data.state_vector[1] = igmm_track.y
+        track_data.state_vector[2] = track_data.velocity_x
+        track_data.state_vector[3] = track_data.velocity_y
+        
+        # Extend history only with new measurements (coasting updates keep the last fix)
+        history = track_data.position_history
+        if not history or history[-1][2] != igmm_track.timestamp:
+            history.append((igmm_track.x, igmm_track.y, igmm_track.timestamp))
+        
+        return track_data
     
     
     def _process_single_plot(self, plot: PlotData):
@@ -281,7 +350,7 @@ class TrackCalculator:
             distance = math.sqrt((x - predicted_pos[0])**2 + (y - predicted_pos[1])**2)
             
             # Check if within association gate
-            if distance <= self._get_association_gate(track):
+            if distance <= self._get_association_gate(track, timestamp):
                 candidates.append(track)
         
         return candidates
@@ -331,8 +400,6 @@ class TrackCalculator:
         
         # Update track history
         track.position_history.append((x, y, plot.timestamp))
-        if len(track.position_history) > 50:  # Keep last 50 positions
-            track.position_history.pop(0)
         
         # Update track statistics
         track.plot_count += 1
@@ -340,6 +407,13 @@ class TrackCalculator:
         track.last_update = plot.timestamp
         track.associated_plots.append(plot.plot_id)
         
+        # Check for track confirmation
+        if (track.state == TrackState.TENTATIVE and 
+            track.plot_count >= self.track_confirmation_threshold):
+            track.state = TrackState.CONFIRMED
+            self.stats['tracks_confirmed'] += 1
+            logger.info(f"Track {track.track_id} confirmed")
+        
         # Calculate speed and heading
         self._calculate_kinematics(track)
         
@@ -367,7 +441,11 @@ class TrackCalculator:
         
         # Initialize Kalman filter state
         track.state_vector = np.array([x, y, 0.0, 0.0])  # [x, y, vx, vy]
-        track.covariance_matrix = np.eye(4) * 1000  # Initial uncertainty
+        
+        # Filter engine (CV or IMM) if configured
+        track.motion_filter = create_motion_filter(self.filter_engine, self.config)
+        if track.motion_filter is not None:
+            track.motion_filter.initialize(x, y)
         
         # Add initial position
         track.position_history.append((x, y, plot.timestamp))
@@ -395,6 +473,14 @@ class TrackCalculator:
         else:
             dt = self.time_delta
         
+        if track.motion_filter is not None:
+            # Configured filter engine handles prediction and update
+            track.motion_filter.step(x, y, dt)
+            track.state_vector = track.motion_filter.state[:4].copy()
+            track.velocity_x = track.state_vector[2]
+            track.velocity_y = track.state_vector[3]
+            return
+        
         # State transition matrix (constant velocity model)
         F = np.array([
             [1, 0, dt, 0],
@@ -420,6 +506,9 @@ class TrackCalculator:
         # Measurement noise covariance
         R = np.eye(2) * (self.measurement_noise_std ** 2)
         
+        if track.covariance_matrix is None:
+            track.covariance_matrix = np.eye(4) * 1000  # Initial uncertainty
+        
         # Predict
         predicted_state = F @ track.state_vector
         predicted_covariance = F @ track.covariance_matrix @ F.T + Q
@@ -459,6 +548,10 @@ class TrackCalculator:
             heading_rad = math.atan2(vx, vy)  # atan2(East, North)
             track.heading_deg = (math.degrees(heading_rad) + 360) % 360
         
+        # IMM/CV engines model manoeuvres themselves; no position-based override
+        if track.motion_filter is not None:
+            return
+        
         # Alternative calculation using position history for validation
         if len(track.position_history) >= 2:
             p1 = track.position_history[-2]
@@ -497,6 +590,10 @@ class TrackCalculator:
         last_time = track.position_history[-1][2]
         dt = (timestamp - last_time).total_seconds()
         
+        if track.motion_filter is not None and track.motion_filter.initialized:
+            predicted, _ = track.motion_filter.predict_measurement(dt)
+            return (float(predicted[0]), float(predicted[1]))
+        
         # Use Kalman filter state for prediction
         current_x, current_y = track.state_vector[0], track.state_vector[1]
         vx, vy = track.velocity_x, track.velocity_y
@@ -507,12 +604,13 @@ class TrackCalculator:
         return (predicted_x, predicted_y)
     
     
-    def _get_association_gate(self, track: TrackData) -> float:
+    def _get_association_gate(self, track: TrackData, timestamp: datetime | None = None) -> float:
         """
         Get association gate size for track
         
         Args:
             track: Track to get gate for
+            timestamp: Plot timestamp (sizes filter-based gates for the elapsed time)
             
         Returns:
             Gate size in meters
@@ -522,8 +620,16 @@ class TrackCalculator:
         # Adjust gate based on track quality and speed
         quality_factor = max(track.quality_score, 0.1)
         speed_factor = min(track.speed_ms / 50.0, 2.0)  # Larger gate for faster targets
+        legacy_gate = base_gate * (1.0 + speed_factor) / quality_factor
+        
+        if track.motion_filter is not None and track.motion_filter.initialized:
+            # Innovation-covariance gate over the time since the last update
+            dt = self.time_delta
+            if timestamp is not None and track.position_history:
+                dt = (timestamp - track.position_history[-1][2]).total_seconds()
+            return min(track.motion_filter.gate_radius(dt, self.gate_sigma), legacy_gate)
         
-        return base_gate * (1.0 + speed_factor) / quality_factor
+        return legacy_gate
     
     
     def _update_track_quality(self, track: TrackData):
@@ -553,73 +659,66 @@ class TrackCalculator:
         track.quality_score = max(track.quality_score, 0.1)
     
     
-    def _update_track_states(self):
-        """
-        Update track states based on recent activity
+    def _polar_to_cartesian(self, range_m: float, azimuth_deg: float) -> Tuple[float, float]:
         """
-        current_time = datetime.now()
+        Convert polar coordinates to cartesian
         
-        for track in self.active_tracks.values():
-            if track.state == TrackState.TERMINATED:
-                continue
-            
-            # Check for track confirmation
-            if (track.state == TrackState.TENTATIVE and 
-                track.plot_count >= self.track_confirmation_threshold):
-                track.state = TrackState.CONFIRMED
-                self.stats['tracks_confirmed'] += 1
-                logger.info(f"Track {track.track_id} confirmed")
+        Args:
+            range_m: Range in meters
+            azimuth_deg: Azimuth in degrees
             
-            # Check for coasting
-            time_since_update = (current_time - track.last_update).total_seconds()
-            if (time_since_update > self.coasting_threshold * self.time_delta and 
-                track.state == TrackState.CONFIRMED):
-                track.state = TrackState.COASTING
-                track.consecutive_misses += 1
-                logger.debug(f"Track {track.track_id} coasting")
+        Returns:
+            (x, y) coordinates in meters
+        """
+        x, y, _ = polar_to_enu(range_m, azimuth_deg)  # East, North
+        return (x, y)
     
     
-    def _perform_track_maintenance(self):
+    def get_state(self) -> Dict:
         """
-        Perform track maintenance - terminate old tracks
-        """
-        tracks_to_terminate = []
+        Get the full tracker state for a snapshot
         
-        for track_id, track in self.active_tracks.items():
-            # Terminate tracks with too many consecutive misses
-            if track.consecutive_misses >= self.track_termination_threshold:
-                tracks_to_terminate.append(track_id)
-            
-            # Terminate tentative tracks that haven't been confirmed
-            elif (track.state == TrackState.TENTATIVE and 
-                  track.plot_count < self.track_confirmation_threshold and
-                  track.consecutive_misses >= 3):
-                tracks_to_terminate.append(track_id)
+        Returns:
+            Dictionary with associator state, legacy track view and statistics
+        """
+        return {
+            'associator': self.igmm_associator.get_state(),
+            'active_tracks': self.active_tracks,
+            'terminated_tracks': self.terminated_tracks,
+            'stats': self.stats
+        }
+    
+    
+    def restore_state(self, state: Dict):
+        """
+        Restore tracker state produced by get_state
         
-        # Terminate selected tracks
-        for track_id in tracks_to_terminate:
-            track = self.active_tracks.pop(track_id)
-            track.state = TrackState.TERMINATED
-            self.terminated_tracks[track_id] = track
-            self.stats['tracks_terminated'] += 1
-            logger.info(f"Terminated track {track_id}")
+        Args:
+            state: Tracker state dictionary
+        """
+        self.igmm_associator.restore_state(state['associator'])
+        self.active_tracks = state['active_tracks']
+        self.terminated_tracks = state['terminated_tracks']
+        self.stats = state['stats']
+        self.config = dict(self.config, scan_period_s=self.igmm_associator.scan_period_s)
+        logger.info(f"Restored tracker state with {len(self.active_tracks)} active tracks")
     
     
-    def _polar_to_cartesian(self, range_m: float, azimuth_deg: float) -> Tuple[float, float]:
+    def set_scan_period(self, scan_period_s: float) -> bool:
         """
-        Convert polar coordinates to cartesian
+        Set the antenna rotation period reported by the radar (CAT-34 I034/041)
         
         Args:
-            range_m: Range in meters
-            azimuth_deg: Azimuth in degrees
+            scan_period_s: Antenna rotation period in seconds
             
         Returns:
-            (x, y) coordinates in meters
+            True if the tracker's scan period changed
         """
-        azimuth_rad = math.radians(azimuth_deg)
-        x = range_m * math.sin(azimuth_rad)  # East
-        y = range_m * math.cos(azimuth_rad)  # North
-        return (x, y)
+        if not self.igmm_associator.set_scan_period(scan_period_s):
+            return False
+        self.config = dict(self.config, scan_period_s=scan_period_s)
+        logger.info(f"Scan period set to {scan_period_s:.2f} s")
+        return True
     
     
     def get_track_summary(self) -> Dict:
@@ -648,61 +747,64 @@ class TrackCalculator:
         Returns:
             List of track dictionaries for display
         """
-        display_tracks = []
+        tracks = [track for track in self.active_tracks.values()
+                  if track.state != TrackState.TERMINATED and track.position_history]
+        if not tracks:
+            return []
         
-        for track in self.active_tracks.values():
-            if track.state == TrackState.TERMINATED:
-                continue
-            
-            # Get latest position
-            if track.position_history:
-                latest_pos = track.position_history[-1]
-                
-                # Convert back to lat/lon for display
-                lat, lon = self._cartesian_to_latlon(latest_pos[0], latest_pos[1])
-                
-                display_tracks.append({
-                    'track_id': track.track_id,
-                    'state': track.state.value,
-                    'latitude': lat,
-                    'longitude': lon,
-                    'speed_ms': track.speed_ms,
-                    'heading_deg': track.heading_deg,
-                    'plot_count': track.plot_count,
-                    'quality_score': track.quality_score,
-                    'last_update': track.last_update.isoformat(),
-                    'created_time': track.created_time.isoformat(),
-                    # Add fields expected by dashboard
-                    'track_type': track.track_type,  # Use actual track type
-                    'type': track.track_type,        # Alias for track_type
-                    'status': 'Active',              # All displayed tracks are active
-                    'callsign': None,                # Not available from radar tracks
-                    'altitude': None,                # Not available from 2D radar
-                    'speed': track.speed_ms,         # Alias for speed_ms
-                    'heading': track.heading_deg     # Alias for heading_deg
-                })
+        # Convert latest positions back to lat/lon for display in one vectorized call
+        latest = [track.position_history[-1] for track in tracks]
+        lats, lons = self._cartesian_to_latlon(np.array([pos[0] for pos in latest]),
+                                               np.array([pos[1] for pos in latest]))
         
-        return display_tracks
+        return [track_display_dict(track, lat, lon)
+                for track, lat, lon in zip(tracks, lats.tolist(), lons.tolist())]
     
     
     def _cartesian_to_latlon(self, x: float, y: float) -> Tuple[float, float]:
         """
-        Convert cartesian coordinates back to lat/lon
+        Convert cartesian coordinates back to lat/lon (WGS-84, radar tangent plane)
         
         Args:
-            x, y: Cartesian coordinates in meters
+            x, y: Cartesian coordinates in meters (scalars or arrays)
             
         Returns:
             (latitude, longitude) in degrees
         """
-        # Earth radius in meters
-        R = 6378137.0
-        
-        # Convert to lat/lon offset
-        lat_offset = y / R * 180.0 / math.pi
-        lon_offset = x / (R * math.cos(math.radians(self.radar_lat))) * 180.0 / math.pi
+        return self.site.plane_to_geodetic(x, y)
+
+
+def track_display_dict(track: TrackData, latitude: float, longitude: float) -> Dict:
+    """
+    Format a track for display
+    
+    Args:
+        track: Track to format
+        latitude, longitude: Display position in degrees
         
-        return (self.radar_lat + lat_offset, self.radar_lon + lon_offset)
+    Returns:
+        Track dictionary for the dashboard
+    """
+    return {
+        'track_id': track.track_id,
+        'state': track.state.value,
+        'latitude': latitude,
+        'longitude': longitude,
+        'speed_ms': track.speed_ms,
+        'heading_deg': track.heading_deg,
+        'plot_count': track.plot_count,
+        'quality_score': track.quality_score,
+        'last_update': track.last_update.isoformat(),
+        'created_time': track.created_time.isoformat(),
+        # Add fields expected by dashboard
+        'track_type': track.track_type,  # Use actual track type
+        'type': track.track_type,        # Alias for track_type
+        'status': 'Active',              # All displayed tracks are active
+        'callsign': None,                # Not available from radar tracks
+        'altitude': None,                # Not available from 2D radar
+        'speed': track.speed_ms,         # Alias for speed_ms
+        'heading': track.heading_deg     # Alias for heading_deg
+    }
 
 
 def create_default_config() -> Dict:
@@ -721,38 +823,74 @@ def create_default_config() -> Dict:
         'max_speed_threshold': 300.0,           # m/s
         'process_noise_std': 5.0,               # meters
         'measurement_noise_std': 10.0,          # meters
-        'time_delta': 1.0                       # seconds
+        'time_delta': 1.0,                      # seconds
+        'filter_engine': 'igmm',                # igmm, cv or imm
+        'gate_sigma': 3.0,                      # gate size in innovation std devs (legacy path)
+        'gate_chi2': 9.21,                      # Mahalanobis gate, chi-square 2 dof (99%)
+        'gate_cell_size_m': 1000.0,             # spatial index cell for gate lookups
+        'imm_model_stay_probability': 0.90,     # IMM Markov matrix diagonal
+        'imm_max_turn_rate_deg': 6.0,           # deg/s, coordinated turn model
+        'imm_ca_jerk_std': 2.0,                 # m/s^3, constant acceleration model
+        'time_source': 'measurement',           # measurement (plot time) or wall clock
+        # Track ageing follows measurement time: no plot for coast_after_s counts
+        # the first miss, then one more per miss_interval_s until the track passes
+        # track_termination_threshold. (Previously one miss was counted per
+        # processed batch once 10 s had passed, so ageing followed the batch rate.)
+        'coast_after_s': 10.0,                  # first miss after this long without a plot
+        'miss_interval_s': 1.0,                 # one further miss per interval until termination
+        'association_engine': 'nn',             # nn (nearest neighbour) or jpda
+        'jpda_detection_probability': 0.9,      # JPDA target detection probability
+        'jpda_clutter_density': 1e-8,           # JPDA false plots per m^2 per scan
+        'jpda_max_hypotheses': 1000,            # exact enumeration limit per cluster
+        'jpda_frame_s': 2.0,                    # JPDA frame length (below the scan period)
+        # M-of-N counts scans, so it needs the antenna rotation period: the track
+        # integrator takes it from CAT-34 north markers (I034/041) and plots start
+        # tracks immediately until one has been received
+        'track_initiation': 'm_of_n',           # m_of_n (candidate buffer) or immediate
+        'initiation_m': 3,                      # plots needed to start a track...
+        'initiation_n': 4,                      # ...within this many scans
+        'scan_period_s': None,                  # antenna rotation period (s), None until reported
+        'sector_batching': True,                # hand plots to the tracker per antenna sector
+        'sector_count': 16,                     # azimuth sectors per antenna scan
+        'sharded_tracking': False,              # one tracker process per azimuth/range shard
+        'shard_azimuth_sectors': 4,             # azimuth shards
+        'shard_range_boundaries_m': [],         # range ring boundaries in meters
+        'handoff_lookahead_s': 4.0,             # hand off tracks predicted to cross a shard boundary
+        'handoff_margin_m': 500.0,              # plots this close to a track follow its shard
+        'radar_lat': 28.0836,                   # radar site (Melbourne FL)
+        'radar_lon': -80.6081,
+        'multi_sensor_fusion': False,           # track per radar (by sensor_id) and fuse with ADS-B
+        'fusion_sensors': [],                   # SensorSite fields of each fused sensor
+        'snapshot_interval_s': 30.0,            # periodic tracker snapshots (0 = only on shutdown)
+        'snapshot_path': None                   # default: tracker_snapshot.pkl next to the database
     }
 
 
 if __name__ == "__main__":
     # Example usage
     config = create_default_config()
+    config['scan_period_s'] = 4.0  # as a CAT-34 north marker would report it
     tracker = TrackCalculator(config)
     
-    # Create sample plots
-    sample_plots = [
-        PlotData(
-            timestamp=datetime.now(),
-            range_m=5000,
-            azimuth_deg=45,
-            latitude=28.1,
-            longitude=-80.6
-        ),
-        PlotData(
-            timestamp=datetime.now() + timedelta(seconds=1),
-            range_m=5100,
-            azimuth_deg=46,
-            latitude=28.11,
-            longitude=-80.59
-        )
+    # One target moving outbound, one plot per antenna scan; with the default
+    # M-of-N initiation a track starts once initiation_m of initiation_n scans hit
+    start = datetime.now()
+    sample_scans = [
+        [PlotData(
+            timestamp=start + timedelta(seconds=scan * config['scan_period_s']),
+            range_m=5000 + scan * 400,
+            azimuth_deg=45
+        )]
+        for scan in range(6)
     ]
     
-    # Process plots
-    tracks = tracker.process_plot_batch(sample_plots)
+    # Process plots scan by scan
+    for scan_plots in sample_scans:
+        tracker.process_plot_batch(scan_plots)
+    tracks = tracker.active_tracks
     
     # Print results
-    print(f"Processed {len(sample_plots)} plots")
+    print(f"Processed {sum(len(plots) for plots in sample_scans)} plots in {len(sample_scans)} scans")
     print(f"Active tracks: {len(tracks)}")
     
     for track in tracks.values():
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Track Cluster Aggregation
+Per-cell track counts, type mix, centroid and representative tracks for
+zoomed-out map views.
+
+Cells are web-mercator tiles: at map zoom z a cell is the tile at level
+z + cell_bits, i.e. (2^cell_bits)^2 cells per 256 px map tile. Aggregates are
+kept for every zoom from 0 to max_zoom and updated from live picture deltas,
+so a track change touches one cell per zoom and a cluster request reads only
+the occupied cells at its zoom: O(cells), not O(tracks).
+"""
+
+import logging
+import math
+import threading
+from itertools import islice
+from typing import Dict, List, Optional, Tuple
+
+from live_picture import LiveSnapshot
+from track_subscriptions import BoundingBox, bbox_parts
+
+logger = logging.getLogger(__name__)
+
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def tile_xy(latitude: float, longitude: float, level: int) -> Tuple[int, int]:
+    """Web-mercator tile containing a position at a tile level"""
+    n = 1 << level
+    latitude = max(min(latitude, MAX_MERCATOR_LAT), -MAX_MERCATOR_LAT)
+    lat_rad = math.radians(latitude)
+    x = int((longitude + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+class ClusterCell:
+    """Aggregate of the tracks in one cell"""
+
+    __slots__ = ('count', 'types', 'sum_lat', 'sum_lon', 'members')
+
+    def __init__(self):
+        self.count = 0
+        self.types: Dict[str, int] = {}
+        self.sum_lat = 0.0
+        self.sum_lon = 0.0
+        self.members: Dict[str, None] = {}  # insertion-ordered set of track IDs
+
+
+class ClusterIndex:
+    """
+    Incrementally maintained per-zoom cell aggregates of the live picture
+    """
+
+    def __init__(self, max_zoom: int = 12, cell_bits: int = 3, representatives: int = 3):
+        """
+        Initialize index
+
+        Args:
+            max_zoom: Highest map zoom aggregated (closer views get individual tracks)
+            cell_bits: Cells per map tile side as a power of two
+            representatives: Tracks returned per cell
+        """
+        self.max_zoom = max_zoom
+        self.cell_bits = cell_bits
+        self.representatives = representatives
+        self.levels: List[Dict[Tuple[int, int], ClusterCell]] = [{} for _ in range(max_zoom + 1)]
+        self.placed: Dict[str, Tuple[int, int, str, float, float]] = {}  # track_id -> (x, y, type, lat, lon) at max_zoom
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def _place(self, track_id: str, track: Dict):
+        latitude, longitude = track.get('latitude'), track.get('longitude')
+        if latitude is None or longitude is None:
+            return
+        track_type = track.get('track_type') or 'Unknown'
+        x, y = tile_xy(latitude, longitude, self.max_zoom + self.cell_bits)
+        self.placed[track_id] = (x, y, track_type, latitude, longitude)
+        for zoom in range(self.max_zoom, -1, -1):
+            shift = self.max_zoom - zoom
+            cell = self.levels[zoom].get((x >> shift, y >> shift))
+            if cell is None:
+                cell = self.levels[zoom][(x >> shift, y >> shift)] = ClusterCell()
+            cell.count += 1
+            cell.types[track_type] = cell.types.get(track_type, 0) + 1
+            cell.sum_lat += latitude
+            cell.sum_lon += longitude
+            cell.members[track_id] = None
+
+    def _unplace(self, track_id: str):
+        placed = self.placed.pop(track_id, None)
+        if placed is None:
+            return
+        x, y, track_type, latitude, longitude = placed
+        for zoom in range(self.max_zoom, -1, -1):
+            shift = self.max_zoom - zoom
+            key = (x >> shift, y >> shift)
+            cell = self.levels[zoom][key]
+            cell.count -= 1
+            if not cell.count:
+                del self.levels[zoom][key]
+                continue
+            cell.types[track_type] -= 1
+            if not cell.types[track_type]:
+                del cell.types[track_type]
+            cell.sum_lat -= latitude
+            cell.sum_lon -= longitude
+            del cell.members[track_id]
+
+    def rebuild(self, snapshot: LiveSnapshot):
+        """Aggregate a whole snapshot from scratch"""
+        with self.lock:
+            self.levels = [{} for _ in range(self.max_zoom + 1)]
+            self.placed = {}
+            for track_id, track in snapshot.tracks.items():
+                self._place(track_id, track)
+            self.version = snapshot.version
+
+    def apply(self, snapshot: LiveSnapshot):
+        """
+        Apply a snapshot's delta (live picture listener)
+
+        Falls back to a rebuild when the delta does not follow the aggregated version.
+        """
+        delta = snapshot.delta
+        if not delta or delta['base'] != self.version:
+            self.rebuild(snapshot)
+            return
+
+        with self.lock:
+            for track_id in delta['removed']:
+                self._unplace(track_id)
+            changed = [track['track_id'] for track in delta['added']] + [
+                changes['track_id'] for changes in delta['updated']
+                if {'latitude', 'longitude', 'track_type'} & changes.keys()]
+            for track_id in changed:
+                self._unplace(track_id)
+                self._place(track_id, snapshot.tracks[track_id])
+            self.version = snapshot.version
+
+    def clusters(self, zoom: int, snapshot: LiveSnapshot, bbox: Optional[BoundingBox] = None) -> List[Dict]:
+        """
+        Cells occupied at a map zoom
+
+        Args:
+            zoom: Map zoom (clamped to 0..max_zoom)
+            snapshot: Current snapshot, for representative track details
+            bbox: Optional area to limit the cells to
+
+        Returns:
+            One dict per occupied cell with tile coordinates, count, type mix,
+            centroid and up to `representatives` track dicts
+        """
+        if self.version < snapshot.version:
+            self.rebuild(snapshot)  # never aggregated, or a listener failed
+        zoom = max(0, min(zoom, self.max_zoom))
+        level = zoom + self.cell_bits
+
+        with self.lock:
+            cells = self.levels[zoom]
+            if bbox is None:
+                keys = list(cells)
+            else:
+                keys = []
+                for west, south, east, north in bbox_parts(bbox):
+                    min_x, min_y = tile_xy(north, west, level)
+                    max_x, max_y = tile_xy(south, east, level)
+                    if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+                        keys.extend(key for key in cells if min_x <= key[0] <= max_x and min_y <= key[1] <= max_y)
+                    else:
+                        keys.extend(key for key in ((x, y) for x in range(min_x, max_x + 1)
+                                                    for y in range(min_y, max_y + 1)) if key in cells)
+
+            result = []
+            for x, y in keys:
+                cell = cells[(x, y)]
+                result.append({
+                    'x': x,
+                    'y': y,
+                    'level': level,
+                    'count': cell.count,
+                    'types': dict(cell.types),
+                    'latitude': cell.sum_lat / cell.count,
+                    'longitude': cell.sum_lon / cell.count,
+                    'tracks': [snapshot.tracks[track_id] for track_id in islice(cell.members, self.representatives)
+                               if track_id in snapshot.tracks]
+                })
+            return result
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Packed Binary Track Encoding
+Compact alternative to JSON track lists for REST and Socket.IO feeds,
+negotiated per client ('application/x-track-packed' / encoding 'packed').
+
+Message layout (little-endian):
+
+    magic     4s   b'TRK1'
+    seq       I    live picture / subscription sequence number
+    count     I    number of track records
+    vocab_len H    length of the vocabulary JSON
+    vocab          JSON array of track type and status strings
+    records        count x record
+
+Record:
+
+    latitude, longitude    i, i   1e-7 degrees (INT32_MIN = null)
+    altitude, speed, heading  f, f, f   (NaN = null)
+    last_updated, created_at  d, d   epoch seconds UTC (NaN = null)
+    id                     I      database row ID (0xFFFFFFFF = null)
+    track_type, status     B, B   vocabulary indices (0xFF = null)
+    track_id               B + UTF-8
+    callsign               B + UTF-8 (length 0xFF = same as track_id, 0xFE = null)
+
+Records are encoded once per track dict and cached, so encoding a picture is
+a join of cached bytes plus the records of tracks that changed.
+"""
+
+import json
+import math
+import struct
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PACKED_MIME = 'application/x-track-packed'
+MAGIC = b'TRK1'
+
+_HEADER = struct.Struct('<4sIIH')
+_FIXED = struct.Struct('<iifffddIBB')
+_NULL_INT = -2 ** 31
+_NULL_ID = 0xFFFFFFFF
+_NULL_INDEX = 0xFF
+_SAME_AS_ID = 0xFF
+_NULL_STRING = 0xFE
+_MAX_STRING = 0xFD
+_NAN = float('nan')
+
+
+def _epoch(value) -> float:
+    """ISO timestamp (naive = UTC) or datetime -> epoch seconds, NaN if absent"""
+    if not value:
+        return _NAN
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return _NAN
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _iso(value: float) -> Optional[str]:
+    return None if math.isnan(value) else datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+def _float(value) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _degrees(value) -> int:
+    return _NULL_INT if value is None else int(round(float(value) * 1e7))
+
+
+def _string(value: str) -> bytes:
+    encoded = value.encode('utf-8')[:_MAX_STRING]
+    return bytes((len(encoded),)) + encoded
+
+
+class PackedTrackEncoder:
+    """
+    Encodes track dicts (Track.to_dict() shape) into packed messages
+    """
+
+    def __init__(self):
+        self.vocabulary: List[str] = []
+        self._vocabulary_index: Dict[str, int] = {}
+        self._records: Dict[str, Tuple[Dict, bytes]] = {}  # track_id -> (track dict, encoded record)
+
+    def _index(self, value) -> int:
+        if value is None:
+            return _NULL_INDEX
+        index = self._vocabulary_index.get(value)
+        if index is None:
+            if len(self.vocabulary) >= _NULL_INDEX:
+                return _NULL_INDEX
+            index = self._vocabulary_index[value] = len(self.vocabulary)
+            self.vocabulary.append(value)
+        return index
+
+    def _record(self, track: Dict) -> bytes:
+        track_id = str(track['track_id'])
+        cached = self._records.get(track_id)
+        if cached is not None and cached[0] is track:
+            return cached[1]
+
+        callsign = track.get('callsign')
+        record = _FIXED.pack(
+            _degrees(track.get('latitude')),
+            _degrees(track.get('longitude')),
+            _float(track.get('altitude')),
+            _float(track.get('speed')),
+            _float(track.get('heading')),
+            _epoch(track.get('last_updated')),
+            _epoch(track.get('created_at')),
+            _NULL_ID if track.get('id') is None else track['id'] & 0xFFFFFFFF,
+            self._index(track.get('track_type')),
+            self._index(track.get('status'))
+        ) + _string(track_id)
+        if callsign is None:
+            record += bytes((_NULL_STRING,))
+        elif callsign == track_id:
+            record += bytes((_SAME_AS_ID,))
+        else:
+            record += _string(str(callsign))
+
+        self._records[track_id] = (track, record)
+        return record
+
+    def encode(self, tracks: Iterable[Dict], seq: int = 0) -> bytes:
+        """
+        Packed message for a list of tracks
+
+        Args:
+            tracks: Track dicts; the same dict objects as in earlier calls reuse their records
+            seq: Sequence number carried in the header
+
+        Returns:
+            Message bytes
+        """
+        records = [self._record(track) for track in tracks]
+        vocabulary = json.dumps(self.vocabulary, separators=(',', ':')).encode('utf-8')
+        return _HEADER.pack(MAGIC, seq, len(records), len(vocabulary)) + vocabulary + b''.join(records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def prune(self, live_track_ids):
+        """Forget cached records of tracks no longer in the picture"""
+        live_track_ids = set(live_track_ids)
+        for track_id in [track_id for track_id in list(self._records) if track_id not in live_track_ids]:
+            self._records.pop(track_id, None)
+
+
+def decode_packed(data: bytes) -> Tuple[int, List[Dict]]:
+    """
+    Decode a packed message
+
+    Returns:
+        (seq, track dicts in Track.to_dict() shape, with 'type' mirroring 'track_type')
+    """
+    magic, seq, count, vocabulary_length = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a packed track message")
+    position = _HEADER.size
+    vocabulary = json.loads(data[position:position + vocabulary_length])
+    position += vocabulary_length
+
+    def string(at: int) -> Tuple[str, int]:
+        length = data[at]
+        return data[at + 1:at + 1 + length].decode('utf-8', 'replace'), at + 1 + length
+
+    tracks = []
+    for _ in range(count):
+        (latitude, longitude, altitude, speed, heading, last_updated, created_at,
+         row_id, type_index, status_index) = _FIXED.unpack_from(data, position)
+        track_id, position = string(position + _FIXED.size)
+        if data[position] == _SAME_AS_ID:
+            callsign, position = track_id, position + 1
+        elif data[position] == _NULL_STRING:
+            callsign, position = None, position + 1
+        else:
+            callsign, position = string(position)
+
+        track_type = None if type_index == _NULL_INDEX else vocabulary[type_index]
+        tracks.append({
+            'id': None if row_id == _NULL_ID else row_id,
+            'track_id': track_id,
+            'callsign': callsign,
+            'track_type': track_type,
+            'type': track_type,
+            'latitude': None if latitude == _NULL_INT else latitude / 1e7,
+            'longitude': None if longitude == _NULL_INT else longitude / 1e7,
+            'altitude': None if math.isnan(altitude) else altitude,
+            'heading': None if math.isnan(heading) else heading,
+            'speed': None if math.isnan(speed) else speed,
+            'status': None if status_index == _NULL_INDEX else vocabulary[status_index],
+            'last_updated': _iso(last_updated),
+            'created_at': _iso(created_at)
+        })
+    return seq, tracks
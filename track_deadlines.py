@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Track Deadline Scheduler
+Min-heap of per-track deadlines (coast, miss, terminate) so track ageing only
+touches tracks whose deadline has passed instead of scanning every track on
+every batch.
+
+Rescheduling a track pushes a new heap entry and leaves the old one in place;
+stale entries are recognised by their sequence number no longer being the
+key's live entry and are skipped when they reach the top of the heap (lazy
+invalidation). The heap is rebuilt when stale entries outnumber live ones.
+"""
+
+import heapq
+from datetime import datetime
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class DeadlineScheduler:
+    """Earliest-deadline-first schedule with at most one live deadline per key"""
+
+    def __init__(self, compact_ratio: int = 4):
+        """
+        Initialize scheduler
+
+        Args:
+            compact_ratio: Rebuild the heap when it holds this many entries per live key
+        """
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._live: Dict[Hashable, Tuple[datetime, int]] = {}  # key -> (deadline, entry sequence)
+        self._next_sequence = 0  # plain int so schedulers can be pickled in snapshots
+        self.compact_ratio = compact_ratio
+
+    def schedule(self, key: Hashable, deadline: datetime):
+        """Set (or move) the deadline for a key"""
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._live[key] = (deadline, sequence)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+
+        if len(self._heap) > self.compact_ratio * max(16, len(self._live)):
+            self._compact()
+
+    def cancel(self, key: Hashable):
+        """Remove a key's deadline (its heap entry becomes stale)"""
+        self._live.pop(key, None)
+
+    def deadline_of(self, key: Hashable) -> Optional[datetime]:
+        """Current deadline for a key, or None"""
+        entry = self._live.get(key)
+        return entry[0] if entry else None
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Earliest live deadline, or None"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_expired(self, now: datetime) -> Iterator[Tuple[Hashable, datetime]]:
+        """
+        Yield (key, deadline) for every deadline strictly before now, earliest first
+
+        Keys may be rescheduled while iterating; a new deadline that is also
+        before now is yielded in the same pass.
+        """
+        while True:
+            self._discard_stale()
+            if not self._heap or not self._heap[0][0] < now:
+                return
+            deadline, _, key = heapq.heappop(self._heap)
+            del self._live[key]
+            yield key, deadline
+
+    def clear(self):
+        """Remove all deadlines"""
+        self._heap = []
+        self._live = {}
+
+    def _is_stale(self, entry: Tuple[datetime, int, Hashable]) -> bool:
+        _, sequence, key = entry
+        live = self._live.get(key)
+        return live is None or live[1] != sequence
+
+    def _discard_stale(self):
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._live
@@ -26,18 +26,21 @@ background_thread = None  # Removed global cache usage (database-only dataflow)
 background_running = False
 
 
-def initialize_tracking():
+def initialize_tracking(db_path: str = "instance/surveillance.db"):
     """
     Initialize the tracking system
+    
+    Args:
+        db_path: Path to surveillance database
     """
     global track_integrator
     
     try:
         # Create database schema
-        create_database_schema()
+        create_database_schema(db_path)
         
         # Initialize track integrator
-        track_integrator = TrackIntegrator()
+        track_integrator = TrackIntegrator(db_path)
         
         logger.info("Track calculator initialized successfully")
         return True
@@ -58,9 +61,8 @@ def background_tracking_worker():
     while background_running:
         try:
             if track_integrator:
-                # Process new data
-                # Process new data (database-only dataflow)
-                # result = track_integrator.process_new_data()
+                # Process new plot and CAT-34 events from the database
+                result = track_integrator.process_new_data()
                 
                 if result['status'] == 'success' and result['processed'] > 0:
                     logger.info(f"Processed {result['processed']} plots, "
@@ -87,7 +89,7 @@ def start_background_tracking():
     background_running = True
     background_thread = threading.Thread(target=background_tracking_worker, daemon=True)
     background_thread.start()
-                # Removed result usage (database-only dataflow)
+    logger.info("Background tracking started")
 
 def stop_background_tracking():
     """
@@ -99,6 +101,10 @@ def stop_background_tracking():
     if background_thread:
         background_thread.join(timeout=2.0)
     
+    # Final snapshot for a warm restart
+    if track_integrator:
+        track_integrator.save_snapshot()
+    
     logger.info("Background tracking stopped")
 
 
@@ -164,11 +170,11 @@ def setup_track_calculator_routes(app):
         Manually trigger track processing
         """
         try:
+            if not track_integrator:
+                return jsonify({'error': 'Track calculator not initialized'}), 500
+            
+            result = track_integrator.process_new_data()
             return jsonify({
-                'success': True,
-                'message': 'Track processing is now database-only. No direct backend result.',
-                'timestamp': datetime.now().isoformat()
-            })
                 'success': True,
                 'result': result,
                 'timestamp': datetime.now().isoformat()
@@ -269,6 +275,25 @@ def setup_track_calculator_routes(app):
             return jsonify({'error': str(e)}), 500
 
 
+def app_database_path(app) -> str:
+    """
+    SQLite file of the app's SQLAlchemy database
+    
+    Args:
+        app: Flask application instance
+        
+    Returns:
+        Database file path (the default path if the app has no SQLite database)
+    """
+    extension = app.extensions.get('sqlalchemy')
+    if extension is not None:
+        with app.app_context():
+            url = extension.engine.url
+        if url.get_backend_name() == 'sqlite' and url.database:
+            return url.database
+    return "instance/surveillance.db"
+
+
 def initialize_track_calculator_app(app):
     """
     Initialize track calculator integration with Flask app
@@ -278,8 +303,8 @@ def initialize_track_calculator_app(app):
     """
     logger.info("Initializing track calculator integration")
     
-    # Initialize tracking system
-    if not initialize_tracking():
+    # Initialize tracking system on the app's database (DATABASE_URL)
+    if not initialize_tracking(app_database_path(app)):
         logger.error("Failed to initialize tracking system")
         return False
     
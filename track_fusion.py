@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+"""
+Multi-Sensor Track Fusion
+Fuses local tracks from several radars (each tracked by its own
+TrackCalculator in that radar's tangent plane) and ADS-B reports into system
+tracks in a common ENU frame.
+
+- Local tracks are converted radar polar -> radar ENU -> ECEF -> system ENU
+  with WGS-84 geodesy, after removing the radar's estimated bias.
+- Local tracks are associated to system tracks by a chi-square gate on the
+  position difference; once associated, the pairing is kept while it stays
+  within a wider gate. Single-sensor system tracks merge into a gated
+  multi-sensor track as soon as one exists.
+- System track state is the inverse-variance weighted combination of its
+  contributing local tracks (cross-correlation between sensors is ignored).
+- Radar range and azimuth biases are estimated from system tracks that also
+  hold a reference contribution (ADS-B or a sensor flagged as reference).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Tuple, Iterable, Any
+import logging
+import math
+
+import numpy as np
+
+from geodesy import LocalTangentPlane, polar_to_enu, enu_to_polar
+from track_calculator import TrackCalculator, TrackData, PlotData, create_default_config
+from track_deadlines import DeadlineScheduler
+from tracking_clock import to_naive_utc
+
+logger = logging.getLogger(__name__)
+
+FEET_TO_METERS = 0.3048
+
+
+@dataclass
+class SensorSite:
+    """Sensor location and accuracy"""
+    sensor_id: str
+    latitude: float
+    longitude: float
+    altitude_m: float = 0.0
+    sensor_type: str = "radar"          # radar or adsb
+    range_noise_m: float = 50.0         # radar range accuracy (1 sigma)
+    azimuth_noise_deg: float = 0.1      # radar azimuth accuracy (1 sigma)
+    position_noise_m: float = 30.0      # accuracy of position-reporting sensors (ADS-B)
+    reference: bool = False             # treat as unbiased for bias estimation
+
+
+@dataclass
+class SensorBias:
+    """Estimated systematic radar error"""
+    range_m: float = 0.0
+    azimuth_deg: float = 0.0
+    samples: int = 0
+
+
+@dataclass
+class LocalTrack:
+    """Latest state of one sensor's track, in the system frame"""
+    sensor_id: str
+    local_id: str
+    east: float
+    north: float
+    vel_east: float
+    vel_north: float
+    variance: float
+    timestamp: datetime
+    altitude_m: Optional[float] = None
+    raw_range_m: Optional[float] = None        # radar measurement before bias correction
+    raw_azimuth_deg: Optional[float] = None
+    system_track_id: Optional[str] = None
+
+
+@dataclass
+class SystemTrack:
+    """Fused track across sensors"""
+    system_track_id: str
+    east: float
+    north: float
+    vel_east: float
+    vel_north: float
+    variance: float
+    last_update: datetime
+    altitude_m: Optional[float] = None
+    created_time: Optional[datetime] = None
+    contributors: Dict[str, str] = field(default_factory=dict)  # sensor_id -> local_id
+
+
+class TrackFusionEngine:
+    """
+    Multi-radar / ADS-B fusion into system tracks
+    """
+
+    def __init__(self, config: Dict | None = None):
+        """
+        Initialize fusion engine
+
+        Args:
+            config: Fusion configuration. 'sensors' is a list of SensorSite
+                field dicts; 'fusion_origin' ({'latitude', 'longitude',
+                'altitude_m'}) defaults to the first sensor.
+        """
+        self.config = config or {}
+
+        self.gate_chi2 = self.config.get('fusion_gate_chi2', 9.21)          # 99% for 2 DOF
+        self.release_chi2 = self.config.get('fusion_release_chi2', 36.0)    # keep pairing up to 6 sigma
+        self.bias_alpha = self.config.get('bias_alpha', 0.05)
+        self.bias_min_samples = self.config.get('bias_min_samples', 10)
+        self.local_track_timeout_s = self.config.get('local_track_timeout_s', 20.0)
+        self.tracker_config = self.config.get('tracker_config') or create_default_config()
+
+        self.sensors: Dict[str, SensorSite] = {}
+        self.frames: Dict[str, LocalTangentPlane] = {}
+        self.biases: Dict[str, SensorBias] = {}
+        self.trackers: Dict[str, TrackCalculator] = {}
+
+        for sensor in self.config.get('sensors', []):
+            self.add_sensor(SensorSite(**sensor))
+
+        origin = self.config.get('fusion_origin')
+        if origin:
+            self.system_frame = LocalTangentPlane(origin['latitude'], origin['longitude'],
+                                                  origin.get('altitude_m', 0.0))
+        elif self.sensors:
+            first = next(iter(self.sensors.values()))
+            self.system_frame = LocalTangentPlane(first.latitude, first.longitude, first.altitude_m)
+        else:
+            raise ValueError("Fusion needs at least one sensor or a fusion_origin")
+
+        self.local_tracks: Dict[Tuple[str, str], LocalTrack] = {}
+        self.system_tracks: Dict[str, SystemTrack] = {}
+        self.next_system_id = 1
+        self.deadlines = DeadlineScheduler()
+
+        # System tracks changed / removed by the last update call
+        self.updated_system_ids: set = set()
+        self.removed_system_ids: set = set()
+
+        self.stats = {
+            'local_updates': 0,
+            'system_tracks_created': 0,
+            'associations': 0,
+            'releases': 0
+        }
+
+        logger.info(f"Track fusion initialized with {len(self.sensors)} sensors")
+
+    def add_sensor(self, site: SensorSite):
+        """Register a sensor and its tangent plane"""
+        self.sensors[site.sensor_id] = site
+        self.frames[site.sensor_id] = LocalTangentPlane(site.latitude, site.longitude, site.altitude_m)
+        self.biases.setdefault(site.sensor_id, SensorBias())
+
+    def _tracker_for(self, sensor_id: str) -> TrackCalculator:
+        tracker = self.trackers.get(sensor_id)
+        if tracker is None:
+            site = self.sensors[sensor_id]
+            config = dict(self.tracker_config)
+            config['radar_lat'] = site.latitude
+            config['radar_lon'] = site.longitude
+            tracker = TrackCalculator(config)
+            self.trackers[sensor_id] = tracker
+        return tracker
+
+    def set_scan_period(self, sensor_id: str, scan_period_s: float) -> bool:
+        """Set a radar's reported antenna rotation period on its local tracker"""
+        site = self.sensors.get(sensor_id)
+        if site is None or site.sensor_type == 'adsb':
+            return False
+        return self._tracker_for(sensor_id).set_scan_period(scan_period_s)
+
+    # ------------------------------------------------------------------
+    # Sensor input
+    # ------------------------------------------------------------------
+
+    def process_radar_plots(self, sensor_id: str, plots: List[PlotData]) -> List[str]:
+        """
+        Track one radar's plots locally, then fuse the updated local tracks
+
+        Args:
+            sensor_id: Radar sensor ID
+            plots: Plots from that radar (range/azimuth relative to its site)
+
+        Returns:
+            IDs of system tracks changed by this update
+        """
+        tracker = self._tracker_for(sensor_id)
+        updated = tracker.process_plot_batch(plots)
+        removed = tracker.igmm_associator.removed_track_ids
+        current_time = tracker.igmm_associator.clock.now()
+        return self.update_radar_tracks(sensor_id, updated.values(), removed, current_time)
+
+    def update_radar_tracks(self, sensor_id: str, tracks: Iterable[TrackData],
+                            removed_ids: Iterable[str] = (),
+                            current_time: Optional[datetime] = None) -> List[str]:
+        """
+        Fuse local radar tracks (TrackData in the radar's own ENU plane)
+
+        Args:
+            sensor_id: Radar sensor ID
+            tracks: Created or updated local tracks
+            removed_ids: Local tracks the radar tracker terminated
+            current_time: Tracker time, used to expire stale local tracks
+
+        Returns:
+            IDs of system tracks changed by this update
+        """
+        self._begin_update()
+        site = self.sensors[sensor_id]
+        frame = self.frames[sensor_id]
+        bias = self.biases[sensor_id]
+        apply_bias = bias.samples >= self.bias_min_samples
+
+        for track_id in removed_ids:
+            self._drop_local((sensor_id, track_id))
+
+        for track in tracks:
+            if not track.position_history:
+                continue
+            x, y, timestamp = track.position_history[-1]
+            raw_range, raw_azimuth, _ = enu_to_polar(x, y)
+
+            range_m, azimuth_deg = raw_range, raw_azimuth
+            if apply_bias:
+                range_m -= bias.range_m
+                azimuth_deg -= bias.azimuth_deg
+
+            east_l, north_l, _ = polar_to_enu(range_m, azimuth_deg)
+            east, north, _ = frame.enu_to_frame(self.system_frame, east_l, north_l, 0.0)
+            vel_east, vel_north = self._rotate_velocity(frame, track.state_vector[2], track.state_vector[3])
+
+            azimuth_sigma_m = raw_range * math.radians(site.azimuth_noise_deg)
+            variance = max(site.range_noise_m ** 2, azimuth_sigma_m ** 2)
+
+            self._ingest(LocalTrack(
+                sensor_id=sensor_id,
+                local_id=track.track_id,
+                east=east,
+                north=north,
+                vel_east=vel_east,
+                vel_north=vel_north,
+                variance=variance,
+                timestamp=to_naive_utc(timestamp),
+                raw_range_m=raw_range,
+                raw_azimuth_deg=raw_azimuth
+            ))
+
+        if current_time is not None:
+            self.expire_stale(current_time)
+        return sorted(self.updated_system_ids)
+
+    def update_adsb_reports(self, sensor_id: str, reports: List[Dict[str, Any]]) -> List[str]:
+        """
+        Fuse ADS-B (CAT-21) position reports
+
+        Args:
+            sensor_id: ADS-B ground station sensor ID
+            reports: Decoded reports with aircraft_address (or track_id),
+                latitude, longitude, optional flight_level and measurement_time/timestamp
+
+        Returns:
+            IDs of system tracks changed by this update
+        """
+        self._begin_update()
+        site = self.sensors[sensor_id]
+        latest_time = None
+
+        for report in reports:
+            local_id = report.get('aircraft_address') or report.get('track_id')
+            if local_id is None or report.get('latitude') is None or report.get('longitude') is None:
+                continue
+            timestamp = to_naive_utc(report.get('measurement_time') or report.get('timestamp'))
+            if timestamp is None:
+                continue
+
+            altitude_m = None
+            if report.get('flight_level') is not None:
+                altitude_m = report['flight_level'] * 100.0 * FEET_TO_METERS
+            # Horizontal position of the ground point, comparable with 2D radar plots
+            east, north, _ = self.system_frame.geodetic_to_enu(report['latitude'], report['longitude'], 0.0)
+
+            # Velocity from consecutive reports of the same aircraft
+            vel_east = vel_north = 0.0
+            previous = self.local_tracks.get((sensor_id, str(local_id)))
+            if previous is not None:
+                dt = (timestamp - previous.timestamp).total_seconds()
+                if dt > 0:
+                    vel_east = (east - previous.east) / dt
+                    vel_north = (north - previous.north) / dt
+                else:
+                    vel_east, vel_north = previous.vel_east, previous.vel_north
+
+            self._ingest(LocalTrack(
+                sensor_id=sensor_id,
+                local_id=str(local_id),
+                east=east,
+                north=north,
+                vel_east=vel_east,
+                vel_north=vel_north,
+                variance=site.position_noise_m ** 2,
+                timestamp=timestamp,
+                altitude_m=altitude_m
+            ))
+            latest_time = timestamp if latest_time is None else max(latest_time, timestamp)
+
+        if latest_time is not None:
+            self.expire_stale(latest_time)
+        return sorted(self.updated_system_ids)
+
+    def _rotate_velocity(self, frame: LocalTangentPlane, vel_east: float, vel_north: float) -> Tuple[float, float]:
+        """Rotate a horizontal velocity from a sensor's ENU axes to the system ENU axes"""
+        velocity = self.system_frame.rotation @ frame.rotation.T @ np.array([vel_east, vel_north, 0.0])
+        return float(velocity[0]), float(velocity[1])
+
+    # ------------------------------------------------------------------
+    # Association and fusion
+    # ------------------------------------------------------------------
+
+    def _begin_update(self):
+        self.updated_system_ids = set()
+        self.removed_system_ids = set()
+
+    def _ingest(self, local: LocalTrack):
+        """Store a local track update and associate it to a system track"""
+        key = (local.sensor_id, local.local_id)
+        previous = self.local_tracks.get(key)
+        if previous is not None:
+            local.system_track_id = previous.system_track_id
+        self.local_tracks[key] = local
+        self.deadlines.schedule(key, local.timestamp + timedelta(seconds=self.local_track_timeout_s))
+        self.stats['local_updates'] += 1
+
+        system = self.system_tracks.get(local.system_track_id) if local.system_track_id else None
+        if system is not None:
+            if len(system.contributors) == 1:
+                # Single-sensor system track: merge into a gated track from other sensors
+                # once one appears (e.g. after bias correction brings them together)
+                other = self._find_system_track(local, exclude=system.system_track_id)
+                if other is None:
+                    self._refuse(system)
+                    return
+                self._detach(key, system)
+                self._attach(local, other)
+                self.stats['associations'] += 1
+                return
+            if self._distance_chi2(local, system, exclude=key) <= self.release_chi2:
+                self._refuse(system)
+                self._update_bias(system)
+                return
+            # Pairing no longer consistent: release and re-associate
+            self._detach(key, system)
+            self.stats['releases'] += 1
+
+        system = self._find_system_track(local)
+        if system is None:
+            system = self._create_system_track(local)
+        else:
+            self.stats['associations'] += 1
+        self._attach(local, system)
+
+    def _attach(self, local: LocalTrack, system: SystemTrack):
+        system.contributors[local.sensor_id] = local.local_id
+        local.system_track_id = system.system_track_id
+        self._refuse(system)
+        self._update_bias(system)
+
+    def _distance_chi2(self, local: LocalTrack, system: SystemTrack,
+                       exclude: Optional[Tuple[str, str]] = None) -> float:
+        """Normalised squared distance between a local track and a system track's other contributors"""
+        others = [self.local_tracks[(sensor_id, local_id)]
+                  for sensor_id, local_id in system.contributors.items()
+                  if (sensor_id, local_id) != exclude and (sensor_id, local_id) in self.local_tracks]
+        if not others:
+            return 0.0
+        east, north, variance = self._combine(others, local.timestamp)
+        d_east = local.east - east
+        d_north = local.north - north
+        return (d_east * d_east + d_north * d_north) / (local.variance + variance)
+
+    def _find_system_track(self, local: LocalTrack, exclude: Optional[str] = None) -> Optional[SystemTrack]:
+        """Best gated system track without a contribution from this sensor"""
+        best, best_chi2 = None, self.gate_chi2
+        for system in self.system_tracks.values():
+            if local.sensor_id in system.contributors or system.system_track_id == exclude:
+                continue
+            dt = (local.timestamp - system.last_update).total_seconds()
+            d_east = local.east - (system.east + system.vel_east * dt)
+            d_north = local.north - (system.north + system.vel_north * dt)
+            chi2 = (d_east * d_east + d_north * d_north) / (local.variance + system.variance)
+            if chi2 <= best_chi2:
+                best, best_chi2 = system, chi2
+        return best
+
+    def _create_system_track(self, local: LocalTrack) -> SystemTrack:
+        system = SystemTrack(
+            system_track_id=f"sys_{self.next_system_id:06d}",
+            east=local.east,
+            north=local.north,
+            vel_east=local.vel_east,
+            vel_north=local.vel_north,
+            variance=local.variance,
+            last_update=local.timestamp,
+            altitude_m=local.altitude_m,
+            created_time=local.timestamp
+        )
+        self.next_system_id += 1
+        self.system_tracks[system.system_track_id] = system
+        self.stats['system_tracks_created'] += 1
+        return system
+
+    def _combine(self, locals_: List[LocalTrack], at_time: datetime) -> Tuple[float, float, float]:
+        """Inverse-variance weighted position of local tracks predicted to at_time"""
+        weight_sum = east = north = 0.0
+        for local in locals_:
+            dt = (at_time - local.timestamp).total_seconds()
+            weight = 1.0 / local.variance
+            east += weight * (local.east + local.vel_east * dt)
+            north += weight * (local.north + local.vel_north * dt)
+            weight_sum += weight
+        return east / weight_sum, north / weight_sum, 1.0 / weight_sum
+
+    def _refuse(self, system: SystemTrack):
+        """Recompute a system track from its contributors"""
+        contributors = [self.local_tracks[(sensor_id, local_id)]
+                        for sensor_id, local_id in system.contributors.items()
+                        if (sensor_id, local_id) in self.local_tracks]
+        if not contributors:
+            return
+
+        latest = max(local.timestamp for local in contributors)
+        system.east, system.north, system.variance = self._combine(contributors, latest)
+
+        weight_sum = sum(1.0 / local.variance for local in contributors)
+        system.vel_east = sum(local.vel_east / local.variance for local in contributors) / weight_sum
+        system.vel_north = sum(local.vel_north / local.variance for local in contributors) / weight_sum
+        altitudes = [local.altitude_m for local in contributors if local.altitude_m is not None]
+        if altitudes:
+            system.altitude_m = altitudes[0]
+        system.last_update = latest
+        self.updated_system_ids.add(system.system_track_id)
+
+    def _update_bias(self, system: SystemTrack):
+        """Update radar bias estimates from a system track holding a reference contribution"""
+        references = []
+        radars = []
+        for sensor_id, local_id in system.contributors.items():
+            local = self.local_tracks.get((sensor_id, local_id))
+            if local is None:
+                continue
+            site = self.sensors[sensor_id]
+            if site.sensor_type == 'adsb' or site.reference:
+                references.append(local)
+            elif local.raw_range_m is not None:
+                radars.append(local)
+
+        if not references or not radars:
+            return
+
+        for radar in radars:
+            reference = min(references, key=lambda ref: abs((ref.timestamp - radar.timestamp).total_seconds()))
+            if reference is radar:
+                continue
+            dt = (radar.timestamp - reference.timestamp).total_seconds()
+            ref_east = reference.east + reference.vel_east * dt
+            ref_north = reference.north + reference.vel_north * dt
+
+            # Reference position in the radar's own polar coordinates
+            east_r, north_r, _ = self.system_frame.enu_to_frame(self.frames[radar.sensor_id], ref_east, ref_north, 0.0)
+            ref_range, ref_azimuth, _ = enu_to_polar(east_r, north_r)
+
+            range_residual = radar.raw_range_m - ref_range
+            azimuth_residual = (radar.raw_azimuth_deg - ref_azimuth + 180.0) % 360.0 - 180.0
+
+            bias = self.biases[radar.sensor_id]
+            bias.range_m += self.bias_alpha * (range_residual - bias.range_m)
+            bias.azimuth_deg += self.bias_alpha * (azimuth_residual - bias.azimuth_deg)
+            bias.samples += 1
+
+    def _detach(self, key: Tuple[str, str], system: SystemTrack):
+        """Remove a local track's contribution from a system track"""
+        sensor_id, local_id = key
+        if system.contributors.get(sensor_id) == local_id:
+            del system.contributors[sensor_id]
+        local = self.local_tracks.get(key)
+        if local is not None:
+            local.system_track_id = None
+
+        if system.contributors:
+            self._refuse(system)
+        else:
+            del self.system_tracks[system.system_track_id]
+            self.updated_system_ids.discard(system.system_track_id)
+            self.removed_system_ids.add(system.system_track_id)
+
+    def _drop_local(self, key: Tuple[str, str]):
+        local = self.local_tracks.get(key)
+        if local is None:
+            return
+        system = self.system_tracks.get(local.system_track_id) if local.system_track_id else None
+        if system is not None:
+            self._detach(key, system)
+        del self.local_tracks[key]
+        self.deadlines.cancel(key)
+
+    def expire_stale(self, current_time: datetime):
+        """Drop local tracks not updated within local_track_timeout_s"""
+        current_time = to_naive_utc(current_time)
+        for key, _ in self.deadlines.pop_expired(current_time):
+            self._drop_local(key)
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def get_system_tracks(self) -> List[Dict]:
+        """
+        Get fused system tracks for display
+
+        Returns:
+            List of system track dictionaries (heading clockwise from north)
+        """
+        result = []
+        for system in self.system_tracks.values():
+            lat, lon, _ = self.system_frame.enu_to_geodetic(system.east, system.north, 0.0)
+            speed = math.hypot(system.vel_east, system.vel_north)
+            result.append({
+                'track_id': system.system_track_id,
+                'latitude': lat,
+                'longitude': lon,
+                'altitude': system.altitude_m,
+                'speed_ms': speed,
+                'heading_deg': (math.degrees(math.atan2(system.vel_east, system.vel_north)) + 360.0) % 360.0,
+                'position_sigma_m': math.sqrt(system.variance),
+                'sensors': sorted(system.contributors),
+                'local_tracks': dict(system.contributors),
+                'last_update': system.last_update.isoformat(),
+                'created_at': (system.created_time or system.last_update).isoformat()
+            })
+        return result
+
+    def get_sensor_biases(self) -> Dict[str, Dict]:
+        """Current radar bias estimates"""
+        return {
+            sensor_id: {
+                'range_m': bias.range_m,
+                'azimuth_deg': bias.azimuth_deg,
+                'samples': bias.samples,
+                'applied': bias.samples >= self.bias_min_samples
+            }
+            for sensor_id, bias in self.biases.items()
+            if self.sensors[sensor_id].sensor_type != 'adsb'
+        }
+
+    def get_statistics(self) -> Dict:
+        """Fusion statistics"""
+        stats = self.stats.copy()
+        stats['system_tracks'] = len(self.system_tracks)
+        stats['local_tracks'] = len(self.local_tracks)
+        return stats
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Track History Buffers
+Fixed-capacity circular buffers for per-track history. Positions are stored in
+typed arrays (two doubles and one int64 per entry) instead of one
+(x, y, datetime) tuple per entry, which keeps memory and garbage-collector
+load per track flat for large numbers of concurrent tracks.
+"""
+
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterator, List, Optional, Tuple
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_AWARE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class PositionHistory:
+    """
+    Ring buffer of (x, y, timestamp) entries, oldest first
+
+    Supports the sequence operations the tracker uses on position history
+    (append, len, truthiness, indexing including negative indices and
+    iteration). Timestamps are kept to the microsecond; the timezone of the
+    first appended timestamp is used for all entries.
+    """
+
+    __slots__ = ('capacity', '_x', '_y', '_t', '_tz', '_aware', '_start')
+
+    def __init__(self, capacity: int = 50):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._x = array('d')
+        self._y = array('d')
+        self._t = array('q')
+        self._tz = None
+        self._aware = False
+        self._start = 0  # index of the oldest entry once the buffer is full
+
+    def append(self, entry: Tuple[float, float, datetime]):
+        """Add an entry, overwriting the oldest one when full"""
+        x, y, timestamp = entry
+        if not self._t:
+            self._aware = timestamp.tzinfo is not None
+            self._tz = timestamp.tzinfo
+        epoch = _AWARE_EPOCH if timestamp.tzinfo is not None else _NAIVE_EPOCH
+        micros = (timestamp - epoch) // _MICROSECOND
+
+        if len(self._t) < self.capacity:
+            self._x.append(x)
+            self._y.append(y)
+            self._t.append(micros)
+        else:
+            self._x[self._start] = x
+            self._y[self._start] = y
+            self._t[self._start] = micros
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self):
+        """Remove all entries"""
+        self._x = array('d')
+        self._y = array('d')
+        self._t = array('q')
+        self._start = 0
+
+    def _timestamp(self, micros: int) -> datetime:
+        if self._aware:
+            return (_AWARE_EPOCH + micros * _MICROSECOND).astimezone(self._tz)
+        return _NAIVE_EPOCH + micros * _MICROSECOND
+
+    def __len__(self) -> int:
+        return len(self._t)
+
+    def __bool__(self) -> bool:
+        return len(self._t) > 0
+
+    def __getitem__(self, index: int) -> Tuple[float, float, datetime]:
+        size = len(self._t)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("position history index out of range")
+        slot = (self._start + index) % size
+        return (self._x[slot], self._y[slot], self._timestamp(self._t[slot]))
+
+    def __iter__(self) -> Iterator[Tuple[float, float, datetime]]:
+        for index in range(len(self._t)):
+            yield self[index]
+
+    def __repr__(self) -> str:
+        return f"PositionHistory({len(self)}/{self.capacity})"
+
+
+class BoundedLog:
+    """Ring buffer of the most recent items (e.g. associated plot IDs), oldest first"""
+
+    __slots__ = ('capacity', '_items', '_start')
+
+    def __init__(self, capacity: int = 50):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._items: List[Any] = []
+        self._start = 0
+
+    def append(self, item: Any):
+        """Add an item, overwriting the oldest one when full"""
+        if len(self._items) < self.capacity:
+            self._items.append(item)
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % self.capacity
+
+    def latest(self) -> Optional[Any]:
+        """Most recently appended item, or None"""
+        if not self._items:
+            return None
+        return self._items[(self._start - 1) % len(self._items)]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        size = len(self._items)
+        for index in range(size):
+            yield self._items[(self._start + index) % size]
+
+    def __repr__(self) -> str:
+        return f"BoundedLog({len(self)}/{self.capacity})"
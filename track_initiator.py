@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+M-of-N Track Initiation
+Unassociated plots are held as lightweight candidates in a spatial hash
+instead of immediately becoming full tracks (course model, motion filter,
+history buffers). A candidate is promoted to a track once it has collected M
+plots from different scans within N scan periods; candidates that do not are
+dropped. Clutter plots therefore rarely allocate anything beyond a small
+candidate record.
+"""
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from track_deadlines import DeadlineScheduler
+
+
+@dataclass(slots=True)
+class InitiationCandidate:
+    """Plots that may belong to a new target, oldest first"""
+    candidate_id: int
+    cell: Tuple[int, int]
+    points: List[Tuple[float, float, datetime]] = field(default_factory=list)
+
+    @property
+    def last(self) -> Tuple[float, float, datetime]:
+        return self.points[-1]
+
+    def predict(self, timestamp: datetime) -> Optional[Tuple[float, float]]:
+        """Straight-line prediction from the last two plots (None with a single plot)"""
+        if len(self.points) < 2:
+            return None
+        x0, y0, t0 = self.points[-2]
+        x1, y1, t1 = self.points[-1]
+        span = (t1 - t0).total_seconds()
+        if span <= 0:
+            return None
+        dt = (timestamp - t1).total_seconds()
+        return (x1 + (x1 - x0) / span * dt, y1 + (y1 - y0) / span * dt)
+
+
+class TrackInitiator:
+    """
+    Candidate buffer for M-of-N track initiation
+    """
+
+    def __init__(self, config: Dict | None = None):
+        """
+        Initialize initiator
+
+        Args:
+            config: Configuration with initiation_m, initiation_n, scan_period_s,
+                initiation_gate_m and max_speed_threshold
+        """
+        self.config = config or {}
+        self.m = self.config.get('initiation_m', 3)
+        self.n = self.config.get('initiation_n', 4)
+        self.scan_period_s = self.config.get('scan_period_s', 4.0)
+        self.gate_m = self.config.get('initiation_gate_m', 500.0)
+        self.max_speed = self.config.get('max_speed_threshold', 300.0)
+
+        # A later plot of the same target is at least this far into the next scan
+        self.min_interval_s = self.scan_period_s / 2.0
+        self.window_s = self.n * self.scan_period_s
+
+        # Cells hold every candidate that can still be reached within the window
+        self.cell_size = self.max_speed * (self.n - 1) * self.scan_period_s + self.gate_m
+        self.cells: Dict[Tuple[int, int], List[InitiationCandidate]] = {}
+        self.candidates: Dict[int, InitiationCandidate] = {}
+        self.deadlines = DeadlineScheduler()
+        self.next_candidate_id = 1
+
+        self.stats = {
+            'candidates_created': 0,
+            'candidates_promoted': 0,
+            'candidates_expired': 0
+        }
+
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(math.floor(x / self.cell_size)), int(math.floor(y / self.cell_size)))
+
+    def add_plot(self, x: float, y: float, timestamp: datetime) -> Optional[List[Tuple[float, float, datetime]]]:
+        """
+        Offer an unassociated plot to the candidate buffer
+
+        The plot extends the best matching candidate and also seeds a
+        candidate of its own, so a target plot is not lost when it first
+        lands in the gate of a clutter candidate.
+
+        Args:
+            x, y: Plot position in meters
+            timestamp: Plot measurement time
+
+        Returns:
+            The M plots of a candidate that reached M-of-N (to be promoted
+            to a track), or None
+        """
+        best, best_distance = None, None
+        cell_x, cell_y = self._cell_of(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for candidate in self.cells.get((cell_x + dx, cell_y + dy), ()):
+                    distance = self._gated_distance(candidate, x, y, timestamp)
+                    if distance is not None and (best_distance is None or distance < best_distance):
+                        best, best_distance = candidate, distance
+
+        if best is not None:
+            best.points.append((x, y, timestamp))
+            if len(best.points) >= self.m:
+                self._remove(best)
+                self.stats['candidates_promoted'] += 1
+                return list(best.points)
+
+        self._create(x, y, timestamp)
+        return None
+
+    def _gated_distance(self, candidate: InitiationCandidate, x: float, y: float,
+                        timestamp: datetime) -> Optional[float]:
+        """Distance from the candidate's expected position, or None when outside its gate"""
+        last_x, last_y, last_time = candidate.last
+        dt = (timestamp - last_time).total_seconds()
+        if dt < self.min_interval_s or (timestamp - candidate.points[0][2]).total_seconds() > self.window_s:
+            return None
+
+        predicted = candidate.predict(timestamp)
+        if predicted is None:
+            # Single plot: anywhere a target could have flown since
+            distance = math.hypot(x - last_x, y - last_y)
+            return distance if distance <= self.max_speed * dt + self.gate_m else None
+
+        distance = math.hypot(x - predicted[0], y - predicted[1])
+        return distance if distance <= self.gate_m else None
+
+    def _create(self, x: float, y: float, timestamp: datetime):
+        candidate = InitiationCandidate(self.next_candidate_id, self._cell_of(x, y), [(x, y, timestamp)])
+        self.next_candidate_id += 1
+        self.candidates[candidate.candidate_id] = candidate
+        self.cells.setdefault(candidate.cell, []).append(candidate)
+        self.deadlines.schedule(candidate.candidate_id, timestamp + timedelta(seconds=self.window_s))
+        self.stats['candidates_created'] += 1
+
+    def next_scan_position(self, candidate: InitiationCandidate) -> Tuple[float, float, float]:
+        """
+        Where the candidate's next plot is expected, one scan after its last
+
+        Returns:
+            (x, y, reach): the predicted position and the distance from it
+            within which a plot can extend the candidate (anywhere a target
+            could fly in a scan for a single-plot candidate)
+        """
+        last_x, last_y, last_time = candidate.last
+        predicted = candidate.predict(last_time + timedelta(seconds=self.scan_period_s))
+        if predicted is None:
+            return last_x, last_y, self.max_speed * self.scan_period_s + self.gate_m
+        return predicted[0], predicted[1], self.gate_m
+
+    def release(self, candidate_id: int) -> Optional[InitiationCandidate]:
+        """Give up a candidate (e.g. handed off to another shard) and return it"""
+        candidate = self.candidates.get(candidate_id)
+        if candidate is not None:
+            self._remove(candidate)
+        return candidate
+
+    def adopt(self, candidate: InitiationCandidate):
+        """Take over a candidate released by another initiator, under a new local ID"""
+        first_x, first_y, first_time = candidate.points[0]
+        candidate.candidate_id = self.next_candidate_id
+        candidate.cell = self._cell_of(first_x, first_y)
+        self.next_candidate_id += 1
+        self.candidates[candidate.candidate_id] = candidate
+        self.cells.setdefault(candidate.cell, []).append(candidate)
+        self.deadlines.schedule(candidate.candidate_id, first_time + timedelta(seconds=self.window_s))
+
+    def _remove(self, candidate: InitiationCandidate):
+        del self.candidates[candidate.candidate_id]
+        self.deadlines.cancel(candidate.candidate_id)
+        bucket = self.cells.get(candidate.cell)
+        if bucket is not None:
+            bucket.remove(candidate)
+            if not bucket:
+                del self.cells[candidate.cell]
+
+    def expire(self, current_time: datetime) -> int:
+        """
+        Drop candidates whose N-scan window has closed
+
+        Returns:
+            Number of candidates dropped
+        """
+        expired = 0
+        for candidate_id, _ in self.deadlines.pop_expired(current_time):
+            candidate = self.candidates.get(candidate_id)
+            if candidate is None:
+                continue
+            self._remove(candidate)
+            expired += 1
+        self.stats['candidates_expired'] += expired
+        return expired
+
+    def clear(self):
+        """Drop all candidates"""
+        self.cells = {}
+        self.candidates = {}
+        self.deadlines.clear()
+
+    def __len__(self) -> int:
+        return len(self.candidates)
@@ -10,10 +10,20 @@ Date: 2024
 """
 
 import logging
+import os
+import time
 from datetime import datetime
 from typing import List, Dict, Optional
 import sqlite3
+import numpy as np
 from track_calculator import TrackCalculator, PlotData, TrackData, create_default_config
+from scan_batcher import SectorBatcher, SectorBatch
+from sharded_tracker import ShardedTracker
+from track_fusion import TrackFusionEngine
+from track_snapshot import save_snapshot, load_snapshot, SnapshotScheduler
+from geodesy import site_frame
+from tracking_clock import utc_now
+from live_picture import live_picture
 from models import Track, Event, db
 
 logger = logging.getLogger(__name__)
@@ -32,11 +42,16 @@ class TrackIntegrator:
             db_path: Path to surveillance database
         """
         self.db_path = db_path
-        self.tracker = TrackCalculator(create_default_config())
+        config = create_default_config()
+        self.tracker = self._create_tracker(config)
         self.last_processed_id = 0
+        self._configure_batching(config)
+        self._configure_snapshots(config)
+        self._configure_fusion(config)
         
-        # Process existing data on startup
-        self._process_existing_data()
+        # Warm restart from the last snapshot, else rebuild from existing tracks
+        if not self._restore_snapshot():
+            self._process_existing_data()
         
         logger.info("Track integrator initialized")
     
@@ -53,10 +68,26 @@ class TrackIntegrator:
             new_events = self._get_new_events()
             
             if not new_events:
+                if self.batcher and not self.fusion:
+                    # Data gap: hand over the sector still under the antenna
+                    completed = self.batcher.flush()
+                    if completed:
+                        return self._process_sector_batches(completed)
                 return {"status": "no_new_data", "processed": 0}
             
+            # Update last processed ID
+            self.last_processed_id = max(event.id for event in new_events)
+            self._update_scan_period(new_events)
+            
+            if self.fusion:
+                return self._process_fused_events(new_events)
+            
+            if self.batcher:
+                return self._process_sector_batches(self._batch_events(new_events))
+            
             # Convert events to plot data
-            plots = self._convert_events_to_plots(new_events)
+            plot_events = [event for event in new_events if event.event_type == 'asterix_plot']
+            plots = self._convert_events_to_plots(plot_events)
             
             # Process plots through track calculator
             updated_tracks = self.tracker.process_plot_batch(plots)
@@ -64,18 +95,16 @@ class TrackIntegrator:
             # Update database with track information
             self._update_database_tracks(updated_tracks)
             
-            # Update last processed ID
-            if new_events:
-                self.last_processed_id = max(event.id for event in new_events)
-            
             result = {
                 "status": "success",
                 "processed": len(plots),
-                "active_tracks": len(updated_tracks),
+                "updated_tracks": len(updated_tracks),
+                "active_tracks": len(self.tracker.active_tracks),
                 "summary": self.tracker.get_track_summary()
             }
             
-            logger.info(f"Processed {len(plots)} plots into {len(updated_tracks)} tracks")
+            logger.info(f"Processed {len(plots)} plots, updated {len(updated_tracks)} tracks")
+            self._maybe_snapshot()
             return result
             
         except Exception as e:
@@ -83,6 +112,288 @@ class TrackIntegrator:
             return {"status": "error", "error": str(e)}
     
     
+    def _update_scan_period(self, events: List[Event]):
+        """
+        Take the scan period for M-of-N initiation from CAT-34 north markers
+        
+        The antenna rotation period (I034/041) a north marker reports goes to
+        the tracker, or with fusion to the local tracker of that radar.
+        
+        Args:
+            events: New events in measurement time order
+        """
+        for event in events:
+            if event.event_type != 'asterix_north_marker' or not event.scan_period_s:
+                continue
+            if self.fusion:
+                self.fusion.set_scan_period(event.sensor_id, event.scan_period_s)
+            else:
+                self.tracker.set_scan_period(event.scan_period_s)
+    
+    
+    def _batch_events(self, events: List[Event]) -> List[SectorBatch]:
+        """
+        Feed plot and CAT-34 marker events through the sector batcher
+        
+        Args:
+            events: New events in measurement time order
+            
+        Returns:
+            Sector batches completed by these events
+        """
+        completed = []
+        
+        for event in events:
+            if event.event_type == 'asterix_north_marker':
+                completed.extend(self.batcher.on_north_marker(event.timestamp))
+            elif event.event_type == 'asterix_sector_crossing':
+                completed.extend(self.batcher.on_sector_crossing(event.heading_deg, event.timestamp))
+            elif event.event_type == 'asterix_plot':
+                for plot in self._convert_events_to_plots([event]):
+                    completed.extend(self.batcher.add_plot(plot))
+        
+        return completed
+    
+    
+    def _process_sector_batches(self, batches: List[SectorBatch]) -> Dict:
+        """
+        Run completed sectors through the tracker in antenna order
+        
+        Args:
+            batches: Completed sector batches
+            
+        Returns:
+            Processing results summary
+        """
+        processed = 0
+        updated_tracks = {}
+        
+        for batch in batches:
+            updated_tracks.update(self.tracker.process_plot_batch(batch.plots))
+            processed += len(batch.plots)
+        
+        if updated_tracks:
+            self._update_database_tracks(updated_tracks)
+        
+        logger.info(f"Processed {processed} plots in {len(batches)} sectors, updated {len(updated_tracks)} tracks")
+        self._maybe_snapshot()
+        return {
+            "status": "success",
+            "processed": processed,
+            "sectors": len(batches),
+            "pending": self.batcher.get_statistics()['pending_plots'],
+            "updated_tracks": len(updated_tracks),
+            "active_tracks": len(self.tracker.active_tracks),
+            "summary": self.tracker.get_track_summary()
+        }
+    
+    
+    def _process_fused_events(self, events: List[Event]) -> Dict:
+        """
+        Track each radar's plots locally and fuse them with ADS-B into system tracks
+        
+        Events are taken one scan period of measurement time at a time and
+        grouped by sensor_id within it. Radar plots go to that radar's own
+        tracker (range/azimuth from its site) and CAT-21 reports straight to
+        the fusion engine. Sector batching is per radar and not used here, so
+        CAT-34 events are skipped, as are events from sensors that are not
+        listed in fusion_sensors.
+        
+        Args:
+            events: New events in measurement time order
+            
+        Returns:
+            Processing results summary
+        """
+        scan_period_s = max((tracker.config.get('scan_period_s') or 0.0
+                             for tracker in self.fusion.trackers.values()), default=0.0) or 4.0
+        windows = []
+        window_start = None
+        unknown = 0
+        for event in events:
+            if event.event_type not in ('asterix_plot', 'asterix_adsb'):
+                continue
+            if event.sensor_id not in self.fusion.sensors:
+                unknown += 1
+                continue
+            if window_start is None or (event.timestamp - window_start).total_seconds() >= scan_period_s:
+                window_start = event.timestamp
+                windows.append({})
+            windows[-1].setdefault(event.sensor_id, []).append(event)
+        if unknown:
+            logger.warning(f"Skipped {unknown} reports from sensors not configured for fusion")
+        
+        processed = 0
+        sensors = set()
+        updated_ids = set()
+        for sensor_id, sensor_events in ((sensor_id, sensor_events) for window in windows
+                                         for sensor_id, sensor_events in window.items()):
+            site = self.fusion.sensors[sensor_id]
+            if site.sensor_type == 'adsb':
+                reports = [{
+                    'track_id': event.track_id,
+                    'latitude': event.latitude,
+                    'longitude': event.longitude,
+                    'flight_level': event.altitude / 100.0 if event.altitude else None,  # feet
+                    'timestamp': event.timestamp
+                } for event in sensor_events]
+                updated_ids.update(self.fusion.update_adsb_reports(sensor_id, reports))
+            else:
+                plots = self._convert_events_to_plots(sensor_events, site_frame(site.latitude, site.longitude))
+                updated_ids.update(self.fusion.process_radar_plots(sensor_id, plots))
+            processed += len(sensor_events)
+            sensors.add(sensor_id)
+        
+        system_tracks = [track for track in self.fusion.get_system_tracks() if track['track_id'] in updated_ids]
+        self._store_tracks([{
+            'track_id': track['track_id'],
+            'latitude': track['latitude'],
+            'longitude': track['longitude'],
+            'altitude': track['altitude'] / 0.3048 if track['altitude'] is not None else None,  # feet
+            'heading': track['heading_deg'],
+            'speed': track['speed_ms'] * 1.94384,  # Convert m/s to knots
+            'last_updated': track['last_update'],
+            'created_at': track['created_at']
+        } for track in system_tracks])
+        
+        logger.info(f"Fused {processed} reports from {len(sensors)} sensors in {len(windows)} scans, "
+                    f"updated {len(system_tracks)} system tracks")
+        return {
+            "status": "success",
+            "processed": processed,
+            "sensors": len(sensors),
+            "updated_tracks": len(system_tracks),
+            "active_tracks": len(self.fusion.system_tracks),
+            "summary": self.get_track_statistics()
+        }
+    
+    
+    def _create_tracker(self, config: Dict):
+        """
+        Create a single tracker or a sector-sharded tracker from configuration
+        
+        Args:
+            config: Tracker configuration
+            
+        Returns:
+            TrackCalculator or ShardedTracker
+        """
+        if config.get('sharded_tracking', False):
+            return ShardedTracker(config)
+        return TrackCalculator(config)
+    
+    
+    def _configure_batching(self, config: Dict):
+        """
+        Set up antenna sector batching from tracker configuration
+        
+        Args:
+            config: Tracker configuration
+        """
+        if config.get('sector_batching', True):
+            self.batcher = SectorBatcher(config.get('sector_count', 16))
+        else:
+            self.batcher = None
+    
+    
+    def _configure_fusion(self, config: Dict):
+        """
+        Set up multi-sensor fusion from tracker configuration
+        
+        Args:
+            config: Tracker configuration; multi_sensor_fusion switches it on and
+                fusion_sensors lists the SensorSite fields of each sensor
+        """
+        if config.get('multi_sensor_fusion', False):
+            self.fusion = TrackFusionEngine(dict(config, sensors=config.get('fusion_sensors', []),
+                                                 tracker_config=config))
+        else:
+            self.fusion = None
+    
+    
+    def _configure_snapshots(self, config: Dict):
+        """
+        Set up periodic tracker snapshots from configuration
+        
+        Args:
+            config: Tracker configuration
+        """
+        self.snapshot_path = config.get('snapshot_path') or os.path.join(
+            os.path.dirname(self.db_path) or '.', 'tracker_snapshot.pkl')
+        self.snapshots = SnapshotScheduler(config.get('snapshot_interval_s', 30.0))
+    
+    
+    def _maybe_snapshot(self):
+        """
+        Take a periodic snapshot when one is due (fusion state is not snapshotted)
+        """
+        if self.snapshots.due() and not self.fusion:
+            self.save_snapshot()
+    
+    
+    def save_snapshot(self) -> bool:
+        """
+        Write the full tracker state to the snapshot file
+        
+        Returns:
+            True if the snapshot was written
+        """
+        try:
+            start = time.perf_counter()
+            size = save_snapshot(self.snapshot_path, self.tracker.get_state(), {
+                'last_processed_id': self.last_processed_id,
+                'batcher': self.batcher,
+                'sharded': isinstance(self.tracker, ShardedTracker)
+            })
+            self.snapshots.mark()
+            logger.info(f"Tracker snapshot written: {len(self.tracker.active_tracks)} tracks, "
+                        f"{size / 1024:.0f} KiB in {(time.perf_counter() - start) * 1000:.0f} ms")
+            return True
+        except Exception as e:
+            logger.error(f"Error writing tracker snapshot: {e}")
+            return False
+    
+    
+    def _restore_snapshot(self) -> bool:
+        """
+        Restore tracker state from the snapshot file
+        
+        Events stored after the snapshot was taken are processed normally
+        from the restored last processed ID.
+        
+        Returns:
+            True if tracker state was restored
+        """
+        start = time.perf_counter()
+        snapshot = load_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return False
+        
+        metadata = snapshot['metadata']
+        if metadata.get('sharded', False) != isinstance(self.tracker, ShardedTracker):
+            logger.warning("Tracker snapshot was taken with a different tracker type, ignoring it")
+            return False
+        
+        try:
+            self.tracker.restore_state(snapshot['tracker'])
+        except Exception as e:
+            logger.error(f"Error restoring tracker snapshot: {e}")
+            # Start over with a fresh tracker of the same configuration
+            if isinstance(self.tracker, ShardedTracker):
+                self.tracker.close()
+            self.tracker = self._create_tracker(self.tracker.config)
+            return False
+        
+        self.last_processed_id = metadata.get('last_processed_id', 0)
+        if self.batcher is not None and metadata.get('batcher') is not None:
+            self.batcher = metadata['batcher']
+        
+        logger.info(f"Restored {len(self.tracker.active_tracks)} tracks from snapshot taken "
+                    f"{snapshot['created']} in {(time.perf_counter() - start) * 1000:.0f} ms "
+                    f"(resuming after event {self.last_processed_id})")
+        return True
+    
+    
     def _get_new_events(self) -> List[Event]:
         """
         Get new events from database since last processing
@@ -97,10 +408,11 @@ class TrackIntegrator:
                 # Get events newer than last processed
                 cursor.execute("""
                     SELECT id, timestamp, track_id, latitude, longitude, 
-                           altitude, speed, heading, event_type
+                           altitude, speed, heading, event_type, sensor_id
                     FROM event
-                    WHERE id > ? AND event_type = 'asterix_plot'
-                    ORDER BY timestamp ASC
+                    WHERE id > ? AND event_type IN ('asterix_plot', 'asterix_adsb',
+                                                    'asterix_north_marker', 'asterix_sector_crossing')
+                    ORDER BY timestamp ASC, id ASC
                 """, (self.last_processed_id,))
                 
                 events = []
@@ -108,14 +420,17 @@ class TrackIntegrator:
                     # Create Event-like object with required fields
                     event_data = {
                         'id': row[0],
-                        'timestamp': datetime.fromisoformat(row[1]) if row[1] else datetime.now(),
+                        'timestamp': datetime.fromisoformat(row[1]) if row[1] else utc_now(),
                         'track_id': row[2],
                         'latitude': row[3] or 0.0,
                         'longitude': row[4] or 0.0,
                         'altitude': row[5] or 0.0,
                         'speed_ms': row[6] or 0.0,
                         'heading_deg': row[7] or 0.0,
-                        'event_type': row[8] or 'asterix_plot'
+                        'event_type': row[8] or 'asterix_plot',
+                        'sensor_id': row[9],
+                        # North markers carry the antenna rotation period in the speed column
+                        'scan_period_s': row[6] if row[8] == 'asterix_north_marker' else None
                     }
                     events.append(type('Event', (), event_data)())
                 
@@ -126,30 +441,42 @@ class TrackIntegrator:
             return []
     
     
-    def _convert_events_to_plots(self, events: List[Event]) -> List[PlotData]:
+    def _convert_events_to_plots(self, events: List[Event], site=None) -> List[PlotData]:
         """
         Convert surveillance events to plot data format
         
         Args:
             events: List of surveillance events
+            site: Radar tangent plane the plots are relative to (default: the tracker's site)
             
         Returns:
             List of plot data objects
         """
         plots = []
         
+        # Convert all positions to range/azimuth in one vectorized call
+        valid = []
         for event in events:
             try:
-                # Calculate range and azimuth from lat/lon
-                range_m, azimuth_deg = self._calculate_range_azimuth(event.latitude, event.longitude)
-                
+                valid.append((event, float(event.latitude), float(event.longitude)))
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Error converting event {event.id} to plot: {e}")
+        if not valid:
+            return plots
+        
+        ranges, azimuths = self._calculate_range_azimuth(np.array([lat for _, lat, _ in valid]),
+                                                         np.array([lon for _, _, lon in valid]), site)
+        
+        for (event, lat, lon), range_m, azimuth_deg in zip(valid, np.atleast_1d(ranges).tolist(),
+                                                           np.atleast_1d(azimuths).tolist()):
+            try:
                 plot = PlotData(
                     timestamp=event.timestamp,
                     range_m=range_m,
                     azimuth_deg=azimuth_deg,
                     elevation_deg=0.0,  # Not available in current data
-                    latitude=event.latitude,
-                    longitude=event.longitude,
+                    latitude=lat,
+                    longitude=lon,
                     rcs=0.0,  # Not available in current data
                     plot_id=f"event_{event.id}",
                     quality=1.0  # Default quality
@@ -163,40 +490,20 @@ class TrackIntegrator:
         return plots
     
     
-    def _calculate_range_azimuth(self, lat: float, lon: float) -> tuple:
+    def _calculate_range_azimuth(self, lat, lon, site=None) -> tuple:
         """
-        Calculate range and azimuth from radar location to target
+        Calculate range and azimuth from a radar site to targets
         
         Args:
-            lat, lon: Target latitude and longitude
+            lat, lon: Target latitude and longitude (scalars or arrays)
+            site: Radar tangent plane (default: the tracker's radar site)
             
         Returns:
-            (range_m, azimuth_deg) tuple
+            (range_m, azimuth_deg) tuple, North=0 clockwise
         """
-        import math
-        
-        # Melbourne FL radar location
-        radar_lat = 28.0836
-        radar_lon = -80.6081
-        
-        # Earth radius in meters
-        R = 6378137.0
-        
-        # Calculate differences
-        dlat = lat - radar_lat
-        dlon = lon - radar_lon
-        
-        # Convert to meters
-        x = dlon * R * math.cos(math.radians(radar_lat)) * math.pi / 180
-        y = dlat * R * math.pi / 180
-        
-        # Calculate range
-        range_m = math.sqrt(x**2 + y**2)
-        
-        # Calculate azimuth (0-360 degrees, North=0)
-        azimuth_deg = (math.degrees(math.atan2(x, y)) + 360) % 360
-        
-        return range_m, azimuth_deg
+        if site is None:
+            site = site_frame(self.tracker.radar_lat, self.tracker.radar_lon)
+        return site.geodetic_to_polar(lat, lon)
     
     
     def _update_database_tracks(self, tracks: Dict[str, TrackData]):
@@ -206,42 +513,93 @@ class TrackIntegrator:
         Args:
             tracks: Dictionary of track data
         """
+        # Convert latest positions to lat/lon in one call
+        positioned = [(track_id, track_data) for track_id, track_data in tracks.items()
+                      if track_data.position_history]
+        if not positioned:
+            return
+        lats, lons = self.tracker._cartesian_to_latlon(
+            np.array([track_data.position_history[-1][0] for _, track_data in positioned]),
+            np.array([track_data.position_history[-1][1] for _, track_data in positioned]))
+        
+        self._store_tracks([{
+            'track_id': track_id,
+            'latitude': lat,
+            'longitude': lon,
+            'altitude': None,
+            'heading': track_data.heading_deg,
+            'speed': track_data.speed_ms * 1.94384,  # Convert m/s to knots
+            'last_updated': track_data.last_update.isoformat(),
+            'created_at': track_data.created_time.isoformat()
+        } for (track_id, track_data), lat, lon in zip(positioned, np.atleast_1d(lats).tolist(),
+                                                      np.atleast_1d(lons).tolist())])
+    
+    
+    def _store_tracks(self, records: List[Dict]):
+        """
+        Write track positions to the track table and publish them to the live picture
+        
+        Args:
+            records: Track dictionaries (track_id, latitude, longitude, altitude,
+                heading, speed in knots, last_updated, created_at)
+        """
+        if not records:
+            return
         try:
             with sqlite3.connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Update tracks table
-                for track_id, track_data in tracks.items():
-                    if not track_data.position_history:
-                        continue
-                    
-                    # Get latest position
-                    latest_pos = track_data.position_history[-1]
-                    
-                    # Convert to lat/lon
-                    lat, lon = self.tracker._cartesian_to_latlon(latest_pos[0], latest_pos[1])
-                    
-                    # Update or insert track
+                published = []
+                for record in records:
+                    track_id = record['track_id']
+                    # Update or insert track, keeping its row (and id) across updates
                     cursor.execute("""
-                        INSERT OR REPLACE INTO track (
-                            track_id, latitude, longitude, speed, heading,
+                        INSERT INTO track (
+                            track_id, latitude, longitude, altitude, speed, heading,
                             last_updated, created_at, track_type, status, callsign
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(track_id) DO UPDATE SET
+                            latitude = excluded.latitude, longitude = excluded.longitude,
+                            altitude = excluded.altitude, speed = excluded.speed, heading = excluded.heading,
+                            last_updated = excluded.last_updated, created_at = excluded.created_at,
+                            track_type = excluded.track_type, status = excluded.status, callsign = excluded.callsign
+                        RETURNING id
                     """, (
                         track_id,
-                        lat,
-                        lon,
-                        track_data.speed_ms * 1.94384,  # Convert m/s to knots
-                        track_data.heading_deg,
-                        track_data.last_update.isoformat(),
-                        track_data.created_time.isoformat(),
+                        record['latitude'],
+                        record['longitude'],
+                        record['altitude'],
+                        record['speed'],
+                        record['heading'],
+                        record['last_updated'],
+                        record['created_at'],
                         'Aircraft',  # Default track type
                         'Active',    # Default status
                         track_id     # Use track_id as callsign for now
                     ))
+                    # Same shape as Track.to_dict(), so a reload from the table is no change
+                    published.append({
+                        'id': cursor.fetchone()[0],
+                        'track_id': track_id,
+                        'callsign': track_id,
+                        'track_type': 'Aircraft',
+                        'type': 'Aircraft',
+                        'latitude': record['latitude'],
+                        'longitude': record['longitude'],
+                        'altitude': record['altitude'],
+                        'heading': record['heading'],
+                        'speed': record['speed'],
+                        'status': 'Active',
+                        'last_updated': record['last_updated'],
+                        'created_at': record['created_at']
+                    })
                 
                 conn.commit()
-                logger.debug(f"Updated {len(tracks)} tracks in database")
+                
+                # Dashboard endpoints read the live picture instead of the table
+                live_picture.publish(published)
+                logger.debug(f"Updated {len(records)} tracks in database")
                 
         except Exception as e:
             logger.error(f"Error updating database tracks: {e}")
@@ -254,6 +612,8 @@ class TrackIntegrator:
         Returns:
             List of track dictionaries
         """
+        if self.fusion:
+            return self.fusion.get_system_tracks()
         return self.tracker.get_tracks_for_display()
     
     
@@ -264,6 +624,13 @@ class TrackIntegrator:
         Returns:
             Statistics dictionary
         """
+        if self.fusion:
+            return {
+                'active_tracks': len(self.fusion.system_tracks),
+                'terminated_tracks': sum(len(tracker.terminated_tracks) for tracker in self.fusion.trackers.values()),
+                'statistics': self.fusion.get_statistics(),
+                'sensor_biases': self.fusion.get_sensor_biases()
+            }
         return self.tracker.get_track_summary()
     
     
@@ -271,9 +638,19 @@ class TrackIntegrator:
         """
         Reset tracking state (clear all tracks)
         """
-        self.tracker.active_tracks.clear()
-        self.tracker.terminated_tracks.clear()
+        if isinstance(self.tracker, ShardedTracker):
+            self.tracker.reset()
+        else:
+            # A fresh calculator also drops the associator's tracks, which would
+            # otherwise rebuild the legacy view on the next batch
+            self.tracker = TrackCalculator(self.tracker.config)
         self.last_processed_id = 0
+        if self.batcher:
+            self.batcher = SectorBatcher(self.batcher.sector_count)
+        if self.fusion:
+            self._configure_fusion(self.tracker.config)
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
         logger.info("Tracking state reset")
     
     
@@ -284,7 +661,12 @@ class TrackIntegrator:
         Args:
             config: New configuration parameters
         """
-        self.tracker = TrackCalculator(config)
+        if isinstance(self.tracker, ShardedTracker):
+            self.tracker.close()
+        self.tracker = self._create_tracker(config)
+        self._configure_batching(config)
+        self._configure_snapshots(config)
+        self._configure_fusion(config)
         logger.info(f"Tracker reconfigured with {len(config)} parameters")
 
 
@@ -366,7 +748,7 @@ class TrackIntegrator:
                         range_m, azimuth_deg = self._calculate_range_azimuth(lat, lon)
                         
                         # Parse timestamp
-                        timestamp = datetime.fromisoformat(last_updated) if last_updated else datetime.now()
+                        timestamp = datetime.fromisoformat(last_updated) if last_updated else utc_now()
                         
                         plot = PlotData(
                             timestamp=timestamp,
@@ -398,19 +780,22 @@ class TrackIntegrator:
                         self.last_processed_id = max_id
                         logger.info(f"Set last processed ID to {max_id}")
                     
-                    logger.info(f"Processed {len(plots)} existing tracks into {len(updated_tracks)} calculated tracks")
+                    logger.info(f"Processed {len(plots)} existing tracks into {len(self.tracker.active_tracks)} calculated tracks")
                 else:
                     logger.info("No valid plots created from existing tracks")
                     
         except Exception as e:
             logger.error(f"Error processing existing data: {e}")
 
-def create_database_schema():
+def create_database_schema(db_path: str = "instance/surveillance.db"):
     """
     Create or update database schema for tracking
+    
+    Args:
+        db_path: Path to surveillance database
     """
     try:
-        with sqlite3.connect("instance/surveillance.db") as conn:
+        with sqlite3.connect(db_path) as conn:
             cursor = conn.cursor()
             
             # Create tracks table if it doesn't exist
@@ -441,6 +826,11 @@ def create_database_schema():
                 CREATE INDEX IF NOT EXISTS idx_tracks_last_seen ON tracks(last_seen)
             """)
             
+            # Reporting sensor on events, read by multi-sensor fusion
+            event_columns = [row[1] for row in cursor.execute("PRAGMA table_info(event)")]
+            if event_columns and 'sensor_id' not in event_columns:
+                cursor.execute("ALTER TABLE event ADD COLUMN sensor_id VARCHAR(50)")
+            
             conn.commit()
             logger.info("Database schema created/updated")
             
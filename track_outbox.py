@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Per-Client Track Outbox
+Decouples the track delta stream from client network speed.
+
+Live picture listeners run in the publishing (tracker) thread, so they only
+merge each delta into the outboxes of the clients it concerns; a dispatcher
+thread does the Socket.IO emits. Pending changes are coalesced per track: an
+outbox holds at most one entry per track (the latest state, or its removal),
+so a client that is behind receives one delta from its last sequence number to
+the newest one instead of every intermediate state.
+
+Each client is sent at most max_rate_hz messages per second. Clients that
+acknowledge their messages have at most one unacknowledged message in flight;
+until it is acknowledged (or ack_timeout_s passes) further changes keep
+coalescing, so memory per slow client is bounded by the number of tracks.
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADDED = 'added'
+UPDATED = 'updated'
+REMOVED = 'removed'
+
+# Base of a delta no client can hold: forces the client to resubscribe
+RESYNC_BASE = -1
+
+
+class ClientOutbox:
+    """Coalesced changes waiting to be sent to one client"""
+
+    def __init__(self, sid: str, filtered: bool = False, packed: bool = False, ack: bool = False,
+                 max_waiting: int = 64):
+        self.sid = sid
+        self.filtered = filtered  # own sequence (track_subscriptions) rather than the live picture's
+        self.packed = packed
+        self.ack = ack
+        self.max_waiting = max_waiting
+        self.sent_seq: Optional[int] = None  # sequence number the client is at
+        self.seq: Optional[int] = None  # sequence number the pending changes bring it to (None until released)
+        self.pending: Dict[str, Tuple[str, Optional[Dict], Optional[Dict]]] = {}  # track_id -> (kind, full track, changed fields)
+        self.waiting: Dict[int, Tuple[Dict, Dict]] = {}  # out-of-order deltas by base
+        self.merged = 0  # deltas merged into pending
+        self.next_send_at = 0.0
+        self.in_flight_since: Optional[float] = None
+        self.lost = False  # sequence lost, waiting for the client to resubscribe
+
+    def push(self, delta: Dict, tracks: Dict[str, Dict]):
+        """
+        Merge a delta if it follows the pending changes, otherwise hold it until it does
+
+        Args:
+            delta: Delta with seq and base
+            tracks: Full track dicts at the delta's version (or later), by track ID
+        """
+        if self.lost or (self.seq is not None and delta['seq'] <= self.seq):
+            return  # already covered, or the client is about to resync
+        if self.seq is None or delta['base'] != self.seq:
+            self.waiting[delta['base']] = (delta, tracks)
+            if len(self.waiting) > self.max_waiting:
+                self.resync()
+            return
+
+        self._merge(delta, tracks)
+        while self.seq in self.waiting:
+            self._merge(*self.waiting.pop(self.seq))
+
+    def _merge(self, delta: Dict, tracks: Dict[str, Dict]):
+        for track_id in delta['removed']:
+            self.pending[track_id] = (REMOVED, None, None)
+        for track in delta['added']:
+            self.pending[track['track_id']] = (ADDED, track, None)
+        for changes in delta['updated']:
+            track_id = changes['track_id']
+            kind, track, merged = self.pending.get(track_id, (None, None, None))
+            if kind == ADDED:
+                # The client never saw this version: keep sending it as a full track
+                self.pending[track_id] = (ADDED, {**track, **changes}, None)
+            else:
+                self.pending[track_id] = (UPDATED, tracks.get(track_id), {**(merged or {}), **changes})
+        self.seq = delta['seq']
+        self.merged += 1
+
+    def release(self, seq: int):
+        """Start sending from sequence number seq (the snapshot or position the client was given)"""
+        if self.lost:
+            return  # overflowed while held: the resync message goes out first
+        self.sent_seq = self.seq = seq
+        for base in [base for base, (delta, _) in self.waiting.items() if delta['seq'] <= seq]:
+            del self.waiting[base]
+        while self.seq in self.waiting:
+            self._merge(*self.waiting.pop(self.seq))
+
+    def resync(self):
+        """Give up on the pending changes; the next message makes the client resubscribe"""
+        logger.warning(f"Track outbox for {self.sid} lost its sequence, forcing a resync")
+        newest = max(delta['seq'] for delta, _ in self.waiting.values())
+        self.pending.clear()
+        self.waiting.clear()
+        self.sent_seq = RESYNC_BASE
+        self.seq = newest
+        self.lost = True
+
+    def due(self, now: float, ack_timeout_s: float) -> bool:
+        if self.seq is None or self.seq == self.sent_seq or now < self.next_send_at:
+            return False
+        return self.in_flight_since is None or now - self.in_flight_since > ack_timeout_s
+
+    def take(self) -> Tuple[Dict, Dict[str, Dict]]:
+        """
+        Pending changes as one delta, clearing them
+
+        Returns:
+            (delta from sent_seq to seq, full track dicts of its added and updated tracks)
+        """
+        message = {'seq': self.seq, 'base': self.sent_seq, 'added': [], 'updated': [], 'removed': []}
+        tracks = {}
+        for track_id, (kind, track, changes) in self.pending.items():
+            if kind == REMOVED:
+                message[REMOVED].append(track_id)
+                continue
+            message[kind].append(track if kind == ADDED else changes)
+            if track is not None:
+                tracks[track_id] = track
+        self.pending = {}
+        self.sent_seq = self.seq
+        self.merged = 0
+        return message, tracks
+
+
+class TrackOutbox:
+    """
+    Outboxes of all streaming clients and the dispatcher thread that empties them
+    """
+
+    def __init__(self, send: Callable[[ClientOutbox, Dict, Dict[str, Dict], Optional[Callable]], None],
+                 max_rate_hz: float = 5.0, ack_timeout_s: float = 10.0):
+        """
+        Initialize outbox
+
+        Args:
+            send: Emits a delta to a client: send(outbox, delta, full tracks by ID,
+                ack callback or None)
+            max_rate_hz: Maximum messages per second to one client
+            ack_timeout_s: Seconds to wait for an acknowledgement before sending again
+        """
+        self.send = send
+        self.min_interval_s = 1.0 / max_rate_hz
+        self.ack_timeout_s = ack_timeout_s
+        self.outboxes: Dict[str, ClientOutbox] = {}
+        self.condition = threading.Condition()
+        self.running = False
+        self.stats = {
+            'messages_sent': 0,
+            'deltas_coalesced': 0,
+            'send_errors': 0
+        }
+
+    def open(self, sid: str, filtered: bool = False, packed: bool = False, ack: bool = False) -> ClientOutbox:
+        """
+        Start a new stream for a client
+
+        Deltas pushed from now on are held until release() sets the sequence
+        number the client starts from, so none published while the client's
+        snapshot is read and sent are lost or sent ahead of it.
+
+        Args:
+            sid: Socket.IO session ID
+            filtered: The client's deltas come from its filtered subscription
+                rather than the live picture
+            packed: Send the packed binary encoding
+            ack: The client acknowledges each message
+        """
+        with self.condition:
+            outbox = self.outboxes[sid] = ClientOutbox(sid, filtered, packed, ack)
+            if not self.running:
+                self.running = True
+                threading.Thread(target=self._dispatch_loop, daemon=True).start()
+            return outbox
+
+    def configure(self, sid: str, filtered: bool, packed: bool, ack: bool) -> bool:
+        """Change a stream's encoding and acknowledgement mode; False if the client has no such stream"""
+        with self.condition:
+            outbox = self.outboxes.get(sid)
+            if outbox is None or outbox.filtered != filtered:
+                return False
+            outbox.packed, outbox.ack = packed, ack
+            return True
+
+    def release(self, sid: str, seq: int, deltas: List[Dict] = (), tracks: Optional[Dict[str, Dict]] = None):
+        """
+        Start sending a client's stream
+
+        Args:
+            sid: Socket.IO session ID
+            seq: Sequence number the client is at
+            deltas: Deltas it missed (sent coalesced)
+            tracks: Current full track dicts, for the updated tracks of those deltas
+        """
+        with self.condition:
+            outbox = self.outboxes.get(sid)
+            if outbox is None:
+                return
+            outbox.release(seq)
+            for delta in deltas:
+                outbox.push(delta, tracks or {})
+            self.condition.notify()
+
+    def push(self, sid: str, delta: Dict, tracks: Dict[str, Dict]):
+        """Queue a delta for one client (never blocks on the network)"""
+        with self.condition:
+            outbox = self.outboxes.get(sid)
+            if outbox is not None:
+                outbox.push(delta, tracks)
+                self.condition.notify()
+
+    def push_many(self, sids, delta: Dict, tracks: Dict[str, Dict]):
+        """Queue the same delta for several clients"""
+        with self.condition:
+            for sid in sids:
+                outbox = self.outboxes.get(sid)
+                if outbox is not None:
+                    outbox.push(delta, tracks)
+            self.condition.notify()
+
+    def acknowledge(self, sid: str):
+        """A client confirmed receipt of its last message"""
+        with self.condition:
+            outbox = self.outboxes.get(sid)
+            if outbox is not None:
+                outbox.in_flight_since = None
+                self.condition.notify()
+
+    def close(self, sid: str):
+        """Drop a client's stream (unsubscribe or disconnect)"""
+        with self.condition:
+            self.outboxes.pop(sid, None)
+
+    def streaming(self, filtered: bool = False) -> List[str]:
+        """Session IDs with an open unfiltered (or filtered) stream"""
+        with self.condition:
+            return [sid for sid, outbox in self.outboxes.items() if outbox.filtered == filtered]
+
+    def _collect(self, now: float) -> Tuple[List[Tuple[ClientOutbox, Dict, Dict, Optional[Callable]]], Optional[float]]:
+        """Messages due now, and seconds until the next one may be"""
+        messages, wake_in = [], None
+        for outbox in self.outboxes.values():
+            if outbox.due(now, self.ack_timeout_s):
+                self.stats['deltas_coalesced'] += max(outbox.merged - 1, 0)
+                message, tracks = outbox.take()
+                outbox.next_send_at = now + self.min_interval_s
+                callback = None
+                if outbox.ack:
+                    outbox.in_flight_since = now
+                    callback = (lambda sid: lambda *args: self.acknowledge(sid))(outbox.sid)
+                messages.append((outbox, message, tracks, callback))
+            elif outbox.seq is not None and outbox.seq != outbox.sent_seq:
+                ready_at = outbox.next_send_at
+                if outbox.in_flight_since is not None:
+                    ready_at = max(ready_at, outbox.in_flight_since + self.ack_timeout_s)
+                wait = max(ready_at - now, 0.001)
+                wake_in = wait if wake_in is None else min(wake_in, wait)
+        return messages, wake_in
+
+    def _dispatch_loop(self):
+        while True:
+            with self.condition:
+                messages, wake_in = self._collect(time.monotonic())
+                if not messages:
+                    self.condition.wait(wake_in)
+                    continue
+
+            for outbox, message, tracks, callback in messages:
+                try:
+                    self.send(outbox, message, tracks, callback)
+                    self.stats['messages_sent'] += 1
+                except Exception as e:
+                    self.stats['send_errors'] += 1
+                    logger.error(f"Error sending track delta to {outbox.sid}: {e}")
+
+    def get_statistics(self) -> Dict:
+        """Outbox counters and queue sizes"""
+        with self.condition:
+            return {
+                **self.stats,
+                'clients': len(self.outboxes),
+                'pending_tracks': sum(len(outbox.pending) for outbox in self.outboxes.values()),
+                'awaiting_ack': sum(1 for outbox in self.outboxes.values() if outbox.in_flight_since is not None)
+            }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Filtered Live Track Subscriptions
+Per-client track streams limited to a map viewport (bounding box) and a set of
+track types.
+
+Clients without a filter share the broadcast delta stream. Filtered clients
+get their own deltas: for each live picture delta, only the clients whose
+viewport covers a changed track's position (found through a grid of viewports)
+or that currently hold the track are looked at, so fan-out cost follows the
+changes each client can see rather than total tracks times clients. Tracks
+moving into or out of a viewport arrive as additions and removals.
+
+Each filtered client has its own sequence numbers, starting from the snapshot
+it is sent on subscribing; viewport changes are sent as deltas in the same
+sequence.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from gate_index import GateIndex
+from live_picture import LivePicture, LiveSnapshot
+
+logger = logging.getLogger(__name__)
+
+BoundingBox = Tuple[float, float, float, float]  # west, south, east, north (degrees)
+
+
+def parse_bbox(value) -> Optional[BoundingBox]:
+    """[west, south, east, north] from a client, or None if absent or invalid"""
+    if not value or len(value) != 4:
+        return None
+    try:
+        west, south, east, north = (float(v) for v in value)
+    except (TypeError, ValueError):
+        return None
+    if south > north:
+        return None
+    if east - west >= 360.0:
+        return None  # whole world: no spatial filter
+    west = (west + 180.0) % 360.0 - 180.0
+    east = (east + 180.0) % 360.0 - 180.0
+    return west, max(south, -90.0), east, min(north, 90.0)
+
+
+def bbox_parts(bbox: BoundingBox) -> List[BoundingBox]:
+    """Split a box crossing the antimeridian (west > east) into two"""
+    west, south, east, north = bbox
+    if west <= east:
+        return [bbox]
+    return [(west, south, 180.0, north), (-180.0, south, east, north)]
+
+
+def bbox_contains(bbox: BoundingBox, latitude: float, longitude: float) -> bool:
+    """Whether a position lies inside a box (which may cross the antimeridian)"""
+    west, south, east, north = bbox
+    if not south <= latitude <= north:
+        return False
+    if west <= east:
+        return west <= longitude <= east
+    return longitude >= west or longitude <= east
+
+
+@dataclass
+class TrackSubscription:
+    """One client's filter and the tracks it currently holds"""
+    sid: str
+    bbox: Optional[BoundingBox] = None
+    zoom: Optional[float] = None
+    types: Optional[FrozenSet[str]] = None
+    held: Set[str] = field(default_factory=set)
+    seq: int = 0
+
+    def matches(self, track: Optional[Dict]) -> bool:
+        if track is None:
+            return False
+        if self.types is not None and track.get('track_type') not in self.types:
+            return False
+        if self.bbox is not None:
+            latitude, longitude = track.get('latitude'), track.get('longitude')
+            if latitude is None or longitude is None:
+                return False
+            return bbox_contains(self.bbox, latitude, longitude)
+        return True
+
+
+class SubscriptionRegistry:
+    """
+    Filtered subscriptions and their per-client deltas
+    """
+
+    def __init__(self, picture: LivePicture, cell_deg: float = 1.0, max_viewport_cells: int = 2500):
+        """
+        Initialize registry
+
+        Args:
+            picture: Live picture the subscriptions follow
+            cell_deg: Grid cell size in degrees for the viewport and position indexes
+            max_viewport_cells: Viewports covering more cells than this are not
+                gridded; they are checked against every change instead
+        """
+        self.picture = picture
+        self.cell_deg = cell_deg
+        self.max_viewport_cells = max_viewport_cells
+        self.subscriptions: Dict[str, TrackSubscription] = {}
+        self.holders: Dict[str, Set[str]] = {}  # track_id -> sids holding it
+        self.viewports = GateIndex(cell_deg)  # sid by viewport cells
+        self.unbounded: Set[str] = set()  # type-only or very wide filters, checked on every change
+        self.lock = threading.Lock()
+
+    def _rebuild_viewports(self):
+        self.viewports.clear()
+        self.unbounded = set()
+        for sid, subscription in self.subscriptions.items():
+            if subscription.bbox is None or self._cell_count(subscription.bbox) > self.max_viewport_cells:
+                self.unbounded.add(sid)
+                continue
+            for west, south, east, north in bbox_parts(subscription.bbox):
+                self.viewports.insert_box(sid, west, south, east, north)
+
+    def _cell_count(self, bbox: BoundingBox) -> int:
+        return sum((int((east - west) // self.cell_deg) + 2) * (int((north - south) // self.cell_deg) + 2)
+                   for west, south, east, north in bbox_parts(bbox))
+
+    def _visible(self, subscription: TrackSubscription, snapshot: LiveSnapshot) -> Set[str]:
+        """Track IDs of a snapshot that pass a subscription's filter"""
+        if subscription.bbox is None:
+            candidates = snapshot.tracks.keys()
+        else:
+            index = snapshot.position_index(self.cell_deg)
+            candidates = set()
+            for part in bbox_parts(subscription.bbox):
+                candidates |= index.query_box(*part)
+        return {track_id for track_id in candidates if subscription.matches(snapshot.tracks.get(track_id))}
+
+    def _hold(self, sid: str, track_ids, holding: bool):
+        for track_id in track_ids:
+            if holding:
+                self.holders.setdefault(track_id, set()).add(sid)
+            else:
+                sids = self.holders.get(track_id)
+                if sids:
+                    sids.discard(sid)
+                    if not sids:
+                        del self.holders[track_id]
+
+    def subscribe(self, sid: str, bbox: Optional[BoundingBox], zoom: Optional[float],
+                  types: Optional[FrozenSet[str]]) -> Tuple[str, Dict]:
+        """
+        Start or change a client's filtered subscription
+
+        Args:
+            sid: Socket.IO session ID
+            bbox: Viewport, or None for no spatial filter
+            zoom: Map zoom level reported by the client
+            types: Track types to include, or None for all
+
+        Returns:
+            ('track_snapshot', payload) for a new subscription, or ('track_delta',
+            payload) with the tracks entering and leaving the new filter
+        """
+        with self.lock:
+            subscription = self.subscriptions.get(sid)
+            is_new = subscription is None
+            if is_new:
+                subscription = self.subscriptions[sid] = TrackSubscription(sid)
+            subscription.bbox, subscription.zoom, subscription.types = bbox, zoom, types
+            self._rebuild_viewports()
+
+            # Read under the lock: a version published meanwhile is either in this
+            # snapshot or fanned out to the client afterwards (or both, harmlessly)
+            snapshot = self.picture.snapshot()
+            visible = self._visible(subscription, snapshot)
+            if is_new:
+                subscription.held = visible
+                self._hold(sid, visible, True)
+                return 'track_snapshot', {'seq': subscription.seq,
+                                          'tracks': [snapshot.tracks[track_id] for track_id in visible]}
+
+            entering, leaving = visible - subscription.held, subscription.held - visible
+            self._hold(sid, entering, True)
+            self._hold(sid, leaving, False)
+            subscription.held = visible
+            subscription.seq += 1
+            return 'track_delta', {'seq': subscription.seq, 'base': subscription.seq - 1,
+                                   'added': [snapshot.tracks[track_id] for track_id in entering],
+                                   'updated': [], 'removed': list(leaving)}
+
+    def unsubscribe(self, sid: str):
+        """Drop a client's filtered subscription (e.g. on disconnect)"""
+        with self.lock:
+            subscription = self.subscriptions.pop(sid, None)
+            if subscription is None:
+                return
+            self._hold(sid, subscription.held, False)
+            self._rebuild_viewports()
+
+    def fan_out(self, snapshot: LiveSnapshot) -> List[Tuple[str, Dict]]:
+        """
+        Per-client deltas for a new live picture version
+
+        Args:
+            snapshot: Snapshot whose delta was just published
+
+        Returns:
+            (sid, delta) for every filtered client the change is visible to
+        """
+        delta = snapshot.delta
+        if not delta:
+            return []
+
+        updated = {changes['track_id']: changes for changes in delta['updated']}
+        changed_ids = [track['track_id'] for track in delta['added']] + list(updated) + delta['removed']
+        per_client: Dict[str, Dict] = {}
+
+        with self.lock:
+            if not self.subscriptions:
+                return []
+            for track_id in changed_ids:
+                track = snapshot.tracks.get(track_id)
+                sids = set(self.holders.get(track_id, ()))
+                if track is not None:
+                    sids |= self.unbounded
+                    if track.get('latitude') is not None and track.get('longitude') is not None:
+                        sids.update(self.viewports.query(track['longitude'], track['latitude']))
+
+                for sid in sids:
+                    subscription = self.subscriptions.get(sid)
+                    if subscription is None:
+                        continue
+                    visible, held = subscription.matches(track), track_id in subscription.held
+                    if not visible and not held:
+                        continue
+                    client_delta = per_client.setdefault(sid, {'added': [], 'updated': [], 'removed': []})
+                    if visible and held and track_id in updated:
+                        client_delta['updated'].append(updated[track_id])
+                    elif visible:
+                        client_delta['added'].append(track)
+                    else:
+                        client_delta['removed'].append(track_id)
+                    if visible != held:
+                        self._hold(sid, (track_id,), visible)
+                        (subscription.held.add if visible else subscription.held.discard)(track_id)
+
+            for sid, client_delta in per_client.items():
+                subscription = self.subscriptions[sid]
+                subscription.seq += 1
+                client_delta['seq'] = subscription.seq
+                client_delta['base'] = subscription.seq - 1
+        return list(per_client.items())
+
+    def get_statistics(self) -> Dict:
+        """Subscription counts"""
+        with self.lock:
+            return {
+                'filtered_clients': len(self.subscriptions),
+                'viewport_cells': len(self.viewports),
+                'held_tracks': sum(len(subscription.held) for subscription in self.subscriptions.values())
+            }
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Tracking Clock
+Measurement-time (simulation) clock for the tracker and ASTERIX time-of-day
+conversion. Driving ageing and coasting from measurement time instead of the
+wall clock makes replayed data produce the same tracks at any replay speed.
+"""
+
+from datetime import datetime, date, timedelta, timezone
+from typing import List, Dict, Optional, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400.0
+
+TIME_SOURCES = ('measurement', 'wall')
+
+
+def utc_now() -> datetime:
+    """Current time as a naive UTC datetime, like measurement times"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def to_naive_utc(value: Any) -> Optional[datetime]:
+    """
+    Normalise a timestamp to a naive UTC datetime
+
+    Args:
+        value: datetime, ISO-8601 string or None
+
+    Returns:
+        Naive UTC datetime, or None if the value cannot be interpreted
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class TimeOfDayConverter:
+    """
+    Converts ASTERIX time-of-day (seconds since UTC midnight, e.g. I048/140)
+    to full datetimes, tracking midnight rollover.
+
+    With a reference date (archived replay) the first report is placed on that
+    date; without one (live data) the date closest to the current UTC time is
+    chosen. Subsequent reports roll over to the next day when the time of day
+    jumps backwards by more than half a day.
+    """
+
+    def __init__(self, reference_date: Optional[date] = None):
+        self.reference_date = reference_date
+        self._current_date: Optional[date] = None
+        self._last_tod: Optional[float] = None
+
+    def set_reference_date(self, reference_date: Optional[date]):
+        """Set the date of the first report (None for live data) and reset rollover state"""
+        self.reference_date = reference_date
+        self._current_date = None
+        self._last_tod = None
+
+    def to_datetime(self, time_of_day: float) -> datetime:
+        """Convert seconds since midnight to a naive UTC datetime"""
+        time_of_day = time_of_day % SECONDS_PER_DAY
+
+        if self._current_date is None:
+            if self.reference_date is not None:
+                self._current_date = self.reference_date
+            else:
+                now = utc_now()
+                candidates = [now.date() + timedelta(days=d) for d in (-1, 0, 1)]
+                self._current_date = min(
+                    candidates,
+                    key=lambda d: abs((self._combine(d, time_of_day) - now).total_seconds())
+                )
+        elif self._last_tod is not None:
+            if time_of_day < self._last_tod - SECONDS_PER_DAY / 2:
+                self._current_date += timedelta(days=1)
+            elif time_of_day > self._last_tod + SECONDS_PER_DAY / 2:
+                # Late report from before a rollover we already applied
+                return self._combine(self._current_date - timedelta(days=1), time_of_day)
+
+        self._last_tod = time_of_day
+        return self._combine(self._current_date, time_of_day)
+
+    @staticmethod
+    def _combine(day: date, time_of_day: float) -> datetime:
+        return datetime(day.year, day.month, day.day) + timedelta(seconds=time_of_day)
+
+
+class SimulationClock:
+    """
+    Tracker clock driven by measurement time
+
+    In 'measurement' mode the clock only advances when plots carrying a later
+    measurement timestamp arrive, never goes backwards and never reads the
+    wall clock once data has been seen. 'wall' mode reproduces the legacy
+    behaviour of stamping every batch with the current time. Times are naive
+    UTC throughout, before the first plot as well.
+    """
+
+    def __init__(self, mode: str = 'measurement', start_time: Optional[datetime] = None):
+        if mode not in TIME_SOURCES:
+            raise ValueError(f"Unknown time source '{mode}', expected one of {TIME_SOURCES}")
+        self.mode = mode
+        self._time: Optional[datetime] = to_naive_utc(start_time)
+
+    def now(self) -> datetime:
+        """Current tracker time"""
+        if self._time is None:
+            return utc_now()
+        return self._time
+
+    def plot_time(self, plot: Dict) -> datetime:
+        """Measurement time of a plot (batch time in 'wall' mode)"""
+        if self.mode == 'measurement':
+            timestamp = to_naive_utc(plot.get('timestamp'))
+            if timestamp is not None:
+                return timestamp
+        return self.now()
+
+    def order_plots(self, plots: List[Dict]) -> List[Dict]:
+        """Order plots by measurement time (stable for equal timestamps)"""
+        if self.mode != 'measurement':
+            return list(plots)
+        return sorted(plots, key=self.plot_time)
+
+    def advance(self, plots: List[Dict]) -> datetime:
+        """
+        Advance the clock for a batch of plots
+
+        Returns:
+            Batch reference time used for prediction and track ageing
+        """
+        if self.mode == 'wall':
+            self._time = utc_now()
+            return self._time
+
+        times = [t for t in (to_naive_utc(p.get('timestamp')) for p in plots) if t is not None]
+        if times:
+            latest = max(times)
+            if self._time is None or latest > self._time:
+                self._time = latest
+        return self.now()
+
+    def advance_to(self, timestamp: datetime) -> datetime:
+        """Advance the clock to an explicit time (e.g. a north marker), never backwards"""
+        timestamp = to_naive_utc(timestamp)
+        if timestamp is not None and (self._time is None or timestamp > self._time):
+            self._time = timestamp
+        return self.now()
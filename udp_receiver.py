@@ -1,17 +1,32 @@
+"""
+UDP ASTERIX Receiver
+Receives ASTERIX datagrams and hands the decoded reports to the tracking
+pipeline through the event table:
 
+- CAT-48 plots become 'asterix_plot' events, stamped with their measurement
+  time (I048/140), which the track integrator turns into tracks
+- CAT-21 ADS-B reports become 'asterix_adsb' events, used when the
+  integrator fuses several sensors
+- CAT-34 north marker and sector crossing messages become
+  'asterix_north_marker' / 'asterix_sector_crossing' events, which close
+  antenna sectors in the integrator's sector batcher; the sector azimuth
+  (I034/020) is stored as the heading and a north marker's antenna rotation
+  period (I034/041, seconds) as the speed, which sets the tracker's scan period
+
+Every event carries the reporting sensor (sensor_id, from SAC/SIC).
+
+A datagram may carry several data blocks of different categories; every
+decoded report is routed by its own category.
+"""
 
 import socket
 import threading
 import logging
+import time
 from datetime import datetime, timezone
 from typing import List, Dict, Any
 
-try:
-    from app_init import app, db, Event
-except ImportError:
-    app = None
-    db = None
-    Event = None
+from tracking_clock import utc_now
 
 try:
     from asterix_cat48 import AsterixCAT48Processor
@@ -21,138 +36,84 @@ except ImportError:
 logger = logging.getLogger("udp_receiver")
 logging.basicConfig(level=logging.INFO)
 
-class UDPAsterixReceiver:
-    def __init__(self, host="0.0.0.0", port=8080):
-        self.host = host
-        self.port = port
-        self.running = False
-        self.socket = None
-        self.processor = AsterixCAT48Processor() if AsterixCAT48Processor else None
-        self.stats = {"messages_received": 0, "messages_processed": 0, "errors": 0}
-        logger.info(f"UDPAsterixReceiver initialized on {self.host}:{self.port}")
-
-    def start(self):
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind((self.host, self.port))
-        self.running = True
-        threading.Thread(target=self._receive_loop, daemon=True).start()
-        logger.info(f"UDP receiver started on {self.host}:{self.port}")
-
-    def stop(self):
-        self.running = False
-        if self.socket:
-            self.socket.close()
-        logger.info("UDP receiver stopped.")
-
-    def _receive_loop(self):
-        buffer_size = 65536
-        while self.running:
-            try:
-                data, addr = self.socket.recvfrom(buffer_size)
-                logger.info(f"Received {len(data)} bytes from {addr}")
-                self.stats["messages_received"] += 1
-                self._process_asterix_data(data, addr)
-            except Exception as e:
-                logger.error(f"Error in receive loop: {e}")
-                self.stats["errors"] += 1
-
-    def _process_asterix_data(self, data: bytes, addr: tuple):
-        if not data or len(data) < 3:
-            logger.warning(f"Received too short message from {addr}: {len(data)} bytes")
-            return
-        category = data[0]
-        if category == 48 and self.processor:
-            try:
-                targets = self.processor.process_cat48_message(data)
-                logger.info(f"CAT-48 targets extracted: {targets}")
-                if targets:
-                    logger.info(f"Processed {len(targets)} CAT-48 plots from {addr}")
-                    self._save_plots_to_db(targets)
-                    self.stats["messages_processed"] += 1
-                else:
-                    logger.warning(f"No plots extracted from CAT-48 message from {addr}")
-            except Exception as e:
-                logger.error(f"Error processing CAT-48 data: {e}")
-        else:
-            logger.warning(f"Received unknown ASTERIX category {category} from {addr}")
-
-    def _save_plots_to_db(self, plots: List[Dict[str, Any]]):
-        if not (Event and app and db):
-            logger.warning("Cannot save events - Flask dependencies not available")
-            return
-        for plot in plots:
-            if plot.get("latitude") and plot.get("longitude"):
-                try:
-                    with app.app_context():
-                        event = Event()
-                        event.timestamp = datetime.now(timezone.utc)
-                        event.track_id = plot.get("track_id", f"plot_{int(datetime.now().timestamp() * 1000000)}")
-                        event.latitude = plot["latitude"]
-                        event.longitude = plot["longitude"]
-                        event.altitude = plot.get("altitude", 0)
-                        event.speed = plot.get("speed", 0)
-                        event.heading = plot.get("heading", 0)
-                        event.event_type = "asterix_plot"
-                        event.description = "ASTERIX CAT-48 plot from UDP receiver"
-                        db.session.add(event)
-                        db.session.commit()
-                        logger.info(f"Added ASTERIX plot event for track integrator: {event.track_id}")
-                except Exception as e:
-                    logger.error(f"Error saving event to DB: {e}")
-                    db.session.rollback()
+REPORT_DESCRIPTIONS = {
+    'asterix_plot': "ASTERIX CAT-48 plot from UDP receiver",
+    'asterix_adsb': "ASTERIX CAT-21 ADS-B report from UDP receiver"
+}
 
-udp_receiver_instance = None
-
-def start_udp_receiver(host="0.0.0.0", port=8080):
-    global udp_receiver_instance
-    if udp_receiver_instance is None:
-        udp_receiver_instance = UDPAsterixReceiver(host, port)
-        udp_receiver_instance.start()
-    return udp_receiver_instance
-import socket
-import threading
-import logging
-from datetime import datetime, timezone
-from typing import List, Dict, Any
+SERVICE_EVENT_TYPES = {
+    'North Marker': 'asterix_north_marker',
+    'Sector Crossing': 'asterix_sector_crossing'
+}
 
-try:
-    from app_init import app, db, Event
-except ImportError:
-    app = None
-    db = None
-    Event = None
 
-try:
-    from asterix_cat48 import AsterixCAT48Processor
-except ImportError:
-    AsterixCAT48Processor = None
+def measurement_timestamp(report: Dict[str, Any]) -> datetime:
+    """Measurement time of a decoded report (naive UTC), or now if it carried no time of day"""
+    measurement_time = report.get('measurement_time')
+    return datetime.fromisoformat(measurement_time) if measurement_time else utc_now()
 
-logger = logging.getLogger("udp_receiver")
-logging.basicConfig(level=logging.INFO)
 
 class UDPAsterixReceiver:
-    def __init__(self, host="0.0.0.0", port=8080):
+    def __init__(self, host="0.0.0.0", port=8080, app=None, db=None, socketio=None, Track=None, Event=None):
+        """
+        Initialize receiver
+
+        Args:
+            host: Bind address
+            port: UDP port
+            app: Flask app instance (optional; without it reports are only logged)
+            db: SQLAlchemy database instance (optional)
+            socketio: SocketIO instance (optional)
+            Track: Track model class (optional)
+            Event: Event model class (optional)
+        """
         self.host = host
         self.port = port
+        self.app = app
+        self.db = db
+        self.socketio = socketio
+        self.Track = Track
+        self.Event = Event
         self.running = False
         self.socket = None
+        self.receive_thread = None
         self.processor = AsterixCAT48Processor() if AsterixCAT48Processor else None
-        self.stats = {"messages_received": 0, "messages_processed": 0, "errors": 0}
+        self.reset_statistics()
         logger.info(f"UDPAsterixReceiver initialized on {self.host}:{self.port}")
 
     def start(self):
-        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.socket.bind((self.host, self.port))
+        """
+        Bind the socket and start the receive thread
+
+        Returns:
+            bool: True if started, False if the port could not be bound
+        """
+        try:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind((self.host, self.port))
+            self.socket.settimeout(1.0)  # lets the loop notice stop()
+        except OSError as e:
+            logger.error(f"Cannot bind UDP receiver to {self.host}:{self.port}: {e}")
+            if self.socket:
+                self.socket.close()
+                self.socket = None
+            return False
+
         self.running = True
-        threading.Thread(target=self._receive_loop, daemon=True).start()
+        self.stats['start_time'] = datetime.now(timezone.utc)
+        self.receive_thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.receive_thread.start()
         logger.info(f"UDP receiver started on {self.host}:{self.port}")
+        return True
 
     def stop(self):
         self.running = False
+        if self.receive_thread:
+            self.receive_thread.join(timeout=2.0)
         if self.socket:
             self.socket.close()
+            self.socket = None
         logger.info("UDP receiver stopped.")
 
     def _receive_loop(self):
@@ -160,77 +121,27 @@ class UDPAsterixReceiver:
         while self.running:
             try:
                 data, addr = self.socket.recvfrom(buffer_size)
-                logger.info(f"Received {len(data)} bytes from {addr}")
-                self.stats["messages_received"] += 1
-                self._process_asterix_data(data, addr)
-            except Exception as e:
-                logger.error(f"Error in receive loop: {e}")
-                self.stats["errors"] += 1
+            except socket.timeout:
+                continue
+            except OSError as e:
+                if self.running:
+                    logger.error(f"Error in receive loop: {e}")
+                    self.stats['errors'] += 1
+                continue
 
-    def _process_asterix_data(self, data: bytes, addr: tuple):
-        if not data or len(data) < 3:
-            logger.warning(f"Received too short message from {addr}: {len(data)} bytes")
-            return
-        category = data[0]
-        if category == 48 and self.processor:
-            try:
-                targets = self.processor.process_cat48_message(data)
-                logger.info(f"CAT-48 targets extracted: {targets}")
-                if targets:
-                    logger.info(f"Processed {len(targets)} CAT-48 plots from {addr}")
-                    self._save_plots_to_db(targets)
-                    self.stats["messages_processed"] += 1
-                else:
-                    logger.warning(f"No plots extracted from CAT-48 message from {addr}")
-            except Exception as e:
-                logger.error(f"Error processing CAT-48 data: {e}")
-        else:
-            logger.warning(f"Received unknown ASTERIX category {category} from {addr}")
+            logger.debug(f"Received {len(data)} bytes from {addr}")
+            self.stats['messages_received'] += 1
+            self.stats['last_message_time'] = datetime.now(timezone.utc)
+
+            # Process ASTERIX data
+            self._process_asterix_data(data, addr)
 
-    def _save_plots_to_db(self, plots: List[Dict[str, Any]]):
-        if not (Event and app and db):
-            logger.warning("Cannot save events - Flask dependencies not available")
-            return
-        for plot in plots:
-            if plot.get("latitude") and plot.get("longitude"):
-                try:
-                    with app.app_context():
-                        event = Event()
-                        event.timestamp = datetime.now(timezone.utc)
-                        event.track_id = plot.get("track_id", f"plot_{int(datetime.now().timestamp() * 1000000)}")
-                        event.latitude = plot["latitude"]
-                        event.longitude = plot["longitude"]
-                        event.altitude = plot.get("altitude", 0)
-                        event.speed = plot.get("speed", 0)
-                        event.heading = plot.get("heading", 0)
-                        event.event_type = "asterix_plot"
-                        event.description = "ASTERIX CAT-48 plot from UDP receiver"
-                        db.session.add(event)
-                        db.session.commit()
-                        logger.info(f"Added ASTERIX plot event for track integrator: {event.track_id}")
-                except Exception as e:
-                    logger.error(f"Error saving event to DB: {e}")
-                    db.session.rollback()
-
-udp_receiver_instance = None
-
-def start_udp_receiver(host="0.0.0.0", port=8080):
-    global udp_receiver_instance
-    if udp_receiver_instance is None:
-        udp_receiver_instance = UDPAsterixReceiver(host, port)
-        udp_receiver_instance.start()
-    return udp_receiver_instance
-                
-                # Process ASTERIX data
-                self._process_asterix_data(data, addr)
-                
-    
     def _process_asterix_data(self, data: bytes, addr: tuple):
         """
-        Process received ASTERIX data through track calculator.
-        
+        Decode an ASTERIX datagram and route its reports by category.
+
         Args:
-            data: Raw ASTERIX data
+            data: Raw ASTERIX data (one or more data blocks)
             addr: Source address (IP, port)
         """
         try:
@@ -238,249 +149,202 @@ def start_udp_receiver(host="0.0.0.0", port=8080):
             if len(data) < 3:
                 logger.warning(f"Received too short message from {addr}: {len(data)} bytes")
                 return
-            
-            # Extract category from first byte
-            category = data[0]
-            
-            # Process based on category
-            if category == 48:
-                # Use specialized CAT-48 processor to extract plot data
-                targets = self.processor.process_cat48_message(data)
-                
-                if targets:
-                    logger.info(f"Processed {len(targets)} CAT-48 plots from {addr}")
-                    print(f"UDPReceiver: CAT-48 targets extracted: {targets}")
-                    # Send plot data to track calculator instead of directly to database
-                    self._send_plots_to_track_calculator(targets)
-                    self.stats['messages_processed'] += 1
-                else:
-                    logger.warning(f"No plots extracted from CAT-48 message from {addr}")
-                    
+            if not self.processor:
+                logger.warning("No ASTERIX processor available")
+                return
+
+            # The consolidated processor decodes every data block of the datagram
+            reports = self.processor.process_cat48_message(data)
+            plots = [report for report in reports if report.get('category') == 48]
+            adsb_reports = [report for report in reports if report.get('category') == 21]
+            service_messages = [report for report in reports if report.get('category') == 34]
+
+            if service_messages:
+                self._save_service_messages_to_db(service_messages)
+            if plots:
+                logger.info(f"Processed {len(plots)} CAT-48 plots from {addr}")
+                self._send_plots_to_track_calculator(plots)
+            if adsb_reports:
+                self._send_plots_to_track_calculator(adsb_reports, 'asterix_adsb')
+
+            other = len(reports) - len(plots) - len(adsb_reports) - len(service_messages)
+            if other:
+                logger.warning(f"Ignored {other} reports of unsupported ASTERIX categories from {addr}")
+            if reports:
+                self.stats['messages_processed'] += 1
             else:
-                # Log unknown category
-                logger.warning(f"Received unknown ASTERIX category {category} from {addr}")
-                
-                    print(f"UDPReceiver: No plots extracted from CAT-48 message from {addr}")
+                logger.warning(f"No reports extracted from ASTERIX data from {addr} (category {data[0]})")
         except Exception as e:
             logger.error(f"Error processing ASTERIX data from {addr}: {e}")
             self.stats['errors'] += 1
-    
-    def _send_plots_to_track_calculator(self, plots: List[Dict[str, Any]]):
+
+    def _send_plots_to_track_calculator(self, plots: List[Dict[str, Any]], event_type: str = 'asterix_plot'):
         """
         Send plot data to the central track integrator for processing.
-        
+
         Args:
             plots: List of plot dictionaries from ASTERIX processor
+            event_type: 'asterix_plot' (CAT-48) or 'asterix_adsb' (CAT-21)
         """
         try:
             # Get the global track integrator instance
             from track_flask_integration import track_integrator
-            
+
             if not track_integrator:
-                logger.error("Track integrator not available")
+                logger.warning("Track integrator not available - updating tracks directly")
                 self._update_tracks(plots)
                 return
-            
+
+            if not (self.Event and self.app and self.db):
+                logger.warning("Cannot create events - Flask dependencies not available")
+                return
+
             # Convert ASTERIX plots to database events that track integrator can process
-            for plot in plots:
-                if plot.get('latitude') and plot.get('longitude'):
-                    # Create event record that will be picked up by track integrator
-                    if self.Event and self.app and self.db:
-                        try:
-                            with self.app.app_context():
-                                event = self.Event()
-                                event.timestamp = datetime.now(timezone.utc)
-                                event.track_id = plot.get('track_id', f"plot_{int(datetime.now().timestamp() * 1000000)}")
-                                event.latitude = plot['latitude']
-                                event.longitude = plot['longitude']
-                                event.altitude = plot.get('altitude', 0)
-                                event.speed = plot.get('speed', 0)
-                                event.heading = plot.get('heading', 0)
-                                event.event_type = 'asterix_plot'
-                                event.description = f"ASTERIX CAT-48 plot from UDP receiver"
-                                self.db.session.add(event)
-                                self.db.session.commit()
-                                
-                                logger.debug(f"Added ASTERIX plot event for track integrator: {event.track_id}")
-                        except Exception as e:
-                            logger.error(f"Error creating event for track integrator: {e}")
-                            if self.db:
-                                self.db.session.rollback()
-                                print(f"UDPReceiver: Added ASTERIX plot event for track integrator: {event.track_id}")
-                    else:
-                        logger.warning("Cannot create events - Flask dependencies not available")
-            
+            stored = 0
+            with self.app.app_context():
+                try:
+                    for plot in plots:
+                        if plot.get('latitude') is None or plot.get('longitude') is None:
+                            continue
+                        event = self.Event()
+                        # Prefer the measurement time (I048/140) so replayed data keeps its own timeline
+                        event.timestamp = measurement_timestamp(plot)
+                        event.track_id = plot.get('track_id') or f"plot_{int(datetime.now().timestamp() * 1000000)}"
+                        event.latitude = plot['latitude']
+                        event.longitude = plot['longitude']
+                        event.altitude = plot.get('altitude') or 0
+                        event.speed = plot.get('speed') or 0
+                        event.heading = plot.get('heading') or 0
+                        event.sensor_id = plot.get('sensor_id')
+                        event.event_type = event_type
+                        event.description = REPORT_DESCRIPTIONS[event_type]
+                        self.db.session.add(event)
+                        stored += 1
+                    self.db.session.commit()
+                except Exception as e:
+                    logger.error(f"Error creating events for track integrator: {e}")
+                    self.db.session.rollback()
+                    return
+
             # Update statistics
-            self.stats['tracks_updated'] += len(plots)
-            logger.info(f"Sent {len(plots)} ASTERIX plots to track integrator via database events")
-                
+            self.stats['tracks_updated'] += stored
+            logger.debug(f"Sent {stored} ASTERIX plots to track integrator via database events")
+
         except Exception as e:
             logger.error(f"Error sending plots to track integrator: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
             # Fallback to direct database update if track integrator fails
             self._update_tracks(plots)
-    
+
+    def _save_service_messages_to_db(self, messages: List[Dict[str, Any]]):
+        """Store CAT-34 north marker / sector crossing messages for scan batching in the track integrator"""
+        if not (self.Event and self.app and self.db):
+            return
+        with self.app.app_context():
+            try:
+                for message in messages:
+                    service_type = message.get('service_message_type')
+                    event_type = SERVICE_EVENT_TYPES.get(service_type)
+                    if event_type is None:
+                        continue
+                    event = self.Event()
+                    event.timestamp = measurement_timestamp(message)
+                    event.track_id = f"radar_{message.get('sac') or 0}_{message.get('sic') or 0}"
+                    event.sensor_id = event.track_id
+                    event.heading = message.get('sector_azimuth') or 0.0
+                    event.speed = message.get('antenna_rotation_period')
+                    event.event_type = event_type
+                    event.description = f"ASTERIX CAT-34 {service_type.lower()}"
+                    self.db.session.add(event)
+                self.db.session.commit()
+            except Exception as e:
+                logger.error(f"Error saving CAT-34 events to DB: {e}")
+                self.db.session.rollback()
+
     def _update_tracks(self, targets: List[Dict[str, Any]]):
         """
-        Update database tracks from processed targets.
-        
+        Update database tracks from processed targets (used while no track integrator runs).
+
         Args:
             targets: List of processed target dictionaries
         """
         # Skip database updates if Flask dependencies are not available
         if not self.app or not self.db or not self.Track:
             logger.warning("Flask dependencies not available - skipping database update")
-            logger.info(f"Received {len(targets)} targets:")
-            for i, target in enumerate(targets):
-                logger.info(f"  Target {i+1}: {target}")
+            logger.info(f"Received {len(targets)} targets")
             return
-            
+
         try:
-            # Ensure we have Flask app context
-            if not self.app.app_context:
-                logger.warning("No Flask app context available - running in standalone mode")
-                return
-                
             with self.app.app_context():
                 updated_tracks = []
-                
+
                 for target in targets:
                     target_id = target.get('track_id')
                     if not target_id:
                         logger.warning(f"Target missing track_id: {target}")
                         continue
-                    
+
                     # Find existing track or create new one
                     track = self.Track.query.filter_by(track_id=str(target_id)).first()
                     if not track:
-                        # Ensure required fields have valid defaults
-                        lat = target.get('latitude', 0.0)
-                        lon = target.get('longitude', 0.0)
-                        
-                        # Handle None values and provide sensible defaults
-                        if lat is None:
-                            lat = 0.0
-                        if lon is None:
-                            lon = 0.0
-                            
-                        # Log the extracted data for debugging
-                        logger.debug(f"Creating new track {target_id}: lat={lat}, lon={lon}")
-                        logger.debug(f"Full target data: {target}")
-                            
                         track = self.Track()
                         track.track_id = str(target_id)
                         track.track_type = self._determine_track_type(target)
-                        track.latitude = lat
-                        track.longitude = lon
+                        track.latitude = target.get('latitude') or 0.0
+                        track.longitude = target.get('longitude') or 0.0
                         self.db.session.add(track)
-                    else:
-                        logger.debug(f"Updating existing track {target_id}")
-                    
-            if category == 48:
-                # Use specialized CAT-48 processor to extract plot data
-                targets = self.processor.process_cat48_message(data)
-                print(f"UDPReceiver: CAT-48 targets extracted: {targets}")
-                if targets:
-                    logger.info(f"Processed {len(targets)} CAT-48 plots from {addr}")
-                    # Send plot data to track calculator instead of directly to database
-                    self._send_plots_to_track_calculator(targets)
-                    self.stats['messages_processed'] += 1
-                else:
-                    logger.warning(f"No plots extracted from CAT-48 message from {addr}")
-                    print(f"UDPReceiver: No plots extracted from CAT-48 message from {addr}")
-                    if altitude is not None:
-                        try:
-                            track.altitude = float(altitude)
-                        except (ValueError, TypeError):
-                            logger.warning(f"Invalid altitude value: {altitude}")
-                    
-                    heading = target.get('heading')
-                    if heading is not None:
-                        try:
-                            track.heading = float(heading)
-                        except (ValueError, TypeError):
-                            logger.warning(f"Invalid heading value: {heading}")
-                    
-                    speed = target.get('speed')
-                    if speed is not None:
-                        try:
-                            track.speed = float(speed)
-                        except (ValueError, TypeError):
-                            logger.warning(f"Invalid speed value: {speed}")
-                    
+
+                    if target.get('latitude') is not None and target.get('longitude') is not None:
+                        track.latitude = float(target['latitude'])
+                        track.longitude = float(target['longitude'])
+                    if target.get('callsign'):
+                        track.callsign = target['callsign']
+
+                    for field in ('altitude', 'heading', 'speed'):
+                        value = target.get(field)
+                        if value is not None:
+                            try:
+                                setattr(track, field, float(value))
+                            except (ValueError, TypeError):
+                                logger.warning(f"Invalid {field} value: {value}")
+
                     track.status = 'Active'
-                    track.last_updated = datetime.now(timezone.utc)
-                    
+                    track.last_updated = utc_now()
+
                     updated_tracks.append(track)
-                
+
                 # Commit all changes
                 self.db.session.commit()
-                
+
                 # Update statistics
                 self.stats['tracks_updated'] += len(updated_tracks)
-                
+
                 # Broadcast updates via WebSocket if available
                 if updated_tracks and self.socketio:
-                    track_data = [track.to_dict() for track in updated_tracks]
-                    self.socketio.emit('track_update', track_data)
-                    
-                    # Log track update event if Event model is available
-                    if self.Event:
-                        event = self.Event()
-                        event.track_id = str(updated_tracks[0].track_id)
-                        event.event_type = 'track_update'
-                        event.description = f'Updated {len(updated_tracks)} tracks from ASTERIX CAT-48'
-                        self.db.session.add(event)
-                        self.db.session.commit()
-                
+                    self.socketio.emit('track_update', [track.to_dict() for track in updated_tracks])
+
         except Exception as e:
             logger.error(f"Error updating tracks: {e}")
-            logger.error(f"Target data that caused error: {targets}")
-            import traceback
-            logger.error(f"Full traceback: {traceback.format_exc()}")
-            try:
-                if self.db:
-                    self.db.session.rollback()
-            for plot in plots:
-                print(f"UDPReceiver: Processing plot for DB: {plot}")
-                if plot.get('latitude') and plot.get('longitude'):
-                    # Create event record that will be picked up by track integrator
-                    if self.Event and self.app and self.db:
-                        try:
-                            with self.app.app_context():
-                                event = self.Event()
-                                event.timestamp = datetime.now(timezone.utc)
-                                event.track_id = plot.get('track_id', f"plot_{int(datetime.now().timestamp() * 1000000)}")
-                                event.latitude = plot['latitude']
-                                event.longitude = plot['longitude']
-                                event.altitude = plot.get('altitude', 0)
-                                event.speed = plot.get('speed', 0)
-                                event.heading = plot.get('heading', 0)
-                                event.event_type = 'asterix_plot'
-                                event.description = f"ASTERIX CAT-48 plot from UDP receiver"
-                                self.db.session.add(event)
-                                self.db.session.commit()
-                                print(f"UDPReceiver: Added ASTERIX plot event for track integrator: {event.track_id}")
-                                logger.debug(f"Added ASTERIX plot event for track integrator: {event.track_id}")
-                        except Exception as e:
-                            logger.error(f"Error creating event for track integrator: {e}")
-                            if self.db:
-                                self.db.session.rollback()
-                    else:
-                        logger.warning("Cannot create events - Flask dependencies not available")
+            if self.db:
+                self.db.session.rollback()
+
+    def _determine_track_type(self, target: Dict[str, Any]) -> str:
+        """Track type of a target: aircraft if it reports an identity, otherwise unknown"""
+        if target.get('callsign') or target.get('aircraft_address') or target.get('mode_3a'):
+            return 'Aircraft'
+        return 'Unknown'
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get receiver statistics."""
         stats = self.stats.copy()
         stats['running'] = self.running
         stats['uptime'] = None
-        
+
         if stats['start_time']:
             uptime = datetime.now(timezone.utc) - stats['start_time']
             stats['uptime'] = str(uptime)
-        
+
         return stats
-    
+
     def reset_statistics(self):
         """Reset receiver statistics."""
         self.stats = {
@@ -491,20 +355,20 @@ def start_udp_receiver(host="0.0.0.0", port=8080):
             'start_time': datetime.now(timezone.utc) if self.running else None,
             'last_message_time': None
         }
-    
+
     def is_running(self):
         """
         Check if the UDP receiver is running.
-        
+
         Returns:
             bool: True if running, False otherwise
         """
-        return self.running and self.receive_thread and self.receive_thread.is_alive()
-    
+        return bool(self.running and self.receive_thread and self.receive_thread.is_alive())
+
     def get_stats(self):
         """
         Get current statistics.
-        
+
         Returns:
             dict: Current statistics including uptime
         """
@@ -522,32 +386,31 @@ _global_receiver = None
 def start_udp_receiver(app=None, db=None, socketio=None, Track=None, Event=None):
     """
     Start the global UDP receiver instance.
-    
+
     Args:
         app: Flask app instance (optional)
         db: SQLAlchemy database instance (optional)
         socketio: SocketIO instance (optional)
         Track: Track model class (optional)
         Event: Event model class (optional)
-    
+
     Returns:
         bool: True if started successfully, False otherwise
     """
     global _global_receiver
-    
+
     try:
         if _global_receiver is None:
             _global_receiver = UDPAsterixReceiver(
                 app=app, db=db, socketio=socketio, Track=Track, Event=Event
             )
-        
+
         if not _global_receiver.is_running():
-            _global_receiver.start()
-            return True
+            return _global_receiver.start()
         else:
             logger.warning("UDP receiver is already running")
             return False
-            
+
     except Exception as e:
         logger.error(f"Failed to start UDP receiver: {e}")
         return False
@@ -555,12 +418,12 @@ def start_udp_receiver(app=None, db=None, socketio=None, Track=None, Event=None)
 def stop_udp_receiver():
     """
     Stop the global UDP receiver instance.
-    
+
     Returns:
         bool: True if stopped successfully, False otherwise
     """
     global _global_receiver
-    
+
     try:
         if _global_receiver and _global_receiver.is_running():
             _global_receiver.stop()
@@ -568,7 +431,7 @@ def stop_udp_receiver():
         else:
             logger.warning("UDP receiver is not running")
             return False
-            
+
     except Exception as e:
         logger.error(f"Failed to stop UDP receiver: {e}")
         return False
@@ -576,12 +439,12 @@ def stop_udp_receiver():
 def get_udp_receiver_status():
     """
     Get the status of the global UDP receiver instance.
-    
+
     Returns:
         dict: Status information including running state and statistics
     """
     global _global_receiver
-    
+
     if _global_receiver:
         return {
             'running': _global_receiver.is_running(),
@@ -608,13 +471,13 @@ def get_udp_receiver_status():
 if __name__ == '__main__':
     # Test with sample data - standalone mode
     logger.info("Starting UDP ASTERIX receiver test...")
-    
+
     # Create a standalone receiver that doesn't use Flask app context
     receiver = UDPAsterixReceiver()
-    
+
     if receiver.start():
         logger.info("UDP receiver started successfully")
-        
+
         try:
             # Keep running
             while True:
@@ -623,7 +486,7 @@ if __name__ == '__main__':
                 logger.info(f"Stats: received={stats['messages_received']}, "
                            f"processed={stats['messages_processed']}, "
                            f"errors={stats['errors']}")
-                
+
         except KeyboardInterrupt:
             logger.info("Stopping UDP receiver...")
             receiver.stop()